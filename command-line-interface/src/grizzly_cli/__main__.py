@@ -17,6 +17,7 @@ from grizzly_cli.distributed import distributed
 from grizzly_cli.init import init
 from grizzly_cli.keyvault import keyvault
 from grizzly_cli.local import local
+from grizzly_cli.replay import replay
 from grizzly_cli.utils import ask_yes_no, get_dependency_versions, get_distributed_system, setup_logging
 
 if TYPE_CHECKING:
@@ -136,7 +137,7 @@ def _parse_arguments() -> argparse.Namespace:
     if args.command is None:
         parser.error('no command specified')
 
-    if getattr(args, 'subcommand', None) is None and args.command not in ['init', 'auth']:
+    if getattr(args, 'subcommand', None) is None and args.command not in ['init', 'auth', 'replay']:
         parser.error_no_help(f'no subcommand for {args.command} specified')
 
     if args.command == 'dist':
@@ -147,7 +148,7 @@ def _parse_arguments() -> argparse.Namespace:
 
         if args.registry is not None and not args.registry.endswith('/'):
             args.registry = f'{args.registry}/'
-    elif args.command in ['init', 'auth']:
+    elif args.command in ['init', 'auth', 'replay']:
         args.subcommand = None
 
     if args.subcommand == 'run':
@@ -205,6 +206,8 @@ def main() -> int:
             rc = auth(args)
         elif args.command == 'keyvault':
             rc = keyvault(args)
+        elif args.command == 'replay':
+            rc = replay(args)
         else:
             message = f'unknown command {args.command}'
             raise ValueError(message)
@@ -0,0 +1,122 @@
+"""Functionality for `grizzly-cli replay ...`."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import unquote, urlparse
+
+import requests
+from grizzly_common.journal import MetricsJournal, replay_segments
+
+from grizzly_cli import EXECUTION_CONTEXT, register_parser
+from grizzly_cli.utils import logger
+
+if TYPE_CHECKING:  # pragma: no cover
+    from argparse import Namespace as Arguments
+    from collections.abc import Callable
+
+    from grizzly_cli.argparse import ArgumentSubParser
+
+
+@register_parser()
+def create_parser(sub_parser: ArgumentSubParser) -> None:
+    # grizzly-cli replay
+    replay_parser = sub_parser.add_parser(
+        'replay',
+        description=(
+            'replay metrics that was written to the metrics journal (`Overflow=spill`) during a test, and that was not replayed '
+            'before the test finished. each segment in the journal is removed when all of its metrics has been written.'
+        ),
+    )
+
+    replay_parser.add_argument(
+        'url',
+        type=str,
+        help='statistics URL, in the same format as in step `save statistics to`',
+    )
+
+    replay_parser.add_argument(
+        '--journal',
+        type=str,
+        default=(Path(EXECUTION_CONTEXT) / 'logs' / 'metrics-journal').as_posix(),
+        required=False,
+        help='path to metrics journal directory',
+    )
+
+    replay_parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=5000,
+        required=False,
+        help='maximum number of metrics per write',
+    )
+
+    replay_parser.add_argument(
+        '--keep',
+        action='store_true',
+        default=False,
+        required=False,
+        help='keep segments after they have been replayed',
+    )
+
+    if replay_parser.prog != 'grizzly-cli replay':  # pragma: no cover
+        replay_parser.prog = 'grizzly-cli replay'
+
+
+def create_writer(url: str) -> Callable[[list[bytes]], None]:
+    """Create a function that writes line protocol points to the InfluxDB endpoint in `url`."""
+    parsed = urlparse(url)
+    path = parsed.path[1:] if parsed.path is not None else ''
+
+    if parsed.hostname is None or len(path) < 1:
+        message = f'{url} is not a valid statistics URL'
+        raise ValueError(message)
+
+    port = parsed.port or 8086
+    auth: tuple[str, str] | None = None
+    headers: dict[str, str] = {'Content-Type': 'text/plain; charset=utf-8'}
+
+    if parsed.scheme == 'influxdb2':
+        org, bucket = path.split(':', 1)
+        endpoint = f'https://{parsed.hostname}:{port}/api/v2/write'
+        params = {'org': org, 'bucket': bucket, 'precision': 'ns'}
+        headers.update({'Authorization': f'Token {unquote(parsed.username or "")}'})
+    elif parsed.scheme == 'influxdb':
+        endpoint = f'http://{parsed.hostname}:{port}/write'
+        params = {'db': path, 'precision': 'n'}
+        if parsed.username is not None:
+            auth = (unquote(parsed.username), unquote(parsed.password or ''))
+    else:
+        message = f'"{parsed.scheme}" is not a supported scheme'
+        raise ValueError(message)
+
+    def write(lines: list[bytes]) -> None:
+        try:
+            response = requests.post(endpoint, params=params, data=b'\n'.join(lines), headers=headers, auth=auth, timeout=60)
+        except requests.RequestException as e:
+            message = f'failed to write metrics to {parsed.hostname}: {e!s}'
+            raise ValueError(message) from e
+
+        if response.status_code != 204:
+            message = f'failed to write metrics to {parsed.hostname}: {response.status_code} {response.text}'
+            raise ValueError(message)
+
+    return write
+
+
+def replay(args: Arguments) -> int:
+    journal = Path(args.journal)
+    segments = MetricsJournal.find(journal)
+
+    if len(segments) < 1:
+        logger.info('no metrics journal segments found in %s', journal.as_posix())
+        return 0
+
+    write = create_writer(args.url)
+
+    logger.info('replaying %d metrics journal segments from %s', len(segments), journal.as_posix())
+    count = replay_segments(segments, write, batch_size=args.batch_size, keep=args.keep)
+    logger.info('replayed %d metrics', count)
+
+    return 0
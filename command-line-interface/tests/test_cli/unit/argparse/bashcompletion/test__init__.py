@@ -218,7 +218,7 @@ class TestBashCompleteAction:
     @pytest.mark.parametrize(
         ('command', 'expected'),
         [
-            ('grizzly-cli ', '-h\n--help\n--version\ninit\nkeyvault\nlocal\ndist\nauth'),
+            ('grizzly-cli ', '-h\n--help\n--version\ninit\nkeyvault\nlocal\ndist\nauth\nreplay'),
             ('grizzly-cli -', '-h\n--help\n--version'),
             ('grizzly-cli --', '--help\n--version'),
             ('grizzly-cli lo', 'local'),
@@ -43,7 +43,7 @@ def test__create_parser() -> None:  # noqa: PLR0915
     subparser = parser._subparsers._group_actions[0]
     assert subparser is not None
     assert subparser.choices is not None
-    assert len(cast('dict[str, CoreArgumentParser | None]', subparser.choices).keys()) == 5
+    assert len(cast('dict[str, CoreArgumentParser | None]', subparser.choices).keys()) == 6
 
     init_parser = cast('dict[str, CoreArgumentParser | None]', subparser.choices).get('init', None)
     assert init_parser is not None
@@ -71,6 +71,20 @@ def test__create_parser() -> None:  # noqa: PLR0915
         ]
     )
 
+    replay_parser = cast('dict[str, CoreArgumentParser | None]', subparser.choices).get('replay', None)
+    assert replay_parser is not None
+    assert replay_parser._subparsers is None
+    assert getattr(replay_parser, 'prog', None) == 'grizzly-cli replay'
+    assert sorted([option_string for action in replay_parser._actions for option_string in action.option_strings]) == sorted(
+        [
+            '-h',
+            '--help',
+            '--journal',
+            '--batch-size',
+            '--keep',
+        ]
+    )
+
     keyvault_parser = cast('dict[str, CoreArgumentParser | None]', subparser.choices).get('keyvault', None)
     assert keyvault_parser is not None
     print(keyvault_parser._subparsers)
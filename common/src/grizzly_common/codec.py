@@ -0,0 +1,128 @@
+"""JSON codec used in hot paths, e.g. when transforming response payloads and passing messages between processes.
+
+[orjson](https://github.com/ijl/orjson) is used if it is installed, e.g. with the `orjson` extra, otherwise the standard library `json`
+module. Set environment variable `GRIZZLY_JSON_BACKEND` to `json` to always use the standard library.
+
+Encoded JSON is compact, without whitespace, so it should only be used where the formatting does not matter, e.g. for transport or to
+get the size of a value. Both backends should give the same result, values that orjson handles differently falls back to the standard
+library:
+
+- `NaN` and `Infinity` are decoded, and encoded, as by the standard library, orjson encodes them as `null`
+- integers larger than 64 bits, which orjson decodes as `float`, are decoded by the standard library
+- `datetime`, `date`, `time` and dataclasses can not be encoded, as with the standard library
+
+orjson still encodes `uuid.UUID` and `enum.Enum` values, which the standard library can not encode.
+"""
+
+from __future__ import annotations
+
+import json
+from math import isfinite
+from os import environ
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable
+
+__all__ = [
+    'backend',
+    'json_dumps',
+    'json_encode',
+    'json_loads',
+]
+
+
+# orjson decodes integers that does not fit in 64 bits as float
+INT64_OVERFLOW = float(2**63)
+
+
+def _default(o: Any) -> Any:
+    if isinstance(o, bytes):
+        try:
+            return o.decode('utf-8')
+        except Exception:
+            return o.decode('latin-1')
+
+    message = f'Object of type {o.__class__.__name__} is not JSON serializable'
+    raise TypeError(message)
+
+
+def _has_float(value: Any, predicate: Callable[[float], bool]) -> bool:
+    """Check if any float in value, or in the values of dicts, lists and tuples in value, matches `predicate`."""
+    stack = [value]
+
+    while stack:
+        item = stack.pop()
+        item_type = type(item)
+
+        if item_type is dict:
+            stack.extend(item.values())
+        elif item_type is list or item_type is tuple:
+            stack.extend(item)
+        elif item_type is float and predicate(item):
+            return True
+
+    return False
+
+
+def _is_large_integer(value: float) -> bool:
+    return value.is_integer() and abs(value) >= INT64_OVERFLOW
+
+
+def _is_non_finite(value: float) -> bool:
+    return not isfinite(value)
+
+
+def _stdlib_loads(value: str | bytes | bytearray) -> Any:
+    return json.loads(value)
+
+
+def _stdlib_encode(value: Any) -> bytes:
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=_default).encode()
+
+
+json_loads = _stdlib_loads
+json_encode = _stdlib_encode
+backend = 'json'
+
+if environ.get('GRIZZLY_JSON_BACKEND', 'orjson') != 'json':
+    try:
+        import orjson
+    except ModuleNotFoundError:  # pragma: no cover
+        pass
+    else:
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+        def _orjson_loads(value: str | bytes | bytearray) -> Any:
+            try:
+                decoded = orjson.loads(value)
+            except orjson.JSONDecodeError:
+                # e.g. NaN
+                return _stdlib_loads(value)
+
+            # checking the decoded value is cheaper than searching the JSON for large integers before it is decoded
+            if _has_float(decoded, _is_large_integer):
+                return _stdlib_loads(value)
+
+            return decoded
+
+        def _orjson_encode(value: Any) -> bytes:
+            try:
+                encoded = orjson.dumps(value, default=_default, option=options)
+            except TypeError:
+                # e.g. integers larger than 64 bits, dicts with keys that are not strings or values that can not be encoded
+                return _stdlib_encode(value)
+
+            if b'null' in encoded and _has_float(value, _is_non_finite):
+                return _stdlib_encode(value)
+
+            return encoded
+
+        json_loads = _orjson_loads
+        json_encode = _orjson_encode
+        backend = 'orjson'
+
+
+def json_dumps(value: Any) -> str:
+    """Encode value as compact JSON."""
+    return json_encode(value).decode()
@@ -0,0 +1,133 @@
+"""Append-only journal of metrics in line protocol, split in segment files.
+
+A journal is a directory with segment files, where each line in a segment is one point in InfluxDB line protocol.
+A segment is sealed when it has reached the maximum segment size, and only sealed segments are replayed, oldest
+first. A segment is removed when all of its points has been replayed.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from typing import TYPE_CHECKING, BinaryIO, ClassVar
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable, Iterable, Iterator
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def read_segment(segment: Path, *, batch_size: int) -> Iterator[list[bytes]]:
+    """Read points in a segment, in batches of at most `batch_size` points."""
+    batch: list[bytes] = []
+
+    with segment.open('rb') as fd:
+        for raw_line in fd:
+            line = raw_line.rstrip(b'\r\n')
+            if not line:
+                continue
+
+            batch.append(line)
+
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+    if batch:
+        yield batch
+
+
+def replay_segments(segments: Iterable[Path], write: Callable[[list[bytes]], None], *, batch_size: int, keep: bool = False) -> int:
+    """Write all points in segments, in batches, and remove each segment when all of its points has been written.
+
+    If `write` raises an exception, the segment that was being replayed is kept. Points that already has been written
+    will be written again the next time the segment is replayed, which InfluxDB handles since a point with the same
+    measurement, tag set and timestamp is overwritten.
+    """
+    count = 0
+
+    for segment in segments:
+        for batch in read_segment(segment, batch_size=batch_size):
+            write(batch)
+            count += len(batch)
+
+        if not keep:
+            segment.unlink()
+
+        logger.debug('replayed segment %s', segment)
+
+    return count
+
+
+class MetricsJournal:
+    suffix: ClassVar[str] = '.lp'
+
+    path: Path
+    prefix: str
+    segment_size: int
+    sealed: deque[Path]
+
+    _sequence: int
+    _segment: Path | None
+    _fd: BinaryIO | None
+    _size: int
+
+    def __init__(self, path: Path, *, prefix: str, segment_size: int = 16 * 1024 * 1024) -> None:
+        self.path = path
+        self.prefix = prefix
+        self.segment_size = segment_size
+        self.sealed = deque()
+
+        self._sequence = 0
+        self._segment = None
+        self._fd = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self.sealed) + (1 if self._segment is not None else 0)
+
+    @classmethod
+    def find(cls, path: Path) -> list[Path]:
+        """Find all segments in a journal directory, oldest first."""
+        if not path.is_dir():
+            return []
+
+        return sorted(path.glob(f'*{cls.suffix}'), key=lambda segment: (segment.stat().st_mtime_ns, segment.name))
+
+    def _open(self) -> BinaryIO:
+        if self._fd is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._sequence += 1
+            self._segment = self.path / f'{self.prefix}-{self._sequence:08d}{self.suffix}'
+            self._fd = self._segment.open('ab')
+            self._size = 0
+
+        return self._fd
+
+    def append(self, lines: Iterable[bytes]) -> int:
+        """Append points to the current segment, which is sealed when it exceeds the segment size."""
+        count = 0
+
+        for line in lines:
+            fd = self._open()
+            self._size += fd.write(line) + fd.write(b'\n')
+            count += 1
+
+            if self._size >= self.segment_size:
+                self.seal()
+
+        if self._fd is not None:
+            self._fd.flush()
+
+        return count
+
+    def seal(self) -> None:
+        """Close current segment, so it can be replayed."""
+        if self._fd is None or self._segment is None:
+            return
+
+        self._fd.close()
+        self.sealed.append(self._segment)
+        self._fd = None
+        self._segment = None
@@ -15,6 +15,7 @@ from typing import TYPE_CHECKING, Any, ClassVar, cast
 from jsonpath_ng.ext import parse as jsonpath_parse
 from lxml import etree as XML  # noqa: N812
 
+from grizzly_common.codec import json_loads
 from grizzly_common.text import PermutationEnum, caster
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -115,7 +116,7 @@ class JsonTransformer(Transformer):
 
     @classmethod
     def transform(cls, raw: str) -> Any:
-        return jsonloads(raw)
+        return json_loads(raw)
 
     @classmethod
     def validate(cls, expression: str) -> bool:
@@ -273,12 +274,15 @@ class XmlTransformer(Transformer):
     def transform(cls, raw: str) -> Any:
         document = XML.XML(raw.encode(), parser=cls._parser)
 
-        # remove namespaces, which makes it easier to use XPath...
-        for element in document.getiterator():
-            if isinstance(element.tag, str):
-                element.tag = XML.QName(element).localname
+        # remove namespaces, which makes it easier to use XPath... there are no namespaces without declarations, so
+        # the tree is only walked if there are any
+        if 'xmlns' in raw:
+            for element in document.iter():
+                tag = element.tag
+                if isinstance(tag, str) and tag[0] == '{':
+                    element.tag = tag.split('}', 1)[1]
 
-        XML.cleanup_namespaces(document)
+            XML.cleanup_namespaces(document)
 
         return document
 
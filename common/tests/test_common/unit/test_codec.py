@@ -0,0 +1,129 @@
+"""Unit tests of grizzly_common.codec."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from importlib import reload
+from json import JSONDecodeError
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from grizzly_common import codec
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Generator
+    from types import ModuleType
+
+    from pytest_mock import MockerFixture
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def json_codec(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> Generator[ModuleType, None, None]:
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+
+    monkeypatch.setenv('GRIZZLY_JSON_BACKEND', request.param)
+
+    try:
+        module = reload(codec)
+        assert module.backend == request.param
+
+        yield module
+    finally:
+        monkeypatch.delenv('GRIZZLY_JSON_BACKEND')
+        reload(codec)
+
+
+@pytest.mark.parametrize(
+    ('value', 'expected'),
+    [
+        ({'foo': 'bar', 'baz': [1, 2.5, None, True]}, b'{"foo":"bar","baz":[1,2.5,null,true]}'),
+        ({'name': 'åäö'}, '{"name":"åäö"}'.encode()),
+        ({'payload': b'hello'}, b'{"payload":"hello"}'),
+        ({'payload': b'\xe5\xe4\xf6'}, '{"payload":"åäö"}'.encode()),
+        ([2**70], b'[1180591620717411303424]'),
+        ({1: 'foo'}, b'{"1":"foo"}'),
+    ],
+)
+def test_json_encode(json_codec: ModuleType, value: Any, expected: bytes) -> None:
+    assert json_codec.json_encode(value) == expected
+    assert json_codec.json_dumps(value) == expected.decode()
+
+
+@pytest.mark.parametrize(
+    ('value', 'expected'),
+    [
+        ({'value': float('nan')}, b'{"value":NaN}'),
+        ([1.5, [float('inf')]], b'[1.5,[Infinity]]'),
+        ({'value': (None, -float('inf'))}, b'{"value":[null,-Infinity]}'),
+    ],
+)
+def test_json_encode_non_finite(json_codec: ModuleType, value: Any, expected: bytes) -> None:
+    assert json_codec.json_encode(value) == expected
+
+
+@dataclass
+class Value:
+    value: int
+
+
+@pytest.mark.parametrize(
+    'value',
+    [
+        object(),
+        datetime(2024, 1, 1, tzinfo=timezone.utc),
+        datetime(2024, 1, 1, tzinfo=timezone.utc).date(),
+        Value(1),
+    ],
+)
+def test_json_encode_error(json_codec: ModuleType, value: Any) -> None:
+    with pytest.raises(TypeError, match='is not JSON serializable'):
+        json_codec.json_encode({'foo': value})
+
+
+def test_json_loads(json_codec: ModuleType) -> None:
+    assert json_codec.json_loads('{"foo": "bar", "baz": [1, 2.5, null, true]}') == {'foo': 'bar', 'baz': [1, 2.5, None, True]}
+    assert json_codec.json_loads(b'{"name":"\xc3\xa5\xc3\xa4\xc3\xb6"}') == {'name': 'åäö'}
+
+    value = json_codec.json_loads('{"value": NaN}')
+    assert value['value'] != value['value']
+
+    with pytest.raises(JSONDecodeError):
+        json_codec.json_loads('{"foo": }')
+
+
+@pytest.mark.parametrize(
+    ('value', 'expected'),
+    [
+        ('{"value": "1180591620717411303424"}', {'value': '1180591620717411303424'}),
+        ('{"value": 9223372036854775807}', {'value': 2**63 - 1}),
+        ('{"value": 1.0e3, "values": [1.5e-3]}', {'value': 1000.0, 'values': [1.5e-3]}),
+    ],
+)
+def test_json_loads_orjson(json_codec: ModuleType, mocker: MockerFixture, value: str, expected: Any) -> None:
+    stdlib_loads_spy = mocker.spy(json_codec, '_stdlib_loads')
+
+    assert json_codec.json_loads(value) == expected
+
+    if json_codec.backend == 'orjson':
+        stdlib_loads_spy.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    ('value', 'expected'),
+    [
+        ('{"value": 1180591620717411303424}', 2**70),
+        (b'{"value": 1180591620717411303424}', 2**70),
+        (bytearray(b'{"value": 1180591620717411303424}'), 2**70),
+        ('{"value": -9223372036854775809}', -(2**63) - 1),
+        ('{"value": 18446744073709551616}', 2**64),
+        ('{"value": 18446744073709551615}', 2**64 - 1),
+        ('{"value": 1.5e300}', 1.5e300),
+    ],
+)
+def test_json_loads_large_integer(json_codec: ModuleType, value: str | bytes | bytearray, expected: float) -> None:
+    actual = json_codec.json_loads(value)
+
+    assert type(actual['value']) is type(expected)
+    assert actual == {'value': expected}
@@ -0,0 +1,71 @@
+"""Unit tests of grizzly_common.journal."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from grizzly_common.journal import MetricsJournal, read_segment, replay_segments
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pathlib import Path
+
+
+def test_read_segment(tmp_path: Path) -> None:
+    segment = tmp_path / 'test.lp'
+    segment.write_bytes(b'a value=1i 1\n\nb value=2i 2\r\nc value=3i 3\n')
+
+    assert list(read_segment(segment, batch_size=2)) == [[b'a value=1i 1', b'b value=2i 2'], [b'c value=3i 3']]
+    assert list(read_segment(segment, batch_size=10)) == [[b'a value=1i 1', b'b value=2i 2', b'c value=3i 3']]
+
+
+def test_replay_segments(tmp_path: Path) -> None:
+    segments = [tmp_path / 'a.lp', tmp_path / 'b.lp']
+    segments[0].write_bytes(b'a value=1i 1\na value=2i 2\n')
+    segments[1].write_bytes(b'b value=1i 1\n')
+
+    written: list[list[bytes]] = []
+
+    assert replay_segments(segments, written.append, batch_size=1, keep=True) == 3
+    assert written == [[b'a value=1i 1'], [b'a value=2i 2'], [b'b value=1i 1']]
+    assert all(segment.exists() for segment in segments)
+
+    def write(lines: list[bytes]) -> None:
+        if lines[0].startswith(b'b'):
+            message = 'failed'
+            raise RuntimeError(message)
+
+    with pytest.raises(RuntimeError, match='failed'):
+        replay_segments(segments, write, batch_size=10)
+
+    assert not segments[0].exists()
+    assert segments[1].exists()
+
+
+class TestMetricsJournal:
+    def test_append(self, tmp_path: Path) -> None:
+        path = tmp_path / 'logs' / 'metrics-journal'
+        journal = MetricsJournal(path, prefix='test', segment_size=26)
+
+        assert len(journal) == 0
+        assert MetricsJournal.find(path) == []
+        assert not path.exists()
+
+        assert journal.append([b'a value=1i 1', b'a value=2i 2', b'a value=3i 3']) == 3
+
+        assert len(journal) == 2
+        assert list(journal.sealed) == [path / 'test-00000001.lp']
+        assert (path / 'test-00000001.lp').read_bytes() == b'a value=1i 1\na value=2i 2\n'
+        assert (path / 'test-00000002.lp').read_bytes() == b'a value=3i 3\n'
+
+        journal.seal()
+        journal.seal()
+
+        assert len(journal) == 2
+        assert list(journal.sealed) == [path / 'test-00000001.lp', path / 'test-00000002.lp']
+        assert MetricsJournal.find(path) == [path / 'test-00000001.lp', path / 'test-00000002.lp']
+
+        journal.append([b'b value=1i 1'])
+
+        assert len(journal) == 3
+        assert MetricsJournal.find(path)[-1] == path / 'test-00000003.lp'
@@ -346,6 +346,20 @@ class TestXmlTransformer:
 
         assert isinstance(transformed, XML._Element)
 
+        # namespaces are removed
+        transformed = unwrapped(
+            """<?xml version="1.0" encoding="UTF-8"?>
+            <root xmlns="http://www.example.com/" xmlns:foo="http://www.foo.org/">
+                <foo:child id="1">value</foo:child>
+                <!-- comment -->
+                <child id="2" />
+            </root>""",
+        )
+
+        assert [element.tag for element in transformed.iter(tag=XML.Element)] == ['root', 'child', 'child']
+        assert transformed.nsmap == {}
+        assert transformed.xpath('/root/child/@id') == ['1', '2']
+
         with pytest.raises(XML.ParseError, match='Namespace prefix test on test is not defined'):
             unwrapped(
                 """<?xml version="1.0" encoding="UTF-8"?>
@@ -7,8 +7,6 @@ from __future__ import annotations
 import logging
 from concurrent import futures
 from contextlib import suppress
-from json import dumps as jsondumps
-from json import loads as jsonloads
 from multiprocessing import Process
 from signal import SIGINT, SIGTERM, Signals, signal
 from threading import Event
@@ -19,7 +17,7 @@ from uuid import uuid4
 
 import setproctitle as proc
 import zmq.green as zmq
-from grizzly_common.transformer import JsonBytesEncoder
+from grizzly_common.codec import json_encode, json_loads
 from zmq import sugar as ztypes
 
 from . import (
@@ -106,7 +104,7 @@ class Worker:
 
                 request = cast(
                     'AsyncMessageRequest',
-                    jsonloads(request_proto[-1].decode()),
+                    json_loads(request_proto[-1]),
                 )
 
                 request_request_id = request.get('request_id', None)
@@ -142,7 +140,7 @@ class Worker:
                 response_proto = [
                     request_proto[0],
                     SPLITTER_FRAME,
-                    jsondumps(response, cls=JsonBytesEncoder).encode(),
+                    json_encode(response),
                 ]
 
                 self.socket.send_multipart(response_proto)
@@ -232,7 +230,7 @@ def router(run_daemon: Event, logger: logging.Logger) -> None:  # noqa: C901, PL
                         waiting_for_worker = False
                         logger.debug('worker %s is available', worker_id)
                     else:
-                        payload = jsonloads(reply[-1].decode())
+                        payload = json_loads(reply[-1])
                         request_request_id = payload.get('request_id', None)
 
                         if len(reply) > 0 and reply[0] is not None and payload.get('action', None) in ['DISC', 'DISCONNECT']:
@@ -257,7 +255,7 @@ def router(run_daemon: Event, logger: logging.Logger) -> None:  # noqa: C901, PL
                         continue
 
                     request_id = frontend_response[0]
-                    payload = cast('AsyncMessageRequest', jsonloads(frontend_response[-1].decode()))
+                    payload = cast('AsyncMessageRequest', json_loads(frontend_response[-1]))
 
                     request_worker_id = payload.get('worker', None)
                     request_client_id = str(payload.get('client', None))
@@ -298,7 +296,7 @@ def router(run_daemon: Event, logger: logging.Logger) -> None:  # noqa: C901, PL
                     if payload.get('worker', None) is None:
                         payload['worker'] = worker_id
 
-                    request = jsondumps(payload).encode()
+                    request = json_encode(payload)
                     backend_request = [worker_id.encode(), SPLITTER_FRAME, request_id, SPLITTER_FRAME, request]
                     backend.send_multipart(backend_request)
 
@@ -318,7 +316,7 @@ def router(run_daemon: Event, logger: logging.Logger) -> None:  # noqa: C901, PL
                     response_proto = [
                         worker_identifiers_map.get(identity),
                         SPLITTER_FRAME,
-                        jsondumps(response, cls=JsonBytesEncoder).encode(),
+                        json_encode(response),
                     ]
 
                     frontend.send_multipart(response_proto)
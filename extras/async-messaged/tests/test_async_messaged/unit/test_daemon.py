@@ -67,15 +67,7 @@ def test_worker(mocker: MockerFixture, caplog: LogCaptureFixture, scheme: str, i
         [
             b'ID-54321',
             b'',
-            jsondumps(
-                {
-                    'request_id': 'None',
-                    'worker': 'ID-12345',
-                    'response_time': 0,
-                    'success': False,
-                    'message': 'got ID-54321, expected ID-12345',
-                },
-            ).encode(),
+            b'{"request_id":"None","worker":"ID-12345","response_time":0,"success":false,"message":"got ID-54321, expected ID-12345"}',
         ],
     )
     worker_mock.send_multipart.reset_mock()
@@ -89,15 +81,7 @@ def test_worker(mocker: MockerFixture, caplog: LogCaptureFixture, scheme: str, i
         [
             b'ID-12345',
             b'',
-            jsondumps(
-                {
-                    'request_id': 'None',
-                    'worker': 'ID-12345',
-                    'response_time': 0,
-                    'success': False,
-                    'message': 'integration for http:// is not implemented',
-                },
-            ).encode(),
+            b'{"request_id":"None","worker":"ID-12345","response_time":0,"success":false,"message":"integration for http:// is not implemented"}',
         ],
     )
     worker_mock.send_multipart.reset_mock()
@@ -131,18 +115,7 @@ def test_worker(mocker: MockerFixture, caplog: LogCaptureFixture, scheme: str, i
         [
             b'ID-12345',
             b'',
-            jsondumps(
-                {
-                    'request_id': 'None',
-                    'worker': 'ID-12345',
-                    'success': True,
-                    'payload': 'hello world',
-                    'metadata': {
-                        'some': 'metadata',
-                    },
-                    'response_time': 439,
-                },
-            ).encode(),
+            b'{"request_id":"None","worker":"ID-12345","success":true,"payload":"hello world","metadata":{"some":"metadata"},"response_time":439}',
         ],
     )
     worker_mock.send_multipart.reset_mock()
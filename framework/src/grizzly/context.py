@@ -12,8 +12,10 @@ from typing import TYPE_CHECKING, Any, Literal, cast
 
 import yaml
 from gevent.lock import Semaphore
-from jinja2 import DebugUndefined, Environment, FileSystemLoader
+from grizzly_common.transformer import transformer
+from jinja2 import DebugUndefined, Environment, FileSystemLoader, Template
 from jinja2.filters import FILTERS
+from jinja2.utils import LRUCache
 from typing_extensions import Self
 
 from grizzly.events import events
@@ -24,9 +26,12 @@ from grizzly.utils import flatten, merge_dicts
 if TYPE_CHECKING:  # pragma: no cover
     from cProfile import Profile
 
+    from grizzly_common.transformer import TransformerContentType
     from locust.dispatch import UsersDispatcher
 
     from grizzly.events import GrizzlyEvents
+    from grizzly.listeners.saturation import SaturationMonitor
+    from grizzly.listeners.stats import HistogramStats
     from grizzly.testdata.communication import TestdataProducer
     from grizzly.types.behave import Scenario
     from grizzly.types.locust import Environment as LocustEnvironment
@@ -93,6 +98,16 @@ def jinja2_environment_factory() -> Environment:
     return environment
 
 
+def template_cache_factory() -> LRUCache:
+    """Create a cache of compiled templates, so templates are only compiled once per grizzly scenario."""
+    return LRUCache(1000)
+
+
+def parser_cache_factory() -> LRUCache:
+    """Create a cache of validated and compiled expression parsers, so expressions are only compiled once per grizzly scenario."""
+    return LRUCache(1000)
+
+
 @dataclass
 class GrizzlyContextState:
     spawning_complete: Semaphore = field(default_factory=Semaphore)
@@ -102,6 +117,8 @@ class GrizzlyContextState:
     locust: MasterRunner | WorkerRunner | LocalRunner = field(init=False, repr=False)
     producer: TestdataProducer | None = field(init=False, repr=False, default=None)
     profile: Profile | None = field(init=False, repr=False, default=None)
+    histograms: HistogramStats | None = field(init=False, repr=False, default=None)
+    saturation: SaturationMonitor | None = field(init=False, repr=False, default=None)
     run_mode: Literal['local', 'distributed'] = field(init=False, default=cast('Literal["local", "distributed"]', environ.get('GRIZZLY_RUN_MODE', 'local')))
 
 
@@ -124,6 +141,7 @@ class GrizzlyContextScenarioUser:
     weight: int = field(init=False, hash=True, default=1)
     fixed_count: int | None = field(init=False, repr=False, hash=False, compare=False, default=None)
     sticky_tag: str | None = field(init=False, repr=False, hash=False, compare=False, default=None)
+    cost: float = field(init=False, repr=False, hash=False, compare=False, default=1.0)
 
 
 StackedFuncType = Callable[['GrizzlyContextTasksTmp'], 'GrizzlyTaskWrapper | None']
@@ -227,6 +245,7 @@ class GrizzlyContextScenario:
     index: int = field(init=True)
     iterations: int = field(init=False, repr=False, hash=False, compare=False, default=1)
     pace: str | None = field(init=False, repr=False, hash=False, compare=False, default=None)
+    testdata_batch_size: int = field(init=False, repr=False, hash=False, compare=False, default=1)
 
     grizzly: GrizzlyContext = field(init=True, repr=False, hash=False, compare=False)
     behave: Scenario = field(init=True, repr=False, hash=False, compare=False)
@@ -238,6 +257,8 @@ class GrizzlyContextScenario:
     failure_handling: dict[type[Exception] | str | None, type[Exception] | None] = field(init=False, repr=False, hash=False, default_factory=dict)
     orphan_templates: list[str] = field(init=False, repr=False, hash=False, compare=False, default_factory=list)
     _jinja2: Environment = field(init=False, repr=False, default_factory=jinja2_environment_factory)
+    _templates: LRUCache = field(init=False, repr=False, hash=False, compare=False, default_factory=template_cache_factory)
+    _parsers: LRUCache = field(init=False, repr=False, hash=False, compare=False, default_factory=parser_cache_factory)
 
     @property
     def jinja2(self) -> Environment:
@@ -246,6 +267,36 @@ class GrizzlyContextScenario:
 
         return self._jinja2
 
+    def template(self, source: str) -> Template:
+        """Get compiled template for source, which is shared by all users of the scenario."""
+        template = cast('Template | None', self._templates.get(source))
+
+        if template is None:
+            template = self.jinja2.from_string(source)
+            self._templates[source] = template
+
+        return template
+
+    def parser(self, content_type: TransformerContentType, expression: str) -> Callable[[Any], list[str]]:
+        """Get validated and compiled parser for expression, which is shared by all users of the scenario."""
+        key = (content_type, expression)
+        parser = cast('Callable[[Any], list[str]] | None', self._parsers.get(key))
+
+        if parser is None:
+            transform = transformer.available.get(content_type, None)
+            if transform is None:
+                message = f'could not find a transformer for {content_type.name}'
+                raise TypeError(message)
+
+            if not transform.validate(expression):
+                message = f'"{expression}" is not a valid expression for {content_type.name}'
+                raise TypeError(message)
+
+            parser = transform.parser(expression)
+            self._parsers[key] = parser
+
+        return parser
+
     def __post_init__(self) -> None:
         self.name = self.behave.name
         self.description = self.behave.name
@@ -303,12 +354,16 @@ class GrizzlyContextSetup:
     global_context: StrDict = field(init=False, repr=False, hash=False, compare=False, default_factory=dict)
     user_count: int | None = field(init=False, default=None)
     spawn_rate: float | None = field(init=False, default=None)
+    spawn_max_cpu_usage: float | None = field(init=False, default=None)
     timespan: str | None = field(init=False, default=None)
     dispatcher_class: type[UsersDispatcher] | None = field(init=False, default=None)
     statistics_url: str | None = field(init=False, default=None)
     locust: GrizzlyContextSetupLocust = field(init=False, default_factory=GrizzlyContextSetupLocust)
     hooks: list[Callable[[LocustEnvironment], None]] = field(init=False, default_factory=list)
     wait_for_spawning_complete: float | None = field(default=None)
+    cache_request_files: list[str] = field(init=False, default_factory=list)
+    max_worker_saturation: float | None = field(init=False, default=None)
+    response_time_histograms: bool = field(init=False, default=False)
 
 
 class GrizzlyContextScenarios(list[GrizzlyContextScenario]):
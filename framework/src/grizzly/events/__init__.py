@@ -129,6 +129,9 @@ class GrizzlyEvents:
     user_event: GrizzlyInternalEventHook = field(init=False, default_factory=grizzly_internal_event_hook_factory('user_event'))
     """This can be triggered by a [load user][grizzly.users], i.e. the handling of C2D messages in [IoTHub user][grizzly.users.iothub] user."""
 
+    generator_saturation: GrizzlyInternalEventHook = field(init=False, default_factory=grizzly_internal_event_hook_factory('generator_saturation'))
+    """Triggered on master, when adaptive spawning is enabled and a worker is too busy to get any new users dispatched to it."""
+
 
 class GrizzlyEventDecoder(metaclass=ABCMeta):
     arg: str | int
@@ -3,22 +3,33 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
 import re
 import traceback
+from collections import deque
 from datetime import datetime, timedelta
 from os import environ
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from platform import node as get_hostname
+from random import randrange
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, ClassVar, TextIO
 from urllib.parse import urlparse, urlunparse
 
+import gevent
+from gevent.event import Event
 from grizzly_common.transformer import JsonBytesEncoder
 
 from grizzly.events import GrizzlyEventHandlerClass
 from grizzly.utils import normalize
 
 if TYPE_CHECKING:  # pragma: no cover
+    from jinja2 import Template
+
     from grizzly.tasks import RequestTask
     from grizzly.types import GrizzlyResponse, StrDict
+    from grizzly.types.locust import Environment
     from grizzly.users import GrizzlyUser
 
 LOG_FILE_TEMPLATE = """[{{ request["time"] }}] -> {{ method }}{% if request["url"] != None %} {{ request["url"] }}{% endif %}:
@@ -38,13 +49,270 @@ payload:
 
 {{ stacktrace }}
 {%- endif %}
+{%- if suppressed %}
+
+{{ suppressed }} identical error(s) not logged since last time
+{%- endif %}
 """  # noqa: E501
 
+logger = logging.getLogger(__name__)
+
+
+class RequestLogWriter:
+    """Render and write request logs in a background greenlet, so users do not block on rendering and disk I/O.
+
+    One writer is shared by all users, in the same process, that log to the same directory, and it is closed when the
+    test is quitting.
+    """
+
+    formats: ClassVar[tuple[str, ...]] = ('file', 'segment', 'jsonl')
+    suffixes: ClassVar[dict[str, str]] = {'segment': '.log', 'jsonl': '.jsonl'}
+    instances: ClassVar[dict[Path, RequestLogWriter]] = {}
+
+    max_errors: ClassVar[int] = 10000
+    """Maximum number of unique errors to keep track of when rate limiting identical errors."""
+
+    max_queue_size: ClassVar[int] = 10000
+    """Maximum number of request logs waiting to be written, request logs are dropped when the writer can not keep up."""
+
+    log_dir: Path
+    queue: deque[StrDict]
+    greenlet: gevent.Greenlet | None
+    dropped: int
+
+    _event: Event
+    _prefix: str
+    _sequence: int
+    _segments: dict[str, TextIO]
+    _segment_sizes: dict[str, int]
+    _errors: dict[tuple[str, str], list[float | int]]
+    _sampled: dict[str, int]
+    _rates: dict[str, list[float | int]]
+    _reservoirs: dict[str, tuple[list[int], list[StrDict]]]
+
+    def __init__(self, log_dir: Path) -> None:
+        self.log_dir = log_dir
+        self.queue = deque()
+        self.greenlet = None
+        self.dropped = 0
+
+        self._event = Event()
+        self._prefix = f'requests.{get_hostname()}-{os.getpid()}'
+        self._sequence = 0
+        self._segments = {}
+        self._segment_sizes = {}
+        self._errors = {}
+        self._sampled = {}
+        self._rates = {}
+        self._reservoirs = {}
+
+    @classmethod
+    def get(cls, log_dir: Path, environment: Environment) -> RequestLogWriter:
+        writer = cls.instances.get(log_dir, None)
+
+        if writer is None:
+            writer = cls.instances[log_dir] = cls(log_dir)
+            environment.events.quitting.add_listener(writer.on_quitting)
+
+        return writer
+
+    def on_quitting(self, *_args: Any, **_kwargs: Any) -> None:
+        self.close()
+
+    def allow_error(self, key: tuple[str, str], interval: float) -> int | None:
+        """Get number of identical errors that has been suppressed since it was last logged, or `None` if it should not be logged."""
+        now = perf_counter()
+        state = self._errors.get(key, None)
+
+        if state is not None and now - state[0] < interval:
+            state[1] += 1
+            return None
+
+        if state is None and len(self._errors) >= self.max_errors:
+            self._errors.clear()
+
+        self._errors[key] = [now, 0]
+
+        return 0 if state is None else int(state[1])
+
+    def sample(self, name: str, *, sample_rate: int, max_per_second: float) -> bool:
+        """Check if a successful request should be logged.
+
+        Every `sample_rate` request is logged, and at most `max_per_second` requests per second for each request name.
+        """
+        if sample_rate > 1:
+            count = self._sampled.get(name, 0)
+            self._sampled[name] = count + 1
+
+            if count % sample_rate != 0:
+                return False
+
+        if max_per_second > 0:
+            now = perf_counter()
+            window = self._rates.get(name, None)
+
+            if window is None or now - window[0] >= 1.0:
+                window = self._rates[name] = [now, 0]
+
+            if window[1] >= max_per_second:
+                return False
+
+            window[1] += 1
+
+        return True
+
+    def keep(self, name: str, record: StrDict, size: int) -> None:
+        """Keep a uniform random sample of `size` records for each request name, which are written when the writer is closed."""
+        seen, records = self._reservoirs.setdefault(name, ([0], []))
+        seen[0] += 1
+
+        if len(records) < size:
+            records.append(record)
+            return
+
+        index = randrange(seen[0])  # noqa: S311
+        if index < size:
+            records[index] = record
+
+    def put(self, record: StrDict) -> None:
+        if len(self.queue) >= self.max_queue_size:
+            self.dropped += 1
+        else:
+            self.queue.append(record)
+
+        if self.greenlet is None or self.greenlet.dead:
+            self.greenlet = gevent.spawn(self._run)
+
+        self._event.set()
+
+    def _run(self) -> None:
+        while True:
+            self._event.wait()
+            self._event.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all queued request logs."""
+        count = 0
+
+        while self.queue:
+            record = self.queue.popleft()
+
+            try:
+                self._write(record)
+            except Exception:
+                logger.exception('failed to write request log for %s', record['name'])
+
+            count += 1
+
+            # let other greenlets run during an error storm
+            if count % 100 == 0:
+                gevent.sleep(0)
+
+        for fd in self._segments.values():
+            fd.flush()
+
+        if self.dropped > 0:
+            logger.warning('dropped %d request logs, since more than %d request logs were waiting to be written', self.dropped, self.max_queue_size)
+            self.dropped = 0
+
+    def close(self) -> None:
+        """Write all queued request logs and close current segments."""
+        if self.greenlet is not None:
+            self.greenlet.kill(block=False)
+            self.greenlet = None
+
+        for _, records in self._reservoirs.values():
+            self.queue.extend(records)
+
+        self._reservoirs.clear()
+        self.flush()
+
+        for fd in self._segments.values():
+            fd.close()
+
+        self._segments.clear()
+        self._segment_sizes.clear()
+
+    def _append(self, file_format: str, contents: str, segment_size: int) -> None:
+        fd = self._segments.get(file_format, None)
+
+        if fd is None:
+            self._sequence += 1
+            fd = self._segments[file_format] = (self.log_dir / f'{self._prefix}-{self._sequence:08d}{self.suffixes[file_format]}').open('a')
+            self._segment_sizes[file_format] = 0
+
+        self._segment_sizes[file_format] += fd.write(contents)
+
+        if self._segment_sizes[file_format] >= segment_size:
+            fd.close()
+            del self._segments[file_format]
+
+    def _write(self, record: StrDict) -> None:
+        variables: StrDict = record['variables']
+        log_date: datetime = record['log_date']
+        file_format: str = record['format']
+
+        for v in ['response', 'request']:
+            variables[v]['metadata'] = RequestLogger._remove_secrets_attribute(variables[v]['metadata'])
+            variables[v]['url'] = RequestLogger._remove_secrets_attribute(variables[v]['url'])
+
+            if variables[v]['time'] is None:
+                variables[v]['time'] = f'{log_date.isoformat()}*'
+
+        name = normalize(record['name'])
+
+        if file_format == 'jsonl':
+            contents = json.dumps({'name': name, **variables}, cls=JsonBytesEncoder)
+            self._append(file_format, f'{contents}\n', record['segment_size'])
+            return
+
+        for v in ['response', 'request']:
+            if variables[v]['metadata'] is not None:
+                variables[v]['metadata'] = json.dumps(variables[v]['metadata'], indent=2, cls=JsonBytesEncoder)
+
+        template: Template = record['template']
+        contents = template.render(**variables)
+
+        if file_format == 'segment':
+            self._append(file_format, f'{contents}\n', record['segment_size'])
+            return
+
+        log_file = self.log_dir / f'{name}.{log_date.strftime("%Y%m%dT%H%M%S%f")}.log'
+        log_file.write_text(contents)
+
 
 class RequestLogger(GrizzlyEventHandlerClass):
+    """Log failed requests, or all requests if context variable `log_all_requests` is set, to files in `logs/`.
+
+    Logs are rendered and written by a `RequestLogWriter` in the background. How requests are logged can be changed
+    with the following (optional) context variables:
+
+    * `request_log.format`: `file` (default) writes one file per request, `segment` appends to rotating segment files and
+      `jsonl` appends one JSON object per request to rotating segment files
+    * `request_log.segment_size`: size, in bytes, when a new segment file is started, default 16 MiB
+    * `request_log.error_interval`: identical errors (same request name and exception) are logged at most once per this many
+      seconds, default `0` (all errors are logged)
+
+    When `log_all_requests` is set, successful requests can be sampled, per request name, with:
+
+    * `request_log.sample_rate`: log every N:th request
+    * `request_log.max_per_second`: log at most this many requests per second
+    * `request_log.reservoir`: keep a uniform random sample of this many requests, which are logged when the test stops
+
+    Failed requests are not sampled. Request and response payloads longer than `request_log.max_payload_size` characters are
+    truncated, keeping the head and the tail of the payload.
+
+    If the writer can not keep up, request logs are dropped when `RequestLogWriter.max_queue_size` request logs are waiting to be
+    written, and the number of dropped request logs is logged as a warning.
+    """
+
     _context: StrDict
 
     log_dir: Path
+    writer: RequestLogWriter
+
+    default_segment_size: ClassVar[int] = 16 * 1024 * 1024
 
     def __init__(self, user: GrizzlyUser) -> None:
         super().__init__(user)
@@ -57,6 +325,8 @@ class RequestLogger(GrizzlyEventHandlerClass):
 
         self.log_dir.mkdir(parents=True, exist_ok=True)
 
+        self.writer = RequestLogWriter.get(self.log_dir, user.environment)
+
     @classmethod
     def _remove_secrets_attribute(cls, contents: Any) -> Any:
         if isinstance(contents, str):
@@ -69,6 +339,20 @@ class RequestLogger(GrizzlyEventHandlerClass):
 
         return contents
 
+    @classmethod
+    def _truncate(cls, payload: Any, max_size: int) -> Any:
+        if max_size < 1 or not isinstance(payload, str | bytes) or len(payload) <= max_size:
+            return payload
+
+        head = max_size // 2
+        tail = max_size - head
+        marker = f'\n... {len(payload) - max_size} characters truncated ...\n'
+
+        if isinstance(payload, bytes):
+            return payload[:head] + marker.encode() + payload[-tail:]
+
+        return f'{payload[:head]}{marker}{payload[-tail:]}'
+
     def _get_grizzly_response_user_data(
         self,
         request: RequestTask,
@@ -98,29 +382,19 @@ class RequestLogger(GrizzlyEventHandlerClass):
 
         response_time = kwargs.get('locust_request_meta', {}).get('response_time', None)
 
-        stacktrace: str | None = None
-        if exception is not None:
-            stacktrace = ''.join(
-                traceback.format_exception(
-                    type(exception),
-                    value=exception,
-                    tb=exception.__traceback__,
-                ),
-            )
-
+        # metadata is written later, by the writer, so it must not change in the meantime
         return {
-            'stacktrace': stacktrace,
             'request': {
                 'time': None,
                 'duration': None,
                 'url': url,
-                'metadata': request_metadata,
+                'metadata': dict(request_metadata) if request_metadata is not None else None,
                 'payload': request_payload,
             },
             'response': {
                 'time': response_time,
                 'url': url,
-                'metadata': response_metadata,
+                'metadata': dict(response_metadata) if isinstance(response_metadata, dict) else response_metadata,
                 'payload': response_payload,
                 'status': 'ERROR' if exception is not None else 'OK',
             },
@@ -138,15 +412,40 @@ class RequestLogger(GrizzlyEventHandlerClass):
             return
 
         successful_request = exception is None
+        user_context = self.user.context()
+
+        if successful_request and not user_context.get('log_all_requests', False):
+            return
+
+        options: StrDict = user_context.get('request_log', None) or {}
+        file_format = options.get('format', 'file')
+
+        assert file_format in RequestLogWriter.formats, f'request_log.format must be one of {", ".join(RequestLogWriter.formats)}'
 
-        if successful_request and not self.user.context().get('log_all_requests', False):
+        if successful_request and not self.writer.sample(
+            name,
+            sample_rate=int(options.get('sample_rate', 1)),
+            max_per_second=float(options.get('max_per_second', 0)),
+        ):
             return
 
+        suppressed = 0
+        error_interval = float(options.get('error_interval', 0))
+
+        if exception is not None and error_interval > 0:
+            allowed = self.writer.allow_error((name, f'{exception.__class__.__name__}: {exception}'), error_interval)
+
+            if allowed is None:
+                return
+
+            suppressed = allowed
+
         log_date = datetime.now().astimezone()
 
         variables: StrDict = {
             'method': request.method.name,
             'stacktrace': None,
+            'suppressed': suppressed,
             'request': {
                 'time': None,
                 'duration': None,
@@ -173,22 +472,32 @@ class RequestLogger(GrizzlyEventHandlerClass):
                 variables['request']['time'] = f'{request_time}'
                 variables['response']['time'] = f'{log_date.isoformat()}*'
 
-        variables['response']['metadata'] = self._remove_secrets_attribute(variables['response']['metadata'])
-        variables['request']['metadata'] = self._remove_secrets_attribute(variables['request']['metadata'])
-        variables['response']['url'] = self._remove_secrets_attribute(variables['response']['url'])
-        variables['request']['url'] = self._remove_secrets_attribute(variables['request']['url'])
-
-        for v in ['response', 'request']:
-            if variables[v]['metadata'] is not None:
-                variables[v]['metadata'] = json.dumps(variables[v]['metadata'], indent=2, cls=JsonBytesEncoder)
-
-            if variables[v]['time'] is None:
-                variables[v]['time'] = f'{log_date.isoformat()}*'
-
-        name = normalize(name)
+        # format the stacktrace now, so the queued record does not keep the exception, and its frames, alive
+        if exception is not None:
+            variables['stacktrace'] = ''.join(
+                traceback.format_exception(
+                    type(exception),
+                    value=exception,
+                    tb=exception.__traceback__,
+                ),
+            )
 
-        log_name = f'{name}.{log_date.strftime("%Y%m%dT%H%M%S%f")}.log'
-        contents = self.user._scenario.jinja2.from_string(LOG_FILE_TEMPLATE).render(**variables)
+        max_payload_size = int(options.get('max_payload_size', 0))
+        if max_payload_size > 0:
+            for v in ['response', 'request']:
+                variables[v]['payload'] = self._truncate(variables[v]['payload'], max_payload_size)
+
+        record: StrDict = {
+            'name': name,
+            'log_date': log_date,
+            'format': file_format,
+            'segment_size': int(options.get('segment_size', self.default_segment_size)),
+            'template': self.user._scenario.template(LOG_FILE_TEMPLATE) if file_format != 'jsonl' else None,
+            'variables': variables,
+        }
 
-        log_file = self.log_dir / log_name
-        log_file.write_text(contents)
+        reservoir = int(options.get('reservoir', 0))
+        if successful_request and reservoir > 0:
+            self.writer.keep(name, record, reservoir)
+        else:
+            self.writer.put(record)
@@ -7,11 +7,12 @@ from contextlib import suppress
 from json import dumps as jsondumps
 from typing import TYPE_CHECKING, Any
 
-from grizzly_common.transformer import PlainTransformer, TransformerContentType, TransformerError, transformer
+from grizzly_common.transformer import TransformerContentType, TransformerError, transformer
 from locust.exception import ResponseError
 
 from grizzly.events import GrizzlyEventHandlerClass
 from grizzly.exceptions import ResponseHandlerError
+from grizzly.utils import has_template
 
 if TYPE_CHECKING:  # pragma: no cover
     from grizzly.tasks import RequestTask
@@ -26,6 +27,15 @@ class ResponseHandlerAction(ABC):
         self.expected_matches = expected_matches
         self.as_json = as_json
 
+        # values without templates does not have to be rendered for each response
+        self._render_expression = has_template(expression)
+        self._render_match_with = has_template(match_with)
+        self._expected_matches: int | None = None
+
+        if not has_template(expected_matches):
+            with suppress(ValueError):
+                self._expected_matches = int(expected_matches)
+
     @abstractmethod
     def __call__(
         self,
@@ -53,21 +63,13 @@ class ResponseHandlerAction(ABC):
 
         """
         input_content_type, input_payload = input_context
-        rendered_expression = user.render(self.expression)
-        rendered_match_with = user.render(self.match_with)
-        rendered_expected_matches = int(user.render(self.expected_matches))
-
-        transform = transformer.available.get(input_content_type, None)
-        if transform is None:
-            message = f'could not find a transformer for {input_content_type.name}'
-            raise TypeError(message)
-
-        if not transform.validate(rendered_expression):
-            message = f'"{rendered_expression}" is not a valid expression for {input_content_type.name}'
-            raise TypeError(message)
+        rendered_expression = user.render(self.expression) if self._render_expression else self.expression
+        rendered_match_with = user.render(self.match_with) if self._render_match_with else self.match_with
+        rendered_expected_matches = self._expected_matches if self._expected_matches is not None else int(user.render(self.expected_matches))
 
-        input_get_values = transform.parser(rendered_expression)
-        match_get_values = PlainTransformer.parser(rendered_match_with)
+        # parsers are validated, compiled and cached per scenario
+        input_get_values = user._scenario.parser(input_content_type, rendered_expression)
+        match_get_values = user._scenario.parser(TransformerContentType.PLAIN, rendered_match_with)
 
         values = input_get_values(input_payload)
 
@@ -201,7 +203,7 @@ class ResponseHandler(GrizzlyEventHandlerClass):
                     impl = transformer.available.get(request.response.content_type, None)
                     if impl is not None:
                         # if payload is None, treat it as json 'null', to get correct behaviour
-                        response_payload = impl.transform(response_payload or impl.EMPTY)
+                        response_payload = self.user.transform(request.response.content_type, response_payload or impl.EMPTY)
                     else:
                         message = f'failed to transform: {response_payload} with content type {request.response.content_type.name}'
                         raise TransformerError(message)
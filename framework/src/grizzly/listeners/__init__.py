@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import logging
+import os
 from typing import TYPE_CHECKING, Any, Concatenate, ParamSpec, cast
 from urllib.parse import urlparse
 
 from locust.stats import (
     RequestStats,
     StatsEntry,
+    console_logger,
     print_error_report,
     print_percentile_stats,
     print_stats,
@@ -19,21 +21,35 @@ from grizzly.types import MessageDirection, RequestType, StrDict, TestdataType
 from grizzly.types.behave import Status
 from grizzly.types.locust import Environment, LocustRunner, MasterRunner, Message, WorkerRunner
 
+from .saturation import SaturationMonitor
+from .stats import HistogramStats
+
 if TYPE_CHECKING:  # pragma: no cover
     from collections.abc import Callable
 
     from grizzly.context import GrizzlyContext
+    from grizzly.utils.histogram import Histogram
 
 P = ParamSpec('P')
 
 logger = logging.getLogger(__name__)
 
 
+def _init_monitors(grizzly: GrizzlyContext, environment: Environment) -> None:
+    if grizzly.setup.max_worker_saturation is not None:
+        grizzly.state.saturation = SaturationMonitor(environment, max_saturation=grizzly.setup.max_worker_saturation)
+
+    if grizzly.setup.response_time_histograms:
+        grizzly.state.histograms = HistogramStats(environment)
+
+
 def init(grizzly: GrizzlyContext, dependencies: GrizzlyDependencies, testdata: TestdataType | None = None) -> Callable[Concatenate[LocustRunner, P], None]:
     def init_wrapper(runner: LocustRunner, *_args: P.args, **_kwargs: P.kwargs) -> None:
         # acquire lock, that will be released when all users has spawned (on_spawning_complete)
         grizzly.state.spawning_complete.acquire()
 
+        _init_monitors(grizzly, runner.environment)
+
         if not isinstance(runner, WorkerRunner):
             if testdata is not None:
                 grizzly.state.producer = TestdataProducer(
@@ -45,6 +61,10 @@ def init(grizzly: GrizzlyContext, dependencies: GrizzlyDependencies, testdata: T
 
         if isinstance(runner, WorkerRunner):
             runner.register_message('locust_quit', locust_quit, concurrent=False)
+            runner.send_message('worker_capacity', {'capacity': get_worker_capacity()})
+
+        if isinstance(runner, MasterRunner):
+            runner.register_message('worker_capacity', worker_capacity, concurrent=False)
 
         if not isinstance(runner, MasterRunner):
             for message_type, callback in grizzly.setup.locust.messages.get(MessageDirection.SERVER_CLIENT, {}).items():
@@ -72,9 +92,11 @@ def init(grizzly: GrizzlyContext, dependencies: GrizzlyDependencies, testdata: T
 
 def init_statistics_listener(url: str) -> Callable[Concatenate[Environment, P], None]:
     def statistics_listener(environment: Environment, *_args: P.args, **_kwargs: P.kwargs) -> None:
+        from .sink import metrics_sinks  # noqa: PLC0415
+
         parsed = urlparse(url)
 
-        if parsed.scheme in ('influxdb', 'influxdb2'):
+        if parsed.scheme in metrics_sinks:
             from .influxdb import InfluxDbListener  # noqa: PLC0415
 
             InfluxDbListener(
@@ -119,6 +141,45 @@ def locust_quit(environment: Environment, msg: Message, **_kwargs: Any) -> None:
     raise SystemExit(code)
 
 
+def get_worker_capacity() -> float:
+    """Get the capacity of this worker.
+
+    It is the number of CPUs available to the process, unless overridden by environment variable `GRIZZLY_WORKER_CAPACITY`.
+    """
+    value = os.environ.get('GRIZZLY_WORKER_CAPACITY', None)
+    if value is not None:
+        return float(value)
+
+    try:
+        return float(len(os.sched_getaffinity(0)))
+    except AttributeError:  # pragma: no cover
+        return float(os.cpu_count() or 1)
+
+
+def worker_capacity(environment: Environment, msg: Message, **_kwargs: Any) -> None:
+    """Save the capacity reported by a worker on its worker node, so it can be used by `grizzly.locust.FixedUsersDispatcher`."""
+    runner = environment.runner
+
+    if not isinstance(runner, MasterRunner):
+        logger.error('received worker_capacity message on non-master node')
+        return
+
+    worker_node = runner.clients.get(msg.node_id, None)
+    if worker_node is None:
+        logger.warning('received worker_capacity message from unknown worker %s', msg.node_id)
+        return
+
+    try:
+        capacity = float(msg.data['capacity'])
+        assert capacity > 0
+    except (AssertionError, KeyError, TypeError, ValueError):
+        logger.warning('worker %s reported an invalid capacity: %r', msg.node_id, msg.data)
+        return
+
+    worker_node.capacity = capacity
+    logger.debug('worker %s has capacity %.1f', msg.node_id, capacity)
+
+
 def spawning_complete(grizzly: GrizzlyContext) -> Callable[Concatenate[int, P], None]:
     def gspawning_complete(user_count: int, *_args: P.args, **_kwargs: P.kwargs) -> None:
         logger.debug('spawning of %d users completed', user_count)
@@ -131,8 +192,28 @@ def worker_report(client_id: str, data: StrDict) -> None:  # noqa: ARG001
     logger.debug('received worker_report from %s', client_id)
 
 
+def _print_percentile_stats(stats: RequestStats, histograms: HistogramStats | None) -> None:
+    if histograms is None:
+        print_percentile_stats(stats)
+        return
+
+    for line in histograms.get_percentile_stats_summary(sorted(stats.entries.keys()), stats.total.name):
+        console_logger.info(line)
+    console_logger.info('')
+
+
+def _get_response_time_percentile(stats: RequestStats, percentile: float, histogram: Histogram | None) -> int:
+    """Get response time percentile of all requests in a scenario, from the merged histogram of the scenario if histograms are used."""
+    if histogram is None:
+        return stats.total.get_response_time_percentile(percentile)
+
+    return round(histogram.percentile(percentile))
+
+
 def validate_result(grizzly: GrizzlyContext) -> Callable[Concatenate[Environment, P], None]:
     def gvalidate_result(environment: Environment, *_args: P.args, **_kwargs: P.kwargs) -> None:
+        histograms = grizzly.state.histograms
+
         # first, aggregate statistics per scenario
         scenario_stats: dict[str, RequestStats] = {}
 
@@ -153,8 +234,11 @@ def validate_result(grizzly: GrizzlyContext) -> Callable[Concatenate[Environment
         # then validate against scenario rules
         for scenario in grizzly.scenarios():
             stats = scenario_stats[scenario.identifier]
+            histogram = histograms.merged(stats.entries.keys()) if histograms is not None else None
+
             print_stats(stats, current=False)
-            print_percentile_stats(stats)
+
+            _print_percentile_stats(stats, histograms)
             print_error_report(stats)
 
             if scenario.validation.fail_ratio is not None:
@@ -187,7 +271,7 @@ def validate_result(grizzly: GrizzlyContext) -> Callable[Concatenate[Environment
                 percentile = scenario.validation.response_time_percentile.percentile
                 expected = scenario.validation.response_time_percentile.response_time
 
-                actual = stats.total.get_response_time_percentile(percentile)
+                actual = _get_response_time_percentile(stats, percentile, histogram)
                 if actual > expected:
                     error_message = f'{int(percentile * 100)}%-tile response time {int(actual)} ms > {expected} ms'
                     logger.error('scenario %s failed due to %s', prefix, error_message)
@@ -201,4 +285,7 @@ def validate_result(grizzly: GrizzlyContext) -> Callable[Concatenate[Environment
             if environment.process_exit_code == 1 and hasattr(scenario, 'behave') and scenario.behave is not None:
                 scenario.behave.set_status(Status.failed)
 
+        if grizzly.state.saturation is not None:
+            grizzly.state.saturation.validate()
+
     return cast('Callable[Concatenate[Environment, P], None]', gvalidate_result)
@@ -1,28 +1,37 @@
-"""Write metrics to InfluxDB."""
+"""Write metrics to InfluxDB, or any other registered metrics sink."""
 
 from __future__ import annotations
 
 import json
 import logging
 import os
+from collections import deque
 from contextlib import suppress
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
 from platform import node as get_hostname
+from time import perf_counter, time_ns
 from typing import TYPE_CHECKING, Any, Literal, Protocol, TypedDict, cast
 from urllib.parse import parse_qs, unquote, urlparse
 
 import gevent
 from gevent.event import Event
 from gevent.lock import Semaphore
+from grizzly_common.journal import MetricsJournal, replay_segments
 from influxdb import InfluxDBClient as InfluxDBClientV1
 from influxdb.exceptions import InfluxDBClientError
 from influxdb_client import InfluxDBClient as InfluxDBClientV2  # type: ignore[attr-defined]
 from influxdb_client.rest import ApiException
 
+from grizzly.listeners.sink import MetricsSink, create_metrics_sink
 from grizzly.types.locust import CatchResponseError, Environment
+from grizzly.utils.histogram import Histogram
 
 if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Sequence
     from types import TracebackType
+    from urllib.parse import ParseResult
 
     from influxdb_client.client.query_api import QueryApi
     from influxdb_client.client.write_api import WriteApi
@@ -39,14 +48,76 @@ class InfluxDbError(Exception):
 class InfluxDbPoint(TypedDict):
     measurement: str
     tags: StrDict
-    time: str
+    time: str | int
     fields: StrDict
 
 
-class InfluxDb(Protocol):
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+MEASUREMENT_ESCAPE = str.maketrans({'\\': '\\\\', ',': '\\,', ' ': '\\ ', '\n': '\\n'})
+KEY_ESCAPE = str.maketrans({'\\': '\\\\', ',': '\\,', '=': '\\=', ' ': '\\ ', '\n': '\\n'})
+STRING_FIELD_ESCAPE = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n'})
+
+
+def to_nanoseconds(timestamp: str | int) -> int:
+    """Convert an ISO 8601 timestamp to nanoseconds since epoch, naive timestamps are assumed to be UTC."""
+    if isinstance(timestamp, int):
+        return timestamp
+
+    if timestamp.endswith('Z'):
+        timestamp = f'{timestamp[:-1]}+00:00'
+
+    value = datetime.fromisoformat(timestamp)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+
+    return (value - EPOCH) // timedelta(microseconds=1) * 1000
+
+
+def to_isoformat(timestamp: int) -> str:
+    """Convert nanoseconds since epoch to an ISO 8601 timestamp, with microsecond precision."""
+    return (EPOCH + timedelta(microseconds=timestamp // 1000)).isoformat()
+
+
+def encode_tag_set(measurement: str, tags: StrDict) -> str:
+    """Encode measurement and tags in line protocol, tags without a value are not included."""
+    tag_set = [measurement.translate(MEASUREMENT_ESCAPE)]
+    tag_set.extend(f'{key.translate(KEY_ESCAPE)}={str(value).translate(KEY_ESCAPE)}' for key, value in sorted(tags.items()) if value is not None and value != '')
+
+    return ','.join(tag_set)
+
+
+def encode_field_value(value: Any) -> str | None:
+    if value is None:
+        return None
+
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+
+    if isinstance(value, int):
+        return f'{value}i'
+
+    if isinstance(value, float):
+        return repr(value)
+
+    return f'"{str(value).translate(STRING_FIELD_ESCAPE)}"'
+
+
+def encode_line(tag_set: str, fields: StrDict, timestamp: int) -> bytes:
+    """Encode a point in line protocol, with an already encoded tag set and timestamp in nanoseconds."""
+    field_set = ','.join(f'{key.translate(KEY_ESCAPE)}={value}' for key, value in ((key, encode_field_value(value)) for key, value in fields.items()) if value is not None)
+
+    return f'{tag_set} {field_set} {timestamp}'.encode()
+
+
+def encode_point(point: InfluxDbPoint) -> bytes:
+    return encode_line(encode_tag_set(point['measurement'], point['tags']), point['fields'], to_nanoseconds(point['time']))
+
+
+class InfluxDb(MetricsSink, Protocol):
     def read(self, table: str, columns: list[str]) -> Any: ...
 
-    def write(self, values: list[InfluxDbPoint]) -> None: ...
+    def write(self, values: list[bytes]) -> None: ...
 
     def connect(self) -> Self: ...
 
@@ -114,9 +185,9 @@ class InfluxDbV1(InfluxDb):
 
         return cast('list[StrDict]', result.raw['series'])
 
-    def write(self, values: list[InfluxDbPoint]) -> None:
+    def write(self, values: list[bytes]) -> None:
         try:
-            self.client.write_points(values)
+            self.client.write(b'\n'.join(values).decode(), params={'db': self.database, 'precision': 'n'}, protocol='line')
             logger.debug('successfully wrote %d points to %s@%s:%d', len(values), self.database, self.host, self.port)
         except InfluxDBClientError as e:
             content = json.loads(e.content)
@@ -222,9 +293,9 @@ class InfluxDbV2(InfluxDb):
         # Convert FluxTable results to json, and to dict
         return cast('StrDict', json.loads(result.to_json()))
 
-    def write(self, values: list[InfluxDbPoint]) -> None:
+    def write(self, values: list[bytes]) -> None:
         try:
-            self.write_api.write(bucket=self.bucket, org=self.org, record=values)
+            self.write_api.write(bucket=self.bucket, org=self.org, record=b'\n'.join(values))
             logger.debug('successfully wrote %d points to bucket %s@%s:%d', len(values), self.bucket, self.host, self.port)
         except ApiException as e:
             code = e.status
@@ -236,9 +307,78 @@ class InfluxDbV2(InfluxDb):
             raise InfluxDbError(message) from e
 
 
+def create_influxdb_client(parsed: ParseResult) -> InfluxDb:
+    """Create InfluxDB v2 client for scheme `influxdb2`, otherwise InfluxDB v1 client."""
+    url = parsed.geturl()
+    path = parsed.path[1:] if parsed.path is not None else None
+
+    assert parsed.hostname is not None, f'hostname not found in {url}'
+    assert path is not None, f'{url} contains no path'
+    assert len(path) > 0, f'database was not found in {url}'
+
+    port = parsed.port or 8086
+
+    if parsed.scheme == 'influxdb2':
+        org, bucket = path.split(':')
+
+        return InfluxDbV2(host=parsed.hostname, port=port, org=org, bucket=bucket, token=parsed.username or '')
+
+    return InfluxDbV1(host=parsed.hostname, port=port, database=path, username=parsed.username, password=parsed.password)
+
+
+class RequestAggregate:
+    response_time: Histogram
+    response_length: int
+
+    def __init__(self) -> None:
+        self.response_time = Histogram()
+        self.response_length = 0
+
+
 class InfluxDbListener:
+    """Send metrics to InfluxDB, or any other sink registered in `grizzly.listeners.sink`.
+
+    Points are encoded in line protocol when they are queued, and queued in a buffer, which is swapped with an empty
+    buffer and written in batches by a background greenlet, so writing to the sink never blocks the greenlet that
+    produced a point. Which sink is used depends on the scheme of the URL.
+
+    The following optional query parameters in the URL changes the behavior of the buffer:
+
+    * `MaxBatchSize` (int): maximum number of points per write to InfluxDB, default `5000`
+    * `MaxQueueSize` (int): maximum number of points in the buffer, default `100000`
+    * `Overflow` (str): what to do with points when the buffer is full, default `drop`
+        - `drop`: the oldest points in the buffer are dropped
+        - `spill`: the buffer can hold twice as many points, and the greenlet that writes points moves the oldest points
+          above `MaxQueueSize` to a journal in `logs/metrics-journal`, points that fails to be written are also written to
+          the journal. The journal is replayed when InfluxDB has recovered, and segments that are left when the test is
+          finished can be replayed afterwards with `grizzly-cli replay`. The greenlet that produced a point never writes to
+          the journal, it would block on disk I/O when InfluxDB is slow
+
+    * `AggregationInterval` (float): number of seconds that requests are aggregated, before they are written. By default
+      each request is written as a point in the `request` measurement. When set, one point per request name, method and
+      result is written to the `request_aggregate` measurement each interval, with the fields `count`, `sum`, `min`,
+      `max`, `p50`, `p90`, `p95` and `p99` (response time, percentiles with 1% relative accuracy) and `response_length`
+      (sum). Request metrics can not be overridden from the user context when aggregating
+
+    Each time points are written, an `influxdb_listener` point is also written, with the fields `queue_depth` (number
+    of points in the buffer), `dropped` and `spilled` (number of points dropped or written to the journal since last
+    write) and `write_time` (milliseconds spent writing the previous batches).
+    """
+
     run_events_greenlet: gevent.Greenlet
     run_user_count_greenlet: gevent.Greenlet
+    run_replay_greenlet: gevent.Greenlet | None
+    run_aggregation_greenlet: gevent.Greenlet | None
+
+    max_batch_size: int
+    max_queue_size: int
+    journal: MetricsJournal | None
+    aggregation_interval: float | None
+    points_dropped: int
+    points_spilled: int
+    points_replayed: int
+    points_written: int
+    write_time: float
 
     def __init__(
         self,
@@ -246,28 +386,13 @@ class InfluxDbListener:
         url: str,
     ) -> None:
         self.lock = Semaphore()
+        self.write_lock = Semaphore()
         self.logger = logging.getLogger(__name__)
 
+        self.url = url
         parsed = urlparse(url)
-        path = parsed.path[1:] if parsed.path is not None else None
-
-        assert parsed.hostname is not None, f'hostname not found in {url}'
-        assert path is not None, f'{url} contains no path'
-        assert len(path) > 0, f'database was not found in {url}'
-
         self.logger.debug('url=%s, parsed=%r', url, parsed)
-        self.influx_host = parsed.hostname
-        self.influx_port = parsed.port or 8086
-
-        if parsed.scheme == 'influxdb2':
-            self.influx_org, self.influx_bucket = path.split(':')
-            self.influx_token = parsed.username or ''
-            self.influx_version = 2
-        else:
-            self.influx_database = path
-            self.influx_username = parsed.username
-            self.influx_password = parsed.password
-            self.influx_version = 1
+        sink = self.create_client()
 
         params = parse_qs(parsed.query)
 
@@ -277,11 +402,35 @@ class InfluxDbListener:
         self.environment = environment
         self._hostname = get_hostname()
         self._username = os.getenv('USER', 'unknown')
-        self._events: list[InfluxDbPoint] = []
+        self.max_batch_size = int(params['MaxBatchSize'][0]) if 'MaxBatchSize' in params else 5000
+        self.max_queue_size = int(params['MaxQueueSize'][0]) if 'MaxQueueSize' in params else 100_000
+
+        assert self.max_batch_size > 0, f'MaxBatchSize must be greater than 0 in {parsed.query}'
+        assert self.max_queue_size >= self.max_batch_size, f'MaxQueueSize must be greater than or equal to MaxBatchSize in {parsed.query}'
+
+        overflow = params['Overflow'][0] if 'Overflow' in params else 'drop'
+        assert overflow in ('drop', 'spill'), f'Overflow must be either drop or spill in {parsed.query}'
+
+        self.journal = (
+            MetricsJournal(Path(os.environ.get('GRIZZLY_CONTEXT_ROOT', '.')) / 'logs' / 'metrics-journal', prefix=f'{self._hostname}-{os.getpid()}')
+            if overflow == 'spill'
+            else None
+        )
+        self.aggregation_interval = float(params['AggregationInterval'][0]) if 'AggregationInterval' in params else None
+        assert self.aggregation_interval is None or self.aggregation_interval > 0.0, f'AggregationInterval must be greater than 0 in {parsed.query}'
+
+        self._aggregates: dict[str, RequestAggregate] = {}
+        self.points_dropped = self.points_spilled = self.points_replayed = self.points_written = self._dropped = self._spilled = 0
+        self._sink_healthy = True
+        self.write_time = 0.0
+        self._events: deque[bytes] = deque(maxlen=self._queue_capacity)
+        self._request_tag_set = lru_cache(maxsize=10_000)(self._create_request_tag_set)
+        self._aggregate_tag_set = lru_cache(maxsize=10_000)(self._create_aggregate_tag_set)
+        self._override_key = lru_cache(maxsize=1_000)(self._create_override_key)
         self._profile_name = params['ProfileName'][0] if 'ProfileName' in params else ''
         self._description = params['Description'][0] if 'Description' in params else ''
 
-        self.connection = self.create_client().connect()
+        self.connection = sink.connect()
         self.environment.events.request.add_listener(self.request)
         self.environment.events.heartbeat_sent.add_listener(self.heartbeat_sent)
         self.environment.events.heartbeat_received.add_listener(self.heartbeat_received)
@@ -294,64 +443,93 @@ class InfluxDbListener:
         self.grizzly.events.keystore_request.add_listener(self.on_grizzly_event)
         self.grizzly.events.testdata_request.add_listener(self.on_grizzly_event)
         self.grizzly.events.user_event.add_listener(self.on_grizzly_event)
+        self.grizzly.events.generator_saturation.add_listener(self.on_grizzly_event)
         self.run_events_greenlet = gevent.spawn(self.run_events)
         self.run_user_count_greenlet = gevent.spawn(self.run_user_count)
+        self.run_replay_greenlet = gevent.spawn(self.run_replay) if self.journal is not None else None
+        self.run_aggregation_greenlet = gevent.spawn(self.run_aggregation) if self.aggregation_interval is not None else None
 
         self._quit_event = Event()
 
+    @property
+    def _queue_capacity(self) -> int:
+        # when spilling, there must be room for points that are produced while the writer greenlet is busy writing
+        return self.max_queue_size * 2 if self.journal is not None else self.max_queue_size
+
     def on_quit(self, *_args: Any, **_kwargs: Any) -> None:
         self.logger.info('received quit event')
         self._quit_event.set()
         self.destroy_client()
 
-    def create_client(self) -> InfluxDb:
-        if self.influx_version == 1:
-            return InfluxDbV1(
-                host=self.influx_host,
-                port=self.influx_port,
-                database=self.influx_database,
-                username=self.influx_username,
-                password=self.influx_password,
-            )
-        return InfluxDbV2(
-            host=self.influx_host,
-            port=self.influx_port,
-            bucket=self.influx_bucket,
-            token=self.influx_token,
-            org=self.influx_org,
-        )
+    def create_client(self) -> MetricsSink:
+        return create_metrics_sink(self.url)
 
     def destroy_client(self) -> None:
-        count = 0
-        while len(self._events) > 0:
-            gevent.sleep(0.5)
-            count += 1
+        self.flush_aggregates()
 
-            if count % 20 == 0:
-                self.logger.info('%d events in queue, waiting', len(self._events))
-                if self._quit_event.is_set():
-                    break
-                count = 0
+        # waits for any ongoing write to finish, and then writes what is left in the queue
+        self.flush()
 
         if len(self._events) > 0:
-            self.logger.warning('proceeding with shutdown, %d events still in queue', len(self._events))
-            self.logger.warning('discarded metrics: %s', json.dumps(self._events))
+            if self.journal is not None:
+                self._spill(list(self._events))
+                self._events.clear()
+            else:
+                self.logger.warning('proceeding with shutdown, %d events still in queue', len(self._events))
+                self.logger.warning('discarded metrics: %s', b'\n'.join(self._events).decode())
+
+        if self.journal is not None:
+            self.journal.seal()
+
+            if len(self.journal) > 0:
+                self.logger.warning(
+                    '%d metrics journal segments was not replayed, replay them with: grizzly-cli replay --journal %s <url>', len(self.journal), self.journal.path.as_posix()
+                )
 
         self.run_events_greenlet.kill(block=False)
         self.run_user_count_greenlet.kill(block=False)
 
+        for greenlet in (self.run_replay_greenlet, self.run_aggregation_greenlet):
+            if greenlet is not None:
+                greenlet.kill(block=False)
+
         with suppress(Exception):
             self.connection.disconnect()
 
-    def queue_event(self, p: list[InfluxDbPoint] | InfluxDbPoint) -> None:
+    def queue_event(self, p: Sequence[InfluxDbPoint | bytes] | InfluxDbPoint | bytes) -> None:
         if not p:
             return
 
+        if isinstance(p, bytes):
+            lines = [p]
+        elif isinstance(p, dict):
+            lines = [encode_point(p)]
+        else:
+            lines = [point if isinstance(point, bytes) else encode_point(point) for point in p]
+
         with self.lock:
-            if isinstance(p, list):
-                self._events.extend(p)
-            else:
-                self._events.append(p)
+            overflow = len(self._events) + len(lines) - self._queue_capacity
+            self._events.extend(lines)
+
+            if overflow > 0:
+                self._dropped += overflow
+
+    def _spill_backlog(self) -> None:
+        """Move the oldest points above `max_queue_size` from the buffer to the journal, InfluxDB is behind."""
+        with self.lock:
+            overflow = len(self._events) - self.max_queue_size
+            if overflow <= 0:
+                return
+
+            lines = [self._events.popleft() for _ in range(overflow)]
+
+        self._spill(lines)
+
+    def _spill(self, lines: list[bytes]) -> None:
+        journal = cast('MetricsJournal', self.journal)
+        count = journal.append(lines)
+        self._spilled += count
+        self.points_spilled += count
 
     def run_user_count(self) -> None:
         runner = self.environment.runner
@@ -389,39 +567,178 @@ class InfluxDbListener:
         while not self._quit_event.is_set():
             gevent.sleep(1.5)
 
+            self.flush()
+
+    def run_aggregation(self) -> None:
+        interval = cast('float', self.aggregation_interval)
+
+        while not self._quit_event.is_set():
+            gevent.sleep(interval)
+
+            self.flush_aggregates()
+
+    def flush_aggregates(self) -> None:
+        """Queue one point per aggregated tag set, for requests since the last time aggregates was flushed."""
+        if not self._aggregates:
+            return
+
+        aggregates, self._aggregates = self._aggregates, {}
+        timestamp = time_ns()
+        lines: list[bytes] = []
+
+        for tag_set, aggregate in aggregates.items():
+            response_time = aggregate.response_time
+            fields: StrDict = {
+                'count': response_time.count,
+                'sum': float(response_time.total),
+                'min': float(response_time.minimum),
+                'max': float(response_time.maximum),
+                'p50': response_time.percentile(0.50),
+                'p90': response_time.percentile(0.90),
+                'p95': response_time.percentile(0.95),
+                'p99': response_time.percentile(0.99),
+                'response_length': aggregate.response_length,
+            }
+
+            lines.append(encode_line(tag_set, fields, timestamp))
+
+        self.queue_event(lines)
+
+    def run_replay(self) -> None:
+        journal = cast('MetricsJournal', self.journal)
+
+        while not self._quit_event.is_set():
+            gevent.sleep(5.0)
+
+            # only replay when InfluxDB has caught up
+            if not self._sink_healthy or len(self._events) > self.max_batch_size:
+                continue
+
+            journal.seal()
+
+            try:
+                while len(journal.sealed) > 0 and not self._quit_event.is_set():
+                    with self.write_lock:
+                        count = replay_segments([journal.sealed[0]], self.connection.write, batch_size=self.max_batch_size)
+                        journal.sealed.popleft()
+
+                    self.points_replayed += count
+                    self.logger.info('replayed %d metrics from journal', count)
+            except:
+                self._sink_healthy = False
+                self.logger.exception('failed to replay metrics journal')
+
+    def _create_listener_event(self, queue_depth: int, dropped: int, spilled: int) -> InfluxDbPoint:
+        return {
+            'measurement': 'influxdb_listener',
+            'tags': {
+                'testplan': self._testplan,
+                'hostname': self._hostname,
+                'environment': self._target_environment,
+                'profile': self._profile_name,
+                'description': self._description,
+            },
+            'time': datetime.now(timezone.utc).isoformat(),
+            'fields': {
+                'queue_depth': queue_depth,
+                'dropped': dropped,
+                'spilled': spilled,
+                'write_time': self.write_time,
+            },
+        }
+
+    def flush(self) -> None:
+        """Write all queued points, in batches of at most `max_batch_size` points.
+
+        The buffer is swapped under the lock, and written outside of it, so producers are not blocked while writing.
+        If a write fails, the points that has not been written are put back in front of the buffer, or written to
+        the journal if there is one. Points queued while writing, above `max_queue_size`, are moved to the journal
+        after each batch.
+        """
+        with self.write_lock:
             with self.lock:
-                if self._events:
-                    try:
-                        self.connection.write(self._events)
-                        self.logger.debug('wrote %d measurements', len(self._events))
-                        self._events.clear()
-                    except:
-                        self.logger.exception('failed to write metrics')
-                        if self._quit_event.is_set():
-                            self.logger.warning('discarded metrics: %s', json.dumps(self._events))
+                if not self._events:
+                    return
+
+                events, self._events = self._events, deque(maxlen=self._queue_capacity)
+                dropped, self._dropped = self._dropped, 0
+                spilled, self._spilled = self._spilled, 0
+
+            self.points_dropped += dropped
+            if dropped > 0:
+                self.logger.warning('dropped %d metrics, queue is full', dropped)
+
+            pending = list(events)
+            pending.append(encode_point(self._create_listener_event(len(pending), dropped, spilled)))
+
+            offset = 0
+            started = perf_counter()
+
+            try:
+                while offset < len(pending):
+                    batch = pending[offset : offset + self.max_batch_size]
+                    self.connection.write(batch)
+                    offset += len(batch)
+                    self.logger.debug('wrote %d measurements', len(batch))
+
+                    if self.journal is not None:
+                        self._spill_backlog()
+
+                self._sink_healthy = True
+            except:
+                self._sink_healthy = False
+                self.logger.exception('failed to write metrics')
+                if self.journal is not None:
+                    self._spill(pending[offset:])
+                elif self._quit_event.is_set():
+                    self.logger.warning('discarded metrics: %s', b'\n'.join(pending[offset:]).decode())
+                else:
+                    self._requeue(pending[offset:-1])
+            finally:
+                self.points_written += offset
+                self.write_time = (perf_counter() - started) * 1000
+
+    def _requeue(self, events: list[bytes]) -> None:
+        with self.lock:
+            overflow = len(events) + len(self._events) - self.max_queue_size
+            requeued = deque(events, maxlen=self._queue_capacity)
+            requeued.extend(self._events)
+            self._events = requeued
+
+            if overflow > 0:
+                self._dropped += overflow
+
+    def _create_override_key(self, key: str) -> tuple[str, str] | None:
+        if not key.startswith('__') or not key.endswith('__'):
+            return None
+
+        override_key = key[2:-2]
+
+        if override_key.startswith('fields_'):
+            return 'fields', override_key[7:]
+
+        if override_key.startswith('tags_'):
+            return 'tags', override_key[5:]
+
+        return '', override_key
 
     def _override_event(self, event: InfluxDbPoint, context: StrDict) -> None:
         # override values set in context
         for key, value in context.items():
-            if not key.startswith('__') and not key.endswith('__'):
+            override = self._override_key(key)
+
+            if override is None:
                 continue
 
-            override_key = key[2:-2]
+            section, override_key = override
 
-            if override_key.startswith('fields_'):
-                override_key = override_key[7:]
+            if section in ('fields', 'tags'):
+                values = event['fields'] if section == 'fields' else event['tags']
 
-                if override_key not in event['fields']:
+                if override_key not in values:
                     continue
 
-                event['fields'].update({override_key: value})
-            elif override_key.startswith('tags_'):
-                override_key = override_key[5:]
-
-                if override_key not in event['tags']:
-                    continue
-
-                event['tags'].update({override_key: value})
+                values.update({override_key: value})
             else:
                 if override_key not in event:
                     continue
@@ -459,6 +776,45 @@ class InfluxDbListener:
     ) -> None:
         self._create_event(timestamp, measurement, tags, metrics)
 
+    def _create_request_tag_set(self, name: str, request_type: str, result: str, user: Any) -> str:
+        return encode_tag_set('request', self._create_request_tags(name, request_type, result, user))
+
+    def _create_request_tags(self, name: str, request_type: str, result: str, user: Any) -> StrDict:
+        tags: StrDict = {
+            'name': name,
+            'method': request_type,
+            'result': result,
+            'testplan': self._testplan,
+            'hostname': self._hostname,
+            'environment': self._target_environment,
+            'profile': self._profile_name,
+            'description': self._description,
+            'user': user,
+        }
+
+        try:
+            scenario_identifier, _ = name.split(' ', 1)
+            scenario_index = int(scenario_identifier) - 1
+            current_scenario = self.grizzly.scenarios[scenario_index]
+            tags.update({'scenario': current_scenario.locust_name})
+        except ValueError:
+            pass
+
+        return tags
+
+    def _create_aggregate_tag_set(self, name: str, request_type: str, result: str) -> str:
+        return encode_tag_set('request_aggregate', self._create_request_tags(name, request_type, result, None))
+
+    def _aggregate_request(self, request_type: str, name: str, result: str, metrics: StrDict) -> None:
+        tag_set = self._aggregate_tag_set(name, request_type, result)
+        aggregate = self._aggregates.get(tag_set, None)
+
+        if aggregate is None:
+            aggregate = self._aggregates[tag_set] = RequestAggregate()
+
+        aggregate.response_time.add(metrics['response_time'])
+        aggregate.response_length += metrics.get('response_length', None) or 0
+
     def _log_request(
         self,
         request_type: str,
@@ -468,6 +824,10 @@ class InfluxDbListener:
         context: StrDict,
         exception: Any = None,
     ) -> None:
+        if self.aggregation_interval is not None:
+            self._aggregate_request(request_type, name, result, metrics)
+            return
+
         if exception is not None:
             if isinstance(exception, CatchResponseError):
                 metrics['exception'] = str(exception)
@@ -479,50 +839,33 @@ class InfluxDbListener:
         else:
             metrics['exception'] = None
 
-        tags = {
-            'name': name,
-            'method': request_type,
-            'result': result,
-            'testplan': self._testplan,
-            'hostname': self._hostname,
-            'environment': self._target_environment,
-            'profile': self._profile_name,
-            'description': self._description,
-            'user': context.get('user', id(self)),
-        }
-
-        try:
-            scenario_identifier, _ = name.split(' ', 1)
-            scenario_index = int(scenario_identifier) - 1
-            current_scenario = self.grizzly.scenarios[scenario_index]
-            tags.update({'scenario': current_scenario.locust_name})
-        except ValueError:
-            pass
-
-        timestamp_finished = datetime.now(timezone.utc)
-        timestamp_started = timestamp = timestamp_finished - timedelta(milliseconds=metrics['response_time'])
+        user = context.get('user', id(self))
+        timestamp_finished = time_ns()
+        timestamp_started = timestamp = timestamp_finished - round(metrics['response_time'] * 1_000_000)
 
         metrics.update(
             {
-                'request_started': timestamp_started.isoformat(),
-                'request_finished': timestamp_finished.isoformat(),
+                'request_started': to_isoformat(timestamp_started),
+                'request_finished': to_isoformat(timestamp_finished),
             },
         )
 
-        event: InfluxDbPoint = {
-            'measurement': 'request',
-            'tags': tags,
-            'time': timestamp.isoformat(),
-            'fields': {
-                **metrics,
-            },
-        }
+        if any(self._override_key(key) is not None for key in context):
+            event: InfluxDbPoint = {
+                'measurement': 'request',
+                'tags': self._create_request_tags(name, request_type, result, user),
+                'time': timestamp,
+                'fields': metrics,
+            }
 
-        self._override_event(event, context)
+            self._override_event(event, context)
+            line = encode_point(event)
+        else:
+            line = encode_line(self._request_tag_set(name, request_type, result, user), metrics, timestamp)
 
-        self.logger.debug('%s %s %s', request_type, name, event['time'])
+        self.logger.debug('%s %s %d', request_type, name, timestamp)
 
-        self.queue_event(event)
+        self.queue_event(line)
 
     def request(
         self,
@@ -0,0 +1,205 @@
+"""Detect if the load generator itself, and not the system under test, was the bottleneck during a test.
+
+A monitor greenlet runs on each worker (or the local runner) while the test is running. Every `interval` seconds it measures:
+
+- event loop lag, how much later than scheduled the monitor greenlet was woken up
+- CPU time used by the process, relative to the wall time of the interval
+- number of running greenlets
+
+An interval where the lag or the CPU usage is above its limit is counted as saturated. Workers send their measurements to the
+master together with the statistics (`report_to_master`). When the results are validated (`grizzly.listeners.validate_result`),
+the saturation of each worker is printed, and a warning is logged for each worker that was saturated for more than
+`grizzly.context.GrizzlyContextSetup.max_worker_saturation` percent of the test.
+
+The monitor is only started if `max_worker_saturation` has been set, with step
+`grizzly.steps.background.setup.step_setup_max_worker_saturation`.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict, dataclass
+from time import perf_counter, process_time
+from typing import TYPE_CHECKING, Any
+
+import gevent
+from locust.stats import console_logger
+
+from grizzly.types.locust import MasterRunner, WorkerRunner
+
+if TYPE_CHECKING:  # pragma: no cover
+    from grizzly.types import StrDict
+    from grizzly.types.locust import Environment
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WorkerSaturation:
+    samples: int = 0
+    saturated: int = 0
+    lag_max: float = 0.0
+    cpu_time: float = 0.0
+    wall_time: float = 0.0
+    greenlets_max: int = 0
+
+    def merge(self, other: WorkerSaturation) -> None:
+        self.samples += other.samples
+        self.saturated += other.saturated
+        self.lag_max = max(self.lag_max, other.lag_max)
+        self.cpu_time += other.cpu_time
+        self.wall_time += other.wall_time
+        self.greenlets_max = max(self.greenlets_max, other.greenlets_max)
+
+    @property
+    def saturated_ratio(self) -> float:
+        return self.saturated / self.samples if self.samples > 0 else 0.0
+
+    @property
+    def cpu_usage(self) -> float:
+        return self.cpu_time / self.wall_time if self.wall_time > 0.0 else 0.0
+
+
+class SaturationMonitor:
+    interval: float = 1.0
+    max_lag: float = 0.1
+    max_cpu_usage: float = 0.9
+
+    environment: Environment
+    max_saturation: float
+    workers: dict[str, WorkerSaturation]
+
+    _current: WorkerSaturation
+    _greenlet: gevent.Greenlet | None
+
+    def __init__(self, environment: Environment, *, max_saturation: float) -> None:
+        self.environment = environment
+        self.max_saturation = max_saturation
+        self.workers = {}
+        self._current = WorkerSaturation()
+        self._greenlet = None
+
+        runner = environment.runner
+
+        if not isinstance(runner, MasterRunner):
+            environment.events.test_start.add_listener(self.on_test_start)
+            environment.events.test_stop.add_listener(self.on_test_stop)
+
+        if isinstance(runner, WorkerRunner):
+            environment.events.report_to_master.add_listener(self.on_report_to_master)
+
+        if isinstance(runner, MasterRunner):
+            environment.events.worker_report.add_listener(self.on_worker_report)
+
+    def on_test_start(self, *_args: Any, **_kwargs: Any) -> None:
+        if self._greenlet is None:
+            self._greenlet = gevent.spawn(self.run)
+
+    def on_test_stop(self, *_args: Any, **_kwargs: Any) -> None:
+        if self._greenlet is not None:
+            self._greenlet.kill(block=False)
+            self._greenlet = None
+
+    def on_report_to_master(self, client_id: str, data: StrDict) -> None:  # noqa: ARG002
+        if self._current.samples < 1:
+            return
+
+        data['saturation'] = asdict(self._current)
+        self._current = WorkerSaturation()
+
+    def on_worker_report(self, client_id: str, data: StrDict) -> None:
+        value = data.get('saturation', None)
+        if value is None:
+            return
+
+        try:
+            saturation = WorkerSaturation(**value)
+        except TypeError:
+            logger.warning('worker %s reported invalid saturation data: %r', client_id, value)
+            return
+
+        self.workers.setdefault(client_id, WorkerSaturation()).merge(saturation)
+
+    def validate(self) -> list[str]:
+        """Print the saturation of each worker, and log a warning for each worker that was saturated more than `max_saturation` percent
+        of the test.
+
+        Returns the workers that was saturated more than `max_saturation` percent of the test.
+        """
+        if not isinstance(self.environment.runner, MasterRunner) and self._current.samples > 0:
+            self.workers.setdefault('local', WorkerSaturation()).merge(self._current)
+            self._current = WorkerSaturation()
+
+        if len(self.workers) < 1:
+            return []
+
+        saturated_workers: list[str] = []
+
+        console_logger.info('%-40s %10s %10s %14s %10s %14s', 'Worker', 'saturated', 'seconds', 'max lag (ms)', 'avg CPU', 'max greenlets')
+        console_logger.info('-' * 103)
+
+        for worker, saturation in sorted(self.workers.items()):
+            saturated_percent = saturation.saturated_ratio * 100.0
+            saturated_seconds = round(saturation.saturated * self.interval)
+            seconds = round(saturation.samples * self.interval)
+
+            console_logger.info(
+                '%-40s %9.0f%% %10s %14.0f %9.0f%% %14d',
+                worker,
+                saturated_percent,
+                f'{saturated_seconds}/{seconds}',
+                saturation.lag_max * 1000,
+                saturation.cpu_usage * 100,
+                saturation.greenlets_max,
+            )
+
+            if saturated_percent > self.max_saturation:
+                saturated_workers.append(worker)
+
+        console_logger.info('')
+
+        for worker in saturated_workers:
+            saturation = self.workers[worker]
+            logger.warning(
+                (
+                    'worker %s was saturated %.0f%% of the test (%d of %d seconds), response times might be affected by the load generator: '
+                    'max event loop lag %.0f ms, average CPU usage %.0f%%, max %d greenlets'
+                ),
+                worker,
+                saturation.saturated_ratio * 100.0,
+                round(saturation.saturated * self.interval),
+                round(saturation.samples * self.interval),
+                saturation.lag_max * 1000,
+                saturation.cpu_usage * 100,
+                saturation.greenlets_max,
+            )
+
+        return saturated_workers
+
+    def greenlet_count(self) -> int:
+        runner = self.environment.runner
+        if runner is None:
+            return 0
+
+        return len(runner.user_greenlets) + len(runner.greenlet)
+
+    def sample(self, lag: float, cpu_time: float, wall_time: float) -> None:
+        current = self._current
+        current.samples += 1
+        current.lag_max = max(current.lag_max, lag)
+        current.cpu_time += cpu_time
+        current.wall_time += wall_time
+        current.greenlets_max = max(current.greenlets_max, self.greenlet_count())
+
+        if lag > self.max_lag or (wall_time > 0.0 and cpu_time / wall_time > self.max_cpu_usage):
+            current.saturated += 1
+
+    def run(self) -> None:
+        while True:
+            started = perf_counter()
+            cpu_started = process_time()
+
+            gevent.sleep(self.interval)
+
+            wall_time = perf_counter() - started
+            self.sample(max(wall_time - self.interval, 0.0), process_time() - cpu_started, wall_time)
@@ -0,0 +1,366 @@
+"""Sinks that the statistics listener writes metrics to.
+
+The statistics listener queues points, encoded in InfluxDB line protocol, and writes them in batches to a sink. Which
+sink is used is decided by the scheme of the URL in step `save statistics to`, and custom sinks can be registered with
+`register_metrics_sink`:
+
+```python title="steps/custom.py"
+from urllib.parse import ParseResult
+
+from grizzly.listeners.sink import register_metrics_sink
+
+
+class ConsoleSink:
+    def connect(self) -> ConsoleSink:
+        return self
+
+    def disconnect(self) -> None:
+        pass
+
+    def write(self, values: list[bytes]) -> None:
+        for value in values:
+            print(value.decode())
+
+
+@register_metrics_sink('console')
+def create_console_sink(parsed: ParseResult) -> ConsoleSink:
+    return ConsoleSink()
+```
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from platform import node as get_hostname
+from typing import TYPE_CHECKING, Any, ClassVar, Protocol, TypeVar
+from urllib.parse import parse_qs, unquote, urlparse
+
+from grizzly_common.journal import MetricsJournal
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable
+    from urllib.parse import ParseResult
+
+    from grizzly.types import Self, StrDict
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsSink(Protocol):
+    def write(self, values: list[bytes]) -> None: ...
+
+    def connect(self) -> Self: ...
+
+    def disconnect(self) -> None: ...
+
+
+MetricsSinkFactory = TypeVar('MetricsSinkFactory', bound='Callable[[ParseResult], MetricsSink]')
+
+metrics_sinks: dict[str, Callable[[ParseResult], MetricsSink]] = {}
+
+
+def register_metrics_sink(*schemes: str) -> Callable[[MetricsSinkFactory], MetricsSinkFactory]:
+    """Register a function, that creates a sink from a parsed URL, for one or more URL schemes."""
+
+    def wrapper(factory: MetricsSinkFactory) -> MetricsSinkFactory:
+        for scheme in schemes:
+            metrics_sinks[scheme] = factory
+
+        return factory
+
+    return wrapper
+
+
+def create_metrics_sink(url: str) -> MetricsSink:
+    parsed = urlparse(url)
+    factory = metrics_sinks.get(parsed.scheme, None)
+
+    assert factory is not None, f'"{parsed.scheme}" is not a supported scheme'
+
+    return factory(parsed)
+
+
+def _split(value: str, separator: str, *, quoted: bool = False, maxsplit: int = -1) -> list[str]:
+    """Split `value` on `separator`, except where it is escaped or, if `quoted`, within a string field value."""
+    parts: list[str] = []
+    start = 0
+    escaped = in_string = False
+
+    for index, char in enumerate(value):
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif quoted and char == '"':
+            in_string = not in_string
+        elif char == separator and not in_string and (maxsplit < 0 or len(parts) < maxsplit):
+            parts.append(value[start:index])
+            start = index + 1
+
+    parts.append(value[start:])
+
+    return parts
+
+
+def _unescape(value: str) -> str:
+    if '\\' not in value:
+        return value
+
+    chars: list[str] = []
+    escaped = False
+
+    for char in value:
+        if escaped:
+            chars.append('\n' if char == 'n' else char)
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        else:
+            chars.append(char)
+
+    return ''.join(chars)
+
+
+def decode_field_value(value: str) -> Any:
+    if value.startswith('"'):
+        return _unescape(value[1:-1])
+
+    if value.endswith(('i', 'u')):
+        return int(value[:-1])
+
+    if value in ('t', 'T', 'true', 'True', 'TRUE'):
+        return True
+
+    if value in ('f', 'F', 'false', 'False', 'FALSE'):
+        return False
+
+    return float(value)
+
+
+def decode_line(line: bytes) -> tuple[str, StrDict, StrDict, int]:
+    """Decode a point in line protocol to measurement, tags, fields and timestamp in nanoseconds."""
+    value = line.decode()
+    series, rest = _split(value, ' ', maxsplit=1)
+    field_set, timestamp = rest.rsplit(' ', 1)
+
+    measurement, *tag_set = _split(series, ',')
+    tags: StrDict = {}
+    fields: StrDict = {}
+
+    for tag in tag_set:
+        key, tag_value = _split(tag, '=', maxsplit=1)
+        tags[_unescape(key)] = _unescape(tag_value)
+
+    for field in _split(field_set, ',', quoted=True):
+        key, field_value = _split(field, '=', quoted=True, maxsplit=1)
+        fields[_unescape(key)] = decode_field_value(field_value)
+
+    return _unescape(measurement), tags, fields, int(timestamp)
+
+
+@dataclass
+class MetricsTableWriter:
+    """Open Arrow IPC or Parquet writer, and the file it writes to, for one measurement."""
+
+    fd: Any
+    writer: Any
+    schema: Any
+
+    def conform(self, table: Any) -> Any | None:
+        """Conform `table` to the schema of the writer, by adding tags and fields that are not in any row of the batch.
+
+        Returns `None` if `table` has a tag or field that is not in the schema, or with another type.
+        """
+        import pyarrow as pa  # noqa: PLC0415
+
+        if not set(table.column_names).issubset(self.schema.names):
+            return None
+
+        arrays: list[Any] = []
+
+        for field in self.schema:
+            if field.name not in table.column_names:
+                arrays.append(pa.nulls(table.num_rows, field.type))
+                continue
+
+            column = table.column(field.name)
+
+            if column.type != field.type:
+                return None
+
+            arrays.append(column)
+
+        return pa.Table.from_arrays(arrays, schema=self.schema)
+
+
+class MetricsFileSink:
+    """Write metrics to files in a local directory, instead of a database.
+
+    `file://<path>[?Format=lp|arrow|parquet]`, where a relative path is relative to the grizzly project root, e.g.
+    `file://logs/metrics` or `file:///tmp/metrics`.
+
+    * `lp` (default): points are appended, in line protocol, to segment files. These can be written to InfluxDB
+      afterwards with `grizzly-cli replay --journal <path> <url>`
+    * `arrow` and `parquet`: points are written as Arrow IPC or Parquet files, one per measurement in
+      `<path>/<measurement>/`, with one column per tag and field, and a `time` column. As with `lp` segments, a file is
+      closed and a new one is started when it exceeds the segment size, and all files are closed when the test stops.
+      A new file is also started when a batch has a tag or field that is not in the current file. Requires `pyarrow`,
+      e.g. `grizzly-loadtester[pyarrow]`
+    """
+
+    formats: ClassVar[tuple[str, ...]] = ('lp', 'arrow', 'parquet')
+
+    path: Path
+    file_format: str
+    segment_size: int
+
+    _journal: MetricsJournal | None
+    _writers: dict[str, MetricsTableWriter]
+    _prefix: str
+    _sequence: int
+
+    def __init__(self, path: Path, *, file_format: str = 'lp', segment_size: int = 16 * 1024 * 1024) -> None:
+        assert file_format in self.formats, f'Format must be one of {", ".join(self.formats)}'
+
+        self.path = path
+        self.file_format = file_format
+        self.segment_size = segment_size
+        self._journal = None
+        self._writers = {}
+        self._prefix = f'{get_hostname()}-{os.getpid()}'
+        self._sequence = 0
+
+    @classmethod
+    def from_url(cls, parsed: ParseResult) -> Self:
+        path = Path(unquote(f'{parsed.netloc}{parsed.path}'))
+
+        assert path.as_posix() not in ('', '.'), f'path was not found in {parsed.geturl()}'
+
+        if not path.is_absolute():
+            path = Path(os.environ.get('GRIZZLY_CONTEXT_ROOT', '.')) / path
+
+        params = parse_qs(parsed.query)
+
+        return cls(path, file_format=params['Format'][0] if 'Format' in params else 'lp')
+
+    def connect(self) -> Self:
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        if self.file_format == 'lp':
+            self._journal = MetricsJournal(self.path, prefix=self._prefix, segment_size=self.segment_size)
+        else:
+            try:
+                import pyarrow as pa  # noqa: F401, PLC0415
+            except ModuleNotFoundError as e:
+                message = f'Format={self.file_format} requires pyarrow, which is not installed'
+                raise AssertionError(message) from e
+
+        return self
+
+    def disconnect(self) -> None:
+        if self._journal is not None:
+            self._journal.seal()
+
+        for measurement in list(self._writers.keys()):
+            self._close_writer(measurement)
+
+    def write(self, values: list[bytes]) -> None:
+        if self._journal is not None:
+            self._journal.append(values)
+            return
+
+        tables: dict[str, dict[str, list[Any]]] = {}
+        sizes: dict[str, int] = defaultdict(int)
+
+        for value in values:
+            measurement, tags, fields, timestamp = decode_line(value)
+            columns = tables.setdefault(measurement, {'time': []})
+            size = sizes[measurement]
+
+            for key, column_value in (('time', timestamp), *tags.items(), *fields.items()):
+                column = columns.get(key, None)
+                if column is None:
+                    # column not seen in earlier rows of this batch
+                    column = columns[key] = [None] * size
+
+                column.append(column_value)
+
+            size += 1
+            sizes[measurement] = size
+
+            # columns not set in this row
+            for column in columns.values():
+                if len(column) < size:
+                    column.append(None)
+
+        for measurement, columns in tables.items():
+            self._write_table(measurement, columns)
+
+    def _open_writer(self, measurement: str, schema: Any) -> MetricsTableWriter:
+        import pyarrow as pa  # noqa: PLC0415
+
+        path = self.path / measurement
+        path.mkdir(exist_ok=True)
+        self._sequence += 1
+        fd = pa.OSFile((path / f'{self._prefix}-{self._sequence:08d}.{self.file_format}').as_posix(), 'wb')
+
+        if self.file_format == 'parquet':
+            import pyarrow.parquet as pq  # noqa: PLC0415
+
+            writer = pq.ParquetWriter(fd, schema)
+        else:
+            writer = pa.ipc.new_file(fd, schema)
+
+        table_writer = self._writers[measurement] = MetricsTableWriter(fd, writer, schema)
+
+        return table_writer
+
+    def _close_writer(self, measurement: str) -> None:
+        table_writer = self._writers.pop(measurement, None)
+
+        if table_writer is None:
+            return
+
+        table_writer.writer.close()
+        table_writer.fd.close()
+
+    def _write_table(self, measurement: str, columns: dict[str, list[Any]]) -> None:
+        import pyarrow as pa  # noqa: PLC0415
+
+        table = pa.Table.from_pydict(columns)
+        table = table.set_column(0, 'time', table.column('time').cast(pa.timestamp('ns', tz='UTC')))
+
+        table_writer = self._writers.get(measurement, None)
+
+        if table_writer is not None and not table.schema.equals(table_writer.schema):
+            conformed_table = table_writer.conform(table)
+
+            if conformed_table is None:
+                self._close_writer(measurement)
+                table_writer = None
+            else:
+                table = conformed_table
+
+        if table_writer is None:
+            table_writer = self._open_writer(measurement, table.schema)
+
+        table_writer.writer.write_table(table)
+
+        if table_writer.fd.tell() >= self.segment_size:
+            self._close_writer(measurement)
+
+
+@register_metrics_sink('file')
+def create_file_sink(parsed: ParseResult) -> MetricsSink:
+    return MetricsFileSink.from_url(parsed)
+
+
+@register_metrics_sink('influxdb', 'influxdb2')
+def create_influxdb_sink(parsed: ParseResult) -> MetricsSink:
+    from grizzly.listeners.influxdb import create_influxdb_client  # noqa: PLC0415
+
+    return create_influxdb_client(parsed)
@@ -0,0 +1,119 @@
+"""Response time percentiles calculated from histograms, instead of from locust `response_times` dicts.
+
+Each request is counted in a [histogram][grizzly.utils.histogram] per request name and method. Histograms has fixed relative
+accuracy, so they use the same amount of memory no matter how long the test runs, and they are merged by adding the count of each
+bucket. Workers send their histograms to the master together with the statistics (`report_to_master`), and starts over with empty
+histograms.
+
+Locust still keeps its own statistics, histograms are only used by grizzly when validating `response_time_percentile` for scenarios
+and when printing response time percentiles.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from locust.stats import PERCENTILES_TO_REPORT, STATS_NAME_WIDTH, STATS_TYPE_WIDTH, get_readable_percentiles
+
+from grizzly.types.locust import MasterRunner, WorkerRunner
+from grizzly.utils.histogram import Histogram
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterable
+
+    from grizzly.types import StrDict
+    from grizzly.types.locust import Environment
+
+logger = logging.getLogger(__name__)
+
+
+class HistogramStats:
+    environment: Environment
+    relative_accuracy: float
+    entries: dict[tuple[str, str], Histogram]
+
+    def __init__(self, environment: Environment, *, relative_accuracy: float = 0.01) -> None:
+        self.environment = environment
+        self.relative_accuracy = relative_accuracy
+        self.entries = {}
+
+        runner = environment.runner
+
+        environment.events.request.add_listener(self.on_request)
+
+        if isinstance(runner, WorkerRunner):
+            environment.events.report_to_master.add_listener(self.on_report_to_master)
+        elif isinstance(runner, MasterRunner):
+            environment.events.worker_report.add_listener(self.on_worker_report)
+
+    def on_request(self, request_type: str, name: str, response_time: float | None, *_args: Any, **_kwargs: Any) -> None:
+        if response_time is None:
+            return
+
+        self.get(name, request_type).add(response_time)
+
+    def on_report_to_master(self, client_id: str, data: StrDict) -> None:  # noqa: ARG002
+        if len(self.entries) < 1:
+            return
+
+        data['response_time_histograms'] = [[name, method, histogram.serialize()] for (name, method), histogram in self.entries.items()]
+        self.entries = {}
+
+    def on_worker_report(self, client_id: str, data: StrDict) -> None:
+        for name, method, value in data.get('response_time_histograms', []):
+            try:
+                histogram = Histogram.unserialize(value)
+                self.get(name, method).merge(histogram)
+            except (AssertionError, KeyError, TypeError, ValueError):  # noqa: PERF203
+                logger.warning('worker %s reported an invalid histogram for %s %s', client_id, method, name)
+
+    def get(self, name: str, method: str | None) -> Histogram:
+        key = (name, method or '')
+        histogram = self.entries.get(key, None)
+
+        if histogram is None:
+            histogram = self.entries[key] = Histogram(relative_accuracy=self.relative_accuracy)
+
+        return histogram
+
+    def merged(self, keys: Iterable[tuple[str, str | None]]) -> Histogram:
+        """Merge the histograms of all `keys` (name and method) into a new histogram, e.g. for all requests in a scenario."""
+        histogram = Histogram(relative_accuracy=self.relative_accuracy)
+
+        for name, method in keys:
+            other = self.entries.get((name, method or ''), None)
+            if other is not None:
+                histogram.merge(other)
+
+        return histogram
+
+    @staticmethod
+    def percentile(name: str, method: str | None, histogram: Histogram) -> str:
+        """Format response time percentiles of `histogram` the same way as `locust.stats.StatsEntry.percentile`."""
+        tpl = f'%-{STATS_TYPE_WIDTH}s %-{STATS_NAME_WIDTH}s %8d {" ".join(["%6d"] * len(PERCENTILES_TO_REPORT))}'
+
+        return tpl % (method or '', name, *(round(histogram.percentile(percent)) for percent in PERCENTILES_TO_REPORT), len(histogram))
+
+    def get_percentile_stats_summary(self, keys: Iterable[tuple[str, str | None]], total_name: str) -> list[str]:
+        """Get response time percentiles from histograms, in the order of `keys`, formatted as `locust.stats.get_percentile_stats_summary`."""
+        summary = ['Response time percentiles (approximated)']
+        headers = ('Type', 'Name', *get_readable_percentiles(PERCENTILES_TO_REPORT), '# reqs')
+        summary.append((f'%-{STATS_TYPE_WIDTH}s %-{STATS_NAME_WIDTH}s %8s {" ".join(["%6s"] * len(PERCENTILES_TO_REPORT))}') % headers)
+        separator = (f'{"-" * STATS_TYPE_WIDTH}|{"-" * STATS_NAME_WIDTH}|{"-" * 8}|{("-" * 6 + "|") * len(PERCENTILES_TO_REPORT)}')[:-1]
+        summary.append(separator)
+
+        keys = list(keys)
+
+        for name, method in keys:
+            histogram = self.entries.get((name, method or ''), None)
+            if histogram is not None and len(histogram) > 0:
+                summary.append(self.percentile(name, method, histogram))
+
+        summary.append(separator)
+
+        total = self.merged(keys)
+        if len(total) > 0:
+            summary.append(self.percentile(total_name, None, total))
+
+        return summary
@@ -8,10 +8,13 @@ import subprocess
 import sys
 from collections import defaultdict
 from contextlib import contextmanager, suppress
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from heapq import heapify, heappop, heappush, heapreplace
 from math import ceil, floor
 from operator import attrgetter, itemgetter
 from os import environ
+from pathlib import Path
 from platform import node as gethostname
 from signal import SIGINT, SIGTERM, Signals
 from time import perf_counter
@@ -23,17 +26,20 @@ from locust import events
 from locust import stats as lstats
 from locust.dispatch import UsersDispatcher
 from locust.log import setup_logging
+from locust.runners import HEARTBEAT_LIVENESS
 from locust.util.timespan import parse_timespan
 from roundrobin import smooth
 
 from . import __common_version__, __locust_version__, __version__
+from .events import events as grizzly_events
 from .listeners import init, init_statistics_listener, locust_test_start, spawning_complete, validate_result, worker_report
+from .tasks.request import compile_request_plans
 from .testdata.utils import initialize_testdata
 from .testdata.variables.csv_writer import open_files
 from .types import RequestType, StrDict, TestdataType
 from .types.behave import Context, Status
 from .types.locust import Environment, LocalRunner, LocustOption, LocustRunner, MasterRunner, Message, WorkerRunner
-from .utils import create_scenario_class_type, create_user_class_type
+from .utils import create_scenario_class_type, create_user_class_type, file_cache
 
 __all__ = [
     'UsersDispatcher',
@@ -42,13 +48,14 @@ __all__ = [
 
 
 if TYPE_CHECKING:  # pragma: no cover
-    from collections.abc import Callable, Generator, Iterator
+    from collections.abc import Callable, Collection, Generator, Iterator
 
     from gevent.fileobject import FileObjectThread
     from locust.runners import WorkerNode
     from locust.user.users import User
 
     from .context import GrizzlyContext
+    from .listeners.stats import HistogramStats
     from .testdata.communication import GrizzlyDependencies
     from .users import GrizzlyUser
 
@@ -73,7 +80,7 @@ class LengthOptimizedlist(list[T]):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
 
-        self.__optimized_length__ = 0
+        self.__optimized_length__ = list.__len__(self)
 
     def append(self, _object: Any) -> None:
         self.__optimized_length__ += 1
@@ -93,6 +100,16 @@ class LengthOptimizedlist(list[T]):
         return self.__optimized_length__
 
 
+@dataclass
+class MoveQuota:
+    """Number of users to move from a worker, when users are rebalanced after the workers of a sticky tag has changed."""
+
+    users: int  # users on the worker
+    move: int  # users to move from the worker
+    seen: int = 0  # users on the worker that has been looked at
+    moved: int = 0  # users that has been moved from the worker
+
+
 class FixedUsersDispatcher(UsersDispatcher):
     """Fixed count (only) based iterator that dispatches users to the workers.
 
@@ -101,8 +118,19 @@ class FixedUsersDispatcher(UsersDispatcher):
     the same tag value.
 
     `User.weight`, if set on the user type, will be ignored with this dispatcher.
+
+    If the user types have different `GrizzlyUser.cost`, or the workers have reported different capacity (see
+    `grizzly.listeners.worker_capacity`), workers are assigned to sticky tags based on the cost of the users with the tag, and
+    each user is dispatched to the worker of the tag that has the lowest cost per capacity.
+
+    With adaptive spawning (see `FixedUsersDispatcher.adaptive`), no new users are dispatched to workers that are saturated, i.e. their CPU
+    usage is above `max_cpu_usage` or they have missed `max_heartbeat_lag` heartbeats, for at most `max_pause` seconds.
     """
 
+    max_cpu_usage: float | None = None
+    max_heartbeat_lag: int = 2
+    max_pause: float = 60.0
+
     def __init__(self, worker_nodes: list[WorkerNode], user_classes: list[type[GrizzlyUser]]) -> None:
         self._worker_nodes = worker_nodes
         self._sort_workers()
@@ -149,6 +177,14 @@ class FixedUsersDispatcher(UsersDispatcher):
 
         self._user_class_name_to_type = {user_class.__name__: user_class for user_class in user_classes}
 
+        self._user_class_cost = {user_class.__name__: float(getattr(user_class, 'cost', 1.0)) for user_class in user_classes}
+
+        # users are dispatched based on cost and worker capacity, instead of round robin
+        self._grizzly_weighted: bool = False
+        self._worker_load: dict[str, float] = {}
+        self._worker_heap_index: dict[str, int] = {}
+        self._sticky_tag_to_worker_heap: dict[str, list[tuple[float, int, WorkerNode]]] = {}
+
         self._workers_to_sticky_tag: dict[WorkerNode, str] = {}
 
         self._sticky_tag_to_workers: dict[str, itertools.cycle[WorkerNode]] = {}
@@ -162,6 +198,13 @@ class FixedUsersDispatcher(UsersDispatcher):
 
         self._grizzly_current_user_count: dict[str, int] = {user_class.__name__: 0 for user_class in self._user_classes}
 
+        self._saturated_since: dict[str, float] = {}
+
+    @classmethod
+    def adaptive(cls, max_cpu_usage: float) -> type[FixedUsersDispatcher]:
+        """Create a dispatcher class with adaptive spawning, that will not dispatch users to workers with CPU usage above `max_cpu_usage`."""
+        return cast('type[FixedUsersDispatcher]', type(cls.__name__, (cls,), {'max_cpu_usage': max_cpu_usage}))
+
     def _sort_workers(self) -> None:
         # Sorting workers ensures repeatable behaviour
         worker_nodes_by_id = sorted(self._worker_nodes, key=lambda w: w.id)
@@ -242,24 +285,24 @@ class FixedUsersDispatcher(UsersDispatcher):
         self._prepare_rebalance()
 
     def _prepare_rebalance(self) -> None:
-        """When a rebalance is required because of added and/or removed workers, we compute the desired state as if
-        we started from 0 user. So, if we were currently running 500 users, then the `_distribute_users` will
-        perform a fake ramp-up without any waiting and return the final distribution.
+        """When a rebalance is required because of added and/or removed workers, the users that are currently running are
+        redistributed on the new pool of workers. Only the users needed to balance the workers of each sticky tag are moved,
+        see `_grizzly_distribute_users`.
         """
         self._spread_sticky_tags_on_workers()
 
-        # Reset users before recalculating since the current users is used to calculate how many
-        # fixed users to add.
-        self._users_on_workers = {worker_node.id: {user_class.__name__: 0 for user_class in self._original_user_classes} for worker_node in self._worker_nodes}
+        # users on removed workers are still included, since they should be started on the remaining workers
+        user_count = dict.fromkeys(self._grizzly_target_user_count, 0)
+        for user_counts in self._users_on_workers.values():
+            for user_class_name, count in user_counts.items():
+                user_count[user_class_name] = user_count.get(user_class_name, 0) + count
 
-        users_on_workers, user_gen, active_users = self._grizzly_distribute_users(self._grizzly_current_user_count)
+        users_on_workers, active_users = self._grizzly_distribute_users(user_count)
 
         self._users_on_workers = users_on_workers
         self._active_users = active_users
 
-        # It's important to reset the generators by using the ones from `_distribute_users`
-        # so that the next iterations are smooth and continuous.
-        self._user_generator = user_gen
+        # the user generator is kept as is, the number of users per user class does not change when rebalancing
 
         self._rebalance = True
 
@@ -294,6 +337,8 @@ class FixedUsersDispatcher(UsersDispatcher):
 
             self._user_class_name_to_type = {user_class.__name__: user_class for user_class in cast('list[type[GrizzlyUser]]', self._original_user_classes + grizzly_user_classes)}
 
+            self._user_class_cost = {user_class_name: float(getattr(user_class, 'cost', 1.0)) for user_class_name, user_class in self._user_class_name_to_type.items()}
+
             # only merge target user count for classes that has been specified in user classes
             grizzly_target_user_count = {user_class.__name__: user_class.fixed_count for user_class in grizzly_user_classes}
             self.target_user_count = {**self._grizzly_target_user_count, **grizzly_target_user_count}
@@ -351,6 +396,25 @@ class FixedUsersDispatcher(UsersDispatcher):
             for user_class_name, count in user_counts.items():
                 current_user_count.update({user_class_name: current_user_count.get(user_class_name, 0) + count})
 
+        saturated_workers = self._grizzly_saturated_workers()
+        blocked_sticky_tags: set[str] = set()
+        # number of users that can be dispatched to workers that are not saturated, only counted if there are saturated workers
+        unblocked_user_count: int | None = None
+
+        if len(saturated_workers) > 0:
+            blocked_sticky_tags = {
+                sticky_tag for sticky_tag, workers in self.__sticky_tag_to_workers.items() if all(worker_node.id in saturated_workers for worker_node in workers)
+            }
+            unblocked_user_count = sum(
+                max(target_user_count - current_user_count.get(user_class_name, 0), 0)
+                for user_class_name, target_user_count in self._grizzly_target_user_count.items()
+                if self._users_to_sticky_tag.get(user_class_name, None) not in blocked_sticky_tags
+            )
+
+            if unblocked_user_count < 1:
+                logger.debug('all workers with users left to dispatch are saturated, pausing dispatch')
+                return self._users_on_workers
+
         for next_user_class_name in self._user_generator:
             if not next_user_class_name:
                 self._no_user_to_spawn = True
@@ -360,13 +424,27 @@ class FixedUsersDispatcher(UsersDispatcher):
                 continue
 
             sticky_tag = self._users_to_sticky_tag[next_user_class_name]
-            worker_node = next(self._sticky_tag_to_workers[sticky_tag])
+
+            if unblocked_user_count is None:
+                worker_node = self._grizzly_least_loaded_worker(sticky_tag, next_user_class_name) if self._grizzly_weighted else next(self._sticky_tag_to_workers[sticky_tag])
+            elif sticky_tag in blocked_sticky_tags:
+                continue
+            elif self._grizzly_weighted:
+                worker_node = self._grizzly_least_loaded_worker(sticky_tag, next_user_class_name, skip=saturated_workers)
+            else:
+                worker_node = next(self._sticky_tag_to_workers[sticky_tag])
+                while worker_node.id in saturated_workers:
+                    worker_node = next(self._sticky_tag_to_workers[sticky_tag])
+
             self._users_on_workers[worker_node.id][next_user_class_name] += 1
             current_user_count_actual += 1
             current_user_count[next_user_class_name] += 1
             self._active_users.append((worker_node, next_user_class_name))
 
-            if current_user_count_actual >= current_user_count_target:
+            if unblocked_user_count is not None:
+                unblocked_user_count -= 1
+
+            if current_user_count_actual >= current_user_count_target or unblocked_user_count == 0:
                 self._grizzly_current_user_count = current_user_count
                 break
 
@@ -390,6 +468,8 @@ class FixedUsersDispatcher(UsersDispatcher):
                 return self._users_on_workers
 
             self._users_on_workers[worker_node.id][user] -= 1
+            if self._grizzly_weighted:
+                self._grizzly_release_worker(worker_node, user)
             current_user_count_actual -= 1
             if current_user_count_actual == 0 or current_user_count_actual <= current_user_count_target:
                 self._grizzly_current_user_count.clear()
@@ -424,6 +504,16 @@ class FixedUsersDispatcher(UsersDispatcher):
         if not value_weights:
             return itertools.cycle([None])
 
+        # Instead of calling `gen()` for each user, we cycle through a generator of fixed-length
+        # `generation_length_to_get_proper_distribution`. Doing so greatly improves performance because
+        # we only ever need to call `gen()` a relatively small number of times. The length of this generator
+        # is chosen as the sum of the normalized weights. So, for users A, B, C of weights 2, 5, 6, the length is
+        # 2 + 5 + 6 = 13 which would yield the distribution `CBACBCBCBCABC` that gets repeated over and over
+        # until the target user count is reached.
+        return itertools.cycle(FixedUsersDispatcher._cycle_period(value_weights))
+
+    @staticmethod
+    def _cycle_period(value_weights: list[tuple[type[GrizzlyUser] | str, int]]) -> list[str]:
         # Normalize the weights so that the smallest weight will be equal to "target_min_weight".
         # The value "2" was experimentally determined because it gave a better distribution especially
         # when dealing with weights which are close to each others, e.g. 1.5, 2, 2.4, etc.
@@ -445,16 +535,15 @@ class FixedUsersDispatcher(UsersDispatcher):
         generation_length_to_get_proper_distribution = sum(normalized_weight for _, normalized_weight in normalized_value_weights)
         gen = smooth(normalized_value_weights)
 
-        # Instead of calling `gen()` for each user, we cycle through a generator of fixed-length
-        # `generation_length_to_get_proper_distribution`. Doing so greatly improves performance because
-        # we only ever need to call `gen()` a relatively small number of times. The length of this generator
-        # is chosen as the sum of the normalized weights. So, for users A, B, C of weights 2, 5, 6, the length is
-        # 2 + 5 + 6 = 13 which would yield the distribution `CBACBCBCBCABC` that gets repeated over and over
-        # until the target user count is reached.
-        return itertools.cycle(gen() for _ in range(generation_length_to_get_proper_distribution))
+        return [gen() for _ in range(generation_length_to_get_proper_distribution)]
+
+    @staticmethod
+    def _worker_capacity(worker_node: WorkerNode) -> float:
+        return cast('float', getattr(worker_node, 'capacity', 1.0))
 
     def _spread_sticky_tags_on_workers(self) -> None:
         sticky_tag_user_count: dict[str, int] = {}
+        sticky_tag_cost: dict[str, float] = {}
 
         # summarize target user count per sticky tag
         for user_class_name, sticky_tag in self._users_to_sticky_tag.items():
@@ -462,33 +551,24 @@ class FixedUsersDispatcher(UsersDispatcher):
             if user_count is None:
                 continue
 
+            sticky_tag_cost.update({sticky_tag: sticky_tag_cost.get(sticky_tag, 0.0) + user_count * self._user_class_cost.get(user_class_name, 1.0)})
+
             user_count = sticky_tag_user_count.get(sticky_tag, 0) + user_count
             sticky_tag_user_count.update({sticky_tag: user_count})
 
         logger.debug('user count per sticky tag: %r', sticky_tag_user_count)
 
-        worker_node_count = len(self._worker_nodes)
-        # sort sticky tags based on number of users (more user types should have more workers)
-        sticky_tags: dict[str, int] = dict(sorted(sticky_tag_user_count.items(), key=itemgetter(1), reverse=True))
-        sticky_tag_count = len(sticky_tag_user_count)
-
-        # not enough sticky tags per worker, so cycle sticky tags so all workers gets a tag
-        sticky_tags_gen: Iterator[str | None]
-        if worker_node_count > sticky_tag_count:
-            # make sure each tag get at least one worker, then spread the remaining based on how many users that sticky tag has been assigned
-            sticky_tags_gen = itertools.chain(
-                sticky_tags.keys(),
-                self._infinite_cycle_gen(list(sticky_tags.items())),
-            )
-        else:
-            sticky_tags_gen = iter(sticky_tags.keys())
+        self._grizzly_weighted = len({self._worker_capacity(worker_node) for worker_node in self._worker_nodes}) > 1 or any(
+            self._user_class_cost.get(user_class_name, 1.0) != 1.0 for user_class_name in self._grizzly_target_user_count
+        )
 
         # map worker to sticky tag
         self._workers_to_sticky_tag.clear()
-        for worker, worker_sticky_tag in zip(self._worker_nodes, sticky_tags_gen, strict=False):
-            if worker_sticky_tag is None:
-                continue
-            self._workers_to_sticky_tag.update({worker: worker_sticky_tag})
+        if self._grizzly_weighted:
+            logger.debug('cost per sticky tag: %r', sticky_tag_cost)
+            self._workers_to_sticky_tag.update(self._grizzly_spread_sticky_tags_by_capacity(sticky_tag_cost))
+        else:
+            self._workers_to_sticky_tag.update(self._grizzly_spread_sticky_tags_by_user_count(sticky_tag_user_count))
 
         # map sticky tag to workers
         orig__sticky_tag_to_workers = self.__sticky_tag_to_workers.copy()
@@ -522,6 +602,150 @@ class FixedUsersDispatcher(UsersDispatcher):
             else:
                 del self._sticky_tag_to_workers[sticky_tag]
 
+        self._worker_load.clear()
+        self._worker_heap_index.clear()
+        self._sticky_tag_to_worker_heap.clear()
+        if self._grizzly_weighted:
+            for sticky_tag in self.__sticky_tag_to_workers:
+                self._grizzly_create_worker_heap(sticky_tag, self._users_on_workers)
+
+    def _grizzly_spread_sticky_tags_by_user_count(self, sticky_tag_user_count: dict[str, int]) -> Iterator[tuple[WorkerNode, str]]:
+        """Assign workers to sticky tags, based on number of users with the sticky tag."""
+        worker_node_count = len(self._worker_nodes)
+        # sort sticky tags based on number of users (more user types should have more workers)
+        sticky_tags: dict[str, int] = dict(sorted(sticky_tag_user_count.items(), key=itemgetter(1), reverse=True))
+        sticky_tag_count = len(sticky_tag_user_count)
+
+        # not enough sticky tags per worker, so cycle sticky tags so all workers gets a tag
+        sticky_tags_gen: Iterator[str | None]
+        if worker_node_count > sticky_tag_count:
+            # make sure each tag get at least one worker, then spread the remaining based on how many users that sticky tag has been assigned
+            sticky_tags_gen = itertools.chain(
+                sticky_tags.keys(),
+                self._infinite_cycle_gen(list(sticky_tags.items())),
+            )
+        else:
+            sticky_tags_gen = iter(sticky_tags.keys())
+
+        for worker, worker_sticky_tag in zip(self._worker_nodes, sticky_tags_gen, strict=False):
+            if worker_sticky_tag is None:
+                continue
+
+            yield worker, worker_sticky_tag
+
+    def _grizzly_spread_sticky_tags_by_capacity(self, sticky_tag_cost: dict[str, float]) -> Iterator[tuple[WorkerNode, str]]:
+        """Assign workers to sticky tags, in order of worker capacity, largest first.
+
+        Each sticky tag, in order of cost, gets one worker, and then each of the remaining workers is assigned to the sticky tag with the
+        highest cost per capacity assigned to it so far.
+        """
+        worker_nodes = sorted(self._worker_nodes, key=self._worker_capacity, reverse=True)
+        sticky_tags = [sticky_tag for sticky_tag, _ in sorted(sticky_tag_cost.items(), key=itemgetter(1), reverse=True)]
+        sticky_tag_capacity = dict.fromkeys(sticky_tags, 0.0)
+
+        for index, worker_node in enumerate(worker_nodes):
+            sticky_tag = sticky_tags[index] if index < len(sticky_tags) else max(sticky_tags, key=lambda sticky_tag: sticky_tag_cost[sticky_tag] / sticky_tag_capacity[sticky_tag])
+
+            sticky_tag_capacity[sticky_tag] += self._worker_capacity(worker_node)
+
+            yield worker_node, sticky_tag
+
+    def _grizzly_create_worker_heap(self, sticky_tag: str, users_on_workers: dict[str, dict[str, int]]) -> None:
+        """Create a heap of the workers of the sticky tag, ordered by the cost of the users on the worker per capacity."""
+        heap: list[tuple[float, int, WorkerNode]] = []
+
+        for index, worker_node in enumerate(self.__sticky_tag_to_workers.get(sticky_tag, [])):
+            load = sum(count * self._user_class_cost.get(user_class_name, 1.0) for user_class_name, count in users_on_workers.get(worker_node.id, {}).items())
+            self._worker_load[worker_node.id] = load
+            self._worker_heap_index[worker_node.id] = index
+            heap.append((load / self._worker_capacity(worker_node), index, worker_node))
+
+        heapify(heap)
+        self._sticky_tag_to_worker_heap[sticky_tag] = heap
+
+    def _grizzly_least_loaded_worker(self, sticky_tag: str, user_class_name: str, skip: Collection[str] = ()) -> WorkerNode:
+        """Get the worker of the sticky tag with the lowest cost per capacity, that is not in `skip`, and add the cost of the user to it."""
+        heap = self._sticky_tag_to_worker_heap[sticky_tag]
+        skipped: list[tuple[float, int, WorkerNode]] = []
+
+        while True:
+            relative_load, index, worker_node = heap[0]
+            capacity = self._worker_capacity(worker_node)
+            load = self._worker_load[worker_node.id]
+
+            if relative_load != load / capacity:
+                # outdated entry, users has been removed from the worker since it was added
+                heappop(heap)
+            elif worker_node.id in skip:
+                skipped.append(heappop(heap))
+            else:
+                break
+
+        load += self._user_class_cost.get(user_class_name, 1.0)
+        self._worker_load[worker_node.id] = load
+        heapreplace(heap, (load / capacity, index, worker_node))
+
+        for entry in skipped:
+            heappush(heap, entry)
+
+        return worker_node
+
+    def _grizzly_saturated_workers(self) -> set[str]:
+        """Get the workers that should not get any new users in this dispatch iteration, if adaptive spawning is enabled.
+
+        A `generator_saturation` event is fired for each worker that is saturated.
+        """
+        if self.max_cpu_usage is None:
+            return set()
+
+        now = perf_counter()
+        timestamp = datetime.now(timezone.utc).isoformat()
+        saturated_workers: set[str] = set()
+
+        for worker_node in self._worker_nodes:
+            heartbeat_lag = max(HEARTBEAT_LIVENESS - worker_node.heartbeat, 0)
+
+            if worker_node.cpu_usage < self.max_cpu_usage and heartbeat_lag < self.max_heartbeat_lag:
+                if self._saturated_since.pop(worker_node.id, None) is not None:
+                    logger.info('worker %s is no longer saturated, resuming dispatch of users to it', worker_node.id)
+                continue
+
+            if worker_node.id not in self._saturated_since:
+                self._saturated_since[worker_node.id] = now
+                logger.info('worker %s is saturated (cpu usage %d%%, %d missed heartbeats), pausing dispatch of users to it', worker_node.id, worker_node.cpu_usage, heartbeat_lag)
+
+            saturated_time = now - self._saturated_since[worker_node.id]
+            paused = saturated_time <= self.max_pause
+
+            if paused:
+                saturated_workers.add(worker_node.id)
+
+            grizzly_events.generator_saturation.fire(
+                timestamp=timestamp,
+                metrics={
+                    'cpu_usage': worker_node.cpu_usage,
+                    'heartbeat_lag': heartbeat_lag,
+                    'saturated_time': saturated_time,
+                    'paused': paused,
+                },
+                tags={'worker': worker_node.id},
+                measurement='generator_saturation',
+            )
+
+        return saturated_workers
+
+    def _grizzly_release_worker(self, worker_node: WorkerNode, user_class_name: str) -> None:
+        """Remove the cost of an user from the worker."""
+        sticky_tag = self._workers_to_sticky_tag.get(worker_node, None)
+        heap = self._sticky_tag_to_worker_heap.get(sticky_tag, None) if sticky_tag is not None else None
+
+        if heap is None or worker_node.id not in self._worker_load:
+            return
+
+        load = self._worker_load[worker_node.id] - self._user_class_cost.get(user_class_name, 1.0)
+        self._worker_load[worker_node.id] = load
+        heappush(heap, (load / self._worker_capacity(worker_node), self._worker_heap_index[worker_node.id], worker_node))
+
     def _create_user_generator(self) -> Generator[str | None, None, None]:
         user_cycle: list[tuple[type[GrizzlyUser] | str, int]] = [
             (self._user_class_name_to_type[user_class_name], fixed_count) for user_class_name, fixed_count in self._grizzly_target_user_count.items()
@@ -570,54 +794,322 @@ class FixedUsersDispatcher(UsersDispatcher):
     def _grizzly_distribute_users(
         self,
         target_user_count: dict[str, int],
-    ) -> tuple[dict[str, dict[str, int]], Generator[str | None, None, None], LengthOptimizedlist[tuple[WorkerNode, str]]]:
-        """Distribute users on available workers, and continue user cycle from there."""
-        # used target as setup based on user class values, without changing the original value
+    ) -> tuple[dict[str, dict[str, int]], LengthOptimizedlist[tuple[WorkerNode, str]]]:
+        """Distribute users on available workers, per sticky tag, by only moving the users needed to balance the workers.
 
+        The number of users to move from each worker is calculated from the number of users of the sticky tag, see
+        `_grizzly_round_robin_targets` and `_grizzly_trim_by_cost`, all users on workers that has been removed, or no longer has the sticky
+        tag of the user, are moved. The users are found in the active users, and moved in place to the workers of the tag that are below
+        their target. Users that are not running yet, i.e. `target_user_count` is larger than the number of running users, are added last.
+        """
+        # used target as setup based on user class values, without changing the original value
         if target_user_count == {}:
             target_user_count = {**self._grizzly_target_user_count}
 
         # _grizzly_distribute_users is only called from _prepare_rebalance, which already has called _spread_sticky_tags_on_workers
         # self._spread_sticky_tags_on_workers()  # noqa: ERA001
 
-        user_gen = self._create_user_generator()
+        users_on_workers = self._grizzly_kept_users()
 
-        users_on_workers = {worker_node.id: {user_class.__name__: 0 for user_class in self._original_user_classes} for worker_node in self._worker_nodes}
+        user_class_names_per_sticky_tag: dict[str, list[str]] = defaultdict(list)
+        for user_class_name in target_user_count:
+            user_class_names_per_sticky_tag[self._users_to_sticky_tag[user_class_name]].append(user_class_name)
+
+        # per worker and user class, or per worker (user class `None`) when the user classes to move are decided by the order of the
+        # active users
+        quotas: dict[tuple[str, str | None], MoveQuota] = {}
+        new_users: dict[str, int] = {}
+        user_class_share: dict[str, int] = {}
+        targets: dict[str, dict[str, int]] = {}
+        lost_users: set[tuple[str, str]] = set()
 
-        active_users: LengthOptimizedlist[tuple[WorkerNode, str]] = LengthOptimizedlist()
+        for sticky_tag, user_class_names in user_class_names_per_sticky_tag.items():
+            sticky_tag_targets = self._grizzly_plan_moves(sticky_tag, user_class_names, target_user_count, users_on_workers, quotas, new_users, user_class_share, lost_users)
+            if sticky_tag_targets is not None:
+                targets[sticky_tag] = sticky_tag_targets
+
+        active_users = self._active_users
+        moved_users = self._grizzly_find_moved_users(active_users, quotas, user_class_share, users_on_workers)
+
+        for sticky_tag, user_class_names in user_class_names_per_sticky_tag.items():
+            if len(self.__sticky_tag_to_workers.get(sticky_tag, [])) < 1:
+                continue
+
+            if self._grizzly_weighted:
+                self._grizzly_move_by_cost(sticky_tag, user_class_names, users_on_workers, active_users, moved_users, new_users)
+            else:
+                self._grizzly_move_round_robin(sticky_tag, user_class_names, targets[sticky_tag], user_class_share, users_on_workers, active_users, moved_users, new_users)
 
-        user_count_target = sum(target_user_count.values())
         current_user_count: dict[str, int] = {}
         for user_counts in users_on_workers.values():
             for user_class_name, count in user_counts.items():
                 current_user_count.update({user_class_name: current_user_count.get(user_class_name, 0) + count})
 
-        user_count_total = 0
+        self._grizzly_current_user_count = current_user_count
 
-        for next_user_class_name in user_gen:
-            if not next_user_class_name:
-                break
+        # users that are kept and moved users are included in the load of the workers
+        if self._grizzly_weighted:
+            for sticky_tag in self.__sticky_tag_to_workers:
+                self._grizzly_create_worker_heap(sticky_tag, users_on_workers)
 
-            if current_user_count[next_user_class_name] + 1 > target_user_count[next_user_class_name]:
-                continue
+        # users of a sticky tag without workers can not be moved anywhere
+        if lost_users:
+            active_users = LengthOptimizedlist(
+                [(worker_node, user_class_name) for worker_node, user_class_name in active_users if (worker_node.id, user_class_name) not in lost_users],
+            )
 
-            sticky_tag = self._users_to_sticky_tag[next_user_class_name]
-            worker_node = next(self._sticky_tag_to_workers[sticky_tag])
-            try:
-                users_on_workers[worker_node.id][next_user_class_name] += 1
-            except KeyError:
-                logger.error('worker %s is not available for tag %s', worker_node.id, sticky_tag)  # noqa: TRY400
+        return users_on_workers, active_users
+
+    def _grizzly_kept_users(self) -> dict[str, dict[str, int]]:
+        """Get the users that are running on a worker that still has the sticky tag of the user, they are kept on the worker."""
+        users_on_workers = {worker_node.id: {user_class.__name__: 0 for user_class in self._original_user_classes} for worker_node in self._worker_nodes}
+
+        for worker_node in self._worker_nodes:
+            worker_sticky_tag = self._workers_to_sticky_tag.get(worker_node, None)
+            for user_class_name, count in self._users_on_workers.get(worker_node.id, {}).items():
+                if count > 0 and self._users_to_sticky_tag.get(user_class_name, None) == worker_sticky_tag:
+                    users_on_workers[worker_node.id][user_class_name] = count
+
+        return users_on_workers
+
+    def _grizzly_plan_moves(
+        self,
+        sticky_tag: str,
+        user_class_names: list[str],
+        target_user_count: dict[str, int],
+        users_on_workers: dict[str, dict[str, int]],
+        quotas: dict[tuple[str, str | None], MoveQuota],
+        new_users: dict[str, int],
+        user_class_share: dict[str, int],
+        lost_users: set[tuple[str, str]],
+    ) -> dict[str, int] | None:
+        """Calculate how many users of a sticky tag that must be moved from each worker, and how many new users that must be added.
+
+        Returns the number of users each worker of the tag should run, if the users are spread round robin.
+        """
+        workers = self.__sticky_tag_to_workers.get(sticky_tag, [])
+        worker_ids = {worker_node.id for worker_node in workers}
+
+        if len(workers) < 1:
+            logger.error('no workers are available for tag %s', sticky_tag)
+
+        for user_class_name in user_class_names:
+            running = 0
+
+            for worker_id, user_counts in self._users_on_workers.items():
+                count = user_counts.get(user_class_name, 0)
+                running += count
+
+                if count < 1 or worker_id in worker_ids:
+                    continue
+
+                if len(workers) < 1:
+                    lost_users.add((worker_id, user_class_name))
+                else:
+                    quotas[(worker_id, user_class_name)] = MoveQuota(users=count, move=count)
+
+            new_users[user_class_name] = max(target_user_count[user_class_name] - running, 0) if len(workers) > 0 else 0
+            user_class_share[user_class_name] = target_user_count[user_class_name] // len(workers) if len(workers) > 0 else 0
+
+        if len(workers) < 1:
+            return None
+
+        if self._grizzly_weighted:
+            self._grizzly_trim_by_cost(sticky_tag, user_class_names, target_user_count, users_on_workers, quotas)
+            return None
+
+        targets = self._grizzly_round_robin_targets(workers, user_class_names, target_user_count, users_on_workers)
+
+        for worker_node in workers:
+            user_count = sum(users_on_workers[worker_node.id][user_class_name] for user_class_name in user_class_names)
+            if user_count > targets[worker_node.id]:
+                quotas[(worker_node.id, None)] = MoveQuota(users=user_count, move=user_count - targets[worker_node.id])
+
+        return targets
+
+    @staticmethod
+    def _grizzly_round_robin_targets(
+        workers: list[WorkerNode],
+        user_class_names: list[str],
+        target_user_count: dict[str, int],
+        users_on_workers: dict[str, dict[str, int]],
+    ) -> dict[str, int]:
+        """Calculate the number of users each worker of a sticky tag should run, an equal share of the users of the tag.
+
+        Users that are left over are kept by the workers that already run the most users of the tag.
+        """
+        user_counts = {worker_node.id: sum(users_on_workers[worker_node.id][user_class_name] for user_class_name in user_class_names) for worker_node in workers}
+        share, left_over = divmod(sum(target_user_count[user_class_name] for user_class_name in user_class_names), len(workers))
+
+        return {
+            worker_node.id: share + int(index < left_over) for index, worker_node in enumerate(sorted(workers, key=lambda worker_node: user_counts[worker_node.id], reverse=True))
+        }
+
+    def _grizzly_trim_by_cost(
+        self,
+        sticky_tag: str,
+        user_class_names: list[str],
+        target_user_count: dict[str, int],
+        users_on_workers: dict[str, dict[str, int]],
+        quotas: dict[tuple[str, str | None], MoveQuota],
+    ) -> None:
+        """Calculate the users to move from workers of a sticky tag with more than their share of the cost, most expensive users first.
+
+        The share of a worker is based on its capacity, and users are only moved from a worker as long as it still has at least its share.
+        """
+        workers = self.__sticky_tag_to_workers[sticky_tag]
+        user_class_names = sorted(user_class_names, key=lambda user_class_name: self._user_class_cost.get(user_class_name, 1.0), reverse=True)
+        total_cost = sum(target_user_count[user_class_name] * self._user_class_cost.get(user_class_name, 1.0) for user_class_name in user_class_names)
+        total_capacity = sum(self._worker_capacity(worker_node) for worker_node in workers)
+
+        for worker_node in workers:
+            share = total_cost * self._worker_capacity(worker_node) / total_capacity
+            user_counts = users_on_workers[worker_node.id]
+            load = sum(user_counts[user_class_name] * self._user_class_cost.get(user_class_name, 1.0) for user_class_name in user_class_names)
+
+            for user_class_name in user_class_names:
+                cost = self._user_class_cost.get(user_class_name, 1.0)
+                count = min(user_counts[user_class_name], int((load - share) // cost)) if load > share else 0
+
+                if count > 0:
+                    quotas[(worker_node.id, user_class_name)] = MoveQuota(users=user_counts[user_class_name], move=count)
+                    user_counts[user_class_name] -= count
+                    load -= count * cost
+
+    @staticmethod
+    def _grizzly_find_moved_users(
+        active_users: LengthOptimizedlist[tuple[WorkerNode, str]],
+        quotas: dict[tuple[str, str | None], MoveQuota],
+        user_class_share: dict[str, int],
+        users_on_workers: dict[str, dict[str, int]],
+    ) -> dict[str, list[int]]:
+        """Find the active users to move, as indexes in `active_users` per user class, searching from the last started user.
+
+        The users moved from a worker are spread evenly over the active users of the worker, so users are still stopped from all workers
+        when the number of users decreases. When only the number of users to move from a worker is known, users of user classes the
+        worker runs more of than its share of the user class are moved.
+        """
+        moved_users: dict[str, list[int]] = defaultdict(list)
+        remaining = sum(quota.move for quota in quotas.values())
+
+        index = len(active_users) - 1
+        while remaining > 0 and index >= 0:
+            worker_node, user_class_name = active_users[index]
+            index -= 1
+
+            user_counts: dict[str, int] | None = None
+            quota = quotas.get((worker_node.id, user_class_name), None)
+            if quota is None:
+                quota = quotas.get((worker_node.id, None), None)
+                user_counts = users_on_workers.get(worker_node.id, None)
+
+            if quota is None:
                 continue
 
-            user_count_total += 1
-            current_user_count[next_user_class_name] += 1
-            active_users.append((worker_node, next_user_class_name))
+            quota.seen += 1
 
-            if user_count_total >= user_count_target:
-                self._grizzly_current_user_count = current_user_count
-                break
+            # spread the moved users evenly over the users on the worker, but move all of them before the last user has been seen
+            due = (quota.seen * quota.move + quota.users // 2) // quota.users > quota.moved
+            forced = quota.move - quota.moved > quota.users - quota.seen
+
+            if forced or (due and (user_counts is None or user_counts[user_class_name] > user_class_share[user_class_name])):
+                quota.moved += 1
+                remaining -= 1
+                moved_users[user_class_name].append(index + 1)
 
-        return users_on_workers, user_gen, active_users
+                if user_counts is not None:
+                    user_counts[user_class_name] -= 1
+
+        return moved_users
+
+    def _grizzly_move_round_robin(
+        self,
+        sticky_tag: str,
+        user_class_names: list[str],
+        targets: dict[str, int],
+        user_class_share: dict[str, int],
+        users_on_workers: dict[str, dict[str, int]],
+        active_users: LengthOptimizedlist[tuple[WorkerNode, str]],
+        moved_users: dict[str, list[int]],
+        new_users: dict[str, int],
+    ) -> None:
+        """Move users of a sticky tag to the workers of the tag that are below their target.
+
+        Workers first get users of user classes they run fewer of than their share of the user class, the rest is moved one user of each
+        user class at the time, so the user classes stays spread over the workers.
+        """
+        workers = self.__sticky_tag_to_workers[sticky_tag]
+        available = {user_class_name: len(moved_users[user_class_name]) + new_users[user_class_name] for user_class_name in user_class_names}
+        moved = False
+        index = 0
+
+        for worker_node in workers:
+            user_counts = users_on_workers[worker_node.id]
+            deficit = targets[worker_node.id] - sum(user_counts[user_class_name] for user_class_name in user_class_names)
+
+            for user_class_name in user_class_names:
+                count = min(deficit, available[user_class_name], user_class_share[user_class_name] - user_counts[user_class_name])
+
+                for _ in range(count):
+                    self._grizzly_move_user(worker_node, user_class_name, users_on_workers, active_users, moved_users, new_users)
+
+                if count > 0:
+                    available[user_class_name] -= count
+                    deficit -= count
+                    moved = True
+
+            # continue with the user class after the one the previous worker got last
+            while deficit > 0 and any(count > 0 for count in available.values()):
+                user_class_name = user_class_names[index % len(user_class_names)]
+                index += 1
+
+                if available[user_class_name] > 0:
+                    self._grizzly_move_user(worker_node, user_class_name, users_on_workers, active_users, moved_users, new_users)
+                    available[user_class_name] -= 1
+                    deficit -= 1
+                    moved = True
+
+        if moved:
+            # next user of the sticky tag should be dispatched to the worker with the fewest users of the tag
+            self._sticky_tag_to_workers[sticky_tag] = itertools.cycle(
+                sorted(workers, key=lambda worker_node: sum(users_on_workers[worker_node.id][user_class_name] for user_class_name in user_class_names)),
+            )
+
+    def _grizzly_move_by_cost(
+        self,
+        sticky_tag: str,
+        user_class_names: list[str],
+        users_on_workers: dict[str, dict[str, int]],
+        active_users: LengthOptimizedlist[tuple[WorkerNode, str]],
+        moved_users: dict[str, list[int]],
+        new_users: dict[str, int],
+    ) -> None:
+        """Move users of a sticky tag to the workers of the tag with the lowest cost per capacity, most expensive users first."""
+        self._grizzly_create_worker_heap(sticky_tag, users_on_workers)
+
+        for user_class_name in sorted(user_class_names, key=lambda user_class_name: self._user_class_cost.get(user_class_name, 1.0), reverse=True):
+            for _ in range(len(moved_users[user_class_name]) + new_users[user_class_name]):
+                worker_node = self._grizzly_least_loaded_worker(sticky_tag, user_class_name)
+                self._grizzly_move_user(worker_node, user_class_name, users_on_workers, active_users, moved_users, new_users)
+
+    @staticmethod
+    def _grizzly_move_user(
+        worker_node: WorkerNode,
+        user_class_name: str,
+        users_on_workers: dict[str, dict[str, int]],
+        active_users: LengthOptimizedlist[tuple[WorkerNode, str]],
+        moved_users: dict[str, list[int]],
+        new_users: dict[str, int],
+    ) -> None:
+        """Move an user of an user class to `worker_node`, a running user is updated in place if there are any left, otherwise a new user is added."""
+        users_on_workers[worker_node.id][user_class_name] += 1
+        user_class_moved_users = moved_users[user_class_name]
+
+        if len(user_class_moved_users) > 0:
+            active_users[user_class_moved_users.pop()] = (worker_node, user_class_name)
+        else:
+            new_users[user_class_name] -= 1
+            active_users.append((worker_node, user_class_name))
 
 
 def greenlet_exception_logger(logger: logging.Logger, level: int = logging.CRITICAL) -> Callable[[gevent.Greenlet], None]:
@@ -711,6 +1203,8 @@ def setup_locust_scenarios(grizzly: GrizzlyContext) -> tuple[list[type[GrizzlyUs
             if task_dependencies is not None:
                 dependencies.update(task_dependencies)
 
+        compile_request_plans(scenario.tasks, identifier=scenario.identifier, context_root=Path(environ.get('GRIZZLY_CONTEXT_ROOT', '.')))
+
         logger.debug(
             '%s/%s: tasks=%d, weight=%d, fixed_count=%d, sticky_tag=%s',
             user_class_type.__name__,
@@ -764,12 +1258,14 @@ def setup_environment_listeners(context: Context, *, dependencies: GrizzlyDepend
     if not on_worker(context):
         validate_results = False
 
-        # only add the listener if there are any rules for validating results
+        # only add the listener if there are any rules for validating results, or workers should be checked for saturation
         for scenario in grizzly.scenarios():
             validate_results = scenario.should_validate()
             if validate_results:
                 break
 
+        validate_results = validate_results or grizzly.setup.max_worker_saturation is not None
+
         logger.debug('validate_results=%r', validate_results)
 
         if validate_results:
@@ -1067,6 +1563,12 @@ def run(context: Context) -> int:  # noqa: C901, PLR0915, PLR0912
     user_classes, scenario_dependencies = setup_locust_scenarios(grizzly)
     dependencies.update(scenario_dependencies)
 
+    # And cache request files matching
+    if not on_master(context) and len(grizzly.setup.cache_request_files) > 0:
+        requests_root = Path(environ.get('GRIZZLY_CONTEXT_ROOT', '.')) / 'requests'
+        count = file_cache.warm(path for pattern in grizzly.setup.cache_request_files for path in requests_root.glob(pattern))
+        logger.info('cached %d request files, %d bytes', count, file_cache.size)
+
     assert len(user_classes) > 0, 'no users specified in feature'
 
     try:
@@ -1076,12 +1578,19 @@ def run(context: Context) -> int:  # noqa: C901, PLR0915, PLR0912
 
         spawn_rate = cast('float', grizzly.setup.spawn_rate)
 
+        dispatcher_class = grizzly.setup.dispatcher_class
+        if grizzly.setup.spawn_max_cpu_usage is not None:
+            if dispatcher_class is FixedUsersDispatcher:
+                dispatcher_class = FixedUsersDispatcher.adaptive(grizzly.setup.spawn_max_cpu_usage)
+            else:
+                logger.warning('adaptive spawn rate is only supported with a fixed number of users per scenario, ignoring')
+
         environment = Environment(
             user_classes=cast('list[type[User]]', user_classes),
             shape_class=None,
             events=events,
             stop_timeout=300,  # only wait at most?
-            dispatcher_class=grizzly.setup.dispatcher_class,
+            dispatcher_class=dispatcher_class,
             parsed_options=LocustOption(
                 headless=True,
                 num_users=grizzly.setup.user_count or 0,
@@ -1265,7 +1774,7 @@ def run(context: Context) -> int:  # noqa: C901, PLR0915, PLR0912
                 if running_test is not None:
                     running_test.kill(block=False)
 
-                grizzly_print_percentile_stats(runner.stats)
+                grizzly_print_percentile_stats(runner.stats, histograms=grizzly.state.histograms)
                 grizzly_print_stats(runner.stats, current=False)
                 lstats.print_error_report(runner.stats)
                 print_scenario_summary(grizzly)
@@ -1391,7 +1900,14 @@ def grizzly_print_stats(stats: lstats.RequestStats, *, current: bool = True, gri
     stats_logger.info('')
 
 
-def grizzly_print_percentile_stats(stats: lstats.RequestStats, *, grizzly_style: bool = True) -> None:
+def grizzly_print_percentile_stats(stats: lstats.RequestStats, *, grizzly_style: bool = True, histograms: HistogramStats | None = None) -> None:
+    if histograms is not None:
+        histogram_keys = [(name, method) for name, method, _ in _grizzly_sort_stats(stats)] if grizzly_style else sorted(stats.entries.keys())
+        for line in histograms.get_percentile_stats_summary(histogram_keys, stats.total.name):
+            stats_logger.info(line)
+        stats_logger.info('')
+        return
+
     if not grizzly_style:
         lstats.print_percentile_stats(stats)
         return
@@ -7,7 +7,6 @@ See [Iterations][grizzly.steps.scenario.setup.step_setup_iterations].
 from __future__ import annotations
 
 from contextlib import suppress
-from json import dumps as jsondumps
 from math import ceil
 from random import uniform
 from time import perf_counter
@@ -15,6 +14,7 @@ from typing import TYPE_CHECKING, Any, ClassVar
 
 from gevent import sleep as gsleep
 from gevent.exceptions import GreenletExit
+from grizzly_common.codec import json_encode
 from locust import task
 from locust.exception import InterruptTaskSet, RescheduleTask, RescheduleTaskImmediately
 from locust.user.task import LOCUST_STATE_RUNNING, LOCUST_STATE_STOPPING
@@ -342,7 +342,7 @@ class IteratorScenario(GrizzlyScenario):
             request_type=RequestType.TESTDATA(),
             name=self.user._scenario.locust_name,
             response_time=response_time,
-            response_length=len(jsondumps(remote_context).encode('utf-8')),
+            response_length=len(json_encode(remote_context)),
             context=self.user._context,
             exception=None,
         )
@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import logging
 import re
+from contextlib import suppress
 from errno import ENAMETOOLONG
 from pathlib import Path
 from typing import TYPE_CHECKING, cast
@@ -222,8 +223,18 @@ def _add_response_handler(
 
     if target == ResponseTarget.METADATA:
         add_listener = request.response.handlers.add_metadata
+        content_type = TransformerContentType.JSON
     elif target == ResponseTarget.PAYLOAD:
         add_listener = request.response.handlers.add_payload
+        content_type = request.response.content_type
+
+    # compile expressions without templates once, invalid expressions are reported when the response is handled
+    for expression_content_type, value in [(content_type, expression), (TransformerContentType.PLAIN, match_with)]:
+        if has_template(value):
+            continue
+
+        with suppress(TypeError, ValueError):
+            grizzly.scenario.parser(expression_content_type, value)
 
     add_listener(handler)
 
@@ -9,6 +9,7 @@ from urllib.parse import urlparse
 import parse
 from grizzly_common.text import permutation
 
+from grizzly.listeners.sink import metrics_sinks
 from grizzly.testdata.utils import resolve_variable
 from grizzly.types import MessageDirection
 from grizzly.types.behave import Context, given, register_type
@@ -40,8 +41,28 @@ def step_setup_save_statistics(context: Context, url: str) -> None:
     ```plain
     influxdb://[<username>:<password>@]<hostname>[:<port>]/<database>?TargetEnviroment=<target environment>[&Testplan=<test plan>]
     [&TargetEnvironment=<target environment>][&ProfileName=<profile name>][&Description=<description>]
+    [&MaxBatchSize=<points per write>][&MaxQueueSize=<max queued points>][&Overflow=drop|spill][&AggregationInterval=<seconds>]
     ```
 
+    Metrics are written to InfluxDB in batches of at most `MaxBatchSize` (default `5000`) points. If InfluxDB can not keep up,
+    at most `MaxQueueSize` (default `100000`) points are kept in memory, and the oldest points are dropped. With `Overflow=spill`
+    the points above `MaxQueueSize` are instead moved to a journal in `logs/metrics-journal`, by the greenlet that writes to
+    InfluxDB, and the journal is replayed when InfluxDB has caught up. Journal
+    segments that are left after the test can be replayed with `grizzly-cli replay`.
+
+    With `AggregationInterval` each worker aggregates requests per name, method and result, and writes one point per interval
+    to the `request_aggregate` measurement, with count, sum, min, max and response time percentiles, instead of one point per
+    request.
+
+    To write metrics to local files instead, e.g. to run without a database and analyse the metrics afterwards, the following
+    format **must** be used, see `grizzly.listeners.sink.MetricsFileSink`:
+
+    ```plain
+    file://<path>?Testplan=<test plan>[&Format=lp|arrow|parquet][&TargetEnvironment=<target environment>]...
+    ```
+
+    Other sinks can be registered with `grizzly.listeners.sink.register_metrics_sink`.
+
     For Azure Application Insights the following format **must** be used:
 
     ```plain
@@ -55,6 +76,7 @@ def step_setup_save_statistics(context: Context, url: str) -> None:
     And save statistics to "insights://?IngestionEndpoint=https://insights.example.com&Testplan=grizzly-statistics&InstrumentationKey=asdfasdfasdf="
     And save statistics to "insights://insights.example.com/?Testplan=grizzly-statistics&InstrumentationKey=asdfasdfasdf="
     And save statistics to "influxdb://$conf::statistics.username$:$conf::statistics.password$@influx.example.com/$conf::statistics.database$"
+    And save statistics to "file://logs/metrics?Testplan=grizzly-statistics&Format=parquet"
     ```
 
     Args:
@@ -65,7 +87,7 @@ def step_setup_save_statistics(context: Context, url: str) -> None:
     url = cast('str', resolve_variable(grizzly.scenario, url))
     parsed = urlparse(url)
 
-    assert parsed.scheme in ['influxdb', 'influxdb2', 'insights'], f'"{parsed.scheme}" is not a supported scheme'
+    assert parsed.scheme in [*metrics_sinks.keys(), 'insights'], f'"{parsed.scheme}" is not a supported scheme'
 
     grizzly.setup.statistics_url = url
 
@@ -220,3 +242,77 @@ def step_setup_wait_spawning_complete_indefinitely(context: Context) -> None:
     """
     grizzly = cast('GrizzlyContext', context.grizzly)
     grizzly.setup.wait_for_spawning_complete = -1
+
+
+@given('cache request files matching "{pattern}"')
+def step_setup_cache_request_files(context: Context, pattern: str) -> None:
+    """Read request files into the file cache before the test starts.
+
+    Request files (e.g. payload templates) are read through a process-wide cache, where the contents of a file are
+    read again only if the file has changed. Files that are used by requests with a static source are cached when
+    the scenario is built. This step makes it possible to also cache files that are selected at run time, e.g. with
+    a variable.
+
+    Example:
+    ```gherkin
+    Given cache request files matching "payloads/*.j2.json"
+    And cache request files matching "**/*.xml"
+    ```
+
+    Args:
+        pattern (str): glob pattern, relative to `requests/`, of files that should be cached
+
+    """
+    grizzly = cast('GrizzlyContext', context.grizzly)
+    grizzly.setup.cache_request_files.append(pattern)
+
+
+@given('warn if a worker is saturated more than "{value}" percent of the test')
+def step_setup_max_worker_saturation(context: Context, value: str) -> None:
+    """Monitor if workers are saturated, and set how large part of the test a worker can be saturated before a warning is logged.
+
+    A worker is saturated when it is too busy to keep up, e.g. its event loop is lagging or it is using all of its CPU. Response times
+    measured while a worker is saturated might be affected by the worker and not only by the system under test. The workers are only
+    monitored if this step is used, and the saturation of each worker is printed together with the results of the test. See
+    `grizzly.listeners.saturation`.
+
+    Example:
+    ```gherkin
+    And warn if a worker is saturated more than "5" percent of the test
+    ```
+
+    Args:
+        value (str): percent of the test that a worker can be saturated
+
+    """
+    grizzly = cast('GrizzlyContext', context.grizzly)
+
+    try:
+        max_worker_saturation = float(resolve_variable(grizzly.scenario, value))
+    except ValueError as e:
+        message = f'"{value}" is not a valid number'
+        raise AssertionError(message) from e
+
+    assert 0.0 <= max_worker_saturation <= 100.0, f'{value} resolved to {max_worker_saturation} percent, which is not valid'
+
+    grizzly.setup.max_worker_saturation = max_worker_saturation
+
+
+@given('calculate response time percentiles with histograms')
+def step_setup_response_time_histograms(context: Context) -> None:
+    """Calculate response time percentiles from histograms with fixed memory usage, instead of from locust response times.
+
+    Locust saves response times, rounded, per request, and all of them are sent from the workers to the master. For long tests with
+    many request names this uses a lot of memory, and it takes time to aggregate the response times per scenario on the master. With
+    this step response times are also counted in histograms with 1% relative accuracy, which has a fixed size and are fast to merge.
+    Response time percentiles validated for a scenario and printed when the test is done are then calculated from the histograms.
+    See `grizzly.listeners.stats`.
+
+    Example:
+    ```gherkin
+    And calculate response time percentiles with histograms
+    ```
+
+    """
+    grizzly = cast('GrizzlyContext', context.grizzly)
+    grizzly.setup.response_time_histograms = True
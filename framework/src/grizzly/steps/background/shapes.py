@@ -94,3 +94,36 @@ def step_shapes_spawn_rate(context: Context, value: str, **_kwargs: Any) -> None
         assert int(spawn_rate) <= grizzly.setup.user_count, 'spawn rate cannot be greater than user count'
 
     grizzly.setup.spawn_rate = spawn_rate
+
+
+@given('spawn rate is adaptive, with max "{value}" percent CPU usage on workers')
+def step_shapes_spawn_rate_adaptive(context: Context, value: str) -> None:
+    """Pause spawning of users on workers that are too busy, so that response times measure the system under test and not the load generator.
+
+    A worker is too busy if its CPU usage is above `value` percent, or if it is late with sending heartbeats to the master. No new users
+    are dispatched to the worker until it is no longer busy, but at most for 60 seconds. Each time a busy worker is detected, a
+    `generator_saturation` event is reported (see [InfluxDB listener][grizzly.listeners.influxdb]).
+
+    Only supported together with a fixed number of users per scenario, see [user][grizzly.steps.scenario.user] steps.
+
+    Example:
+    ```gherkin
+    And spawn rate is "10" users per second
+    And spawn rate is adaptive, with max "90" percent CPU usage on workers
+    ```
+
+    Args:
+        value (str): CPU usage, in percent, of a worker above which no new users are dispatched to it
+
+    """
+    grizzly = cast('GrizzlyContext', context.grizzly)
+
+    try:
+        max_cpu_usage = float(resolve_variable(grizzly.scenario, value))
+    except ValueError as e:
+        message = f'"{value}" is not a valid number'
+        raise AssertionError(message) from e
+
+    assert 0.0 < max_cpu_usage <= 100.0, f'{value} resolved to {max_cpu_usage} percent, which is not valid'
+
+    grizzly.setup.spawn_max_cpu_usage = max_cpu_usage
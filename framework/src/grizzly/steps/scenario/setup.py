@@ -121,6 +121,40 @@ def step_setup_iteration_pace(context: Context, pace_time: str) -> None:
     grizzly.scenario.pace = pace_time
 
 
+@given('fetch testdata in batches of "{size}" iterations')
+def step_setup_testdata_batch_size(context: Context, size: str) -> None:
+    """Set how many iterations of testdata a worker should request from the master in one round trip.
+
+    By default each iteration of the scenario does one round trip to the master to get testdata. With a batch
+    size larger than `1`, the testdata consumer on the worker will keep a local buffer of iterations, shared by all
+    users of the scenario on that worker, which is refilled in the background when it is running low.
+
+    Iteration counting is still done by the master, but iterations that has been buffered on a worker when the test
+    is stopped will not be executed.
+
+    Example:
+    ```gherkin
+    And fetch testdata in batches of "50" iterations
+    And fetch testdata in batches of "$conf::test.testdata.batch_size$" iterations
+    ```
+
+    Args:
+        size (str): number of iterations of testdata per request, can be a environment configuration variable
+
+    """
+    grizzly = cast('GrizzlyContext', context.grizzly)
+
+    try:
+        batch_size = int(resolve_variable(grizzly.scenario, size))
+    except ValueError as e:
+        message = f'"{size}" is not a valid number'
+        raise AssertionError(message) from e
+
+    assert batch_size > 0, 'batch size must be greater than 0'
+
+    grizzly.scenario.testdata_batch_size = batch_size
+
+
 @given('set alias "{alias}" for variable "{variable}"')
 def step_setup_set_variable_alias(context: Context, alias: str, variable: str) -> None:
     """Create an alias for a variable that points to another structure in the context.
@@ -158,9 +192,21 @@ def step_setup_log_all_requests(context: Context) -> None:
 
     By default only failed requests (and responses) will be logged.
 
+    Requests are logged in the background, by default to one file per request. To append to rotating segment files
+    instead, set context variable `request_log.format` to `segment` (text) or `jsonl` (one JSON object per request).
+    Context variable `request_log.error_interval` limits how often identical errors are logged, see `grizzly.events.RequestLogger`.
+
+    To keep logging all requests usable under load, successful requests can be sampled per request name with context variables
+    `request_log.sample_rate` (every N:th request), `request_log.max_per_second` or `request_log.reservoir` (random sample of N
+    requests, logged when the test stops). Large payloads can be truncated with `request_log.max_payload_size`.
+
     Example:
     ```gherkin
     And log all requests
+    And set context variable "request_log.format" to "jsonl"
+    And set context variable "request_log.error_interval" to "5"
+    And set context variable "request_log.max_per_second" to "10"
+    And set context variable "request_log.max_payload_size" to "4096"
     ```
 
     """
@@ -139,3 +139,37 @@ def step_user_type(context: Context, user_class_name: str, host: str) -> None:
 
     """
     _setup_user(context, user_class_name, host)
+
+
+@given('user cost is "{cost}"')
+def step_user_cost(context: Context, cost: str) -> None:
+    """Set the relative cost, e.g. CPU usage, of one user in the scenario compared to other users.
+
+    Only used by the fixed user count dispatcher, where users are placed on the worker with the lowest cost per capacity, so that
+    heavy users (e.g. `IotHub` or `ServiceBus`) are not packed on the same worker as many light users. Default cost is `1`.
+
+    Each worker reports its capacity to the master when it connects, which is the number of CPUs available to the worker process,
+    unless overridden by environment variable `GRIZZLY_WORKER_CAPACITY`. If all users have the same cost and all workers the same
+    capacity, users are spread evenly on the workers.
+
+    Example:
+    ```gherkin
+    Given "10" users of type "ServiceBus" with tag "bar" load testing "..."
+    And user cost is "4"
+    ```
+
+    Args:
+        cost (float): relative cost of one user in the scenario, can be an environment configuration variable
+
+    """
+    grizzly = cast('GrizzlyContext', context.grizzly)
+
+    try:
+        cost_value = float(resolve_variable(grizzly.scenario, cost))
+    except ValueError as e:
+        message = f'"{cost}" is not a valid number'
+        raise AssertionError(message) from e
+
+    assert cost_value > 0, f'user cost {cost} resolved to {cost_value}, which is not valid'
+
+    grizzly.scenario.user.cost = cost_value
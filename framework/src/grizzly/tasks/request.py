@@ -56,22 +56,35 @@ Then put request "test/request.j2.json" with name "test-put" to endpoint "/api/t
 And set response content type to "application/json"
 ```
 
+## Request plan
+
+When the scenario is built, each request gets a plan where all values without templates are resolved, e.g. a `source` that is a file
+without templates is only read once. Only values that contains templates are rendered when the request is executed.
+
 """  # noqa: E501
 
 from __future__ import annotations
 
+from errno import ENAMETOOLONG
+from itertools import chain
 from typing import TYPE_CHECKING, Any
 
 from grizzly_common.arguments import parse_arguments, split_value, unquote
 from grizzly_common.text import has_separator
 from grizzly_common.transformer import TransformerContentType
 
+from grizzly.utils import file_cache
+
 from . import GrizzlyMetaRequestTask, grizzlytask
 from . import template as task_template
 
 if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterable
+    from pathlib import Path
+
     from grizzly.events.response_handler import ResponseHandlerAction
     from grizzly.scenarios import GrizzlyScenario
+    from grizzly.tasks import GrizzlyTask
     from grizzly.types import GrizzlyResponse, RequestMethod
 
 
@@ -110,6 +123,107 @@ class RequestTaskResponse:
                 self.status_codes.pop(index)
 
 
+def has_request_template(text: str) -> bool:
+    """Check if given text contains any jinja2 templates, i.e. expressions, statements or comments.
+
+    `grizzly.utils.has_template` only checks for expressions, a value with only statements or comments would then be sent without
+    being rendered if it was planned as static.
+    """
+    return any(start in text and end in text for start, end in (('{{', '}}'), ('{%', '%}'), ('{#', '#}')))
+
+
+def read_request_source(context_root: Path, source: str) -> str | None:
+    """Read contents of source, if it is a file in `requests/`, through the process-wide file cache."""
+    try:
+        return file_cache.read_text(context_root / 'requests' / source)
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError, ValueError):
+        pass
+    except OSError as e:  # source was definitly not a file...
+        if e.errno != ENAMETOOLONG:
+            raise
+
+    return None
+
+
+class RequestTaskPlan:
+    """Values of a request task that are resolved once, so only values with templates has to be rendered for each request."""
+
+    identifier: str
+    name: str
+    endpoint: str
+    source: str | None
+    arguments: dict[str, str] | None
+
+    render_name: bool
+    render_endpoint: bool
+    render_source: bool
+    resolve_source: bool
+    render_arguments: bool
+
+    _key: tuple[str, str, str | None, dict[str, str] | None]
+
+    def __init__(self, request: RequestTask, *, identifier: str, context_root: Path) -> None:
+        self.identifier = identifier
+        self._key = (request.name, request.endpoint, request.source, dict(request.arguments) if request.arguments is not None else None)
+
+        self.render_name = has_request_template(request.name)
+        self.name = request.name if self.render_name else f'{identifier} {request.name}'
+
+        self.render_endpoint = has_request_template(request.endpoint)
+        self.endpoint = request.endpoint
+
+        source = request.source
+        self.render_source = False
+        self.resolve_source = False
+
+        if source is not None:
+            if has_request_template(source):
+                # rendered source might be a file
+                self.render_source = self.resolve_source = True
+            else:
+                content = read_request_source(context_root, source)
+
+                if content is not None:
+                    source = content
+                    self.render_source = has_request_template(source)
+
+        self.source = source
+
+        arguments = request.arguments
+        self.render_arguments = arguments is not None and any(has_request_template(value) for value in chain(arguments.keys(), arguments.values()))
+        self.arguments = dict(arguments) if arguments is not None else None
+
+    def matches(self, request: RequestTask, identifier: str) -> bool:
+        """Check if plan is still valid for request, e.g. that the request has not been changed after the plan was created."""
+        return self.identifier == identifier and self._key == (request.name, request.endpoint, request.source, request.arguments)
+
+
+def compile_request_plans(tasks: Iterable[GrizzlyTask], *, identifier: str, context_root: Path) -> int:
+    """Create request plans for all request tasks, also those wrapped in other tasks."""
+    count = 0
+
+    for task in tasks:
+        if isinstance(task, RequestTask):
+            task.get_plan(identifier, context_root)
+            count += 1
+            continue
+
+        nested_tasks = getattr(task, 'tasks', None)
+
+        if isinstance(nested_tasks, dict):
+            nested_tasks = list(chain.from_iterable(nested_tasks.values()))
+
+        if isinstance(nested_tasks, list):
+            count += compile_request_plans(nested_tasks, identifier=identifier, context_root=context_root)
+
+        nested_request = getattr(task, 'request', None)
+
+        if nested_request is not None:
+            count += compile_request_plans([nested_request], identifier=identifier, context_root=context_root)
+
+    return count
+
+
 @task_template('name', 'endpoint', 'source', 'arguments', 'metadata')
 class RequestTask(GrizzlyMetaRequestTask):
     __rendered__: bool
@@ -120,6 +234,7 @@ class RequestTask(GrizzlyMetaRequestTask):
     arguments: dict[str, str] | None
     metadata: dict[str, str]
     async_request: bool
+    plan: RequestTaskPlan | None
 
     response: RequestTaskResponse
 
@@ -135,6 +250,7 @@ class RequestTask(GrizzlyMetaRequestTask):
 
         self.response = RequestTaskResponse()
         self.__rendered__ = False
+        self.plan = None
 
         content_type: TransformerContentType = TransformerContentType.UNDEFINED
         timeout: float | None = None
@@ -172,6 +288,13 @@ class RequestTask(GrizzlyMetaRequestTask):
         """Add new metadata key value, where default value of metadata is None, it must be initialized as a dict."""
         self.metadata.update({key: value})
 
+    def get_plan(self, identifier: str, context_root: Path) -> RequestTaskPlan:
+        """Get request plan, a new plan is created if the request has changed since the plan was created."""
+        if self.plan is None or not self.plan.matches(self, identifier):
+            self.plan = RequestTaskPlan(self, identifier=identifier, context_root=context_root)
+
+        return self.plan
+
     def __call__(self) -> grizzlytask:
         @grizzlytask.metadata(timeout=self.timeout, method=self.method.name, name=self.name)
         @grizzlytask
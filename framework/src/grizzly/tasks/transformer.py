@@ -94,7 +94,7 @@ class TransformerTask(GrizzlyTask):
                 parser = self._transformer.parser(expression)
 
                 try:
-                    content = self._transformer.transform(content_raw)
+                    content = parent.user.transform(self.content_type, content_raw)
                 except TransformerError:
                     message = f'failed to transform {self.content_type.name}'
                     parent.logger.exception('%s: %s', message, content_raw)
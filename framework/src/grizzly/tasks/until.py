@@ -188,7 +188,8 @@ class UntilRequestTask(GrizzlyTask):
                         _, payload = self.request.execute(parent)
 
                         if payload is not None:
-                            transformed = transform.transform(payload)
+                            # shared with response handlers of the request, if any
+                            transformed = parent.user.transform(self.request.content_type, payload)
                             response_length += len(payload)
                         else:
                             message = 'response payload was not set'
@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import logging
 from abc import ABCMeta, abstractmethod
-from contextlib import suppress
+from collections import deque
+from contextlib import ExitStack, suppress
 from dataclasses import dataclass, field
 from datetime import datetime
 from json import dumps as jsondumps
@@ -16,8 +17,9 @@ from uuid import uuid4
 
 from dateutil.parser import parse as date_parser
 from gevent import sleep as gsleep
+from gevent import spawn as gspawn
 from gevent.event import AsyncResult
-from gevent.lock import Semaphore
+from gevent.lock import BoundedSemaphore, Semaphore
 
 from grizzly.events import GrizzlyEventDecoder, GrizzlyEvents, event, events
 from grizzly.types.locust import LocalRunner, MasterRunner, MessageHandler, StopUser, WorkerRunner
@@ -30,7 +32,7 @@ if TYPE_CHECKING:  # pragma: no cover
     from locust.event import EventHook
     from locust.rpc.protocol import Message
 
-    from grizzly.context import GrizzlyContext
+    from grizzly.context import GrizzlyContext, GrizzlyContextScenario
     from grizzly.scenarios import GrizzlyScenario
     from grizzly.types import StrDict, TestdataType
     from grizzly.types.locust import Environment
@@ -316,7 +318,7 @@ class TestdataConsumer:
     # need so pytest doesn't raise PytestCollectionWarning
     __test__: bool = False
 
-    _responses: ClassVar[dict[int, AsyncResult]] = {}
+    _responses: ClassVar[dict[str, AsyncResult]] = {}
 
     scenario: GrizzlyScenario
     runner: LocalRunner | WorkerRunner
@@ -326,8 +328,17 @@ class TestdataConsumer:
     response: StrDict
     events: GrizzlyEvents
     async_timers: AsyncTimersConsumer
+    batch_size: int
 
     semaphore = Semaphore()
+    window: BoundedSemaphore
+
+    max_in_flight: ClassVar[int] = 100
+    refill_threshold: ClassVar[float] = 0.5
+
+    _buffer: deque[StrDict]
+    _refill: AsyncResult | None
+    _exhausted: bool
 
     def __init__(self, runner: LocalRunner | WorkerRunner, scenario: GrizzlyScenario) -> None:
         self.runner = runner
@@ -341,24 +352,95 @@ class TestdataConsumer:
         self.logger.debug('started consumer')
 
         self.async_timers = AsyncTimersConsumer(scenario, self.semaphore)
+        self.window = BoundedSemaphore(self.max_in_flight)
+
+        self.batch_size = max(scenario.user._scenario.testdata_batch_size, 1)
+        self._buffer = deque()
+        self._refill = None
+        self._exhausted = False
 
     @classmethod
     def handle_response(cls, environment: Environment, msg: Message, **_kwargs: Any) -> None:  # noqa: ARG003
-        uid = msg.data['uid']
+        rid = msg.data['rid']
         response = msg.data['response']
 
-        cls._responses[uid].set(response)
+        result = cls._responses.get(rid, None)
+
+        # request has already timed out
+        if result is None:
+            logger.warning('received response for unknown request %s', rid)
+            return
+
+        result.set(response)
 
     @event(events.testdata_request, tags={'type': 'consumer'}, decoder=TestdataDecoder(arg='request'))
     def _testdata_request(self, *, request: StrDict) -> StrDict | None:
         return self._request({'message': 'testdata', **request})
 
+    @property
+    def low_water_mark(self) -> int:
+        return int(self.batch_size * self.refill_threshold)
+
+    def _refill_buffer(self, refill: AsyncResult) -> None:
+        """Request a batch of iterations from the producer and add them to the local buffer."""
+        try:
+            request = {
+                'identifier': self.identifier,
+                'size': self.batch_size,
+            }
+
+            response = self._testdata_request(request=request)
+
+            if response is not None and response['action'] == 'consume':
+                self._buffer.extend(response['data'])
+                self.logger.debug('buffered %d iterations of testdata', len(response['data']))
+            else:
+                # producer does not have any more iterations to give, no point in refilling in the background
+                self._exhausted = True
+
+            refill.set(response)
+        except Exception as e:
+            self.logger.exception('failed to refill testdata buffer')
+            refill.set_exception(e)
+        finally:
+            self._refill = None
+
+    def _start_refill(self) -> AsyncResult:
+        if self._refill is None:
+            self._refill = AsyncResult()
+            gspawn(self._refill_buffer, self._refill)
+
+        return self._refill
+
+    def _testdata_batched(self) -> StrDict | None:
+        """Get one iteration of testdata from the local buffer, all users of the scenario on this worker shares
+        the same buffer. If the buffer is empty, wait for it to be refilled. When the buffer reaches the low-water mark
+        it is refilled in the background.
+        """
+        while len(self._buffer) < 1:
+            # any user that has to wait for testdata should ask the producer, even if a background refill said stop
+            self._exhausted = False
+            response = cast('StrDict | None', self._start_refill().get())
+
+            if response is None or response['action'] != 'consume':
+                return response
+
+        data = self._buffer.popleft()
+
+        if len(self._buffer) <= self.low_water_mark and not self._exhausted:
+            self._start_refill()
+
+        return {'action': 'consume', 'data': data}
+
     def testdata(self) -> StrDict | None:
-        request = {
-            'identifier': self.identifier,
-        }
+        if self.batch_size > 1:
+            response = self._testdata_batched()
+        else:
+            request = {
+                'identifier': self.identifier,
+            }
 
-        response = self._testdata_request(request=request)
+            response = self._testdata_request(request=request)
 
         if response is None:
             self.logger.error('no testdata received')
@@ -500,22 +582,46 @@ class TestdataConsumer:
         return self._request({'message': 'keystore', **request})
 
     def _request(self, request: dict[str, str]) -> StrDict | None:
-        with self.semaphore:
-            uid = id(self.scenario.user)  # user id (unique instance)
-            rid = str(uuid4())  # request id
-
-            if uid in self._responses:
-                self.logger.warning('greenlet %d is already waiting for testdata', uid)
+        uid = id(self.scenario.user)  # user id (unique instance)
+        rid = str(uuid4())  # request id
 
-            self._responses.update({uid: AsyncResult()})
-            self.runner.send_message('produce_testdata', {'uid': uid, 'cid': self.runner.client_id, 'rid': rid, 'request': request})
+        # responses are matched on request id, so many requests can be in flight at the same time,
+        # but not more than the window allows
+        with self.window:
+            result = AsyncResult()
+            self._responses.update({rid: result})
 
-            # waits for async result
             try:
-                return cast('StrDict | None', self._responses[uid].get(timeout=10.0))
+                self.runner.send_message('produce_testdata', {'uid': uid, 'cid': self.runner.client_id, 'rid': rid, 'request': request})
+
+                # waits for async result
+                return cast('StrDict | None', result.get(timeout=10.0))
             finally:
                 # remove request as pending
-                del self._responses[uid]
+                del self._responses[rid]
+
+
+@dataclass(frozen=True)
+class TestdataVariablePlanStep:
+    # need so pytest doesn't raise PytestCollectionWarning
+    __test__: ClassVar[bool] = False
+
+    key: str
+    variable: Any
+    variable_name: str | None = field(default=None)
+    testdata_type: str | None = field(default=None)
+    attribute: str | None = field(default=None)
+    alias: str | None = field(default=None)
+
+
+@dataclass(frozen=True)
+class TestdataVariablePlan:
+    # need so pytest doesn't raise PytestCollectionWarning
+    __test__: ClassVar[bool] = False
+
+    scenario: GrizzlyContextScenario | None
+    steps: list[TestdataVariablePlanStep]
+    locks: list[Semaphore]
 
 
 class TestdataProducer:
@@ -527,7 +633,8 @@ class TestdataProducer:
 
     logger: logging.Logger
     semaphore: ClassVar[Semaphore] = Semaphore()
-    semaphores: ClassVar[dict[str, Semaphore]] = {}
+    variable_semaphores: dict[int, Semaphore]
+    variable_plans: dict[str, TestdataVariablePlan]
     scenarios_iteration: dict[str, int]
     testdata: TestdataType
     has_persisted: bool
@@ -557,11 +664,16 @@ class TestdataProducer:
         self._persist_file = persist_root / f'{Path(feature_file).stem}.json'
 
         self.keystore = {}
+        self.variable_semaphores = {}
+        self.variable_plans = {}
 
         from grizzly.context import grizzly  # noqa: PLC0415
 
         self.grizzly = grizzly
 
+        for scenario_name in self.testdata:
+            self.get_variable_plan(scenario_name)
+
         self.async_timers = AsyncTimersProducer(self.grizzly, self.semaphore)
         self.runner.register_message('produce_testdata', self.handle_request, concurrent=True)
         self.runner.environment.events.test_stop.add_listener(self.on_test_stop)
@@ -612,6 +724,60 @@ class TestdataProducer:
     def stop(self) -> None:
         self.persist_data()
 
+    def get_variable_plan(self, scenario_name: str) -> TestdataVariablePlan:
+        """Get the compiled variable plan for a scenario, it is created the first time it is requested.
+
+        Everything that can be resolved from the variable names (module, type, attribute and alias) is done once,
+        so that producing an iteration of testdata only has to get the values from the variables.
+        """
+        plan = self.variable_plans.get(scenario_name, None)
+
+        if plan is not None:
+            return plan
+
+        scenario = self.grizzly.scenarios.find_by_class_name(scenario_name)
+        aliases = scenario.variables.alias if scenario is not None else {}
+        steps: list[TestdataVariablePlanStep] = []
+        locks: dict[int, Semaphore] = {}
+
+        for key, variable in self.testdata.get(scenario_name, {}).items():
+            if '.' not in key or variable == '__on_consumer__':
+                steps.append(TestdataVariablePlanStep(key=key, variable=variable, alias=aliases.get(key, None)))
+                continue
+
+            module_name, variable_type, variable_name, _ = GrizzlyVariables.get_variable_spec(key)
+            _, data_attribute = key.rsplit('.', 1)
+            testdata_type: str | None = None
+
+            if variable_name != data_attribute:
+                testdata_type = f'{variable_type}.{variable_name}'
+                if module_name != 'grizzly.testdata.variables':
+                    testdata_type = f'{module_name}.{testdata_type}'
+
+            steps.append(
+                TestdataVariablePlanStep(
+                    key=key,
+                    variable=variable,
+                    variable_name=variable_name,
+                    testdata_type=testdata_type,
+                    attribute=data_attribute,
+                    alias=aliases.get(key, None),
+                ),
+            )
+
+            # one lock per variable instance, shared between all scenarios that uses the same instance
+            variable_id = id(variable)
+            if variable_id not in self.variable_semaphores:
+                self.variable_semaphores.update({variable_id: Semaphore()})
+
+            locks.update({variable_id: self.variable_semaphores[variable_id]})
+
+        # always acquire locks in the same order, to avoid deadlocks between scenarios sharing variables
+        plan = TestdataVariablePlan(scenario=scenario, steps=steps, locks=[locks[variable_id] for variable_id in sorted(locks.keys())])
+        self.variable_plans.update({scenario_name: plan})
+
+        return plan
+
     def _remove_key(self, key: str, response: StrDict) -> None:
         try:
             del self.keystore[key]
@@ -704,14 +870,37 @@ class TestdataProducer:
         return response
 
     @event(events.testdata_request, tags={'type': 'producer'}, decoder=TestdataDecoder(arg='request'))
-    def _handle_request_testdata(self, *, request: StrDict) -> StrDict:  # noqa: PLR0912
+    def _handle_request_testdata(self, *, request: StrDict) -> StrDict:
         scenario_name = request.get('identifier', '')
+        size: int | None = request.get('size', None)
+
+        if size is None:
+            return self._produce_testdata(scenario_name)
+
+        # batched request, produce up to `size` iterations in one response
+        batch: list[StrDict] = []
+
+        for _ in range(size):
+            response = self._produce_testdata(scenario_name)
+
+            if response['action'] != 'consume':
+                break
+
+            batch.append(response['data'])
+
+        if len(batch) < 1:
+            return {'action': 'stop'}
+
+        return {'action': 'consume', 'data': batch}
+
+    def _produce_testdata(self, scenario_name: str) -> StrDict:
         response: StrDict = {
             'action': 'stop',
         }
 
         try:
-            scenario = self.grizzly.scenarios.find_by_class_name(scenario_name)
+            plan = self.get_variable_plan(scenario_name)
+            scenario = plan.scenario
 
             if scenario is not None:
                 if scenario_name not in self.scenarios_iteration and scenario.iterations > 0:
@@ -723,48 +912,37 @@ class TestdataProducer:
                 ):
                     return response
 
-                testdata = self.testdata.get(scenario_name, {})
                 response['action'] = 'consume'
                 data: StrDict = {'variables': {}}
                 loaded_variable_datatypes: StrDict = {}
 
-                for key, variable in testdata.items():
-                    if '.' in key and variable != '__on_consumer__':
-                        module_name, variable_type, variable_name, _ = GrizzlyVariables.get_variable_spec(key)
-                        _, data_attribute = key.rsplit('.', 1)
-
-                        if variable_name != data_attribute:
-                            testdata_type = f'{variable_type}.{variable_name}'
-                            if module_name != 'grizzly.testdata.variables':
-                                testdata_type = f'{module_name}.{testdata_type}'
-
-                            if testdata_type not in loaded_variable_datatypes:
-                                try:
-                                    loaded_variable_datatypes[testdata_type] = variable[variable_name]
-                                except NotImplementedError:
-                                    continue
-
-                            value = loaded_variable_datatypes[testdata_type][data_attribute]
-                        else:
+                for step in plan.steps:
+                    if step.variable_name is None:
+                        value = step.variable
+                    elif step.testdata_type is not None:
+                        if step.testdata_type not in loaded_variable_datatypes:
                             try:
-                                value = variable[variable_name]
+                                loaded_variable_datatypes[step.testdata_type] = step.variable[step.variable_name]
                             except NotImplementedError:
                                 continue
+
+                        value = loaded_variable_datatypes[step.testdata_type][step.attribute]
                     else:
-                        value = variable
+                        try:
+                            value = step.variable[step.variable_name]
+                        except NotImplementedError:
+                            continue
 
                     if value is None and scenario_name not in self.scenarios_iteration:
                         response['action'] = 'stop'
-                        self.logger.warning('%s does not have a value and iterations is not set for %s, stop test', key, scenario_name)
+                        self.logger.warning('%s does not have a value and iterations is not set for %s, stop test', step.key, scenario_name)
                         data = {}
                         break
 
-                    data['variables'][key] = value
+                    data['variables'][step.key] = value
 
-                    alias = scenario.variables.alias.get(key, None)
-                    if alias is not None:
-                        data_key = alias
-                        data[data_key] = value
+                    if step.alias is not None:
+                        data[step.alias] = value
 
                 data['__iteration__'] = (self.scenarios_iteration[scenario_name], scenario.iterations)
 
@@ -789,19 +967,19 @@ class TestdataProducer:
 
         self.logger.debug('handling message from worker %s, user %s, request %s', cid, uid, rid)
 
-        # only handle one request per worker at a time, but allow parallell requests between different scenarios
+        # keystore requests are handled one at a time, _handle_request_keystore never yields so locking per key would not
+        # serve them in parallel. testdata requests are serialized per variable, so scenarios that does not share any
+        # variables can be served in parallel
         if request['message'] == 'keystore':
             with self.semaphore:
                 response = self._handle_request_keystore(request=request)
         elif request['message'] == 'testdata':
-            scenario_name = request.get('identifier', None)
+            plan = self.get_variable_plan(request.get('identifier', ''))
 
-            # create semaphore for client if it does not exist already
-            with self.semaphore:
-                if scenario_name is not None and scenario_name not in self.semaphores:
-                    self.semaphores.update({scenario_name: Semaphore()})
+            with ExitStack() as stack:
+                for lock in plan.locks:
+                    stack.enter_context(lock)
 
-            with self.semaphores[scenario_name]:
                 response = self._handle_request_testdata(request=request)
         else:
             self.logger.error('received unknown message "%s"', request['message'])
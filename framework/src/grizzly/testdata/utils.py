@@ -11,7 +11,7 @@ from typing import TYPE_CHECKING, cast
 
 from grizzly.exceptions import StopUser
 from grizzly.testdata.ast import get_template_variables, parse_templates
-from grizzly.utils import has_template, is_file, merge_dicts, unflatten
+from grizzly.utils import file_cache, has_template, is_file, merge_dicts, unflatten
 
 from . import GrizzlyVariables
 
@@ -174,7 +174,7 @@ def read_file(value: str) -> str:
 
     try:
         file = Path(base_dir) / 'requests' / value
-        return file.read_text()
+        return file_cache.read_text(file)
     except (OSError, FileNotFoundError):
         return value
 
@@ -11,18 +11,24 @@ There are examples of this in the [example][example].
 from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
+from array import array
+from collections import deque
 from contextlib import suppress
-from typing import TYPE_CHECKING, Any, ClassVar, Generic, TypeVar
+from mmap import ACCESS_READ, mmap
+from secrets import randbelow
+from typing import TYPE_CHECKING, Any, ClassVar, Generic, TypeVar, cast
+from weakref import WeakValueDictionary
 
 from gevent.lock import DummySemaphore, Semaphore
 
-from grizzly.types import StrDict, bool_type
+from grizzly.types import Self, StrDict, bool_type
 
 T = TypeVar('T')
 
 
 if TYPE_CHECKING:  # pragma: no cover
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable, Iterator
+    from pathlib import Path
 
     from grizzly.context import GrizzlyContext, GrizzlyContextScenario
     from grizzly.testdata.communication import GrizzlyDependencies
@@ -46,6 +52,213 @@ class AtomicVariableSettable(metaclass=ABCMeta):
     def __setitem__(self, key: str, value: Any) -> None: ...
 
 
+class RowQueue(Generic[T]):
+    """Queue of rows (values) for variables that provides a new row each time it is accessed, where getting
+    a row is `O(1)` regardless of the number of rows.
+
+    * sequential: rows are kept in a `deque`, and with `repeat` the row is put back at the end
+    * random: rows are kept in a `list`, a random row is swapped with the last row before it is removed, and with `repeat`
+      the row is never removed
+    """
+
+    repeat: bool
+    random: bool
+
+    _rows: deque[T] | list[T]
+
+    def __init__(self, rows: Iterable[T], *, repeat: bool = False, random: bool = False) -> None:
+        self.repeat = repeat
+        self.random = random
+        self._rows = list(rows) if random else deque(rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self) -> T | None:
+        """Get next row, `None` if there are no rows left."""
+        roof = len(self._rows)
+
+        if roof < 1:
+            return None
+
+        if not self.random:
+            rows = cast('deque[T]', self._rows)
+            row = rows.popleft()
+
+            if self.repeat:
+                rows.append(row)
+
+            return row
+
+        indexed_rows = cast('list[T]', self._rows)
+        index = randbelow(roof)
+
+        if self.repeat:
+            return indexed_rows[index]
+
+        # swap with last row, so it can be removed without moving the other rows
+        last = indexed_rows.pop()
+        if index < roof - 1:
+            row, indexed_rows[index] = indexed_rows[index], last
+        else:
+            row = last
+
+        return row
+
+    def put_back(self, row: T) -> None:
+        """Undo the last `get`, so the row will be available again."""
+        if not self.random:
+            rows = cast('deque[T]', self._rows)
+
+            if self.repeat:
+                rows.pop()
+
+            rows.appendleft(row)
+        elif not self.repeat:
+            self._rows.append(row)
+
+
+class LazyRowQueue(RowQueue[T]):
+    """`RowQueue` where rows are kept as compact references (e.g. offsets in a file), and a row is decoded
+    from its reference first when it is served.
+
+    The references are not copied unless rows are removed in random order, in which case the copy is as compact
+    as the references themselves. Sequential rows are served by moving a cursor over the references.
+    """
+
+    decode: Callable[[int], T]
+
+    _refs: array[int]
+    _cursor: int
+    _last: int | None
+
+    def __init__(self, refs: array[int], decode: Callable[[int], T], *, repeat: bool = False, random: bool = False) -> None:
+        self.repeat = repeat
+        self.random = random
+        self.decode = decode
+        self._refs = array(refs.typecode, refs) if random and not repeat else refs
+        self._cursor = 0
+        self._last = None
+
+    def __len__(self) -> int:
+        if self.random or self.repeat:
+            return len(self._refs)
+
+        return len(self._refs) - self._cursor
+
+    def get(self) -> T | None:
+        """Get next row, `None` if there are no rows left."""
+        roof = len(self._refs)
+
+        if roof < 1:
+            return None
+
+        if not self.random:
+            if self._cursor >= roof:
+                return None
+
+            ref = self._refs[self._cursor]
+            self._cursor = (self._cursor + 1) % roof if self.repeat else self._cursor + 1
+        else:
+            index = randbelow(roof)
+
+            if self.repeat:
+                ref = self._refs[index]
+            else:
+                # swap with last reference, so it can be removed without moving the other references
+                last = self._refs.pop()
+                if index < roof - 1:
+                    ref, self._refs[index] = self._refs[index], last
+                else:
+                    ref = last
+
+        self._last = ref
+
+        return self.decode(ref)
+
+    def put_back(self, row: T) -> None:  # noqa: ARG002
+        """Undo the last `get`, so the row will be available again."""
+        if self._last is None:
+            return
+
+        if not self.random:
+            self._cursor = (self._cursor - 1) % len(self._refs) if self.repeat else self._cursor - 1
+        elif not self.repeat:
+            self._refs.append(self._last)
+
+        self._last = None
+
+
+class FileOffsetIndex(Generic[T], metaclass=ABCMeta):
+    """Offset index of where each row starts in a memory-mapped file, where a row is decoded from the file
+    first when it is needed.
+
+    Implementations builds the index in one pass over the file, in `_index`, and decodes a row in `decode`.
+    """
+
+    _indexes: ClassVar[WeakValueDictionary[tuple[type, str, int, int], FileOffsetIndex]] = WeakValueDictionary()
+
+    encoding: ClassVar[str] = 'utf-8'
+
+    path: Path
+    offsets: array[int]
+
+    _map: mmap | None
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.offsets = array('Q')
+        self._map = None
+
+        with path.open('rb') as fd:
+            if path.stat().st_size < 1:
+                return
+
+            self._map = mmap(fd.fileno(), 0, access=ACCESS_READ)
+
+        self._index(self._map)
+
+    @classmethod
+    def get(cls, path: Path) -> Self:
+        """Get offset index for file, shared as long as the file has not changed and the index is used."""
+        stat = path.stat()
+        key = (cls, str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+        index = cls._indexes.get(key, None)
+
+        if index is None:
+            index = cls(path)
+            cls._indexes[key] = index
+
+        return cast('Self', index)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def _line(self, offset: int) -> bytes:
+        data = cast('mmap', self._map)
+        end = data.find(b'\n', offset)
+
+        return data[offset:] if end < 0 else data[offset : end + 1]
+
+    def _lines(self, offset: int, encoding: str | None = None) -> Iterator[str]:
+        data = cast('mmap', self._map)
+        size = len(data)
+        encoding = encoding or self.encoding
+
+        while offset < size:
+            line = self._line(offset)
+            yield line.decode(encoding)
+            offset += len(line)
+            encoding = self.encoding
+
+    @abstractmethod
+    def _index(self, data: mmap) -> None: ...
+
+    @abstractmethod
+    def decode(self, offset: int) -> T: ...
+
+
 class AtomicVariable(AbstractAtomicClass, Generic[T]):
     __base_type__: Callable | None = None
     __dependencies__: ClassVar[GrizzlyDependencies] = set()
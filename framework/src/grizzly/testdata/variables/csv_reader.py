@@ -14,6 +14,16 @@ Value is the path, relative to `requests/`, of an file ending with `.csv`.
 | -------- | ------ | --------------------------------------------------------------------------------------------------- | ------- |
 | `repeat` | `bool` | wheter values should be reused, e.g. when reaching the end it should start from the beginning again | `False` |
 | `random` | `bool` | if rows should be selected by random, instead of sequential from first to last                      | `False` |
+| `stream` | `bool` | if rows should be read from the file when they are used, instead of reading all rows at start       | `False` |
+
+## Streaming
+
+By default all rows in the CSV file are read into memory when the variable is initialized. For large files (e.g. multiple GB)
+this is slow and will use a lot of memory on the master. With `stream=True` the file is memory-mapped, and only the offset of
+where each row starts is kept in memory, and a row is first parsed when it is used. The offset index is shared between scenarios
+that uses the same file.
+
+`repeat` and `random` works the same way when streaming.
 
 ## Example
 
@@ -57,10 +67,9 @@ Second request:
 from __future__ import annotations
 
 from contextlib import suppress
-from csv import DictReader
+from csv import DictReader, reader
 from os import environ
 from pathlib import Path
-from secrets import randbelow
 from typing import TYPE_CHECKING, ClassVar, cast
 
 from grizzly_common.arguments import parse_arguments, split_value
@@ -68,9 +77,12 @@ from grizzly_common.text import has_separator
 
 from grizzly.types import StrDict, bool_type
 
-from . import AtomicVariable
+from . import AtomicVariable, FileOffsetIndex, LazyRowQueue, RowQueue
 
 if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterator
+    from mmap import mmap
+
     from grizzly.context import GrizzlyContextScenario
 
 
@@ -111,14 +123,70 @@ def _atomiccsvreader(value: str) -> str:
     return value
 
 
+class CsvRowIndex(FileOffsetIndex[StrDict]):
+    """Offset index of where each row starts in a memory-mapped CSV file.
+
+    Quoted values that spans multiple lines are kept in the same row. Empty lines are skipped, the same way as
+    `csv.DictReader` does.
+    """
+
+    fieldnames: list[str]
+
+    def __init__(self, path: Path) -> None:
+        self.fieldnames = []
+
+        super().__init__(path)
+
+    def _index(self, data: mmap) -> None:
+        header: int | None = None
+
+        for offset in self._scan(data):
+            if header is None:
+                header = offset
+            else:
+                self.offsets.append(offset)
+
+        if header is not None:
+            self.fieldnames = next(reader(self._lines(header, encoding='utf-8-sig')))
+
+    @staticmethod
+    def _scan(data: mmap) -> Iterator[int]:
+        offset = 0
+        start = 0
+        quoted = False
+
+        while line := data.readline():
+            offset += len(line)
+
+            # an odd number of quotes means that a quoted value starts, or ends, on this line
+            if line.count(b'"') % 2 == 1:
+                quoted = not quoted
+
+            if quoted:
+                continue
+
+            if offset - start > len(line) or line.strip(b'\r\n'):
+                yield start
+
+            start = offset
+
+        # unterminated quoted value on the last row
+        if start < offset:
+            yield start
+
+    def decode(self, offset: int) -> StrDict:
+        """Parse the row that starts at offset."""
+        return cast('StrDict', next(DictReader(self._lines(offset), fieldnames=self.fieldnames)))
+
+
 class AtomicCsvReader(AtomicVariable[StrDict]):
     __base_type__ = _atomiccsvreader
     __initialized: bool = False
 
-    _rows: dict[str, list[StrDict]]
+    _rows: dict[str, RowQueue[StrDict]]
     _settings: dict[str, StrDict]
     context_root: Path
-    arguments: ClassVar[StrDict] = {'repeat': bool_type, 'random': bool_type}
+    arguments: ClassVar[StrDict] = {'repeat': bool_type, 'random': bool_type, 'stream': bool_type}
 
     def __init__(self, *, scenario: GrizzlyContextScenario, variable: str, value: str, outer_lock: bool = False) -> None:
         with self.semaphore(outer=outer_lock):
@@ -128,7 +196,7 @@ class AtomicCsvReader(AtomicVariable[StrDict]):
 
             safe_value = self.__class__.__base_type__(value)
 
-            settings = {'repeat': False, 'random': False}
+            settings = {'repeat': False, 'random': False, 'stream': False}
 
             if has_separator('|', safe_value):
                 csv_file, csv_arguments = split_value(safe_value)
@@ -144,7 +212,7 @@ class AtomicCsvReader(AtomicVariable[StrDict]):
 
             if self.__initialized:
                 if variable not in self._rows:
-                    self._rows[variable] = self._create_row_queue(csv_file)
+                    self._rows[variable] = self._create_row_queue(csv_file, settings)
 
                 if variable not in self._settings:
                     self._settings[variable] = settings
@@ -152,16 +220,20 @@ class AtomicCsvReader(AtomicVariable[StrDict]):
                 return
 
             self.context_root = Path(environ.get('GRIZZLY_CONTEXT_ROOT', '')) / 'requests'
-            self._rows = {variable: self._create_row_queue(csv_file)}
+            self._rows = {variable: self._create_row_queue(csv_file, settings)}
             self._settings = {variable: settings}
             self.__initialized = True
 
-    def _create_row_queue(self, value: str) -> list[StrDict]:
+    def _create_row_queue(self, value: str, settings: StrDict) -> RowQueue[StrDict]:
         input_file = self.context_root / value
 
+        if settings['stream']:
+            index = CsvRowIndex.get(input_file)
+            return LazyRowQueue(index.offsets, index.decode, repeat=settings['repeat'], random=settings['random'])
+
         with input_file.open() as fd:
             reader = DictReader(fd)
-            return [cast('StrDict', row) for row in reader]
+            return RowQueue((cast('StrDict', row) for row in reader), repeat=settings['repeat'], random=settings['random'])
 
     @classmethod
     def clear(cls: type[AtomicCsvReader]) -> None:
@@ -183,25 +255,15 @@ class AtomicCsvReader(AtomicVariable[StrDict]):
             if '.' in variable:
                 [variable, column] = variable.rsplit('.', 1)
 
-            try:
-                settings = self._settings[variable]
-
-                if settings['random'] is True:
-                    roof = len(self._rows[variable])
-                    index = randbelow(roof)
-                else:
-                    index = 0
-
-                row = self._rows[variable].pop(index)
+            rows = self._rows[variable]
+            row = rows.get()
 
-                if settings['repeat'] is True:
-                    self._rows[variable].append(row)
-            except (IndexError, ValueError):
+            if row is None:
                 return None
 
             if column is not None:
                 if column not in row:
-                    self._rows[variable].insert(0, row)
+                    rows.put_back(row)
                     message = f'{self.__class__.__name__}.{variable}: {column} does not exists'
                     raise ValueError(message)
                 value = row[column]
@@ -39,7 +39,6 @@ from __future__ import annotations
 from contextlib import suppress
 from os import environ
 from pathlib import Path
-from secrets import randbelow
 from typing import TYPE_CHECKING, ClassVar, cast
 
 from grizzly_common.arguments import parse_arguments, split_value
@@ -47,7 +46,7 @@ from grizzly_common.text import has_separator
 
 from grizzly.types import StrDict, bool_type
 
-from . import AtomicVariable
+from . import AtomicVariable, RowQueue
 
 if TYPE_CHECKING:  # pragma: no cover
     from grizzly.context import GrizzlyContextScenario
@@ -88,7 +87,7 @@ class AtomicDirectoryContents(AtomicVariable[str]):
     __base_type__ = atomicdirectorycontents__base_type__
     __initialized: bool = False
 
-    _files: dict[str, list[str]]
+    _files: dict[str, RowQueue[str]]
     _settings: dict[str, StrDict]
     _requests_context_root: Path
     arguments: ClassVar[StrDict] = {'repeat': bool_type, 'random': bool_type}
@@ -121,7 +120,7 @@ class AtomicDirectoryContents(AtomicVariable[str]):
 
             if self.__initialized:
                 if variable not in self._files:
-                    self._files[variable] = self._create_file_queue(directory)
+                    self._files[variable] = self._create_file_queue(directory, settings)
 
                 if variable not in self._settings:
                     self._settings[variable] = settings
@@ -129,7 +128,7 @@ class AtomicDirectoryContents(AtomicVariable[str]):
                 return
 
             self._requests_context_root = Path(environ.get('GRIZZLY_CONTEXT_ROOT', '.')) / 'requests'
-            self._files = {variable: self._create_file_queue(directory)}
+            self._files = {variable: self._create_file_queue(directory, settings)}
             self._settings = {variable: settings}
             self.__initialized = True
 
@@ -146,34 +145,18 @@ class AtomicDirectoryContents(AtomicVariable[str]):
                 del instance._files[variable]
                 del instance._settings[variable]
 
-    def _create_file_queue(self, directory: str) -> list[str]:
+    def _create_file_queue(self, directory: str, settings: StrDict) -> RowQueue[str]:
         parent_part = len(str(self._requests_context_root)) + 1
         queue = [str(path)[parent_part:] for path in (self._requests_context_root / directory).rglob('*') if path.is_file()]
         queue.sort()
 
-        return queue
+        return RowQueue(queue, repeat=settings['repeat'], random=settings['random'])
 
     def __getitem__(self, variable: str) -> str | None:
         with self.semaphore():
             self._get_value(variable)
 
-            try:
-                settings = self._settings[variable]
-
-                if settings['random'] is True:
-                    roof = len(self._files[variable])
-                    index = randbelow(roof)
-                else:
-                    index = 0
-
-                value = self._files[variable].pop(index)
-
-                if settings['repeat'] is True:
-                    self._files[variable].append(value)
-            except (IndexError, ValueError):
-                return None
-            else:
-                return value
+            return self._files[variable].get()
 
     def __delitem__(self, variable: str) -> None:
         with self.semaphore():
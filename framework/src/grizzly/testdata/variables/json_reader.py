@@ -2,9 +2,13 @@
 
 The JSON file **must** contain a list of JSON objects, and each object **must** have the same properties.
 
+It is also possible to use a [JSON Lines](https://jsonlines.org/) file (`.jsonl` or `.ndjson`), with one JSON object per line. These files
+are memory-mapped, and only the offset of where each object starts is kept in memory. An object is first parsed when it is used, which
+makes it possible to use very large files.
+
 ## Format
 
-Value is the path, relative to `requests/`, of an file ending with `.json`.
+Value is the path, relative to `requests/`, of an file ending with `.json`, `.jsonl` or `.ndjson`.
 
 ## Arguments
 
@@ -32,8 +36,15 @@ Value is the path, relative to `requests/`, of an file ending with `.json`.
 ]
 ```
 
+```json title="requests/example.jsonl"
+{"username": "bob1", "password": "some-password"}
+{"username": "alice1", "password": "some-other-password"}
+{"username": "bob2", "password": "password"}
+```
+
 ```gherkin
 And value for variable "AtomicJsonReader.example" is "example.json | random=False, repeat=True"
+And value for variable "AtomicJsonReader.lines" is "example.jsonl | random=False, repeat=True"
 
 # Reference property by property
 Then post request with name "authenticate" to endpoint "/api/v1/authenticate"
@@ -72,24 +83,91 @@ Second request:
 
 from __future__ import annotations
 
-import json
+import re
+from codecs import BOM_UTF8
 from contextlib import suppress
+from mmap import ACCESS_READ, mmap
 from os import environ
 from pathlib import Path
-from secrets import randbelow
 from typing import TYPE_CHECKING, ClassVar, cast
 
 from grizzly_common.arguments import parse_arguments, split_value
+from grizzly_common.codec import json_loads
 from grizzly_common.text import has_separator
 
 from grizzly.types import StrDict, bool_type
 
-from . import AtomicVariable
+from . import AtomicVariable, FileOffsetIndex, LazyRowQueue, RowQueue
 
 if TYPE_CHECKING:  # pragma: no cover
     from grizzly.context import GrizzlyContextScenario
 
 
+JSON_LINES_SUFFIXES = ('.jsonl', '.ndjson')
+NON_WHITESPACE = re.compile(rb'\S')
+
+
+class JsonLinesIndex(FileOffsetIndex[StrDict]):
+    """Offset index of where each object starts in a memory-mapped JSON Lines file.
+
+    Only the structure is validated when the index is built, each non-empty line must look like a JSON object,
+    the object itself is first parsed when it is decoded.
+    """
+
+    def _index(self, data: mmap) -> None:
+        offset = 0
+        number = 0
+
+        while line := data.readline():
+            number += 1
+            stripped = (line.removeprefix(BOM_UTF8) if offset == 0 else line).strip()
+
+            if stripped:
+                if stripped[:1] != b'{' or stripped[-1:] != b'}':
+                    message = f'line {number} is not a JSON object'
+                    raise ValueError(message)
+
+                self.offsets.append(offset)
+
+            offset += len(line)
+
+    def decode(self, offset: int) -> StrDict:
+        """Parse the object on the line that starts at offset."""
+        return cast('StrDict', json_loads(self._line(offset)))
+
+
+def _outer_characters(path: Path, *, chunk_size: int = 4096) -> tuple[bytes, bytes]:
+    """Get first and last non-whitespace character in a file, without reading all of it."""
+    with path.open('rb') as fd:
+        if path.stat().st_size < 1:
+            return b'', b''
+
+        with mmap(fd.fileno(), 0, access=ACCESS_READ) as data:
+            match = NON_WHITESPACE.search(data, len(BOM_UTF8) if data[: len(BOM_UTF8)] == BOM_UTF8 else 0)
+
+            if match is None:
+                return b'', b''
+
+            end = len(data)
+            last = b''
+            while not last:
+                last = data[max(end - chunk_size, 0) : end].rstrip()[-1:]
+                end -= chunk_size
+
+            return match.group(), last
+
+
+def _first_line(path: Path) -> tuple[int, bytes]:
+    """Get number and contents of the first non-empty line in a file, without reading all of it."""
+    with path.open('rb') as fd:
+        for number, line in enumerate(fd, start=1):
+            stripped = (line.removeprefix(BOM_UTF8) if number == 1 else line).strip()
+            if stripped:
+                return number, stripped
+
+    return 0, b''
+
+
 def atomicjsonreader__base_type__(value: str) -> str:
     grizzly_context_requests = Path(environ.get('GRIZZLY_CONTEXT_ROOT', '')) / 'requests'
 
@@ -115,33 +193,44 @@ def atomicjsonreader__base_type__(value: str) -> str:
 
     path = grizzly_context_requests / json_file
 
-    if path.suffix != '.json':
-        message = f'AtomicJsonReader: {json_file} must be a JSON file with file extension .json'
+    if path.suffix != '.json' and path.suffix not in JSON_LINES_SUFFIXES:
+        message = f'AtomicJsonReader: {json_file} must be a JSON file with file extension .json, .jsonl or .ndjson'
         raise ValueError(message)
 
     if not path.is_file():
         message = f'AtomicJsonReader: {json_file} is not a file in {grizzly_context_requests!s}'
         raise ValueError(message)
 
+    # only validate the first object, all lines are validated when the variable is initialized and the file is indexed
+    if path.suffix in JSON_LINES_SUFFIXES:
+        number, line = _first_line(path)
+
+        if line and (line[:1] != b'{' or line[-1:] != b'}'):
+            message = f'AtomicJsonReader: contents of {json_file} is not valid JSON Lines, line {number} is not a JSON object'
+            raise ValueError(message)
+
+        return value
+
+    # only validate the structure, the contents is parsed when the variable is initialized
+    if _outer_characters(path) == (b'[', b']'):
+        return value
+
     data: list[StrDict] | None = None
     try:
-        data = json.loads(path.read_text())
+        data = json_loads(path.read_text())
     except Exception as e:
         message = f'AtomicJsonReader: failed to load contents of {json_file}'
         raise ValueError(message) from e
 
-    if not isinstance(data, list):
-        message = f'AtomicJsonReader: contents of {json_file} is not a list ({type(data).__name__})'
-        raise ValueError(message) from None  # noqa: TRY004
-
-    return value
+    message = f'AtomicJsonReader: contents of {json_file} is not a list ({type(data).__name__})'
+    raise ValueError(message)
 
 
 class AtomicJsonReader(AtomicVariable[StrDict]):
     __base_type__ = atomicjsonreader__base_type__
     __initialized: bool = False
 
-    _items: dict[str, list[StrDict]]
+    _items: dict[str, RowQueue[StrDict]]
     _settings: dict[str, StrDict]
     context_root: Path
     arguments: ClassVar[StrDict] = {'repeat': bool_type, 'random': bool_type}
@@ -170,7 +259,7 @@ class AtomicJsonReader(AtomicVariable[StrDict]):
 
             if self.__initialized:
                 if variable not in self._items:
-                    self._items[variable] = self._create_row_queue(json_file)
+                    self._items[variable] = self._create_row_queue(json_file, settings)
 
                 if variable not in self._settings:
                     self._settings[variable] = settings
@@ -178,14 +267,29 @@ class AtomicJsonReader(AtomicVariable[StrDict]):
                 return
 
             self.context_root = Path(environ.get('GRIZZLY_CONTEXT_ROOT', '')) / 'requests'
-            self._items = {variable: self._create_row_queue(json_file)}
+            self._items = {variable: self._create_row_queue(json_file, settings)}
             self._settings = {variable: settings}
             self.__initialized = True
 
-    def _create_row_queue(self, value: str) -> list[dict]:
+    def _create_row_queue(self, value: str, settings: StrDict) -> RowQueue[StrDict]:
         input_file = self.context_root / value
 
-        return cast('list[StrDict]', json.loads(input_file.read_text()))
+        if input_file.suffix in JSON_LINES_SUFFIXES:
+            try:
+                index = JsonLinesIndex.get(input_file)
+            except ValueError as e:
+                message = f'{self.__class__.__name__}: contents of {value} is not valid JSON Lines, {e!s}'
+                raise ValueError(message) from e
+
+            return LazyRowQueue(index.offsets, index.decode, repeat=settings['repeat'], random=settings['random'])
+
+        try:
+            items = cast('list[StrDict]', json_loads(input_file.read_text()))
+        except ValueError as e:
+            message = f'{self.__class__.__name__}: failed to load contents of {value}'
+            raise ValueError(message) from e
+
+        return RowQueue(items, repeat=settings['repeat'], random=settings['random'])
 
     @classmethod
     def clear(cls: type[AtomicJsonReader]) -> None:
@@ -207,25 +311,15 @@ class AtomicJsonReader(AtomicVariable[StrDict]):
             if '.' in variable:
                 variable, prop = variable.rsplit('.', 1)
 
-            try:
-                settings = self._settings[variable]
-
-                if settings['random'] is True:
-                    roof = len(self._items[variable])
-                    index = randbelow(roof)
-                else:
-                    index = 0
-
-                item = self._items[variable].pop(index)
+            items = self._items[variable]
+            item = items.get()
 
-                if settings['repeat'] is True:
-                    self._items[variable].append(item)
-            except (IndexError, ValueError):
+            if item is None:
                 return None
 
             if prop is not None:
                 if prop not in item:
-                    self._items[variable].insert(0, item)
+                    items.put_back(item)
                     message = f'{self.__class__.__name__}.{variable}: {prop} does not exists'
                     raise ValueError(message)
 
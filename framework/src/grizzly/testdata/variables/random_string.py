@@ -1,6 +1,8 @@
 """Generate a specified number of unique strings, based on a string format pattern.
 
-The list is pre-populated to ensure that each string is unique.
+Strings are generated in blocks when they are needed, and each string is guaranteed to be unique. For up to `100 000` strings, or when
+the pattern cannot produce many more strings than `count`, uniqueness is checked against all generated strings. Otherwise a bloom filter
+is used, so that memory usage is bounded also for very large values of `count`.
 
 ## Format
 
@@ -34,15 +36,20 @@ This can then be used in a template:
 ```
 
 `AtomicRandomString.registration_plate_number` will then be a string in the format `[A-Z][A-Z]Z[0-9][0-9]0` and there will be `100` unique values for disposal.
+
+If `count` is larger than the number of unique strings the pattern can produce, initializing the variable will fail.
 """
 
 from __future__ import annotations
 
 from contextlib import suppress
-from secrets import choice, randbelow
-from string import ascii_letters
+from functools import cache
+from hashlib import blake2b
+from math import ceil, log, prod
+from os import urandom
+from string import ascii_letters, digits
 from typing import TYPE_CHECKING, ClassVar, cast
-from uuid import uuid4
+from uuid import UUID
 
 from grizzly_common.arguments import parse_arguments, split_value
 from grizzly_common.text import has_separator
@@ -52,7 +59,7 @@ from grizzly.types import StrDict, bool_type, int_rounded_float_type
 from . import AtomicVariable
 
 if TYPE_CHECKING:  # pragma: no cover
-    from collections.abc import Callable
+    from collections.abc import Callable, Sequence
 
     from grizzly.context import GrizzlyContextScenario
 
@@ -95,17 +102,153 @@ def atomicrandomstring__base_type__(value: str) -> str:
     return value
 
 
+@cache
+def _translation(alphabet: str) -> tuple[bytes, bytes]:
+    """Create translation table that maps a random byte to a character in the alphabet, and which bytes to delete to not get a biased result."""
+    limit = 256 - 256 % len(alphabet)
+    table = bytes(ord(alphabet[value % len(alphabet)]) for value in range(256))
+
+    return table, bytes(range(limit, 256))
+
+
+def random_characters(alphabet: str, size: int) -> str:
+    """Get `size` random characters from alphabet, in one go."""
+    table, delete = _translation(alphabet)
+    characters = b''
+
+    while len(characters) < size:
+        characters += urandom(size * 2).translate(table, delete)
+
+    return characters[:size].decode()
+
+
+class BloomFilter:
+    """Probabilistic set of strings, with a fixed size, where `add` might consider a string already added even though it is not,
+    but never the other way around.
+    """
+
+    size: int
+    hashes: int
+
+    _bits: bytearray
+
+    def __init__(self, capacity: int, false_positive_rate: float) -> None:
+        self.size = max(ceil(-capacity * log(false_positive_rate) / log(2) ** 2), 8)
+        self.hashes = max(round(self.size / capacity * log(2)), 1)
+        self._bits = bytearray(ceil(self.size / 8))
+
+    def __sizeof__(self) -> int:
+        return super().__sizeof__() + self._bits.__sizeof__()
+
+    def add(self, value: str) -> bool:
+        """Add value, returns `False` if the value (probably) already has been added."""
+        digest = blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        added = False
+
+        for index in range(self.hashes):
+            position = (first + index * second) % self.size
+            mask = 1 << (position & 7)
+            position >>= 3
+
+            if not self._bits[position] & mask:
+                self._bits[position] |= mask
+                added = True
+
+        return added
+
+
+class RandomStringPool:
+    """Unique strings based on a string format pattern, that are generated in blocks when they are needed."""
+
+    block_size: ClassVar[int] = 1000
+    exact_limit: ClassVar[int] = 100_000
+    false_positive_rate: ClassVar[float] = 0.001
+
+    remaining: int
+    upper: bool
+
+    _format: str
+    _generators: list[Callable[[int], Sequence[str]]]
+    _block: list[str]
+    _seen: set[str] | BloomFilter
+
+    def __init__(self, string_pattern: str, *, count: int, upper: bool) -> None:
+        self.remaining = count
+        self.upper = upper
+        self._format = string_pattern.replace('%g', '%s').replace('%d', '%s')
+        self._generators = AtomicRandomString.get_generators(string_pattern)
+        self._block = []
+
+        combinations = prod(AtomicRandomString.combinations[generator.__name__] for generator in self._generators)
+        if upper and '%s' in string_pattern:
+            combinations //= 2 ** string_pattern.count('%s')
+
+        if count > combinations:
+            message = f'AtomicRandomString: "{string_pattern}" can only generate {combinations} unique strings, not {count}'
+            raise ValueError(message)
+
+        # a bloom filter would reject too many new strings when most of the possible strings are going to be generated
+        if count <= self.exact_limit or count * 2 > combinations:
+            self._seen = set()
+        else:
+            self._seen = BloomFilter(count, self.false_positive_rate)
+
+    def __len__(self) -> int:
+        return self.remaining
+
+    def _add(self, value: str) -> bool:
+        if isinstance(self._seen, BloomFilter):
+            return self._seen.add(value)
+
+        if value in self._seen:
+            return False
+
+        self._seen.add(value)
+
+        return True
+
+    def _generate(self, size: int) -> list[str]:
+        columns = [generator(size) for generator in self._generators]
+        values = [self._format % parts for parts in zip(*columns, strict=True)]
+
+        if self.upper:
+            return [value.upper() for value in values]
+
+        return values
+
+    def _fill(self) -> None:
+        size = min(self.block_size, self.remaining)
+
+        while len(self._block) < size:
+            self._block.extend(value for value in self._generate(size - len(self._block)) if self._add(value))
+
+    def get(self) -> str | None:
+        """Get next unique string, `None` if all strings has been used."""
+        if self.remaining < 1:
+            return None
+
+        if len(self._block) < 1:
+            self._fill()
+
+        self.remaining -= 1
+
+        return self._block.pop()
+
+
 class AtomicRandomString(AtomicVariable[str]):
     __base_type__ = atomicrandomstring__base_type__
     __initialized: bool = False
 
-    _strings: dict[str, list[str]]
+    _strings: dict[str, RandomStringPool]
     arguments: ClassVar[StrDict] = {'upper': bool_type, 'count': int_rounded_float_type}
+    combinations: ClassVar[dict[str, int]] = {'_generate_s': len(ascii_letters), '_generate_d': len(digits), '_generate_g': 2**122}
 
     @staticmethod
-    def get_generators(format_string: str) -> list[Callable[[AtomicRandomString], str]]:
-        """Map format modifiers to generator functions."""
-        formats: list[Callable[[AtomicRandomString], str]] = []
+    def get_generators(format_string: str) -> list[Callable[[int], Sequence[str]]]:
+        """Map format modifiers to generator functions, that generates a number of values in one go."""
+        formats: list[Callable[[int], Sequence[str]]] = []
         # first item is either empty, or it's a static character
         for format_modifier in format_string.split('%')[1:]:
             generator_name = format_modifier[0]  # could be static characters in the pattern, only supports one character formatters
@@ -148,34 +291,22 @@ class AtomicRandomString(AtomicVariable[str]):
             self._strings = {variable: self._generate_strings(string_pattern, settings)}
             self.__initialized = True
 
-    def _generate_s(self) -> str:
-        return choice(ascii_letters)
-
-    def _generate_d(self) -> int:
-        return randbelow(10)
-
-    def _generate_g(self) -> str:
-        return str(uuid4())
-
-    def _generate_strings(self, string_pattern: str, settings: StrDict) -> list[str]:
-        generated_strings: set[str] = set()
-        generators = self.__class__.get_generators(string_pattern)
-
-        string_pattern = string_pattern.replace('%g', '%s')
-
-        for _ in range(settings['count']):
-            generated_string: str | None = None
+    @staticmethod
+    def _generate_s(size: int) -> Sequence[str]:
+        return random_characters(ascii_letters, size)
 
-            while generated_string is None or generated_string in generated_strings:
-                generated_part = tuple([generator(self) for generator in generators])
-                generated_string = string_pattern % generated_part
+    @staticmethod
+    def _generate_d(size: int) -> Sequence[str]:
+        return random_characters(digits, size)
 
-                if settings['upper']:
-                    generated_string = generated_string.upper()
+    @staticmethod
+    def _generate_g(size: int) -> Sequence[str]:
+        data = urandom(size * 16)
 
-            generated_strings.add(generated_string)
+        return [str(UUID(bytes=data[offset : offset + 16], version=4)) for offset in range(0, size * 16, 16)]
 
-        return list(generated_strings)
+    def _generate_strings(self, string_pattern: str, settings: StrDict) -> RandomStringPool:
+        return RandomStringPool(string_pattern, count=settings['count'], upper=settings['upper'])
 
     @classmethod
     def clear(cls: type[AtomicRandomString]) -> None:
@@ -193,10 +324,7 @@ class AtomicRandomString(AtomicVariable[str]):
         with self.semaphore():
             self._get_value(variable)
 
-            try:
-                return self._strings[variable].pop()
-            except (IndexError, ValueError):
-                return None
+            return self._strings[variable].get()
 
     def __delitem__(self, variable: str) -> None:
         with self.semaphore():
@@ -18,10 +18,7 @@ from abc import ABCMeta, abstractmethod
 from contextlib import suppress
 from copy import copy, deepcopy
 from datetime import datetime, timezone
-from errno import ENAMETOOLONG
 from itertools import chain
-from json import dumps as jsondumps
-from json import loads as jsonloads
 from logging import Logger
 from os import environ
 from pathlib import Path
@@ -30,12 +27,14 @@ from typing import TYPE_CHECKING, Any, ClassVar, TypeVar, cast, final
 
 from async_messaged import AsyncMessageError
 from gevent.event import Event
+from grizzly_common.transformer import TransformerError, transformer
 from locust.event import EventHook
 from locust.user.task import LOCUST_STATE_RUNNING
 from locust.user.users import User, UserMeta
 
 from grizzly.events import GrizzlyEventHook, RequestLogger, ResponseHandler
 from grizzly.exceptions import RestartScenario, StopScenario
+from grizzly.tasks.request import has_request_template, read_request_source
 from grizzly.testdata import GrizzlyVariables
 from grizzly.types import GrizzlyResponse, RequestType, ScenarioState, StrDict
 from grizzly.types.locust import Environment, StopUser
@@ -44,6 +43,8 @@ from grizzly.utils import has_template, merge_dicts
 T = TypeVar('T', bound=UserMeta)
 
 if TYPE_CHECKING:  # pragma: no cover
+    from grizzly_common.transformer import TransformerContentType
+
     from grizzly.context import GrizzlyContext, GrizzlyContextScenario
     from grizzly.tasks import GrizzlyTask, RequestTask
     from grizzly.testdata.communication import GrizzlyDependencies, TestdataConsumer
@@ -96,6 +97,7 @@ class GrizzlyUser(User, metaclass=GrizzlyUserMeta):
     _context_root: Path
     _scenario: GrizzlyContextScenario  # copy of scenario for this user instance
     _scenario_state: ScenarioState | None
+    _transformed: dict[TransformerContentType, tuple[str, Any]]
 
     logger: Logger
 
@@ -105,6 +107,7 @@ class GrizzlyUser(User, metaclass=GrizzlyUserMeta):
     environment: Environment
     grizzly: GrizzlyContext
     sticky_tag: str | None = None
+    cost: float = 1.0
     variables: GrizzlyVariables
     consumer: TestdataConsumer
 
@@ -119,6 +122,7 @@ class GrizzlyUser(User, metaclass=GrizzlyUserMeta):
         self._context = deepcopy(self.__class__.__context__)
         self._scenario_state = None
         self._scenario = copy(self.__scenario__)
+        self._transformed = {}
 
         # these are not copied, and we can share reference
         self._scenario._tasks = self.__scenario__._tasks
@@ -197,14 +201,63 @@ class GrizzlyUser(User, metaclass=GrizzlyUserMeta):
     def on_state(self, *, state: ScenarioState) -> None:
         pass
 
+    def transform(self, content_type: TransformerContentType, payload: str) -> Any:
+        """Transform payload with the transformer for content type.
+
+        The last transformed payload is kept for each content type, so that response handlers and tasks handling the same
+        payload (e.g. `UntilRequestTask` and the response handlers of its request) only transforms it once. The transformed
+        payload is shared, and must not be modified.
+        """
+        cached = self._transformed.get(content_type, None)
+        if cached is not None and (cached[0] is payload or cached[0] == payload):
+            return cached[1]
+
+        impl = transformer.available.get(content_type, None)
+        if impl is None:
+            message = f'could not find a transformer for {content_type.name}'
+            raise TransformerError(message)
+
+        transformed = impl.transform(payload)
+        self._transformed[content_type] = (payload, transformed)
+
+        return transformed
+
     def render(self, template: str, variables: StrDict | None = None) -> str:
         if not has_template(template):
             return template
 
+        return self._render(template, variables)
+
+    def _render(self, template: str, variables: StrDict | None = None) -> str:
         if variables is None:
             variables = {}
 
-        return self._scenario.jinja2.from_string(template).render(**self.variables, **variables)
+        return self._scenario.template(template).render(**self.variables, **variables)
+
+    def _render_arguments(self, arguments: dict[str, str]) -> dict[str, str]:
+        rendered: dict[str, str] = {}
+
+        for key, value in arguments.items():
+            rendered_key = self._render(key) if has_request_template(key) else key
+            rendered[rendered_key] = self._render(value) if has_request_template(value) else value
+
+        return rendered
+
+    def _render_fields(self, values: StrDict) -> StrDict:
+        rendered: StrDict = {}
+
+        for key, value in values.items():
+            rendered_value: Any
+            if isinstance(value, str):
+                rendered_value = self.render(value)
+            elif isinstance(value, dict):
+                rendered_value = self._render_fields(value)
+            else:
+                rendered_value = value
+
+            rendered[self.render(key)] = rendered_value
+
+        return rendered
 
     @property
     def metadata(self) -> StrDict:
@@ -331,34 +384,32 @@ class GrizzlyUser(User, metaclass=GrizzlyUserMeta):
         request = copy(request_template)
 
         try:
-            name = self.render(request_template.name)
-            source: str | None = None
-            request.name = f'{self._scenario.identifier} {name}'
-            request.endpoint = self.render(request_template.endpoint)
+            plan = request_template.get_plan(self._scenario.identifier, self._context_root)
 
-            if request_template.source is not None:
-                source = self.render(request_template.source)
+            # the plan has already checked which values are templates
+            request.name = f'{self._scenario.identifier} {self._render(plan.name)}' if plan.render_name else plan.name
+            request.endpoint = self._render(plan.endpoint) if plan.render_endpoint else plan.endpoint
 
-                try:
-                    file = self._context_root / 'requests' / source
+            if plan.source is not None:
+                source = plan.source
+
+                if plan.render_source:
+                    source = self._render(source)
 
-                    if file.is_file():
-                        source = file.read_text()
+                if plan.resolve_source:
+                    content = read_request_source(self._context_root, source)
 
+                    if content is not None:
                         # nested template
-                        if has_template(source):
-                            source = self.render(source)
-                except OSError as e:  # source was definitly not a file...
-                    if e.errno != ENAMETOOLONG:
-                        raise
+                        source = self._render(content) if has_request_template(content) else content
 
                 request.source = source
 
-            if request_template.arguments is not None:
-                request.arguments = jsonloads(self.render(jsondumps(request_template.arguments)))
+            if plan.arguments is not None:
+                request.arguments = self._render_arguments(plan.arguments) if plan.render_arguments else dict(plan.arguments)
 
             if request_template.metadata is not None:
-                request.metadata = jsonloads(self.render(jsondumps(request_template.metadata)))
+                request.metadata = self._render_fields(request_template.metadata)
 
             request.__rendered__ = True
         except Exception as e:
@@ -104,6 +104,7 @@ from html.parser import HTMLParser
 from typing import TYPE_CHECKING, Any, ClassVar
 
 import requests
+from grizzly_common.codec import json_loads
 from grizzly_common.transformer import TransformerContentType
 from locust.contrib.fasthttp import FastHttpSession
 from locust.contrib.fasthttp import ResponseContextManager as FastResponseContextManager
@@ -241,7 +242,7 @@ class RestApiUser(GrizzlyUser, AsyncRequests, GrizzlyHttpAuthClient, metaclass=R
             message = str(text[0]).replace('_', ' ')
         else:
             try:
-                payload = json.loads(response.text)
+                payload = json_loads(response.text)
 
                 # special handling for dynamics error messages
                 if 'Message' in payload:
@@ -304,7 +305,7 @@ class RestApiUser(GrizzlyUser, AsyncRequests, GrizzlyHttpAuthClient, metaclass=R
         if request.method.direction == RequestDirection.TO and request.source is not None:
             if request.response.content_type == TransformerContentType.JSON:
                 try:
-                    parameters['json'] = json.loads(request.source) if len(request.source.strip()) > 0 else ''
+                    parameters['json'] = json_loads(request.source) if len(request.source.strip()) > 0 else ''
                 except json.decoder.JSONDecodeError as e:
                     message = f'{url}: failed to decode'
                     self.logger.exception('%s: %s', url, request.source)
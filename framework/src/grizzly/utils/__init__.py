@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import logging
 import re
-from collections.abc import Generator, Mapping
+from collections import OrderedDict
+from collections.abc import Generator, Iterable, Mapping
 from contextlib import contextmanager, suppress
 from copy import deepcopy
 from importlib import import_module
@@ -48,6 +49,77 @@ class ModuleLoader(Generic[T]):
         return cast('type[T]', class_type_instance)
 
 
+class FileCache:
+    """Process-wide cache of file contents, bounded by number of bytes, where the least recently used files are evicted first.
+
+    Cached contents are validated against the modification time and size of the file each time it is read, so changed
+    files are read again.
+    """
+
+    max_bytes: int
+    size: int
+
+    _entries: OrderedDict[Path, tuple[int, int, str]]
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path: Path) -> bool:
+        return path in self._entries
+
+    def _evict(self, path: Path) -> None:
+        _, size, _ = self._entries.pop(path)
+        self.size -= size
+
+    def read_text(self, path: Path) -> str:
+        """Read contents of file, raises the same exceptions as `pathlib.Path.read_text`."""
+        stat = path.stat()
+        entry = self._entries.get(path, None)
+
+        if entry is not None:
+            mtime, size, content = entry
+
+            if mtime == stat.st_mtime_ns and size == stat.st_size:
+                self._entries.move_to_end(path)
+                return content
+
+            self._evict(path)
+
+        content = path.read_text()
+
+        if stat.st_size <= self.max_bytes:
+            self._entries[path] = (stat.st_mtime_ns, stat.st_size, content)
+            self.size += stat.st_size
+
+            while self.size > self.max_bytes:
+                self._evict(next(iter(self._entries)))
+
+        return content
+
+    def warm(self, paths: Iterable[Path]) -> int:
+        """Read files into the cache, returns number of files that was read."""
+        count = 0
+
+        for path in paths:
+            if path.is_file():
+                self.read_text(path)
+                count += 1
+
+        return count
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+
+file_cache = FileCache(max_bytes=64 * 1024 * 1024)
+
+
 @contextmanager
 def fail_direct(context: Context) -> Generator[None, None, None]:
     """Context manager used to stop behave directly on failure in critical code paths."""
@@ -100,6 +172,7 @@ def create_user_class_type(scenario: GrizzlyContextScenario, global_context: Str
     distribution: dict[str, int | float | str | None] = {
         'weight': scenario.user.weight,
         'sticky_tag': scenario.user.sticky_tag,
+        'cost': scenario.user.cost,
     }
 
     if fixed_count is not None:
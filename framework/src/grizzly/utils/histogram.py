@@ -0,0 +1,143 @@
+"""Histogram with fixed relative accuracy, where values are counted in logarithmically sized buckets.
+
+The size of a histogram only depends on the range of the values, not on the number of values, and two histograms are
+merged by adding the counts of each bucket. The relative error of a percentile is at most `relative_accuracy`.
+"""
+
+from __future__ import annotations
+
+from math import ceil, log
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from grizzly.types import Self, StrDict
+
+
+class Histogram:
+    relative_accuracy: float
+    count: int
+    total: float
+    minimum: float
+    maximum: float
+
+    _gamma: float
+    _log_gamma: float
+    _zero: int
+    _buckets: dict[int, int]
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        assert 0.0 < relative_accuracy < 1.0, 'relative accuracy must be between 0 and 1'
+
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._log_gamma = log(self._gamma)
+        self.clear()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.minimum = 0.0
+        self.maximum = 0.0
+        self._zero = 0
+        self._buckets = {}
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add `count` occurrences of `value`, values less than or equal to 0 are counted as 0."""
+        if self.count == 0:
+            self.minimum = self.maximum = value
+        elif value < self.minimum:
+            self.minimum = value
+        elif value > self.maximum:
+            self.maximum = value
+
+        self.count += count
+        self.total += value * count
+
+        if value <= 0.0:
+            self._zero += count
+            return
+
+        key = ceil(log(value) / self._log_gamma)
+        self._buckets[key] = self._buckets.get(key, 0) + count
+
+    def merge(self, other: Histogram) -> Self:
+        """Add all values in `other`, which must have the same relative accuracy."""
+        assert other.relative_accuracy == self.relative_accuracy, 'can only merge histograms with the same relative accuracy'
+
+        if other.count == 0:
+            return self
+
+        if self.count == 0:
+            self.minimum, self.maximum = other.minimum, other.maximum
+        else:
+            self.minimum = min(self.minimum, other.minimum)
+            self.maximum = max(self.maximum, other.maximum)
+
+        self.count += other.count
+        self.total += other.total
+        self._zero += other._zero
+
+        for key, count in other._buckets.items():
+            self._buckets[key] = self._buckets.get(key, 0) + count
+
+        return self
+
+    def serialize(self) -> StrDict:
+        """Get histogram as a `dict`, e.g. so it can be sent between processes."""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'count': self.count,
+            'total': self.total,
+            'minimum': self.minimum,
+            'maximum': self.maximum,
+            'zero': self._zero,
+            'buckets': [[key, count] for key, count in self._buckets.items()],
+        }
+
+    @classmethod
+    def unserialize(cls, data: StrDict) -> Histogram:
+        """Create histogram from a `dict` created by `Histogram.serialize`."""
+        histogram = cls(relative_accuracy=data['relative_accuracy'])
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.minimum = data['minimum']
+        histogram.maximum = data['maximum']
+        histogram._zero = data['zero']
+        histogram._buckets = {int(key): int(count) for key, count in data['buckets']}
+
+        return histogram
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count > 0 else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Get value at `percent` (between 0.0 and 1.0), the value is never less than the minimum or greater than the maximum value."""
+        if self.count == 0:
+            return 0.0
+
+        rank = max(ceil(percent * self.count), 1)
+
+        if rank == 1:
+            return float(self.minimum)
+
+        if rank >= self.count:
+            return float(self.maximum)
+
+        seen = self._zero
+        value = 0.0
+
+        if rank > seen:
+            value = self.maximum
+
+            for key in sorted(self._buckets):
+                seen += self._buckets[key]
+
+                if seen >= rank:
+                    value = 2.0 * self._gamma**key / (self._gamma + 1.0)
+                    break
+
+        return float(min(max(value, self.minimum), self.maximum))
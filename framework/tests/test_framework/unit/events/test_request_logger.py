@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+import json
+import logging
 from contextlib import suppress
 from os import environ
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pytest
+from gevent import sleep as gsleep
 from grizzly.events import GrizzlyEventHandlerClass, RequestLogger
+from grizzly.events.request_logger import RequestLogWriter
 from grizzly.tasks import RequestTask
 from grizzly.types import RequestMethod
 from grizzly.users import GrizzlyUser
@@ -18,7 +22,9 @@ from test_framework.helpers import rm_rf
 if TYPE_CHECKING:  # pragma: no cover
     from collections.abc import Callable
 
-    from test_framework.fixtures import GrizzlyFixture
+    from _pytest.logging import LogCaptureFixture
+
+    from test_framework.fixtures import GrizzlyFixture, MockerFixture
 
 
 @pytest.fixture
@@ -51,6 +57,19 @@ class TestRequestLogger:
                 h.__class__ is RequestLogger and isinstance(h, GrizzlyEventHandlerClass) and isinstance(h.user, GrizzlyUser) and h.user is parent.user
                 for h in parent.user.events.request._handlers
             )
+
+            # the writer, shared by all users, is closed when quitting, request loggers does not add any listeners
+            writer = RequestLogWriter.instances.pop(log_root)
+            quitting_handlers = parent.user.environment.events.quitting._handlers
+            handler_count = len(quitting_handlers)
+
+            event = RequestLogger(parent.user)
+            RequestLogger(parent.user)
+
+            assert event.writer is not writer
+            assert event.writer is RequestLogWriter.instances[log_root]
+            assert len(quitting_handlers) == handler_count + 1
+            assert quitting_handlers[-1] == event.writer.on_quitting
         finally:
             with suppress(KeyError):
                 del environ['GRIZZLY_LOG_DIR']
@@ -82,7 +101,7 @@ class TestRequestLogger:
         assert RequestLogger._remove_secrets_attribute('hello;SharedAccessKey=foobar;world') == 'hello;SharedAccessKey=*** REMOVED ***;world'
 
     @pytest.mark.usefixtures('get_log_files')
-    def test___call__(self, grizzly_fixture: GrizzlyFixture, get_log_files: Callable[[], list[Path]]) -> None:
+    def test___call__(self, grizzly_fixture: GrizzlyFixture, get_log_files: Callable[[], list[Path]]) -> None:  # noqa: PLR0915
         parent = grizzly_fixture()
         parent.user.host = 'mq://mq.example.org?QueueManager=QMGR01&Channel=SYS.CONN'
 
@@ -95,10 +114,12 @@ class TestRequestLogger:
 
         # no exception, and do not log all requests
         event('test-request', (None, '{}'), request)
+        event.writer.flush()
 
         assert get_log_files() == []
 
         event('[test-request!', (None, '{}'), request, Exception('error message'))
+        event.writer.flush()
 
         log_files = get_log_files()
 
@@ -136,6 +157,7 @@ class TestRequestLogger:
             ),
             request,
         )
+        event.writer.flush()
 
         log_files = get_log_files()
         assert len(log_files) == 1
@@ -191,6 +213,7 @@ execute command foobar"""
                 'response_time': 133.7,
             },
         )
+        event.writer.flush()
 
         log_files = get_log_files()
         assert len(log_files) == 1
@@ -227,3 +250,224 @@ execute command foobar"""
             )
         finally:
             log_file.unlink()
+
+    def test___call___background(self, grizzly_fixture: GrizzlyFixture, get_log_files: Callable[[], list[Path]]) -> None:
+        parent = grizzly_fixture()
+        parent.user.host = 'https://api.example.com'
+
+        event = RequestLogger(parent.user)
+        request = RequestTask(RequestMethod.GET, name='test-request', endpoint='/api/test')
+        request.metadata = {'Authorization': 'Bearer secret'}
+
+        event('test-request', (None, '{}'), request, Exception('error message'))
+
+        # rendered and written by the writer greenlet
+        assert get_log_files() == []
+        assert event.writer.greenlet is not None
+        assert request.metadata == {'Authorization': 'Bearer secret'}
+
+        gsleep(0.01)
+
+        log_files = get_log_files()
+        assert len(log_files) == 1
+
+        try:
+            log_file_contents = log_files[-1].read_text()
+            assert '"Authorization": "*** REMOVED ***"' in log_file_contents
+            assert 'Exception: error message' in log_file_contents
+            assert request.metadata == {'Authorization': 'Bearer secret'}
+        finally:
+            event.writer.on_quitting()
+            assert event.writer.greenlet is None
+
+            for log_file in log_files:
+                log_file.unlink()
+
+    @pytest.mark.parametrize('file_format', ['segment', 'jsonl'])
+    def test___call___segment(self, grizzly_fixture: GrizzlyFixture, file_format: str) -> None:
+        parent = grizzly_fixture()
+        parent.user.host = 'https://api.example.com'
+        parent.user._context['request_log'] = {'format': file_format, 'segment_size': 1500}
+
+        event = RequestLogger(parent.user)
+        request = RequestTask(RequestMethod.GET, name='test-request', endpoint='/api/test')
+        suffix = '.log' if file_format == 'segment' else '.jsonl'
+
+        try:
+            for index in range(10):
+                event('test-request', ({'x-index': index}, '{"hello": "world"}'), request, Exception(f'error {index}'))
+
+            event.writer.on_quitting()
+
+            segments = sorted(event.log_dir.glob(f'requests.*{suffix}'))
+            assert len(segments) > 1
+            assert all(segment.stat().st_size >= 1500 for segment in segments[:-1])
+
+            contents = ''.join(segment.read_text() for segment in segments)
+            assert contents.count('Exception: error') == 10
+
+            if file_format == 'jsonl':
+                records = [json.loads(line) for line in contents.splitlines()]
+                assert [record['response']['metadata'] for record in records] == [{'x-index': index} for index in range(10)]
+                assert {record['name'] for record in records} == {'test-request'}
+                assert all(record['response']['status'] == 'ERROR' for record in records)
+            else:
+                assert '-> GET https://api.example.com/api/test:' in contents
+        finally:
+            for segment in event.log_dir.glob('requests.*'):
+                segment.unlink()
+
+        parent.user._context['request_log'] = {'format': 'foo'}
+
+        with pytest.raises(AssertionError, match=r'request_log\.format must be one of file, segment, jsonl'):
+            event('test-request', (None, '{}'), request, Exception('error'))
+
+    def test___call___error_interval(self, grizzly_fixture: GrizzlyFixture, get_log_files: Callable[[], list[Path]], mocker: MockerFixture) -> None:
+        parent = grizzly_fixture()
+        parent.user.host = 'https://api.example.com'
+        parent.user._context['request_log'] = {'error_interval': 10}
+
+        perf_counter_mock = mocker.patch('grizzly.events.request_logger.perf_counter', return_value=100.0)
+
+        event = RequestLogger(parent.user)
+        event.writer._errors.clear()
+        request = RequestTask(RequestMethod.GET, name='test-request', endpoint='/api/test')
+
+        try:
+            for _ in range(3):
+                event('test-request', (None, '{}'), request, Exception('error message'))
+
+            event('test-request', (None, '{}'), request, Exception('other error message'))
+            event('other-request', (None, '{}'), request, Exception('error message'))
+            event.writer.flush()
+
+            assert len(get_log_files()) == 3
+
+            perf_counter_mock.return_value = 110.0
+            event('test-request', (None, '{}'), request, Exception('error message'))
+            event.writer.flush()
+
+            log_files = get_log_files()
+            assert len(log_files) == 4
+            assert sum(log_file.read_text().count('2 identical error(s) not logged since last time') for log_file in log_files) == 1
+        finally:
+            for log_file in get_log_files():
+                log_file.unlink()
+
+    def test___call___queue_size(
+        self,
+        grizzly_fixture: GrizzlyFixture,
+        get_log_files: Callable[[], list[Path]],
+        mocker: MockerFixture,
+        caplog: LogCaptureFixture,
+    ) -> None:
+        parent = grizzly_fixture()
+        parent.user.host = 'https://api.example.com'
+
+        event = RequestLogger(parent.user)
+        mocker.patch.object(event.writer, 'max_queue_size', 2)
+        request = RequestTask(RequestMethod.GET, name='test-request', endpoint='/api/test')
+
+        try:
+            for index in range(5):
+                event('test-request', (None, '{}'), request, Exception(f'error message {index}'))
+
+            # the writer greenlet has not run yet
+            assert len(event.writer.queue) == 2
+            assert event.writer.dropped == 3
+
+            # stacktrace is formatted before the record is queued
+            for record in event.writer.queue:
+                assert 'exception' not in record
+                assert isinstance(record['variables']['stacktrace'], str)
+
+            assert [record['variables']['stacktrace'].strip().rsplit('\n', 1)[-1] for record in event.writer.queue] == [
+                'Exception: error message 0',
+                'Exception: error message 1',
+            ]
+
+            with caplog.at_level(logging.WARNING):
+                event.writer.flush()
+
+            assert caplog.messages == ['dropped 3 request logs, since more than 2 request logs were waiting to be written']
+            assert event.writer.dropped == 0
+            assert len(get_log_files()) == 2
+        finally:
+            for log_file in get_log_files():
+                log_file.unlink()
+
+    def test__truncate(self) -> None:
+        assert RequestLogger._truncate(None, 10) is None
+        assert RequestLogger._truncate('hello world', 0) == 'hello world'
+        assert RequestLogger._truncate('hello world', 11) == 'hello world'
+        assert RequestLogger._truncate('hello world', 4) == 'he\n... 7 characters truncated ...\nld'
+        assert RequestLogger._truncate('hello world', 5) == 'he\n... 6 characters truncated ...\nrld'
+        assert RequestLogger._truncate(b'hello world', 4) == b'he\n... 7 characters truncated ...\nld'
+        assert RequestLogger._truncate({'hello': 'world'}, 4) == {'hello': 'world'}
+
+    def test___call___sampling(self, grizzly_fixture: GrizzlyFixture, get_log_files: Callable[[], list[Path]], mocker: MockerFixture) -> None:
+        parent = grizzly_fixture()
+        parent.user.host = 'https://api.example.com'
+        parent.user._context.update({'log_all_requests': True, 'request_log': {'sample_rate': 3, 'max_payload_size': 10}})
+
+        perf_counter_mock = mocker.patch('grizzly.events.request_logger.perf_counter', return_value=100.0)
+
+        event = RequestLogger(parent.user)
+        event.writer._sampled.clear()
+        event.writer._rates.clear()
+        request = RequestTask(RequestMethod.GET, name='test-request', endpoint='/api/test')
+
+        try:
+            # every 3rd successful request, per request name, and all failed requests
+            for _ in range(7):
+                event('test-request', (None, 'a' * 100), request)
+
+            event('other-request', (None, '{}'), request)
+            event('test-request', (None, '{}'), request, Exception('error message'))
+            event.writer.flush()
+
+            log_files = get_log_files()
+            assert len(log_files) == 5
+            assert sum(log_file.read_text().count('aaaaa\n... 90 characters truncated ...\naaaaa') for log_file in log_files) == 3
+
+            for log_file in log_files:
+                log_file.unlink()
+
+            # at most 2 successful requests per second, per request name
+            parent.user._context['request_log'] = {'max_per_second': 2}
+
+            for _ in range(5):
+                event('test-request', (None, '{}'), request)
+
+            event.writer.flush()
+            assert len(get_log_files()) == 2
+
+            perf_counter_mock.return_value = 101.0
+            event('test-request', (None, '{}'), request)
+            event.writer.flush()
+            assert len(get_log_files()) == 3
+
+            for log_file in get_log_files():
+                log_file.unlink()
+
+            # random sample of 3 successful requests, per request name, logged when quitting
+            parent.user._context['request_log'] = {'reservoir': 3, 'format': 'jsonl'}
+
+            for index in range(20):
+                event('test-request', ({'x-index': index}, '{}'), request)
+
+            event('other-request', (None, '{}'), request)
+            event.writer.flush()
+
+            assert list(event.log_dir.glob('requests.*.jsonl')) == []
+
+            event.writer.on_quitting()
+
+            records = [json.loads(line) for segment in event.log_dir.glob('requests.*.jsonl') for line in segment.read_text().splitlines()]
+            assert len(records) == 4
+            assert sorted(record['name'] for record in records) == ['other-request', 'test-request', 'test-request', 'test-request']
+            assert len({record['response']['metadata']['x-index'] for record in records if record['name'] == 'test-request'}) == 3
+            assert event.writer._reservoirs == {}
+        finally:
+            for log_file in [*get_log_files(), *event.log_dir.glob('requests.*')]:
+                log_file.unlink(missing_ok=True)
@@ -12,6 +12,7 @@ from typing import TYPE_CHECKING
 
 import pytest
 from grizzly.events import GrizzlyEventHandlerClass
+from grizzly.events.request_logger import RequestLogWriter
 from grizzly.events.response_handler import ResponseHandler, ResponseHandlerAction, SaveHandlerAction, ValidationHandlerAction
 from grizzly.exceptions import ResponseHandlerError, RestartScenario
 from grizzly.tasks import RequestTask
@@ -67,6 +68,14 @@ class TestResponseHandlerAction:
         assert handler.expression == '$.'
         assert handler.match_with == '.*'
         assert handler.expected_matches == '1'
+        assert not handler._render_expression
+        assert not handler._render_match_with
+        assert handler._expected_matches == 1
+
+        handler_template = TestResponseHandlerAction.Dummy('$.{{ property }}', '{{ value }}', '{{ count }}')
+        assert handler_template._render_expression
+        assert handler_template._render_match_with
+        assert handler_template._expected_matches is None
 
         with pytest.raises(NotImplementedError, match='Dummy has not implemented __call__'):
             handler((TransformerContentType.JSON, None), user)
@@ -739,6 +748,9 @@ class TestResponseHandler:
                 request,
             )
 
+        for writer in RequestLogWriter.instances.values():
+            writer.flush()
+
         log_files = get_log_files()
 
         assert len(log_files) == 1
@@ -11,19 +11,23 @@ import pytest
 from grizzly.auth import RefreshTokenDistributor
 from grizzly.context import GrizzlyContextScenarioResponseTimePercentile
 from grizzly.listeners import (
+    get_worker_capacity,
     init,
     init_statistics_listener,
     locust_quit,
     locust_test_start,
     spawning_complete,
     validate_result,
+    worker_capacity,
 )
+from grizzly.listeners.saturation import SaturationMonitor, WorkerSaturation
+from grizzly.listeners.stats import HistogramStats
 from grizzly.testdata.communication import TestdataConsumer, TestdataProducer
 from grizzly.types import MessageDirection
 from grizzly.types.behave import Scenario, Status
 from grizzly.types.locust import Environment, LocalRunner, MasterRunner, Message, WorkerRunner
 from locust.runners import STATE_RUNNING, WorkerNode
-from locust.stats import RequestStats, StatsError
+from locust.stats import RequestStats, StatsEntry, StatsError
 
 from test_framework.helpers import SOME
 
@@ -74,6 +78,7 @@ def test_init_master(caplog: LogCaptureFixture, grizzly_fixture: GrizzlyFixture)
         assert grizzly.state.spawning_complete.locked()
         assert grizzly.state.producer is not None
         assert grizzly.state.locust.custom_messages == {
+            'worker_capacity': (worker_capacity, False),
             'produce_token': (RefreshTokenDistributor.handle_request, True),
         }
 
@@ -107,6 +112,7 @@ def test_init_master(caplog: LogCaptureFixture, grizzly_fixture: GrizzlyFixture)
         assert grizzly.state.locust.custom_messages == cast(
             'dict[str, tuple[Callable, bool]]',
             {
+                'worker_capacity': (worker_capacity, False),
                 'test_message': (callback, True),
                 'produce_token': (RefreshTokenDistributor.handle_request, True),
             },
@@ -119,7 +125,7 @@ def test_init_master(caplog: LogCaptureFixture, grizzly_fixture: GrizzlyFixture)
 
 
 @pytest.mark.usefixtures('_listener_test_mocker')
-def test_init_worker(grizzly_fixture: GrizzlyFixture) -> None:
+def test_init_worker(grizzly_fixture: GrizzlyFixture, mocker: MockerFixture) -> None:
     grizzly_fixture()
     runner: WorkerRunner | None = None
 
@@ -130,6 +136,7 @@ def test_init_worker(grizzly_fixture: GrizzlyFixture) -> None:
         assert callable(init_function)
 
         runner = WorkerRunner(grizzly_fixture.behave.locust.environment, 'localhost', 5555)
+        runner_client_send = mocker.patch('locust.runners.rpc.Client.send', return_value=None)
 
         grizzly.state.locust = runner
 
@@ -138,7 +145,11 @@ def test_init_worker(grizzly_fixture: GrizzlyFixture) -> None:
         init_function(runner)
 
         assert grizzly.state.spawning_complete.locked()
+        assert grizzly.state.saturation is None
         assert environ.get('TESTDATA_PRODUCER_ADDRESS', None) is None
+        runner_client_send.assert_called_once_with(
+            SOME(Message, type='worker_capacity', data={'capacity': get_worker_capacity()}, node_id=runner.client_id),
+        )
         assert runner.custom_messages == cast(
             'dict[str, tuple[Callable, bool]]',
             {
@@ -213,9 +224,23 @@ def test_init_local(grizzly_fixture: GrizzlyFixture) -> None:
     grizzly.setup.locust.messages.register(MessageDirection.CLIENT_SERVER, 'test_message', callback)
     grizzly.setup.locust.messages.register(MessageDirection.SERVER_CLIENT, 'test_message_ack', callback_ack)
 
+    grizzly.setup.response_time_histograms = True
+    grizzly.setup.max_worker_saturation = 5.0
+
     init_function(grizzly.state.locust)
 
     assert grizzly.state.spawning_complete.locked()
+    assert isinstance(grizzly.state.histograms, HistogramStats)
+    grizzly.state.locust.environment.events.request.remove_listener(grizzly.state.histograms.on_request)
+    grizzly.state.histograms = None
+
+    assert isinstance(grizzly.state.saturation, SaturationMonitor)
+    assert grizzly.state.saturation.max_saturation == 5.0
+    grizzly.state.locust.environment.events.test_start.remove_listener(grizzly.state.saturation.on_test_start)
+    grizzly.state.locust.environment.events.test_stop.remove_listener(grizzly.state.saturation.on_test_stop)
+    grizzly.state.saturation = None
+    grizzly.setup.max_worker_saturation = None
+
     assert grizzly.state.locust.custom_messages == cast(
         'dict[str, tuple[Callable, bool]]',
         {
@@ -289,6 +314,16 @@ def test_init_statistics_listener(mocker: MockerFixture, locust_fixture: LocustF
     finally:
         environment.events.quit.fire(exit_code=0)
 
+    try:
+        grizzly.setup.statistics_url = 'file://logs/metrics?Testplan=test'
+        init_statistics_listener(grizzly.setup.statistics_url)(environment)
+        assert len(environment.events.request._handlers) == 4
+        assert len(environment.events.quitting._handlers) == 0
+        assert len(environment.events.quit._handlers) == 3
+        assert len(environment.events.spawning_complete._handlers) == 0
+    finally:
+        environment.events.quit.fire(exit_code=0)
+
 
 @pytest.mark.usefixtures('_listener_test_mocker')
 def test_locust_test_start(grizzly_fixture: GrizzlyFixture, caplog: LogCaptureFixture) -> None:
@@ -430,6 +465,102 @@ def test_validate_result(mocker: MockerFixture, caplog: LogCaptureFixture, grizz
     grizzly.scenario.behave.set_status(Status.passed)
 
 
+def test_validate_result_histograms(caplog: LogCaptureFixture, grizzly_fixture: GrizzlyFixture, mocker: MockerFixture) -> None:
+    grizzly_fixture()
+
+    grizzly = grizzly_fixture.grizzly
+    grizzly.scenarios.clear()
+
+    environment = grizzly.state.locust.environment
+    environment.stats = RequestStats()
+    grizzly.state.histograms = HistogramStats(environment)
+
+    try:
+        for response_time in range(1, 101):
+            environment.events.request.fire(request_type='GET', name='001 Read', response_time=response_time, response_length=10, exception=None, context={})
+
+        assert environment.stats.get('001 Read', 'GET').num_requests == 100
+        assert len(grizzly.state.histograms.get('001 Read', 'GET')) == 100
+
+        scenario = Scenario(None, None, '', 'do some gets')
+        grizzly.scenarios.create(scenario)
+        grizzly.scenario.validation.response_time_percentile = GrizzlyContextScenarioResponseTimePercentile(90, 0.95)
+
+        validate_result_wrapper: Callable[..., None] = validate_result(grizzly)
+        get_response_time_percentile_spy = mocker.spy(StatsEntry, 'get_response_time_percentile')
+
+        environment.process_exit_code = 0
+
+        with caplog.at_level(logging.INFO):
+            validate_result_wrapper(environment)
+
+        # percentiles are taken from the histograms, the scenario total is still extended with locust statistics
+        get_response_time_percentile_spy.assert_not_called()
+        total = next(message.split() for message in caplog.messages if message.startswith('         001 '))
+        assert total[:9] == ['001', '100', '0(0.00%)', '|', '50', '1', '100', '50', '|']
+        assert 'scenario 001 failed due to 95%-tile response time 95 ms > 90 ms' in caplog.messages
+        assert 'Response time percentiles (approximated)' in caplog.messages
+        assert any(message.startswith('GET      001 Read') and message.endswith('100') for message in caplog.messages)
+        assert environment.process_exit_code == 1
+        assert grizzly.scenario.behave.status == Status.failed
+        caplog.clear()
+
+        environment.process_exit_code = 0
+        grizzly.scenario.behave.set_status(Status.passed)
+        grizzly.scenario.validation.response_time_percentile = GrizzlyContextScenarioResponseTimePercentile(95, 0.95)
+
+        with caplog.at_level(logging.ERROR):
+            validate_result_wrapper(environment)
+
+        assert caplog.messages == []
+        assert environment.process_exit_code == 0
+        assert grizzly.scenario.behave.status == Status.passed
+    finally:
+        environment.events.request.remove_listener(grizzly.state.histograms.on_request)
+        grizzly.state.histograms = None
+
+
+def test_validate_result_saturation(caplog: LogCaptureFixture, grizzly_fixture: GrizzlyFixture) -> None:
+    grizzly_fixture()
+
+    grizzly = grizzly_fixture.grizzly
+    grizzly.scenarios.clear()
+    grizzly.scenarios.create(Scenario(None, None, '', 'do some gets'))
+
+    environment = grizzly.state.locust.environment
+    environment.stats = RequestStats()
+
+    monitor = SaturationMonitor(environment, max_saturation=10.0)
+    monitor.workers = {
+        'worker-1': WorkerSaturation(samples=20, saturated=5, lag_max=0.5, cpu_time=13.0, wall_time=20.0, greenlets_max=120),
+        'worker-2': WorkerSaturation(samples=20, saturated=1, lag_max=0.01, cpu_time=4.0, wall_time=20.0, greenlets_max=50),
+    }
+    grizzly.state.saturation = monitor
+
+    try:
+        validate_result_wrapper: Callable[..., None] = validate_result(grizzly)
+        environment.process_exit_code = 0
+
+        with caplog.at_level(logging.INFO):
+            validate_result_wrapper(environment)
+
+        assert [message.split() for message in caplog.messages if message.startswith('worker-')] == [
+            ['worker-1', '25%', '5/20', '500', '65%', '120'],
+            ['worker-2', '5%', '1/20', '10', '20%', '50'],
+        ]
+        assert (
+            'worker worker-1 was saturated 25% of the test (5 of 20 seconds), response times might be affected by the load generator: '
+            'max event loop lag 500 ms, average CPU usage 65%, max 120 greenlets'
+        ) in caplog.messages
+        # saturated workers are only warned about
+        assert environment.process_exit_code == 0
+        assert grizzly.scenario.behave.status == Status.passed
+    finally:
+        environment.events.test_start.remove_listener(monitor.on_test_start)
+        environment.events.test_stop.remove_listener(monitor.on_test_stop)
+        grizzly.state.saturation = None
+
+
 def test_locust_quit_non_worker(locust_fixture: LocustFixture, caplog: LogCaptureFixture) -> None:
     environment = locust_fixture.environment
 
@@ -496,3 +627,53 @@ def test_locust_quit_worker(locust_fixture: LocustFixture, caplog: LogCaptureFix
 
     assert log_messages == ['received locust_quit message from master, quitting', 'Sending quit message to master']
     caplog.clear()
+
+
+def test_get_worker_capacity(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv('GRIZZLY_WORKER_CAPACITY', raising=False)
+
+    assert get_worker_capacity() >= 1.0
+
+    monkeypatch.setenv('GRIZZLY_WORKER_CAPACITY', '2.5')
+
+    assert get_worker_capacity() == 2.5
+
+
+@pytest.mark.usefixtures('_listener_test_mocker')
+def test_worker_capacity(locust_fixture: LocustFixture, caplog: LogCaptureFixture) -> None:
+    environment = locust_fixture.environment
+
+    with caplog.at_level(logging.ERROR):
+        worker_capacity(environment, Message(message_type='worker_capacity', data={'capacity': 4}, node_id='worker-1'))
+
+    assert caplog.messages == ['received worker_capacity message on non-master node']
+    caplog.clear()
+
+    runner = MasterRunner(environment, '0.0.0.0', 5555)
+    environment.runner = runner
+
+    try:
+        with caplog.at_level(logging.WARNING):
+            worker_capacity(environment, Message(message_type='worker_capacity', data={'capacity': 4}, node_id='worker-1'))
+
+        assert caplog.messages == ['received worker_capacity message from unknown worker worker-1']
+        caplog.clear()
+
+        worker_node = WorkerNode('worker-1')
+        runner.clients['worker-1'] = worker_node
+
+        with caplog.at_level(logging.WARNING):
+            worker_capacity(environment, Message(message_type='worker_capacity', data={'capacity': 0}, node_id='worker-1'))
+            worker_capacity(environment, Message(message_type='worker_capacity', data={}, node_id='worker-1'))
+
+        assert caplog.messages == [
+            "worker worker-1 reported an invalid capacity: {'capacity': 0}",
+            'worker worker-1 reported an invalid capacity: {}',
+        ]
+        assert not hasattr(worker_node, 'capacity')
+
+        worker_capacity(environment, Message(message_type='worker_capacity', data={'capacity': 4}, node_id='worker-1'))
+
+        assert getattr(worker_node, 'capacity', None) == 4.0
+    finally:
+        runner.quit()
@@ -6,7 +6,6 @@ import logging
 import os
 import socket
 from contextlib import suppress
-from datetime import datetime, timezone
 from itertools import cycle
 from json import dumps as jsondumps
 from platform import node as get_hostname
@@ -15,14 +14,26 @@ from unittest.mock import patch
 
 import pytest
 from gevent.event import Event
-from grizzly.listeners.influxdb import InfluxDbError, InfluxDbListener, InfluxDbPoint, InfluxDbV1, InfluxDbV2
+from grizzly.listeners.influxdb import (
+    InfluxDbError,
+    InfluxDbListener,
+    InfluxDbPoint,
+    InfluxDbV1,
+    InfluxDbV2,
+    encode_field_value,
+    encode_line,
+    encode_point,
+    encode_tag_set,
+    to_isoformat,
+    to_nanoseconds,
+)
 from grizzly.types.locust import CatchResponseError
 from influxdb.exceptions import InfluxDBClientError
 from influxdb_client.client.query_api import QueryApi
 from influxdb_client.client.write_api import WriteApi
 from influxdb_client.rest import ApiException
 
-from test_framework.helpers import ANY, SOME
+from test_framework.helpers import ANY
 
 if TYPE_CHECKING:  # pragma: no cover
     from collections.abc import Callable
@@ -60,6 +71,48 @@ def patch_influxdblistener(mocker: MockerFixture) -> Callable[[], None]:
     return wrapper
 
 
+def test_to_nanoseconds() -> None:
+    assert to_nanoseconds(1337) == 1337
+    assert to_nanoseconds('1970-01-01T00:00:01Z') == 1_000_000_000
+    assert to_nanoseconds('1970-01-01T00:00:01.000001') == 1_000_001_000
+    assert to_nanoseconds('1970-01-01T01:00:01+01:00') == 1_000_000_000
+
+
+def test_to_isoformat() -> None:
+    assert to_isoformat(1_000_001_999) == '1970-01-01T00:00:01.000001+00:00'
+    assert to_isoformat(to_nanoseconds('2022-12-16T10:28:00.123456+00:00')) == '2022-12-16T10:28:00.123456+00:00'
+
+
+def test_encode_tag_set() -> None:
+    assert encode_tag_set('request', {}) == 'request'
+    assert encode_tag_set('my request,foo', {'b': 'x', 'a': 'y'}) == 'my\\ request\\,foo,a=y,b=x'
+    assert encode_tag_set('request', {'name': 'a b,c=d\\e', 'empty': '', 'none': None, 'user': 1}) == 'request,name=a\\ b\\,c\\=d\\\\e,user=1'
+
+
+def test_encode_field_value() -> None:
+    assert encode_field_value(None) is None
+    assert encode_field_value(True) == 'true'  # noqa: FBT003
+    assert encode_field_value(False) == 'false'  # noqa: FBT003
+    assert encode_field_value(1337) == '1337i'
+    assert encode_field_value(13.37) == '13.37'
+    assert encode_field_value('hello "world"\\') == '"hello \\"world\\"\\\\"'
+
+
+def test_encode_line() -> None:
+    assert encode_line('request,name=test', {'value': 1, 'none': None, 'my field': 'a\nb'}, 1337) == b'request,name=test value=1i,my\\ field="a\\nb" 1337'
+
+
+def test_encode_point() -> None:
+    point: InfluxDbPoint = {
+        'measurement': 'heartbeat',
+        'tags': {'direction': 'sent', 'client_id': 'worker-1'},
+        'time': '1970-01-01T00:00:01+00:00',
+        'fields': {'value': 1},
+    }
+
+    assert encode_point(point) == b'heartbeat,client_id=worker-1,direction=sent value=1i 1000000000'
+
+
 class TestInfluxDbV1:
     def test___init__(self) -> None:
         client = InfluxDbV1('https://influx.example.com', 1232, 'testdb')
@@ -146,8 +199,8 @@ class TestInfluxDbV1:
         test_query('monitor', ['cpu_idle', 'cpu_user', 'cpu_system'])
 
     def test_write(self, mocker: MockerFixture) -> None:
-        mocker.patch(
-            'grizzly.listeners.influxdb.InfluxDBClientV1.write_points',
+        write_mock = mocker.patch(
+            'grizzly.listeners.influxdb.InfluxDBClientV1.write',
             return_value=None,
         )
 
@@ -167,14 +220,22 @@ class TestInfluxDbV1:
 
         influx.write([])
 
+        write_mock.assert_called_once_with('', params={'db': 'testdb', 'precision': 'n'}, protocol='line')
+        write_mock.reset_mock()
+
+        mocker.patch('logging.Logger.debug', return_value=None)
+        influx.write([b'test value=1i 1000', b'test value=2i 2000'])
+
+        write_mock.assert_called_once_with('test value=1i 1000\ntest value=2i 2000', params={'db': 'testdb', 'precision': 'n'}, protocol='line')
+
         def generate_write_error(content: StrDict, code: int | None = 500) -> None:
             raw_content = jsondumps(content)
 
-            def write_error(_instance: InfluxDBClient, _values: list[StrDict]) -> None:
+            def write_error(_instance: InfluxDBClient, *_args: Any, **_kwargs: Any) -> None:
                 raise InfluxDBClientError(raw_content, code)
 
             mocker.patch(
-                'grizzly.listeners.influxdb.InfluxDBClientV1.write_points',
+                'grizzly.listeners.influxdb.InfluxDBClientV1.write',
                 write_error,
             )
 
@@ -293,6 +354,14 @@ class TestInfluxDbV2:
 
         influx.write([])
 
+        write_api_mock.write.assert_called_once_with(bucket='testdb', org='org', record=b'')
+        write_api_mock.write.reset_mock()
+
+        mocker.patch('logging.Logger.debug', return_value=None)
+        influx.write([b'test value=1i 1000', b'test value=2i 2000'])
+
+        write_api_mock.write.assert_called_once_with(bucket='testdb', org='org', record=b'test value=1i 1000\ntest value=2i 2000')
+
         def generate_write_error(raw_content: str | None, code: int | None = 500) -> None:
             write_api_mock.write.side_effect = [ApiException(reason=raw_content, status=code)]
 
@@ -313,31 +382,40 @@ class TestInfluxDbV2:
 
 class TestInfluxDblistener:
     @pytest.mark.usefixtures('patch_influxdblistener')
-    def test___init__(self, locust_fixture: LocustFixture, patch_influxdblistener: Callable[[], None]) -> None:
-        with pytest.raises(AssertionError, match='hostname not found in'):
+    def test___init__(self, locust_fixture: LocustFixture, patch_influxdblistener: Callable[[], None]) -> None:  # noqa: PLR0915
+        with pytest.raises(AssertionError, match='"" is not a supported scheme'):
             InfluxDbListener(locust_fixture.environment, '')
 
+        with pytest.raises(AssertionError, match='hostname not found in'):
+            InfluxDbListener(locust_fixture.environment, 'influxdb:///testdb')
+
         with pytest.raises(AssertionError, match='database was not found in'):
-            InfluxDbListener(locust_fixture.environment, 'https://influx.test.com')
+            InfluxDbListener(locust_fixture.environment, 'influxdb://influx.test.com')
 
         with pytest.raises(AssertionError, match='Testplan was not found in'):
-            InfluxDbListener(locust_fixture.environment, 'https://influx.test.com/testdb')
+            InfluxDbListener(locust_fixture.environment, 'influxdb://influx.test.com/testdb')
 
         patch_influxdblistener()
 
         assert len(locust_fixture.environment.events.request._handlers) == 1  # interally added handler for deprecated request events
 
-        listener = InfluxDbListener(locust_fixture.environment, 'https://influx.test.com/testdb?Testplan=unittest-plan')
+        listener = InfluxDbListener(locust_fixture.environment, 'influxdb://influx.test.com/testdb?Testplan=unittest-plan')
 
         try:
             assert len(locust_fixture.environment.events.request._handlers) == 2
-            assert listener.influx_port == 8086
+            assert isinstance(listener.connection, InfluxDbV1)
+            assert listener.connection.host == 'influx.test.com'
+            assert listener.connection.port == 8086
+            assert listener.connection.database == 'testdb'
             assert listener._testplan == 'unittest-plan'
             assert listener._target_environment is None
             assert listener._hostname == socket.gethostname()
             assert listener.environment is locust_fixture.environment
             assert listener._username == os.getenv('USER', 'unknown')
-            assert listener._events == []
+            assert len(listener._events) == 0
+            assert listener._events.maxlen == 100_000
+            assert listener.max_queue_size == 100_000
+            assert listener.max_batch_size == 5000
             assert listener._profile_name == ''
             assert listener._description == ''
         finally:
@@ -347,19 +425,34 @@ class TestInfluxDblistener:
 
         locust_fixture.environment.events.request._handlers.pop()
 
+        with pytest.raises(AssertionError, match='MaxBatchSize must be greater than 0 in'):
+            InfluxDbListener(locust_fixture.environment, 'influxdb://influx.test.com/testdb?Testplan=unittest-plan&MaxBatchSize=0')
+
+        with pytest.raises(AssertionError, match='Overflow must be either drop or spill in'):
+            InfluxDbListener(locust_fixture.environment, 'influxdb://influx.test.com/testdb?Testplan=unittest-plan&Overflow=foo')
+
+        with pytest.raises(AssertionError, match='MaxQueueSize must be greater than or equal to MaxBatchSize in'):
+            InfluxDbListener(locust_fixture.environment, 'influxdb://influx.test.com/testdb?Testplan=unittest-plan&MaxBatchSize=10&MaxQueueSize=5')
+
+        with pytest.raises(AssertionError, match='AggregationInterval must be greater than 0 in'):
+            InfluxDbListener(locust_fixture.environment, 'influxdb://influx.test.com/testdb?Testplan=unittest-plan&AggregationInterval=0')
+
         listener = InfluxDbListener(
             locust_fixture.environment,
-            'https://influx.test.com:1239/testdb?Testplan=unittest-plan&TargetEnvironment=local&ProfileName=unittest-profile&Description=unittesting',
+            'influxdb://influx.test.com:1239/testdb?Testplan=unittest-plan&TargetEnvironment=local&ProfileName=unittest-profile&Description=unittesting&MaxBatchSize=10&MaxQueueSize=20',
         )
         try:
             assert len(locust_fixture.environment.events.request._handlers) == 2
-            assert listener.influx_port == 1239
+            assert listener.max_batch_size == 10
+            assert listener.max_queue_size == 20
+            assert listener._events.maxlen == 20
+            assert listener.connection.port == 1239
             assert listener._testplan == 'unittest-plan'
             assert listener._target_environment == 'local'
             assert listener._hostname == socket.gethostname()
             assert listener.environment is locust_fixture.environment
             assert listener._username == os.getenv('USER', 'unknown')
-            assert listener._events == []
+            assert len(listener._events) == 0
             assert listener._profile_name == 'unittest-profile'
             assert listener._description == 'unittesting'
         finally:
@@ -380,7 +473,7 @@ class TestInfluxDblistener:
 
         listener = InfluxDbListener(
             locust_fixture.environment,
-            'https://influx.test.com:1240/testdb?Testplan=unittest-plan&TargetEnvironment=local&ProfileName=unittest-profile&Description=unittesting',
+            'influxdb://influx.test.com:1240/testdb?Testplan=unittest-plan&TargetEnvironment=local&ProfileName=unittest-profile&Description=unittesting',
         )
         quit_event_mock = mocker.MagicMock(spec=Event)
         listener._quit_event = quit_event_mock
@@ -437,9 +530,8 @@ class TestInfluxDblistener:
 
         listener = InfluxDbListener(
             locust_fixture.environment,
-            'https://influx.test.com:1241/testdb?Testplan=unittest-plan&TargetEnvironment=local&ProfileName=unittest-profile&Description=unittesting',
+            'influxdb://influx.test.com:1241/testdb?Testplan=unittest-plan&TargetEnvironment=local&ProfileName=unittest-profile&Description=unittesting',
         )
-        listener._events = []
         quit_event_mock = mocker.MagicMock(spec=Event)
         quit_event_mock.is_set.side_effect = cycle([False, True])
         listener._quit_event = quit_event_mock
@@ -468,6 +560,249 @@ class TestInfluxDblistener:
                 listener._events.clear()
                 listener.destroy_client()
 
+    @pytest.mark.usefixtures('patch_influxdblistener')
+    def test_flush(self, locust_fixture: LocustFixture, patch_influxdblistener: Callable[[], None], mocker: MockerFixture) -> None:
+        patch_influxdblistener()
+
+        listener = InfluxDbListener(
+            locust_fixture.environment,
+            'influxdb://influx.test.com:1242/testdb?Testplan=unittest-plan&MaxBatchSize=4&MaxQueueSize=10',
+        )
+
+        def create_point(index: int) -> InfluxDbPoint:
+            return {'measurement': 'test', 'tags': {}, 'time': index, 'fields': {'value': index}}
+
+        def value(line: bytes) -> int:
+            return int(line.split(b' ')[1][6:-1])
+
+        written: list[list[bytes]] = []
+
+        def write(values: list[bytes]) -> None:
+            # producers are not blocked while writing
+            assert not listener.lock.locked()
+            listener.queue_event(create_point(100))
+            written.append(values)
+
+        write_mock = mocker.patch.object(listener.connection, 'write', side_effect=write)
+
+        try:
+            # nothing queued, nothing written
+            listener.flush()
+            write_mock.assert_not_called()
+
+            # oldest points are dropped when the queue is full
+            listener.queue_event([create_point(index) for index in range(8)])
+            listener.queue_event([create_point(index) for index in range(8, 12)])
+            listener.queue_event(create_point(12))
+
+            assert len(listener._events) == 10
+            assert listener._dropped == 3
+
+            listener.flush()
+
+            assert [len(batch) for batch in written] == [4, 4, 3]
+            assert [value(line) for batch in written for line in batch if line.startswith(b'test ')] == list(range(3, 13))
+            assert written[-1][-1].startswith(b'influxdb_listener,')
+            assert b',testplan=unittest-plan queue_depth=10i,dropped=3i,spilled=0i,write_time=0.0 ' in written[-1][-1]
+            assert listener.points_dropped == 3
+            assert listener.points_written == 11
+            assert listener.write_time > 0.0
+            assert listener._dropped == 0
+            # queued while writing
+            assert [value(line) for line in listener._events] == [100, 100, 100]
+
+            # points that was not written are put back in front of the queue
+            listener._events.clear()
+            written.clear()
+            write_mock.side_effect = [None, InfluxDbError('failed')]
+            listener.queue_event([create_point(index) for index in range(6)])
+            listener.flush()
+
+            assert [value(line) for line in listener._events] == [4, 5]
+            assert listener.points_written == 15
+
+            # ... unless quitting
+            listener._quit_event.set()
+            write_mock.side_effect = [InfluxDbError('failed')]
+            listener.flush()
+
+            assert len(listener._events) == 0
+        finally:
+            with suppress(Exception):
+                listener._events.clear()
+                listener.destroy_client()
+
+    @pytest.mark.usefixtures('patch_influxdblistener')
+    def test_spill(self, locust_fixture: LocustFixture, patch_influxdblistener: Callable[[], None], mocker: MockerFixture, caplog: LogCaptureFixture) -> None:  # noqa: PLR0915
+        patch_influxdblistener()
+
+        listener = InfluxDbListener(
+            locust_fixture.environment,
+            'influxdb://influx.test.com:1242/testdb?Testplan=unittest-plan&MaxBatchSize=2&MaxQueueSize=2&Overflow=spill',
+        )
+
+        assert listener.journal is not None
+        journal = listener.journal
+        journal_path = locust_fixture._test_context_root / 'logs' / 'metrics-journal'
+
+        assert journal.path == journal_path
+        assert journal.prefix == f'{get_hostname()}-{os.getpid()}'
+
+        write_mock = mocker.patch.object(listener.connection, 'write', side_effect=InfluxDbError('failed'))
+        quit_event_mock = mocker.MagicMock(spec=Event)
+        listener._quit_event = quit_event_mock
+        mocker.patch('gevent.sleep', return_value=None)
+
+        try:
+            append_spy = mocker.spy(journal, 'append')
+
+            # the queue holds twice as many points when spilling, points are never written to the journal when they are queued
+            listener.queue_event([b'a value=1i 1', b'a value=2i 2'])
+            listener.queue_event([b'a value=3i 3', b'a value=4i 4', b'a value=5i 5'])
+
+            assert list(listener._events) == [b'a value=2i 2', b'a value=3i 3', b'a value=4i 4', b'a value=5i 5']
+            assert listener._dropped == 1
+            assert listener.points_spilled == 0
+            append_spy.assert_not_called()
+            assert len(journal) == 0
+
+            # points that could not be written are written to the journal
+            listener.flush()
+
+            assert len(listener._events) == 0
+            assert listener.points_spilled == 5
+            assert listener.points_dropped == 1
+            assert not listener._sink_healthy
+            assert journal.append([]) == 0
+            assert [line.split(b',')[0] for line in (journal_path / f'{journal.prefix}-00000001.lp').read_bytes().splitlines()] == [
+                b'a value=2i 2',
+                b'a value=3i 3',
+                b'a value=4i 4',
+                b'a value=5i 5',
+                b'influxdb_listener',
+            ]
+
+            # points queued while writing, above the max queue size, are written to the journal by the writer
+            def write_slowly(_values: list[bytes]) -> None:
+                listener.queue_event([b'd value=1i 1', b'd value=2i 2', b'd value=3i 3'])
+
+            write_mock.side_effect = write_slowly
+            listener.queue_event([b'd value=0i 0'])
+            listener.flush()
+
+            assert listener._sink_healthy
+            assert list(listener._events) == [b'd value=2i 2', b'd value=3i 3']
+            assert listener.points_spilled == 6
+            assert (journal_path / f'{journal.prefix}-00000001.lp').read_bytes().splitlines()[-1] == b'd value=1i 1'
+
+            listener._events.clear()
+            write_mock.side_effect = InfluxDbError('failed')
+            listener._sink_healthy = False
+
+            # not replayed until InfluxDB has recovered
+            write_mock.reset_mock()
+            quit_event_mock.is_set.side_effect = cycle([False, True])
+            listener.run_replay()
+
+            write_mock.assert_not_called()
+            assert len(journal) == 1
+
+            write_mock.reset_mock()
+            write_mock.side_effect = None
+            listener._sink_healthy = True
+            quit_event_mock.is_set.side_effect = cycle([False, False, False, True])
+            listener.run_replay()
+
+            assert write_mock.call_count == 3
+            assert listener.points_replayed == 6
+            assert len(journal) == 0
+            assert list(journal_path.iterdir()) == []
+
+            # replay fails
+            journal.append([b'b value=1i 1'])
+            write_mock.side_effect = InfluxDbError('failed')
+            quit_event_mock.is_set.side_effect = cycle([False, False, True])
+
+            with caplog.at_level(logging.ERROR):
+                listener.run_replay()
+
+            assert 'failed to replay metrics journal' in caplog.text
+            assert not listener._sink_healthy
+            assert len(journal.sealed) == 1
+
+            # what is left when quitting is written to the journal
+            quit_event_mock.is_set.side_effect = None
+            quit_event_mock.is_set.return_value = True
+            listener.queue_event([b'c value=1i 1'])
+            listener.run_events_greenlet = listener.run_user_count_greenlet = listener.run_replay_greenlet = mocker.MagicMock()
+            caplog.clear()
+
+            with caplog.at_level(logging.WARNING):
+                listener.destroy_client()
+
+            assert len(listener._events) == 0
+            assert len(journal.sealed) == 2
+            assert f'2 metrics journal segments was not replayed, replay them with: grizzly-cli replay --journal {journal_path.as_posix()} <url>' in caplog.text
+        finally:
+            with suppress(Exception):
+                listener._events.clear()
+                listener.destroy_client()
+
+    def test_aggregation(self, grizzly_fixture: GrizzlyFixture, patch_influxdblistener: Callable[[], None], mocker: MockerFixture) -> None:
+        patch_influxdblistener()
+
+        listener = InfluxDbListener(
+            grizzly_fixture.behave.locust.environment,
+            'influxdb://influx.test.com:1243/testdb?Testplan=unittest-plan&TargetEnvironment=local&Description=unittesting&AggregationInterval=2.5',
+        )
+        tag_set = f'request_aggregate,description=unittesting,environment=local,hostname={get_hostname()}'
+
+        assert listener.aggregation_interval == 2.5
+
+        mocker.patch('grizzly.listeners.influxdb.time_ns', return_value=1000)
+        quit_event_mock = mocker.MagicMock(spec=Event)
+        listener._quit_event = quit_event_mock
+        sleep_mock = mocker.patch('gevent.sleep', return_value=None)
+
+        try:
+            for response_time in range(1, 101):
+                listener._log_request('GET', 'Request: /api/v1/test', 'Success', {'response_time': response_time, 'response_length': 10}, {})
+
+            listener._log_request('POST', 'Request: /api/v1/test', 'Failure', {'response_time': 1000, 'response_length': None}, {}, exception=RuntimeError('error'))
+
+            # nothing is queued until the aggregates are flushed
+            assert len(listener._events) == 0
+            assert len(listener._aggregates) == 2
+
+            quit_event_mock.is_set.side_effect = cycle([False, True])
+            listener.run_aggregation()
+
+            sleep_mock.assert_called_once_with(2.5)
+            assert listener._aggregates == {}
+            success, failure = listener._events
+            assert success.startswith(f'{tag_set},method=GET,name=Request:\\ /api/v1/test,result=Success,testplan=unittest-plan '.encode())
+            assert b'count=100i,' in success
+            assert b'sum=5050.0,min=1.0,max=100.0,' in success
+            assert b',response_length=1000i 1000' in success
+            assert failure.startswith(f'{tag_set},method=POST,name=Request:\\ /api/v1/test,result=Failure,testplan=unittest-plan '.encode())
+            assert b'count=1i,sum=1000.0,min=1000.0,max=1000.0,p50=1000.0,p90=1000.0,p95=1000.0,p99=1000.0,response_length=0i 1000' in failure
+
+            # percentiles are within the relative accuracy of the histogram
+            _, field_set, _ = success.rsplit(b' ', 2)
+            fields = dict(field.split(b'=') for field in field_set.split(b','))
+            for name, expected in [(b'p50', 50), (b'p90', 90), (b'p95', 95), (b'p99', 99)]:
+                assert float(fields[name]) == pytest.approx(expected, rel=0.01)
+
+            # flushing when there is nothing aggregated does not queue anything
+            listener._events.clear()
+            listener.flush_aggregates()
+
+            assert len(listener._events) == 0
+        finally:
+            with suppress(Exception):
+                listener._events.clear()
+                listener.destroy_client()
+
     @pytest.mark.usefixtures('patch_influxdblistener')
     def test__override_event(self, grizzly_fixture: GrizzlyFixture, patch_influxdblistener: Callable[[], None]) -> None:
         patch_influxdblistener()
@@ -487,7 +822,7 @@ class TestInfluxDblistener:
 
         listener = InfluxDbListener(
             grizzly_fixture.behave.locust.environment,
-            'https://influx.test.com:1242/testdb?Testplan=unittest-plan&TargetEnvironment=local&ProfileName=unittest-profile&Description=unittesting',
+            'influxdb://influx.test.com:1242/testdb?Testplan=unittest-plan&TargetEnvironment=local&ProfileName=unittest-profile&Description=unittesting',
         )
 
         try:
@@ -522,49 +857,29 @@ class TestInfluxDblistener:
     def test__log_request(self, grizzly_fixture: GrizzlyFixture, patch_influxdblistener: Callable[[], None], mocker: MockerFixture) -> None:
         patch_influxdblistener()
 
-        expected_datetime = datetime(2022, 12, 16, 10, 28, 0, 123456, timezone.utc)
+        expected_timestamp = to_nanoseconds('2022-12-16T10:28:00.123456+00:00')
 
-        datetime_mock = mocker.patch(
-            'grizzly.listeners.influxdb.datetime',
-            side_effect=lambda *args, **kwargs: datetime(*args, **kwargs),  # noqa: DTZ001
-        )
-        datetime_mock.now.return_value = expected_datetime
+        mocker.patch('grizzly.listeners.influxdb.time_ns', return_value=expected_timestamp)
 
         listener = InfluxDbListener(
             grizzly_fixture.behave.locust.environment,
-            'https://influx.test.com:1243/testdb?Testplan=unittest-plan&TargetEnvironment=local&ProfileName=unittest-profile&Description=unittesting',
+            'influxdb://influx.test.com:1243/testdb?Testplan=unittest-plan&TargetEnvironment=local&ProfileName=unittest-profile&Description=unittesting',
         )
+        hostname = get_hostname()
+        tag_set = f'description=unittesting,environment=local,hostname={hostname}'
 
         try:
             assert len(listener._events) == 0
 
             listener._log_request('GET', 'Request: /api/v1/test', 'Success', {'response_time': 133.7}, {}, None)
 
-            assert len(listener._events) == 1
-
-            expected_keys = ['measurement', 'tags', 'time', 'fields']
-
-            event = listener._events[-1]
-
-            assert sorted(expected_keys) == sorted(event.keys())
-            assert event.get('measurement', None) == 'request'
-            assert event.get('tags', None) == {
-                'name': 'Request: /api/v1/test',
-                'method': 'GET',
-                'result': 'Success',
-                'testplan': 'unittest-plan',
-                'hostname': get_hostname(),
-                'profile': 'unittest-profile',
-                'environment': 'local',
-                'description': 'unittesting',
-                'user': id(listener),
-            }
-            assert event.get('fields', None) == {
-                'exception': None,
-                'response_time': 133.7,
-                'request_started': '2022-12-16T10:27:59.989756+00:00',
-                'request_finished': '2022-12-16T10:28:00.123456+00:00',
-            }
+            assert list(listener._events) == [
+                (
+                    f'request,{tag_set},method=GET,name=Request:\\ /api/v1/test,profile=unittest-profile,result=Success,testplan=unittest-plan,user={id(listener)} '
+                    'response_time=133.7,request_started="2022-12-16T10:27:59.989756+00:00",request_finished="2022-12-16T10:28:00.123456+00:00" '
+                    f'{expected_timestamp - 133_700_000}'
+                ).encode(),
+            ]
 
             os.environ['TESTDATA_VARIABLE_TEST1'] = 'unittest-1'
             os.environ['TESTDATA_VARIABLE_TEST2'] = 'unittest-2'
@@ -590,30 +905,45 @@ class TestInfluxDblistener:
 
             for exception, expected in exceptions:
                 listener._log_request('POST', '001 Request: /api/v2/test', 'Failure', {'response_time': 111.1}, {}, exception)
-                event = listener._events[-1]
-
-                assert event.get('tags', None) == {
-                    'name': '001 Request: /api/v2/test',
-                    'method': 'POST',
-                    'result': 'Failure',
-                    'testplan': 'unittest-plan',
-                    'hostname': get_hostname(),
-                    'scenario': '001 test scenario',
-                    'description': 'unittesting',
-                    'environment': 'local',
-                    'profile': 'unittest-profile',
-                    'user': id(listener),
-                }
-                assert event.get('fields', None) == {
-                    'exception': expected,
-                    'response_time': 111.1,
-                    'request_started': '2022-12-16T10:28:00.012356+00:00',
-                    'request_finished': '2022-12-16T10:28:00.123456+00:00',
-                }
+
+                assert (
+                    listener._events[-1]
+                    == (
+                        f'request,{tag_set},method=POST,name=001\\ Request:\\ /api/v2/test,profile=unittest-profile,result=Failure,'
+                        f'scenario=001\\ test\\ scenario,testplan=unittest-plan,user={id(listener)} '
+                        f'response_time=111.1,exception="{expected}",request_started="2022-12-16T10:28:00.012356+00:00",request_finished="2022-12-16T10:28:00.123456+00:00" '
+                        f'{expected_timestamp - 111_100_000}'
+                    ).encode()
+                )
+
             assert len(listener._events) == 4
+
+            # tag sets are interned
+            assert listener._request_tag_set.cache_info().currsize == 2
+            assert listener._request_tag_set.cache_info().hits == 2
+
+            # values overridden by context
+            listener._log_request(
+                'GET',
+                'Request: /api/v1/test',
+                'Success',
+                {'response_time': 100},
+                {'user': 'foo', '__time__': '2024-07-08T10:52:01Z', '__tags_method__': 'PUT', '__fields_response_time__': 200, '__fields_foo__': 'bar'},
+                None,
+            )
+
+            assert (
+                listener._events[-1]
+                == (
+                    f'request,{tag_set},method=PUT,name=Request:\\ /api/v1/test,profile=unittest-profile,result=Success,testplan=unittest-plan,user=foo '
+                    'response_time=200i,request_started="2022-12-16T10:28:00.023456+00:00",request_finished="2022-12-16T10:28:00.123456+00:00" '
+                    '1720435921000000000'
+                ).encode()
+            )
         finally:
-            del os.environ['TESTDATA_VARIABLE_TEST1']
-            del os.environ['TESTDATA_VARIABLE_TEST2']
+            with suppress(KeyError):
+                del os.environ['TESTDATA_VARIABLE_TEST1']
+                del os.environ['TESTDATA_VARIABLE_TEST2']
 
             with suppress(Exception):
                 listener._events.clear()
@@ -625,91 +955,32 @@ class TestInfluxDblistener:
 
         listener = InfluxDbListener(
             locust_fixture.environment,
-            'https://influx.example.com:1244/testdb?Testplan=unittest-plan&TargetEnvironment=local&ProfileName=unittest-profile&Description=unittesting',
+            'influxdb://influx.example.com:1244/testdb?Testplan=unittest-plan&TargetEnvironment=local&ProfileName=unittest-profile&Description=unittesting',
         )
 
         mocker.patch.object(listener, 'run_events', return_value=None)
+        mocker.patch('grizzly.listeners.influxdb.time_ns', return_value=1_000_000_000_000)
+        tag_set = f'description=unittesting,environment=local,hostname={get_hostname()}'
 
         try:
             listener.request('GET', '/api/v1/test', 133.7, 200, {}, None)
-            assert listener._events == [
-                SOME(
-                    dict,
-                    measurement='request',
-                    tags=SOME(
-                        dict,
-                        name='/api/v1/test',
-                        method='GET',
-                        result='Success',
-                        testplan='unittest-plan',
-                        hostname=get_hostname(),
-                        environment='local',
-                        profile='unittest-profile',
-                        description='unittesting',
-                    ),
-                    time=ANY(str),
-                    fields=SOME(
-                        dict,
-                        response_time=134,
-                        response_length=200,
-                        exception=None,
-                        request_started=ANY(str),
-                        request_finished=ANY(str),
-                    ),
-                ),
+            assert list(listener._events) == [
+                (
+                    f'request,{tag_set},method=GET,name=/api/v1/test,profile=unittest-profile,result=Success,testplan=unittest-plan,user={id(listener)} '
+                    'response_time=134i,response_length=200i,request_started="1970-01-01T00:16:39.866000+00:00",request_finished="1970-01-01T00:16:40+00:00" '
+                    '999866000000'
+                ).encode(),
             ]
 
-            listener.request('POST', '/api/v2/test', 555.37, 137, {}, CatchResponseError('request failed'))
-            assert listener._events == [
-                SOME(
-                    dict,
-                    measurement='request',
-                    tags=SOME(
-                        dict,
-                        name='/api/v1/test',
-                        method='GET',
-                        result='Success',
-                        testplan='unittest-plan',
-                        hostname=get_hostname(),
-                        environment='local',
-                        profile='unittest-profile',
-                        description='unittesting',
-                    ),
-                    time=ANY(str),
-                    fields=SOME(
-                        dict,
-                        response_time=134,
-                        response_length=200,
-                        exception=None,
-                        request_started=ANY(str),
-                        request_finished=ANY(str),
-                    ),
-                ),
-                SOME(
-                    dict,
-                    measurement='request',
-                    tags=SOME(
-                        dict,
-                        name='/api/v2/test',
-                        method='POST',
-                        result='Failure',
-                        testplan='unittest-plan',
-                        hostname=get_hostname(),
-                        environment='local',
-                        profile='unittest-profile',
-                        description='unittesting',
-                    ),
-                    time=ANY(str),
-                    fields=SOME(
-                        dict,
-                        response_time=555,
-                        response_length=137,
-                        exception='request failed',
-                        request_started=ANY(str),
-                        request_finished=ANY(str),
-                    ),
-                ),
-            ]
+            listener.request('POST', '/api/v2/test', 555.37, -1, {}, CatchResponseError('request failed'))
+            assert (
+                listener._events[-1]
+                == (
+                    f'request,{tag_set},method=POST,name=/api/v2/test,profile=unittest-profile,result=Failure,testplan=unittest-plan,user={id(listener)} '
+                    'response_time=555i,exception="request failed",request_started="1970-01-01T00:16:39.445000+00:00",request_finished="1970-01-01T00:16:40+00:00" '
+                    '999445000000'
+                ).encode()
+            )
         finally:
             with suppress(Exception):
                 listener._events.clear()
@@ -726,7 +997,7 @@ class TestInfluxDblistener:
         patch_influxdblistener()
         listener = InfluxDbListener(
             locust_fixture.environment,
-            'https://influx.example.com:1245/testdb?Testplan=unittest-plan&TargetEnvironment=local&ProfileName=unittest-profile&Description=unittesting',
+            'influxdb://influx.example.com:1245/testdb?Testplan=unittest-plan&TargetEnvironment=local&ProfileName=unittest-profile&Description=unittesting',
         )
         mocker.patch.object(listener, '_create_metrics', side_effect=[Exception])
 
@@ -746,7 +1017,7 @@ class TestInfluxDblistener:
 
         listener = InfluxDbListener(
             locust_fixture.environment,
-            'https://influx.example.com:1246/testdb?Testplan=unittest-plan&TargetEnvironment=local&ProfileName=unittest-profile&Description=unittesting',
+            'influxdb://influx.example.com:1246/testdb?Testplan=unittest-plan&TargetEnvironment=local&ProfileName=unittest-profile&Description=unittesting',
         )
         expected_keys = ['response_time', 'response_length']
 
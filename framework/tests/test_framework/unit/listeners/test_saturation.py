@@ -0,0 +1,174 @@
+"""Unit tests of grizzly.listeners.saturation."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import gevent
+from grizzly.listeners.saturation import SaturationMonitor, WorkerSaturation
+from grizzly.types.locust import MasterRunner, WorkerRunner
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.logging import LogCaptureFixture
+
+    from test_framework.fixtures import LocustFixture, MockerFixture
+
+
+def test_worker_saturation() -> None:
+    saturation = WorkerSaturation()
+
+    assert saturation.saturated_ratio == 0.0
+    assert saturation.cpu_usage == 0.0
+
+    saturation.merge(WorkerSaturation(samples=4, saturated=1, lag_max=0.2, cpu_time=2.0, wall_time=4.0, greenlets_max=10))
+    saturation.merge(WorkerSaturation(samples=4, saturated=3, lag_max=0.1, cpu_time=4.0, wall_time=4.0, greenlets_max=20))
+
+    assert saturation == WorkerSaturation(samples=8, saturated=4, lag_max=0.2, cpu_time=6.0, wall_time=8.0, greenlets_max=20)
+    assert saturation.saturated_ratio == 0.5
+    assert saturation.cpu_usage == 0.75
+
+
+class TestSaturationMonitor:
+    def test___init__(self, locust_fixture: LocustFixture, mocker: MockerFixture) -> None:
+        environment = locust_fixture.environment
+
+        monitor = SaturationMonitor(environment, max_saturation=10.0)
+
+        assert monitor.max_saturation == 10.0
+        assert monitor.workers == {}
+        assert monitor.on_test_start in environment.events.test_start._handlers
+        assert monitor.on_test_stop in environment.events.test_stop._handlers
+        assert monitor.on_report_to_master not in environment.events.report_to_master._handlers
+        assert monitor.on_worker_report not in environment.events.worker_report._handlers
+
+        environment.runner = mocker.MagicMock(spec=WorkerRunner)
+        monitor = SaturationMonitor(environment, max_saturation=10.0)
+
+        assert monitor.on_test_start in environment.events.test_start._handlers
+        assert monitor.on_report_to_master in environment.events.report_to_master._handlers
+        assert monitor.on_worker_report not in environment.events.worker_report._handlers
+
+        environment.runner = mocker.MagicMock(spec=MasterRunner)
+        monitor = SaturationMonitor(environment, max_saturation=10.0)
+
+        assert monitor.on_test_start not in environment.events.test_start._handlers
+        assert monitor.on_report_to_master not in environment.events.report_to_master._handlers
+        assert monitor.on_worker_report in environment.events.worker_report._handlers
+
+    def test_run(self, locust_fixture: LocustFixture) -> None:
+        monitor = SaturationMonitor(locust_fixture.environment, max_saturation=10.0)
+        monitor.interval = 0.01
+
+        monitor.on_test_start()
+        greenlet = monitor._greenlet
+        assert greenlet is not None
+
+        monitor.on_test_start()
+        assert monitor._greenlet == greenlet
+
+        gevent.sleep(0.1)
+
+        monitor.on_test_stop()
+        assert monitor._greenlet is None
+        gevent.sleep(0)
+        assert greenlet.dead
+
+        samples = monitor._current.samples
+        assert samples > 0
+        assert monitor._current.wall_time >= samples * monitor.interval
+
+        gevent.sleep(0.05)
+        assert monitor._current.samples == samples
+
+    def test_sample(self, locust_fixture: LocustFixture, mocker: MockerFixture) -> None:
+        monitor = SaturationMonitor(locust_fixture.environment, max_saturation=10.0)
+        mocker.patch.object(monitor, 'greenlet_count', side_effect=[10, 30, 20])
+
+        monitor.sample(0.01, 0.5, 1.0)
+        monitor.sample(0.25, 0.5, 1.25)
+        monitor.sample(0.01, 0.95, 1.0)
+
+        assert monitor._current == WorkerSaturation(samples=3, saturated=2, lag_max=0.25, cpu_time=1.95, wall_time=3.25, greenlets_max=30)
+
+    def test_report(self, locust_fixture: LocustFixture, mocker: MockerFixture, caplog: LogCaptureFixture) -> None:
+        environment = locust_fixture.environment
+        environment.runner = mocker.MagicMock(spec=WorkerRunner)
+        worker = SaturationMonitor(environment, max_saturation=10.0)
+
+        data: dict = {}
+        worker.on_report_to_master('worker-1', data)
+        assert data == {}
+
+        worker._current = WorkerSaturation(samples=10, saturated=5, lag_max=0.5, cpu_time=9.5, wall_time=10.0, greenlets_max=120)
+        worker.on_report_to_master('worker-1', data)
+        assert data == {
+            'saturation': {'samples': 10, 'saturated': 5, 'lag_max': 0.5, 'cpu_time': 9.5, 'wall_time': 10.0, 'greenlets_max': 120},
+        }
+        assert worker._current == WorkerSaturation()
+
+        environment.runner = mocker.MagicMock(spec=MasterRunner)
+        master = SaturationMonitor(environment, max_saturation=10.0)
+
+        master.on_worker_report('worker-1', {})
+        assert master.workers == {}
+
+        master.on_worker_report('worker-1', data)
+        master.on_worker_report('worker-1', {'saturation': {'samples': 10, 'saturated': 0, 'lag_max': 0.01, 'cpu_time': 3.5, 'wall_time': 10.0, 'greenlets_max': 100}})
+        master.on_worker_report('worker-2', {'saturation': {'samples': 20, 'saturated': 1, 'lag_max': 0.01, 'cpu_time': 4.0, 'wall_time': 20.0, 'greenlets_max': 50}})
+
+        with caplog.at_level(logging.WARNING):
+            master.on_worker_report('worker-3', {'saturation': {'foo': 'bar'}})
+
+        assert caplog.messages == ["worker worker-3 reported invalid saturation data: {'foo': 'bar'}"]
+        caplog.clear()
+
+        assert master.workers == {
+            'worker-1': WorkerSaturation(samples=20, saturated=5, lag_max=0.5, cpu_time=13.0, wall_time=20.0, greenlets_max=120),
+            'worker-2': WorkerSaturation(samples=20, saturated=1, lag_max=0.01, cpu_time=4.0, wall_time=20.0, greenlets_max=50),
+        }
+
+        with caplog.at_level(logging.WARNING):
+            assert master.validate() == ['worker-1']
+
+        assert caplog.messages == [
+            (
+                'worker worker-1 was saturated 25% of the test (5 of 20 seconds), response times might be affected by the load generator: '
+                'max event loop lag 500 ms, average CPU usage 65%, max 120 greenlets'
+            ),
+        ]
+        caplog.clear()
+
+        master.max_saturation = 25.0
+
+        with caplog.at_level(logging.WARNING):
+            assert master.validate() == []
+
+        assert caplog.messages == []
+
+    def test_validate(self, locust_fixture: LocustFixture, caplog: LogCaptureFixture) -> None:
+        monitor = SaturationMonitor(locust_fixture.environment, max_saturation=0.0)
+
+        with caplog.at_level(logging.INFO):
+            assert monitor.validate() == []
+
+        assert caplog.messages == []
+        assert monitor.workers == {}
+
+        monitor._current = WorkerSaturation(samples=2, saturated=1, lag_max=0.2, cpu_time=1.0, wall_time=2.0, greenlets_max=3)
+
+        with caplog.at_level(logging.INFO):
+            assert monitor.validate() == ['local']
+
+        assert caplog.messages == [
+            f'{"Worker":<40} {"saturated":>10} {"seconds":>10} {"max lag (ms)":>14} {"avg CPU":>10} {"max greenlets":>14}',
+            '-' * 103,
+            f'{"local":<40} {"50%":>10} {"1/2":>10} {"200":>14} {"50%":>10} {"3":>14}',
+            '',
+            (
+                'worker local was saturated 50% of the test (1 of 2 seconds), response times might be affected by the load generator: '
+                'max event loop lag 200 ms, average CPU usage 50%, max 3 greenlets'
+            ),
+        ]
+        assert monitor.workers == {'local': WorkerSaturation(samples=2, saturated=1, lag_max=0.2, cpu_time=1.0, wall_time=2.0, greenlets_max=3)}
+        assert monitor._current == WorkerSaturation()
@@ -0,0 +1,225 @@
+"""Unit tests of grizzly.listeners.sink."""
+
+from __future__ import annotations
+
+import os
+from platform import node as get_hostname
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
+
+import pytest
+from grizzly.listeners.influxdb import InfluxDbV1, InfluxDbV2, encode_line, encode_tag_set
+from grizzly.listeners.sink import MetricsFileSink, create_metrics_sink, decode_field_value, decode_line, metrics_sinks, register_metrics_sink
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pathlib import Path
+    from urllib.parse import ParseResult
+
+    from test_framework.fixtures import LocustFixture, MockerFixture
+
+
+def test_register_metrics_sink() -> None:
+    assert sorted(metrics_sinks.keys()) == ['file', 'influxdb', 'influxdb2']
+
+    class DummySink:
+        def connect(self) -> DummySink:
+            return self
+
+        def disconnect(self) -> None:
+            pass
+
+        def write(self, values: list[bytes]) -> None:
+            pass
+
+    try:
+
+        @register_metrics_sink('dummy', 'dummy2')
+        def create_dummy_sink(_parsed: ParseResult) -> DummySink:
+            return DummySink()
+
+        assert metrics_sinks['dummy'] is create_dummy_sink
+        assert metrics_sinks['dummy2'] is create_dummy_sink
+        assert isinstance(create_metrics_sink('dummy://localhost'), DummySink)
+    finally:
+        metrics_sinks.pop('dummy', None)
+        metrics_sinks.pop('dummy2', None)
+
+
+@pytest.mark.usefixtures('locust_fixture')
+def test_create_metrics_sink() -> None:
+    with pytest.raises(AssertionError, match='"http" is not a supported scheme'):
+        create_metrics_sink('http://localhost')
+
+    sink = create_metrics_sink('influxdb://influx.example.com/testdb')
+    assert isinstance(sink, InfluxDbV1)
+    assert sink.host == 'influx.example.com'
+    assert sink.port == 8086
+    assert sink.database == 'testdb'
+
+    sink = create_metrics_sink('influxdb2://token@influx.example.com:1234/org:bucket')
+    assert isinstance(sink, InfluxDbV2)
+    assert sink.host == 'influx.example.com'
+    assert sink.port == 1234
+    assert sink.org == 'org'
+    assert sink.bucket == 'bucket'
+    assert sink.token == 'token'  # noqa: S105
+
+    sink = create_metrics_sink('file://logs/metrics')
+    assert isinstance(sink, MetricsFileSink)
+
+
+@pytest.mark.parametrize(
+    ('value', 'expected'),
+    [
+        ('"hello \\"world\\"\\nfoo"', 'hello "world"\nfoo'),
+        ('1337i', 1337),
+        ('42u', 42),
+        ('1.5', 1.5),
+        ('true', True),
+        ('F', False),
+    ],
+)
+def test_decode_field_value(value: str, expected: Any) -> None:
+    assert decode_field_value(value) == expected
+
+
+def test_decode_line() -> None:
+    tags = {'name': '001 RequestTask, foo=bar', 'method': 'GET', 'environment': 'local'}
+    fields = {'response_time': 12.5, 'response_length': 1337, 'success': False, 'exception': 'error: "foo", bar=baz\nline'}
+
+    line = encode_line(encode_tag_set('request events', tags), fields, 1700000000000000000)
+
+    assert decode_line(line) == ('request events', tags, fields, 1700000000000000000)
+    assert decode_line(b'heartbeat,worker=1 value=1i 10') == ('heartbeat', {'worker': '1'}, {'value': 1}, 10)
+
+
+class TestMetricsFileSink:
+    def test_from_url(self, locust_fixture: LocustFixture) -> None:
+        with pytest.raises(AssertionError, match='path was not found in'):
+            MetricsFileSink.from_url(urlparse('file://'))
+
+        with pytest.raises(AssertionError, match='Format must be one of lp, arrow, parquet'):
+            MetricsFileSink.from_url(urlparse('file://logs/metrics?Format=csv'))
+
+        sink = MetricsFileSink.from_url(urlparse('file://logs/metrics?Testplan=test'))
+        assert sink.path == locust_fixture._test_context_root / 'logs' / 'metrics'
+        assert sink.file_format == 'lp'
+
+        sink = MetricsFileSink.from_url(urlparse('file:///tmp/metrics?Testplan=test&Format=parquet'))
+        assert sink.path.as_posix() == '/tmp/metrics'  # noqa: S108
+        assert sink.file_format == 'parquet'
+
+    def test_write_lp(self, tmp_path: Path) -> None:
+        sink = MetricsFileSink(tmp_path / 'metrics').connect()
+
+        try:
+            sink.write([b'request,name=foo response_time=1.0 1', b'request,name=bar response_time=2.0 2'])
+            sink.write([b'heartbeat value=1i 3'])
+        finally:
+            sink.disconnect()
+
+        segments = list((tmp_path / 'metrics').iterdir())
+        assert [segment.name for segment in segments] == [f'{get_hostname()}-{os.getpid()}-00000001.lp']
+        assert segments[0].read_bytes() == b'request,name=foo response_time=1.0 1\nrequest,name=bar response_time=2.0 2\nheartbeat value=1i 3\n'
+
+    def test_write_columnar(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        mocker.patch.dict('sys.modules', {'pyarrow': None})
+
+        with pytest.raises(AssertionError, match='Format=parquet requires pyarrow, which is not installed'):
+            MetricsFileSink(tmp_path / 'metrics', file_format='parquet').connect()
+
+        mocker.patch.dict('sys.modules', {'pyarrow': mocker.MagicMock()})
+
+        sink = MetricsFileSink(tmp_path / 'metrics', file_format='arrow').connect()
+        write_table_mock = mocker.patch.object(sink, '_write_table', return_value=None)
+
+        sink.write(
+            [
+                b'request,name=foo response_time=1.0,success=true 1',
+                b'request,name=bar response_time=2.0,success=false,exception="error" 2',
+                b'heartbeat,worker=1 value=1i 3',
+                b'request,name=baz response_time=3.0,success=true 4',
+            ],
+        )
+
+        assert write_table_mock.call_count == 2
+
+        write_table_mock.assert_any_call(
+            'request',
+            {
+                'time': [1, 2, 4],
+                'name': ['foo', 'bar', 'baz'],
+                'response_time': [1.0, 2.0, 3.0],
+                'success': [True, False, True],
+                'exception': [None, 'error', None],
+            },
+        )
+        write_table_mock.assert_any_call('heartbeat', {'time': [3], 'worker': ['1'], 'value': [1]})
+
+    @pytest.mark.parametrize('file_format', ['arrow', 'parquet'])
+    def test_write_table(self, tmp_path: Path, file_format: str) -> None:
+        pa = pytest.importorskip('pyarrow')
+        pq = pytest.importorskip('pyarrow.parquet')
+
+        def read_table(file: Path) -> Any:
+            if file_format == 'parquet':
+                return pq.read_table(file)
+
+            with pa.memory_map(file.as_posix()) as fd:
+                return pa.ipc.open_file(fd).read_all()
+
+        prefix = f'{get_hostname()}-{os.getpid()}'
+        sink = MetricsFileSink(tmp_path / 'metrics', file_format=file_format).connect()
+
+        try:
+            sink.write([b'request,name=foo response_time=1.0,exception="error" 1', b'heartbeat value=1i 2'])
+            sink.write([b'request,name=bar response_time=2.0 3'])
+            sink.write([b'heartbeat value=2i 4'])
+
+            # files are kept open between batches
+            assert sorted(sink._writers.keys()) == ['heartbeat', 'request']
+            assert sink._sequence == 2
+
+            # new field, new file
+            sink.write([b'request,name=baz response_time=3.0,success=true 5'])
+
+            assert sink._sequence == 3
+        finally:
+            sink.disconnect()
+
+        assert sink._writers == {}
+
+        request = tmp_path / 'metrics' / 'request'
+        assert sorted(file.name for file in request.iterdir()) == [
+            f'{prefix}-00000001.{file_format}',
+            f'{prefix}-00000003.{file_format}',
+        ]
+
+        table = read_table(request / f'{prefix}-00000001.{file_format}')
+        assert table.column('name').to_pylist() == ['foo', 'bar']
+        assert table.column('response_time').to_pylist() == [1.0, 2.0]
+        assert table.column('exception').to_pylist() == ['error', None]
+        assert [value.value for value in table.column('time')] == [1, 3]
+
+        table = read_table(request / f'{prefix}-00000003.{file_format}')
+        assert table.column('success').to_pylist() == [True]
+
+        heartbeat = tmp_path / 'metrics' / 'heartbeat'
+        assert [file.name for file in heartbeat.iterdir()] == [f'{prefix}-00000002.{file_format}']
+        assert read_table(heartbeat / f'{prefix}-00000002.{file_format}').column('value').to_pylist() == [1, 2]
+
+    def test_write_table_rotate(self, tmp_path: Path) -> None:
+        pytest.importorskip('pyarrow')
+
+        sink = MetricsFileSink(tmp_path / 'metrics', file_format='arrow', segment_size=1).connect()
+
+        try:
+            sink.write([b'request,name=foo response_time=1.0 1'])
+            assert sink._writers == {}
+
+            sink.write([b'request,name=bar response_time=2.0 2'])
+            assert sink._writers == {}
+        finally:
+            sink.disconnect()
+
+        assert len(list((tmp_path / 'metrics' / 'request').iterdir())) == 2
@@ -0,0 +1,137 @@
+"""Unit tests of grizzly.listeners.stats."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import pytest
+from grizzly.listeners.stats import HistogramStats
+from grizzly.types.locust import MasterRunner, WorkerRunner
+from grizzly.utils.histogram import Histogram
+
+if TYPE_CHECKING:  # pragma: no cover
+    from _pytest.logging import LogCaptureFixture
+
+    from test_framework.fixtures import LocustFixture, MockerFixture
+
+
+class TestHistogramStats:
+    def test___init__(self, locust_fixture: LocustFixture, mocker: MockerFixture) -> None:
+        environment = locust_fixture.environment
+
+        stats = HistogramStats(environment)
+
+        try:
+            assert stats.relative_accuracy == 0.01
+            assert stats.entries == {}
+            assert stats.on_request in environment.events.request._handlers
+            assert stats.on_report_to_master not in environment.events.report_to_master._handlers
+            assert stats.on_worker_report not in environment.events.worker_report._handlers
+
+            environment.events.request.fire(request_type='GET', name='001 Read', response_time=10, response_length=10, exception=None, context={})
+            environment.events.request.fire(request_type='GET', name='001 Read', response_time=None, response_length=10, exception=None, context={})
+
+            assert list(stats.entries.keys()) == [('001 Read', 'GET')]
+            assert len(stats.get('001 Read', 'GET')) == 1
+        finally:
+            environment.events.request.remove_listener(stats.on_request)
+
+        environment.runner = mocker.MagicMock(spec=WorkerRunner)
+        stats = HistogramStats(environment, relative_accuracy=0.02)
+        environment.events.request.remove_listener(stats.on_request)
+
+        assert stats.relative_accuracy == 0.02
+        assert stats.on_report_to_master in environment.events.report_to_master._handlers
+        assert stats.on_worker_report not in environment.events.worker_report._handlers
+
+        environment.runner = mocker.MagicMock(spec=MasterRunner)
+        stats = HistogramStats(environment)
+        environment.events.request.remove_listener(stats.on_request)
+
+        assert stats.on_report_to_master not in environment.events.report_to_master._handlers
+        assert stats.on_worker_report in environment.events.worker_report._handlers
+
+    def test_report(self, locust_fixture: LocustFixture, mocker: MockerFixture, caplog: LogCaptureFixture) -> None:
+        environment = locust_fixture.environment
+        environment.runner = mocker.MagicMock(spec=WorkerRunner)
+        worker = HistogramStats(environment)
+        environment.events.request.remove_listener(worker.on_request)
+
+        data: dict = {}
+        worker.on_report_to_master('worker-1', data)
+        assert data == {}
+
+        for response_time in range(1, 101):
+            worker.on_request('GET', '001 Read', response_time)
+            worker.on_request('POST', '001 Write', response_time * 10)
+
+        expected = [[name, method, histogram.serialize()] for (name, method), histogram in worker.entries.items()]
+
+        worker.on_report_to_master('worker-1', data)
+
+        assert data == {'response_time_histograms': expected}
+        assert [name for name, _, _ in expected] == ['001 Read', '001 Write']
+        assert worker.entries == {}
+
+        environment.runner = mocker.MagicMock(spec=MasterRunner)
+        master = HistogramStats(environment)
+        environment.events.request.remove_listener(master.on_request)
+
+        master.on_worker_report('worker-1', {})
+        assert master.entries == {}
+
+        for response_time in range(1, 101):
+            worker.on_request('GET', '001 Read', response_time + 100)
+
+        worker_data: dict = {}
+        worker.on_report_to_master('worker-2', worker_data)
+
+        master.on_worker_report('worker-1', data)
+        master.on_worker_report('worker-2', worker_data)
+
+        with caplog.at_level(logging.WARNING):
+            master.on_worker_report('worker-3', {'response_time_histograms': [['001 Read', 'GET', {'foo': 'bar'}]]})
+            master.on_worker_report('worker-3', {'response_time_histograms': [['001 Read', 'GET', Histogram(relative_accuracy=0.02).serialize()]]})
+
+        assert caplog.messages == [
+            'worker worker-3 reported an invalid histogram for GET 001 Read',
+            'worker worker-3 reported an invalid histogram for GET 001 Read',
+        ]
+
+        read = master.get('001 Read', 'GET')
+        write = master.get('001 Write', 'POST')
+
+        assert len(read) == 200
+        assert read.minimum == 1.0
+        assert read.maximum == 200.0
+        assert read.percentile(0.5) == pytest.approx(100, rel=0.01)
+        assert len(write) == 100
+        assert write.percentile(0.95) == pytest.approx(950, rel=0.01)
+
+        total = master.merged([('001 Read', 'GET'), ('001 Write', 'POST'), ('001 Unknown', None)])
+        assert len(total) == 300
+        assert total.maximum == 1000.0
+        assert len(master.merged([])) == 0
+
+    def test_get_percentile_stats_summary(self, locust_fixture: LocustFixture) -> None:
+        stats = HistogramStats(locust_fixture.environment)
+        locust_fixture.environment.events.request.remove_listener(stats.on_request)
+
+        assert HistogramStats.percentile('001 Read', None, Histogram()).split() == ['001', 'Read', *(['0'] * 12)]
+
+        for response_time in range(1, 101):
+            stats.on_request('GET', '001 Read', response_time)
+
+        stats.get('001 Empty', 'GET')
+
+        summary = stats.get_percentile_stats_summary([('001 Empty', 'GET'), ('001 Read', 'GET')], '001')
+
+        assert len(summary) == 6
+        assert summary[0] == 'Response time percentiles (approximated)'
+        assert summary[1].split() == ['Type', 'Name', '50%', '66%', '75%', '80%', '90%', '95%', '98%', '99%', '99.9%', '99.99%', '100%', '#', 'reqs']
+        assert summary[2] == summary[4]
+        assert summary[3].split() == ['GET', '001', 'Read', '50', '66', '74', '81', '89', '95', '99', '99', '100', '100', '100', '100']
+        assert summary[5].split() == ['001', '50', '66', '74', '81', '89', '95', '99', '99', '100', '100', '100', '100']
+
+        assert stats.get_percentile_stats_summary([], 'Aggregated')[3:] == [summary[2]]
@@ -39,7 +39,7 @@ def test_parse_message_direction() -> None:
     assert message_direction == MessageDirection.CLIENT_SERVER
 
 
-def test_step_setup_save_statistics(behave_fixture: BehaveFixture) -> None:
+def test_step_setup_save_statistics(behave_fixture: BehaveFixture) -> None:  # noqa: PLR0915
     behave = behave_fixture.context
     grizzly = cast('GrizzlyContext', behave_fixture.context.grizzly)
     grizzly.scenarios.create(behave_fixture.create_scenario('test scenario'))
@@ -53,6 +53,9 @@ def test_step_setup_save_statistics(behave_fixture: BehaveFixture) -> None:
     step_impl(behave, 'influxdb://test:8000/test_db')
     assert grizzly.setup.statistics_url == 'influxdb://test:8000/test_db'
 
+    step_impl(behave, 'file://logs/metrics?Testplan=test&Format=parquet')
+    assert grizzly.setup.statistics_url == 'file://logs/metrics?Testplan=test&Format=parquet'
+
     try:
         step_impl(behave, 'influxdb://test:8000/$env::DATABASE$')
         assert behave.exceptions == {behave.scenario.name: [ANY(AssertionError, message='environment variable "DATABASE" is not set')]}
@@ -236,3 +239,47 @@ def test_step_setup_wait_spawning_complete_indefinitely(behave_fixture: BehaveFi
     step_setup_wait_spawning_complete_indefinitely(behave)
 
     assert grizzly.setup.wait_for_spawning_complete == -1
+
+
+def test_step_setup_cache_request_files(behave_fixture: BehaveFixture) -> None:
+    behave = behave_fixture.context
+    grizzly = cast('GrizzlyContext', behave.grizzly)
+
+    assert grizzly.setup.cache_request_files == []
+
+    step_setup_cache_request_files(behave, '*.j2.json')
+    step_setup_cache_request_files(behave, 'payloads/**/*.xml')
+
+    assert grizzly.setup.cache_request_files == ['*.j2.json', 'payloads/**/*.xml']
+
+
+def test_step_setup_max_worker_saturation(behave_fixture: BehaveFixture) -> None:
+    behave = behave_fixture.context
+    grizzly = cast('GrizzlyContext', behave.grizzly)
+    grizzly.scenarios.create(behave_fixture.create_scenario('test scenario'))
+    behave.scenario = grizzly.scenario.behave
+
+    step_setup_max_worker_saturation(behave, '2.5')
+    assert grizzly.setup.max_worker_saturation == 2.5
+
+    step_setup_max_worker_saturation(behave, 'foo')
+    step_setup_max_worker_saturation(behave, '-1')
+
+    assert behave.exceptions == {
+        behave.scenario.name: [
+            ANY(AssertionError, message='"foo" is not a valid number'),
+            ANY(AssertionError, message='-1 resolved to -1.0 percent, which is not valid'),
+        ],
+    }
+    assert grizzly.setup.max_worker_saturation == 2.5
+
+
+def test_step_setup_response_time_histograms(behave_fixture: BehaveFixture) -> None:
+    behave = behave_fixture.context
+    grizzly = cast('GrizzlyContext', behave.grizzly)
+
+    assert not grizzly.setup.response_time_histograms
+
+    step_setup_response_time_histograms(behave)
+
+    assert grizzly.setup.response_time_histograms
@@ -129,3 +129,25 @@ def test_step_shapes_spawn_rate(behave_fixture: BehaveFixture) -> None:
     step_impl(behave, '$conf::user.rate', grammar='users')
     assert behave.exceptions == {behave.scenario.name: [ANY(AssertionError, message='this expression does not support $conf or $env variables')]}
     delattr(behave, 'exceptions')
+
+
+def test_step_shapes_spawn_rate_adaptive(behave_fixture: BehaveFixture) -> None:
+    behave = behave_fixture.context
+    grizzly = cast('GrizzlyContext', behave.grizzly)
+    grizzly.scenarios.create(behave_fixture.create_scenario('test scenario'))
+    behave.scenario = grizzly.scenario.behave
+    assert grizzly.setup.spawn_max_cpu_usage is None
+
+    step_shapes_spawn_rate_adaptive(behave, '90')
+    assert grizzly.setup.spawn_max_cpu_usage == 90.0
+
+    step_shapes_spawn_rate_adaptive(behave, 'foo')
+    step_shapes_spawn_rate_adaptive(behave, '101')
+
+    assert behave.exceptions == {
+        behave.scenario.name: [
+            ANY(AssertionError, message='"foo" is not a valid number'),
+            ANY(AssertionError, message='101 resolved to 101.0 percent, which is not valid'),
+        ],
+    }
+    assert grizzly.setup.spawn_max_cpu_usage == 90.0
@@ -130,6 +130,39 @@ def test_step_setup_iteration_pace(behave_fixture: BehaveFixture) -> None:
     assert grizzly.scenario.pace == '{{ pace }}'
 
 
+def test_step_setup_testdata_batch_size(behave_fixture: BehaveFixture) -> None:
+    behave = behave_fixture.context
+    grizzly = cast('GrizzlyContext', behave.grizzly)
+    grizzly.scenarios.create(behave_fixture.create_scenario('test scenario'))
+    behave.scenario = grizzly.scenario.behave
+
+    assert grizzly.scenario.testdata_batch_size == 1
+    assert behave.exceptions == {}
+
+    step_setup_testdata_batch_size(behave, '50')
+
+    assert grizzly.scenario.testdata_batch_size == 50
+
+    grizzly.state.configuration['test.batch_size'] = 10
+    step_setup_testdata_batch_size(behave, '$conf::test.batch_size$')
+
+    assert grizzly.scenario.testdata_batch_size == 10
+
+    step_setup_testdata_batch_size(behave, 'asdf')
+
+    assert behave.exceptions == {behave.scenario.name: [ANY(AssertionError, message='"asdf" is not a valid number')]}
+
+    step_setup_testdata_batch_size(behave, '0')
+
+    assert behave.exceptions == {
+        behave.scenario.name: [
+            ANY(AssertionError, message='"asdf" is not a valid number'),
+            ANY(AssertionError, message='batch size must be greater than 0'),
+        ],
+    }
+    assert grizzly.scenario.testdata_batch_size == 10
+
+
 def test_step_setup_set_variable_alias(behave_fixture: BehaveFixture, mocker: MockerFixture) -> None:
     behave = behave_fixture.context
     grizzly = cast('GrizzlyContext', behave.grizzly)
@@ -180,3 +180,26 @@ def test_step_user_type_with_weight(behave_fixture: BehaveFixture) -> None:
             ANY(AssertionError, message='weight value {{ weight }} resolved to 0, which is not valid'),
         ],
     }
+
+
+def test_step_user_cost(behave_fixture: BehaveFixture) -> None:
+    behave = behave_fixture.context
+    grizzly = cast('GrizzlyContext', behave.grizzly)
+    grizzly.scenarios.create(behave_fixture.create_scenario('test scenario'))
+    behave.scenario = grizzly.scenario.behave
+
+    assert grizzly.scenario.user.cost == 1.0
+
+    step_user_cost(behave, '2.5')
+    assert grizzly.scenario.user.cost == 2.5
+
+    step_user_cost(behave, 'foo')
+    step_user_cost(behave, '0')
+
+    assert behave.exceptions == {
+        behave.scenario.name: [
+            ANY(AssertionError, message='"foo" is not a valid number'),
+            ANY(AssertionError, message='user cost 0 resolved to 0.0, which is not valid'),
+        ],
+    }
+    assert grizzly.scenario.user.cost == 2.5
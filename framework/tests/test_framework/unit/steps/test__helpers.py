@@ -448,6 +448,10 @@ def test_add_validation_handler(grizzly_fixture: GrizzlyFixture, *, as_async: bo
     assert len(task.response.handlers.metadata) == 1
     assert len(task.response.handlers.payload) == 1
 
+    # expressions without templates are compiled when the handler is added
+    assert (TransformerContentType.JSON, '$.test.value') in grizzly.scenario._parsers
+    assert (TransformerContentType.PLAIN, 'test') in grizzly.scenario._parsers
+
     metadata_handler = next(iter(task.response.handlers.metadata))
     payload_handler = next(iter(task.response.handlers.payload))
 
@@ -466,6 +470,7 @@ def test_add_validation_handler(grizzly_fixture: GrizzlyFixture, *, as_async: bo
     parent.user.add_context({'variables': {'property': 'name', 'name': 'bob'}})
     add_validation_handler(grizzly, ResponseTarget.PAYLOAD, '$.test.{{ property }}', '{{ name }}', condition=False)
     assert len(task.response.handlers.payload) == 2
+    assert (TransformerContentType.JSON, '$.test.{{ property }}') not in grizzly.scenario._parsers
 
     # test that they validates
     for handler in task.response.handlers.payload:
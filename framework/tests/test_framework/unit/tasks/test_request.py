@@ -7,10 +7,15 @@ from typing import TYPE_CHECKING
 import pytest
 from grizzly.events.response_handler import ResponseHandlerAction
 from grizzly.tasks import (
+    ConditionalTask,
+    LogMessageTask,
+    LoopTask,
     RequestTask,
     RequestTaskHandlers,
     RequestTaskResponse,
+    UntilRequestTask,
 )
+from grizzly.tasks.request import RequestTaskPlan, compile_request_plans, has_request_template, read_request_source
 from grizzly.types import RequestMethod
 from grizzly_common.transformer import TransformerContentType
 
@@ -135,3 +140,139 @@ class TestRequestTask:
         assert task_factory.metadata is not None
         assert task_factory.metadata['foo'] == 'bar'
         assert task_factory.metadata['alice'] == 'bob'
+
+
+def test_has_request_template() -> None:
+    assert not has_request_template('hello world')
+    assert not has_request_template('{{ hello_world')
+    assert has_request_template('is {{ this }} really a template?')
+    assert has_request_template('{% if hello_world %}hello{% endif %}')
+    assert has_request_template('{# hello world #}')
+    assert not has_request_template('{% hello_world')
+    assert not has_request_template('hello_world #}')
+
+
+def test_read_request_source(grizzly_fixture: GrizzlyFixture) -> None:
+    context_root = grizzly_fixture.test_context
+    (context_root / 'requests' / 'test').mkdir(parents=True, exist_ok=True)
+    (context_root / 'requests' / 'test' / 'payload.json').write_text('{"hello": "{{ name }}"}')
+
+    assert read_request_source(context_root, 'test/payload.json') == '{"hello": "{{ name }}"}'
+    assert read_request_source(context_root, 'test') is None
+    assert read_request_source(context_root, 'hello world') is None
+    assert read_request_source(context_root, 'a' * 1024) is None
+
+
+class TestRequestTaskPlan:
+    def test___init__(self, grizzly_fixture: GrizzlyFixture) -> None:
+        context_root = grizzly_fixture.test_context
+        (context_root / 'requests').mkdir(exist_ok=True)
+        (context_root / 'requests' / 'static.txt').write_text('static payload')
+        (context_root / 'requests' / 'dynamic.j2.txt').write_text('hello {{ name }}')
+        (context_root / 'requests' / 'statement.j2.txt').write_text('hello{% if name %} world{% endif %}{# comment #}')
+
+        request = RequestTask(RequestMethod.POST, name='test', endpoint='/api/test | foo=bar', source='static.txt')
+        plan = RequestTaskPlan(request, identifier='001', context_root=context_root)
+
+        assert not plan.render_name
+        assert plan.name == '001 test'
+        assert not plan.render_endpoint
+        assert plan.endpoint == '/api/test'
+        assert not plan.render_source
+        assert not plan.resolve_source
+        assert plan.source == 'static payload'
+        assert not plan.render_arguments
+        assert plan.arguments == {'foo': 'bar'}
+        assert plan.arguments is not request.arguments
+
+        request = RequestTask(RequestMethod.POST, name='{{ name }}', endpoint='/api/{{ name }}', source='dynamic.j2.txt')
+        request.arguments = {'{{ key }}': 'bar'}
+        plan = RequestTaskPlan(request, identifier='002', context_root=context_root)
+
+        assert plan.render_name
+        assert plan.name == '{{ name }}'
+        assert plan.render_endpoint
+        assert plan.endpoint == '/api/{{ name }}'
+        assert plan.render_source
+        assert not plan.resolve_source
+        assert plan.source == 'hello {{ name }}'
+        assert plan.render_arguments
+
+        request = RequestTask(RequestMethod.POST, name='test', endpoint='/api/test', source='{{ file }}')
+        plan = RequestTaskPlan(request, identifier='001', context_root=context_root)
+
+        assert plan.render_source
+        assert plan.resolve_source
+        assert plan.source == '{{ file }}'
+        assert plan.arguments is None
+        assert not plan.render_arguments
+
+        # templates with only statements or comments
+        request = RequestTask(RequestMethod.POST, name='{# test #}', endpoint='/api/{% if name %}test{% endif %}', source='statement.j2.txt')
+        plan = RequestTaskPlan(request, identifier='001', context_root=context_root)
+
+        assert plan.render_name
+        assert plan.render_endpoint
+        assert plan.render_source
+        assert not plan.resolve_source
+        assert plan.source == 'hello{% if name %} world{% endif %}{# comment #}'
+
+        request = RequestTask(RequestMethod.POST, name='test', endpoint='/api/test', source='{% if name %}dynamic.j2.txt{% endif %}')
+        plan = RequestTaskPlan(request, identifier='001', context_root=context_root)
+
+        assert plan.render_source
+        assert plan.resolve_source
+
+        request = RequestTask(RequestMethod.GET, name='test', endpoint='/api/test')
+        plan = RequestTaskPlan(request, identifier='001', context_root=context_root)
+        assert plan.source is None
+        assert not plan.render_source
+
+    def test_matches(self, grizzly_fixture: GrizzlyFixture) -> None:
+        context_root = grizzly_fixture.test_context
+        request = RequestTask(RequestMethod.POST, name='test', endpoint='/api/test | foo=bar', source='hello')
+
+        plan = request.get_plan('001', context_root)
+        assert plan.matches(request, '001')
+        assert not plan.matches(request, '002')
+        assert request.get_plan('001', context_root) is plan
+
+        request.source = 'world'
+        assert not plan.matches(request, '001')
+        changed_plan = request.get_plan('001', context_root)
+        assert changed_plan is not plan
+        assert changed_plan.source == 'world'
+
+        # changed in-place
+        assert request.arguments is not None
+        request.arguments['foo'] = 'baz'
+        assert not changed_plan.matches(request, '001')
+        assert request.get_plan('001', context_root).arguments == {'foo': 'baz'}
+
+
+def test_compile_request_plans(grizzly_fixture: GrizzlyFixture) -> None:
+    context_root = grizzly_fixture.test_context
+
+    request1 = RequestTask(RequestMethod.GET, name='test-1', endpoint='/api/test')
+    request2 = RequestTask(RequestMethod.GET, name='test-2', endpoint='/api/test')
+    request3 = RequestTask(RequestMethod.GET, name='test-3', endpoint='/api/test | content_type=json')
+    request4 = RequestTask(RequestMethod.GET, name='test-4', endpoint='/api/test')
+
+    conditional = ConditionalTask(name='conditional', condition='{{ true }}')
+    conditional.switch(pointer=True)
+    conditional.add(request2)
+    conditional.switch(pointer=False)
+    conditional.add(UntilRequestTask(request3, condition='$.foo | retries=1'))
+
+    grizzly_fixture.grizzly.scenario.variables['foo'] = 'none'
+    loop = LoopTask(name='loop', values='["a", "b"]', variable='foo')
+    loop.add(request4)
+
+    tasks = [request1, LogMessageTask(message='hello'), conditional, loop]
+
+    assert compile_request_plans(tasks, identifier='001', context_root=context_root) == 4
+
+    for index, request in enumerate([request1, request2, request3, request4], start=1):
+        assert request.plan is not None
+        assert request.plan.name == f'001 {request.name}'
+        assert request.name.endswith(f'test-{index}')
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from contextlib import suppress
+from copy import copy
 from os import environ
 from typing import TYPE_CHECKING, Any, cast
 
@@ -25,6 +26,7 @@ from grizzly.locust import FixedUsersDispatcher
 from grizzly.tasks import AsyncRequestGroupTask, ConditionalTask, ExplicitWaitTask, LogMessageTask, LoopTask, RequestTask
 from grizzly.types import MessageDirection, RequestMethod
 from grizzly.types.behave import Scenario
+from grizzly_common.transformer import TransformerContentType
 
 from test_framework.helpers import ANY, TestTask, get_property_decorated_attributes, rm_rf
 
@@ -99,6 +101,8 @@ class TestGrizzlyContextSetup:
             'dispatcher_class': (None, FixedUsersDispatcher),
             'hooks': ([], []),
             'wait_for_spawning_complete': (None, 10.0),
+            'cache_request_files': ([], ['*.j2.json']),
+            'max_worker_saturation': (None, 5.0),
         }
 
         expected_attributes = list(expected_properties.keys())
@@ -323,6 +327,41 @@ class TestGrizzlyContextScenario:
 
         assert not scenario.should_validate()
 
+    def test_template(self, behave_fixture: BehaveFixture) -> None:
+        scenario = GrizzlyContextScenario(1, behave=behave_fixture.create_scenario('Test'), grizzly=behave_fixture.grizzly)
+
+        template = scenario.template('hello {{ name }}')
+        assert template.render(name='world') == 'hello world'
+        assert scenario.template('hello {{ name }}') is template
+        assert scenario.template('hello {{ name }}!') is not template
+
+        # copies of the scenario, e.g. for each user, shares cache
+        assert copy(scenario).template('hello {{ name }}') is template
+
+        other_scenario = GrizzlyContextScenario(2, behave=behave_fixture.create_scenario('Test'), grizzly=behave_fixture.grizzly)
+        assert other_scenario.template('hello {{ name }}') is not template
+
+    def test_parser(self, behave_fixture: BehaveFixture) -> None:
+        scenario = GrizzlyContextScenario(1, behave=behave_fixture.create_scenario('Test'), grizzly=behave_fixture.grizzly)
+
+        with pytest.raises(TypeError, match='could not find a transformer for UNDEFINED'):
+            scenario.parser(TransformerContentType.UNDEFINED, '$.hello')
+
+        with pytest.raises(TypeError, match='"//hello" is not a valid expression for JSON'):
+            scenario.parser(TransformerContentType.JSON, '//hello')
+
+        parser = scenario.parser(TransformerContentType.JSON, '$.hello')
+        assert parser({'hello': 'world'}) == ['world']
+        assert scenario.parser(TransformerContentType.JSON, '$.hello') is parser
+        assert scenario.parser(TransformerContentType.JSON, '$.world') is not parser
+
+        plain_parser = scenario.parser(TransformerContentType.PLAIN, 'wor(ld)')
+        assert plain_parser('world') == ['ld']
+        assert scenario.parser(TransformerContentType.PLAIN, 'wor(ld)') is plain_parser
+
+        # copies of the scenario, e.g. for each user, shares cache
+        assert copy(scenario).parser(TransformerContentType.JSON, '$.hello') is parser
+
     def test_tasks(self, request_task: RequestTaskFixture, behave_fixture: BehaveFixture) -> None:
         scenario = GrizzlyContextScenario(1, behave=behave_fixture.create_scenario('TestScenario'), grizzly=behave_fixture.grizzly)
         scenario.context['host'] = 'test'
@@ -18,6 +18,7 @@ import gevent
 import pytest
 from dateutil.parser import parse as date_parse
 from grizzly.auth import RefreshTokenDistributor
+from grizzly.listeners.stats import HistogramStats
 from grizzly.locust import (
     greenlet_exception_logger,
     grizzly_print_percentile_stats,
@@ -39,6 +40,7 @@ from grizzly.types import RequestDirection, RequestMethod, RequestType, pymqi
 from grizzly.types.behave import Context, Scenario
 from grizzly.types.locust import Environment
 from grizzly.users import MessageQueueUser, RestApiUser
+from grizzly.utils import file_cache
 from locust.dispatch import UsersDispatcher as WeightedUsersDispatcher
 from locust.stats import RequestStats
 
@@ -182,6 +184,8 @@ def test_setup_locust_scenarios(behave_fixture: BehaveFixture, noop_zmq: NoopZmq
 
     assert dependencies == {RefreshTokenDistributor}
     assert len(user_classes) == 1
+    assert task.plan is not None
+    assert task.plan.name == '001 test-1'
 
     user_class = user_classes[-1]
     assert issubclass(user_class, RestApiUser)
@@ -460,6 +464,20 @@ def test_setup_environment_listeners(behave_fixture: BehaveFixture, mocker: Mock
         assert len(environment.events.spawning_complete._handlers) == 1
         assert len(environment.events.quitting._handlers) == 1
 
+        # results are validated if workers should be checked for saturation
+        grizzly.scenario.validation.fail_ratio = None
+        environment.events.spawning_complete._handlers = []
+
+        setup_environment_listeners(behave, dependencies=set(), testdata=testdata)
+        assert len(environment.events.quitting._handlers) == 0
+
+        grizzly.setup.max_worker_saturation = 10.0
+        environment.events.spawning_complete._handlers = []
+
+        setup_environment_listeners(behave, dependencies=set(), testdata=testdata)
+        assert len(environment.events.quitting._handlers) == 1
+
+        grizzly.setup.max_worker_saturation = None
         grizzly.setup.statistics_url = None
         environment.events.spawning_complete._handlers = []
     finally:
@@ -611,9 +629,21 @@ def test_run_worker(behave_fixture: BehaveFixture, mocker: MockerFixture) -> Non
     task = RequestTask(RequestMethod.GET, 'test-1', '/api/v1/test/1')
     grizzly.scenario.tasks.add(task)
 
+    requests_root = behave_fixture.locust._test_context_root / 'requests'
+    (requests_root / 'payloads').mkdir()
+    (requests_root / 'payloads' / 'test.j2.json').write_text('{}')
+    (requests_root / 'test.j2.xml').write_text('<test/>')
+    grizzly.setup.cache_request_files.append('payloads/*.j2.json')
+    file_cache_warm_spy = mocker.spy(file_cache, 'warm')
+
     assert run(behave) == 1
     assert messagequeue_process_spy.call_count == 0
     assert grizzly.setup.dispatcher_class == WeightedUsersDispatcher
+    assert file_cache_warm_spy.spy_return == 1
+    assert requests_root / 'payloads' / 'test.j2.json' in file_cache
+    assert requests_root / 'test.j2.xml' not in file_cache
+
+    file_cache.clear()
 
     # @TODO: test coverage further down in run is needed!
 
@@ -870,3 +900,39 @@ def test_grizzly_print_percentile_stats(caplog: LogCaptureFixture, mocker: Mocke
 
     for stat in grizzly_stats:
         assert stat in locust_stats
+
+
+def test_grizzly_print_percentile_stats_histograms(caplog: LogCaptureFixture, mocker: MockerFixture) -> None:
+    test_stats_logger = logging.getLogger('test_grizzly_print_percentile_stats_histograms')
+    mocker.patch('grizzly.locust.stats_logger', test_stats_logger)
+
+    environment = Environment()
+    stats = environment.stats
+    histograms = HistogramStats(environment)
+    environment.events.request.remove_listener(histograms.on_request)
+
+    for name, method in [('001 read-test', 'GET'), ('001 scenario', 'SCEN'), ('002 write-test', 'POST')]:
+        for response_time in range(1, 101):
+            stats.log_request(method, name, response_time, 10)
+            histograms.on_request(method, name, response_time)
+
+    with caplog.at_level(logging.INFO):
+        grizzly_print_percentile_stats(stats, histograms=histograms)
+
+    grizzly_stats = caplog.messages
+    caplog.clear()
+
+    with caplog.at_level(logging.INFO):
+        grizzly_print_percentile_stats(stats, grizzly_style=False, histograms=histograms)
+
+    locust_stats = caplog.messages
+    caplog.clear()
+
+    assert len(grizzly_stats) == 9
+    assert grizzly_stats[0] == 'Response time percentiles (approximated)'
+    assert [stat.split()[:3] for stat in grizzly_stats[3:6]] == [['SCEN', '001', 'scenario'], ['GET', '001', 'read-test'], ['POST', '002', 'write-test']]
+    assert grizzly_stats[7].split() == ['Aggregated', '50', '66', '74', '81', '89', '95', '99', '99', '100', '100', '100', '300']
+    assert grizzly_stats[8] == ''
+
+    assert [stat.split()[:3] for stat in locust_stats[3:6]] == [['GET', '001', 'read-test'], ['SCEN', '001', 'scenario'], ['POST', '002', 'write-test']]
+    assert sorted(locust_stats) == sorted(grizzly_stats)
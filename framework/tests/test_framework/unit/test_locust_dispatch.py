@@ -11,6 +11,7 @@ import unittest
 import warnings
 from operator import attrgetter
 from typing import TYPE_CHECKING, Any, cast
+from unittest.mock import patch
 
 from grizzly.locust import FixedUsersDispatcher, UsersDispatcher
 from grizzly.users import GrizzlyUser
@@ -2245,6 +2246,7 @@ class TestLargeScale(UsersDispatcherTestCase):
             ts = time.perf_counter()
             distribute_users: Any
             if isinstance(users_dispatcher, FixedUsersDispatcher):
+                users_dispatcher._spread_sticky_tags_on_workers()
                 distribute_users = users_dispatcher._grizzly_distribute_users({})
             else:
                 distribute_users = users_dispatcher._distribute_users(target_user_count=target_user_count_1m)
@@ -2259,6 +2261,44 @@ class TestLargeScale(UsersDispatcherTestCase):
 
             self.assertEqual(_user_count(users_on_workers), 1_000_000)
 
+    def test_rebalance_50_000_users_with_25_user_classes_and_100_workers(self) -> None:
+        user_classes = self.fixed_user_classes_10k[:25]
+        target_user_count = 50_000 if self.user_dispatcher_class == UsersDispatcher else -1
+
+        workers = [WorkerNode(str(i)) for i in range(100)]
+
+        users_dispatcher = self.user_dispatcher_class(worker_nodes=workers, user_classes=user_classes)
+        users_dispatcher.new_dispatch(target_user_count=target_user_count, spawn_rate=50_000)
+        users_dispatcher._wait_between_dispatch = 0
+        dispatched_users = list(users_dispatcher)[-1]
+
+        for rebalance, moved in [(lambda: users_dispatcher.remove_worker(workers[50]), -1), (lambda: users_dispatcher.add_worker(workers[50]), 1)]:
+            previous_users = {worker_node_id: dict(user_classes_count) for worker_node_id, user_classes_count in dispatched_users.items()}
+
+            ts = time.perf_counter()
+            rebalance()
+            users_dispatcher.new_dispatch(target_user_count=target_user_count, spawn_rate=50_000)
+            dispatched_users = next(users_dispatcher)
+            delta = time.perf_counter() - ts
+
+            self.assertLessEqual(1000 * delta, 1000)
+
+            if self.user_dispatcher_class == UsersDispatcher:
+                continue
+
+            # only users of the removed worker are moved to the other workers, and only users needed by the added worker are moved to it
+            for worker_node_id, user_classes_count in dispatched_users.items():
+                if worker_node_id == workers[50].id:
+                    continue
+
+                for user_class_name, count in user_classes_count.items():
+                    self.assertGreaterEqual((count - previous_users[worker_node_id][user_class_name]) * -moved, 0)
+            self.assertEqual(_user_count(dispatched_users), 50_000)
+            self.assertDictEqual(_aggregate_dispatched_users(dispatched_users), {user_class.__name__: 2000 for user_class in user_classes})
+
+            user_count_on_workers = [sum(user_classes_count.values()) for user_classes_count in dispatched_users.values()]
+            self.assertLessEqual(max(user_count_on_workers) - min(user_count_on_workers), 1)
+
     def test_ramp_up_from_0_to_100_000_users_with_50_user_classes_and_1000_workers_and_5000_spawn_rate(self) -> None:
         if self.user_dispatcher_class == UsersDispatcher:
             user_classes_categories = [
@@ -5252,6 +5292,255 @@ class TestFixedUsersDispatcher(unittest.TestCase):
         self.assertEqual(_user_count_on_worker(dispatched_users, worker_nodes[0].id), 6)
         self.assertEqual(_user_count_on_worker(dispatched_users, worker_nodes[2].id), 3)
 
+    def test_rebalance_only_changed_sticky_tags(self) -> None:
+        class User1(GrizzlyUser):
+            sticky_tag = 'foo'
+            fixed_count = 6
+
+        class User2(GrizzlyUser):
+            sticky_tag = 'foo'
+            fixed_count = 3
+
+        class User3(GrizzlyUser):
+            sticky_tag = 'bar'
+            fixed_count = 8
+
+        user_classes = [User1, User2, User3]
+
+        worker_nodes = [WorkerNode(str(i + 1)) for i in range(4)]
+
+        users_dispatcher = FixedUsersDispatcher(worker_nodes=worker_nodes, user_classes=user_classes)
+
+        users_dispatcher.new_dispatch(target_user_count=-1, spawn_rate=17)
+        users_dispatcher._wait_between_dispatch = 0
+
+        dispatched_users = next(users_dispatcher)
+        self.assertDictEqual(_aggregate_dispatched_users(dispatched_users), {'User1': 6, 'User2': 3, 'User3': 8})
+        self.assertEqual(users_dispatcher.get_current_user_count_total(), 17)
+
+        foo_workers = {worker_id: dispatched_users[worker_id] for worker_id in ['1', '3']}
+        self.assertEqual(sum(user_count['User1'] + user_count['User2'] for user_count in foo_workers.values()), 9)
+
+        users_dispatcher.remove_worker(worker_nodes[3])
+
+        self.assertEqual(
+            [
+                worker_node.id
+                for worker_node in users_dispatcher._FixedUsersDispatcher__sticky_tag_to_workers.get('bar', [])  # type: ignore[attr-defined]
+            ],
+            ['2'],
+        )
+
+        users_dispatcher.new_dispatch(target_user_count=-1, spawn_rate=17)
+        dispatched_users = next(users_dispatcher)
+
+        # users on workers with sticky tag "foo" was not touched, the users on the removed worker was moved to the other "bar" worker
+        self.assertDictEqual({worker_id: dispatched_users[worker_id] for worker_id in ['1', '3']}, foo_workers)
+        self.assertDictEqual(dispatched_users['2'], {'User1': 0, 'User2': 0, 'User3': 8})
+        self.assertEqual(users_dispatcher.get_current_user_count_total(), 17)
+        self.assertEqual([user_class_name for worker_node, user_class_name in users_dispatcher._active_users if worker_node.id == '2'], ['User3'] * 8)
+
+        self.assertRaises(StopIteration, lambda: next(users_dispatcher))
+
+    def test_rebalance_only_moves_users_needed(self) -> None:
+        class User1(GrizzlyUser):
+            fixed_count = 6
+
+        class User2(GrizzlyUser):
+            fixed_count = 6
+
+        user_classes = [User1, User2]
+
+        worker_nodes = [WorkerNode(str(i + 1)) for i in range(4)]
+
+        users_dispatcher = FixedUsersDispatcher(worker_nodes=worker_nodes[:3], user_classes=user_classes)
+
+        users_dispatcher.new_dispatch(target_user_count=-1, spawn_rate=12)
+        users_dispatcher._wait_between_dispatch = 0
+
+        dispatched_users = next(users_dispatcher)
+        self.assertEqual([_user_count_on_worker(dispatched_users, worker_node.id) for worker_node in worker_nodes[:3]], [4, 4, 4])
+
+        active_users = list(users_dispatcher._active_users)
+
+        users_dispatcher.add_worker(worker_nodes[3])
+        users_dispatcher.new_dispatch(target_user_count=-1, spawn_rate=12)
+        dispatched_users = next(users_dispatcher)
+
+        # one user is moved from each worker to the new worker, all other users are kept, in the same order
+        self.assertEqual([_user_count_on_worker(dispatched_users, worker_node.id) for worker_node in worker_nodes], [3, 3, 3, 3])
+        self.assertDictEqual(_aggregate_dispatched_users(dispatched_users), {'User1': 6, 'User2': 6})
+        self.assertEqual(
+            [(before[0].id, after[0].id) for before, after in zip(active_users, users_dispatcher._active_users, strict=True) if before != after],
+            [('1', '4'), ('2', '4'), ('3', '4')],
+        )
+
+        active_users = list(users_dispatcher._active_users)
+
+        users_dispatcher.remove_worker(worker_nodes[0])
+        users_dispatcher.new_dispatch(target_user_count=-1, spawn_rate=12)
+        dispatched_users = next(users_dispatcher)
+
+        # only the users on the removed worker are moved
+        self.assertEqual([_user_count_on_worker(dispatched_users, worker_node.id) for worker_node in worker_nodes[1:]], [4, 4, 4])
+        self.assertDictEqual(_aggregate_dispatched_users(dispatched_users), {'User1': 6, 'User2': 6})
+        self.assertEqual(
+            [before[0].id for before, after in zip(active_users, users_dispatcher._active_users, strict=True) if before != after],
+            ['1', '1', '1'],
+        )
+
+        self.assertRaises(StopIteration, lambda: next(users_dispatcher))
+
+    def test_dispatch_by_cost_and_capacity(self) -> None:
+        class User1(GrizzlyUser):
+            sticky_tag = 'foo'
+            fixed_count = 4
+            cost = 10.0
+
+        class User2(GrizzlyUser):
+            sticky_tag = 'foo'
+            fixed_count = 40
+
+        class User3(GrizzlyUser):
+            sticky_tag = 'bar'
+            fixed_count = 10
+
+        user_classes: list[type[GrizzlyUser]] = [User1, User2, User3]
+
+        worker_nodes = [WorkerNode(str(i + 1)) for i in range(4)]
+        for worker_node, capacity in zip(worker_nodes, [1.0, 2.0, 4.0, 2.0], strict=True):
+            worker_node.capacity = capacity  # type: ignore[attr-defined]
+
+        users_dispatcher = FixedUsersDispatcher(worker_nodes=worker_nodes, user_classes=user_classes)
+
+        users_dispatcher.new_dispatch(target_user_count=-1, spawn_rate=54)
+        users_dispatcher._wait_between_dispatch = 0
+
+        self.assertTrue(users_dispatcher._grizzly_weighted)
+
+        # "foo" has the highest cost, and gets the worker with most capacity, and the workers that are left
+        self.assertEqual(
+            {
+                sticky_tag: [worker_node.id for worker_node in worker_nodes]
+                for sticky_tag, worker_nodes in users_dispatcher._FixedUsersDispatcher__sticky_tag_to_workers.items()  # type: ignore[attr-defined]
+            },
+            {'foo': ['3', '4', '1'], 'bar': ['2']},
+        )
+
+        dispatched_users = next(users_dispatcher)
+        self.assertDictEqual(_aggregate_dispatched_users(dispatched_users), {'User1': 4, 'User2': 40, 'User3': 10})
+        self.assertDictEqual(dispatched_users['2'], {'User1': 0, 'User2': 0, 'User3': 10})
+
+        # cost per capacity is about the same on all "foo" workers, the expensive users are not on the same worker
+        self.assertDictEqual(
+            {worker_id: dispatched_users[worker_id] for worker_id in ['1', '3', '4']},
+            {
+                '1': {'User1': 0, 'User2': 11, 'User3': 0},
+                '3': {'User1': 3, 'User2': 17, 'User3': 0},
+                '4': {'User1': 1, 'User2': 12, 'User3': 0},
+            },
+        )
+        self.assertDictEqual(users_dispatcher._worker_load, {'1': 11.0, '2': 10.0, '3': 47.0, '4': 22.0})
+
+        users_dispatcher.remove_worker(worker_nodes[2])
+        users_dispatcher.new_dispatch(target_user_count=-1, spawn_rate=54)
+        dispatched_users = next(users_dispatcher)
+
+        self.assertEqual(users_dispatcher.get_current_user_count_total(), 54)
+        self.assertDictEqual(
+            dispatched_users,
+            {
+                '1': {'User1': 1, 'User2': 17, 'User3': 0},
+                '2': {'User1': 3, 'User2': 23, 'User3': 0},
+                '4': {'User1': 0, 'User2': 0, 'User3': 10},
+            },
+        )
+        self.assertDictEqual(users_dispatcher._worker_load, {'1': 27.0, '2': 53.0, '4': 10.0})
+
+        self.assertRaises(StopIteration, lambda: next(users_dispatcher))
+
+        # same cost and capacity, users are dispatched round robin
+        for worker_node in worker_nodes:
+            worker_node.capacity = 2.0  # type: ignore[attr-defined]
+
+        User1.cost = 1.0
+        users_dispatcher = FixedUsersDispatcher(worker_nodes=worker_nodes, user_classes=user_classes)
+        users_dispatcher.new_dispatch(target_user_count=-1, spawn_rate=54)
+
+        self.assertFalse(users_dispatcher._grizzly_weighted)
+
+    def test_adaptive_spawning(self) -> None:
+        class User1(GrizzlyUser):
+            sticky_tag = 'foo'
+            fixed_count = 6
+
+        class User2(GrizzlyUser):
+            sticky_tag = 'bar'
+            fixed_count = 2
+
+        worker_nodes = [WorkerNode(str(i + 1)) for i in range(4)]
+
+        users_dispatcher_class = FixedUsersDispatcher.adaptive(max_cpu_usage=90.0)
+        self.assertEqual(users_dispatcher_class.__name__, 'FixedUsersDispatcher')
+        self.assertEqual(users_dispatcher_class.max_cpu_usage, 90.0)
+        self.assertIsNone(FixedUsersDispatcher.max_cpu_usage)
+
+        users_dispatcher = users_dispatcher_class(worker_nodes=worker_nodes, user_classes=[User1, User2])
+        users_dispatcher.new_dispatch(target_user_count=-1, spawn_rate=4)
+        users_dispatcher._wait_between_dispatch = 0
+
+        self.assertEqual(
+            {
+                sticky_tag: [worker_node.id for worker_node in worker_nodes]
+                for sticky_tag, worker_nodes in users_dispatcher._FixedUsersDispatcher__sticky_tag_to_workers.items()  # type: ignore[attr-defined]
+            },
+            {'foo': ['1', '3', '4'], 'bar': ['2']},
+        )
+
+        # worker 1 is busy, and the only "bar" worker is late with its heartbeats
+        worker_nodes[0].cpu_usage = 95
+        worker_nodes[1].heartbeat -= 2
+
+        with patch('grizzly.locust.grizzly_events.generator_saturation.fire') as fire_mock:
+            dispatched_users = next(users_dispatcher)
+
+        self.assertDictEqual(
+            dispatched_users,
+            {
+                '1': {'User1': 0, 'User2': 0},
+                '2': {'User1': 0, 'User2': 0},
+                '3': {'User1': 2, 'User2': 0},
+                '4': {'User1': 2, 'User2': 0},
+            },
+        )
+        self.assertEqual(fire_mock.call_count, 2)
+        self.assertEqual(fire_mock.call_args_list[0].kwargs['tags'], {'worker': '1'})
+        self.assertEqual(fire_mock.call_args_list[0].kwargs['measurement'], 'generator_saturation')
+        self.assertEqual(fire_mock.call_args_list[0].kwargs['metrics'], ANY(dict))
+        self.assertEqual(fire_mock.call_args_list[0].kwargs['metrics']['cpu_usage'], 95)
+        self.assertTrue(fire_mock.call_args_list[0].kwargs['metrics']['paused'])
+        self.assertEqual(fire_mock.call_args_list[1].kwargs['tags'], {'worker': '2'})
+        self.assertEqual(fire_mock.call_args_list[1].kwargs['metrics']['heartbeat_lag'], 2)
+
+        # all "foo" workers are busy, only "bar" users left and they can not be dispatched
+        worker_nodes[2].cpu_usage = worker_nodes[3].cpu_usage = 100
+
+        dispatched_users = next(users_dispatcher)
+
+        self.assertEqual(_user_count(dispatched_users), 4)
+        self.assertTrue(users_dispatcher.dispatch_in_progress)
+
+        # "bar" worker is no longer late, but a worker can not be paused for longer than max_pause
+        worker_nodes[1].heartbeat = 3
+        users_dispatcher.max_pause = 0.0
+
+        dispatched_users = next(users_dispatcher)
+
+        self.assertEqual(_user_count(dispatched_users), 8)
+        self.assertDictEqual(_aggregate_dispatched_users(dispatched_users), {'User1': 6, 'User2': 2})
+        self.assertDictEqual(dispatched_users['2'], {'User1': 0, 'User2': 2})
+        self.assertRaises(StopIteration, lambda: next(users_dispatcher))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -8,14 +8,25 @@ from contextlib import suppress
 from datetime import datetime, timedelta, timezone
 from os import environ, sep
 from pathlib import Path
+from time import perf_counter
 from typing import TYPE_CHECKING, Any, Literal, cast
 from uuid import uuid4
 
 import pytest
-from gevent.event import AsyncResult
-from gevent.lock import Semaphore
+from gevent import joinall
+from gevent import sleep as gsleep
+from gevent import spawn as gspawn
+from gevent.event import AsyncResult, Event
+from gevent.lock import BoundedSemaphore, Semaphore
 from grizzly.tasks import LogMessageTask
-from grizzly.testdata.communication import AsyncTimer, AsyncTimersConsumer, AsyncTimersProducer, TestdataConsumer, TestdataProducer
+from grizzly.testdata.communication import (
+    AsyncTimer,
+    AsyncTimersConsumer,
+    AsyncTimersProducer,
+    TestdataConsumer,
+    TestdataProducer,
+    TestdataVariablePlanStep,
+)
 from grizzly.testdata.utils import initialize_testdata, transform
 from grizzly.testdata.variables import AtomicIntegerIncrementer
 from grizzly.testdata.variables.csv_writer import atomiccsvwriter_message_handler
@@ -964,6 +975,174 @@ value3,value4
 
             cleanup()
 
+    def test_run_batched(self, grizzly_fixture: GrizzlyFixture, cleanup: AtomicVariableCleanupFixture) -> None:
+        try:
+            grizzly = grizzly_fixture.grizzly
+            parent = grizzly_fixture()
+            environ['GRIZZLY_FEATURE_FILE'] = 'features/test_run_batched.feature'
+
+            grizzly.scenarios.clear()
+            grizzly.scenarios.create(grizzly_fixture.behave.create_scenario(parent.__class__.__name__))
+            grizzly.scenario.variables.update(
+                {
+                    'AtomicIntegerIncrementer.value': '1',
+                    'foo': 'bar',
+                },
+            )
+            grizzly.scenario.variables.alias.update({'AtomicIntegerIncrementer.value': 'auth.value'})
+            grizzly.scenario.iterations = 5
+            grizzly.scenario.user.class_name = 'TestUser'
+            grizzly.scenario.tasks.add(LogMessageTask(message='{{ AtomicIntegerIncrementer.value }} {{ foo }}'))
+
+            testdata, _ = initialize_testdata(grizzly)
+
+            producer = TestdataProducer(runner=cast('LocalRunner', grizzly.state.locust), testdata=testdata)
+            grizzly.state.producer = producer
+
+            request = {'identifier': grizzly.scenario.class_name, 'size': 3}
+
+            response = producer._handle_request_testdata(request=request)
+            assert response['action'] == 'consume'
+            assert [data['__iteration__'] for data in response['data']] == [(0, 5), (1, 5), (2, 5)]
+            assert [data['variables']['AtomicIntegerIncrementer.value'] for data in response['data']] == [1, 2, 3]
+            assert [data['auth.value'] for data in response['data']] == [1, 2, 3]
+            assert all(data['variables']['foo'] == 'bar' for data in response['data'])
+
+            # only 2 iterations left, partial batch
+            response = producer._handle_request_testdata(request=request)
+            assert response['action'] == 'consume'
+            assert [data['__iteration__'] for data in response['data']] == [(3, 5), (4, 5)]
+            assert producer.scenarios_iteration[grizzly.scenario.class_name] == 5
+
+            assert producer._handle_request_testdata(request=request) == {'action': 'stop'}
+
+            # unbatched request still gets a single iteration
+            producer.scenarios_iteration[grizzly.scenario.class_name] = 4
+            response = producer._handle_request_testdata(request={'identifier': grizzly.scenario.class_name})
+            assert response['action'] == 'consume'
+            assert response['data']['__iteration__'] == (4, 5)
+        finally:
+            with suppress(KeyError):
+                del environ['GRIZZLY_FEATURE_FILE']
+
+            cleanup()
+
+    def test_get_variable_plan(self, grizzly_fixture: GrizzlyFixture, cleanup: AtomicVariableCleanupFixture) -> None:
+        try:
+            grizzly = grizzly_fixture.grizzly
+            environ['GRIZZLY_FEATURE_FILE'] = 'features/test_get_variable_plan.feature'
+            context_root = grizzly_fixture.test_context / 'requests'
+            context_root.mkdir(exist_ok=True)
+            (context_root / 'test.csv').write_text('header1,header2\nvalue1,value2\n')
+
+            grizzly.scenarios.clear()
+            first = grizzly.scenarios.create(grizzly_fixture.behave.create_scenario('first'))
+            first.variables.update(
+                {
+                    'AtomicCsvReader.test': 'test.csv',
+                    'AtomicIntegerIncrementer.value': '1',
+                    'foo': 'bar',
+                },
+            )
+            first.variables.alias.update({'AtomicCsvReader.test.header1': 'auth.user'})
+            first.tasks.add(LogMessageTask(message='{{ AtomicCsvReader.test.header1 }} {{ AtomicCsvReader.test.header2 }} {{ AtomicIntegerIncrementer.value }} {{ foo }}'))
+
+            second = grizzly.scenarios.create(grizzly_fixture.behave.create_scenario('second'))
+            second.variables.update({'AtomicIntegerIncrementer.value': '10'})
+            second.tasks.add(LogMessageTask(message='{{ AtomicIntegerIncrementer.value }}'))
+
+            testdata, _ = initialize_testdata(grizzly)
+            # third scenario shares variable instance with the first
+            testdata.update({'IteratorScenario_003': {'AtomicIntegerIncrementer.value': testdata[first.class_name]['AtomicIntegerIncrementer.value']}})
+
+            producer = TestdataProducer(runner=cast('LocalRunner', grizzly.state.locust), testdata=testdata)
+
+            # compiled at start-up
+            assert sorted(producer.variable_plans.keys()) == sorted([first.class_name, second.class_name, 'IteratorScenario_003'])
+
+            plan = producer.get_variable_plan(first.class_name)
+            assert plan is producer.variable_plans[first.class_name]
+            assert plan.scenario is first
+            csv_type = 'AtomicCsvReader.test'
+            assert sorted(plan.steps, key=lambda step: step.key) == [
+                SOME(TestdataVariablePlanStep, key=f'{csv_type}.header1', variable_name='test', testdata_type=csv_type, attribute='header1', alias='auth.user'),
+                SOME(TestdataVariablePlanStep, key=f'{csv_type}.header2', variable_name='test', testdata_type=csv_type, attribute='header2', alias=None),
+                SOME(TestdataVariablePlanStep, key='AtomicIntegerIncrementer.value', variable_name='value', testdata_type=None, attribute='value', alias=None),
+                SOME(TestdataVariablePlanStep, key='foo', variable='bar', variable_name=None, testdata_type=None, alias=None),
+            ]
+            # AtomicCsvReader and AtomicIntegerIncrementer
+            assert len(plan.locks) == 2
+
+            second_plan = producer.get_variable_plan(second.class_name)
+            assert len(second_plan.locks) == 1
+            assert second_plan.locks[0] not in plan.locks
+
+            third_plan = producer.get_variable_plan('IteratorScenario_003')
+            assert third_plan.scenario is None
+            assert len(third_plan.locks) == 1
+            assert third_plan.locks[0] in plan.locks
+
+            # scenario without testdata
+            empty_plan = producer.get_variable_plan('IteratorScenario_004')
+            assert empty_plan.scenario is None
+            assert empty_plan.steps == []
+            assert empty_plan.locks == []
+        finally:
+            with suppress(KeyError):
+                del environ['GRIZZLY_FEATURE_FILE']
+
+            cleanup()
+
+    def test_handle_request_parallel(self, grizzly_fixture: GrizzlyFixture, mocker: MockerFixture, cleanup: AtomicVariableCleanupFixture) -> None:
+        try:
+            grizzly = grizzly_fixture.grizzly
+            environ['GRIZZLY_FEATURE_FILE'] = 'features/test_handle_request_parallel.feature'
+
+            grizzly.scenarios.clear()
+            for name, value in [('first', '1'), ('second', '10')]:
+                scenario = grizzly.scenarios.create(grizzly_fixture.behave.create_scenario(name))
+                scenario.variables.update({'AtomicIntegerIncrementer.value': value})
+                scenario.tasks.add(LogMessageTask(message='{{ AtomicIntegerIncrementer.value }}'))
+                scenario.iterations = 2
+
+            testdata, _ = initialize_testdata(grizzly)
+            producer = TestdataProducer(runner=cast('LocalRunner', grizzly.state.locust), testdata=testdata)
+            send_message_mock = mocker.patch.object(producer.runner, 'send_message', return_value=None)
+
+            running: list[str] = []
+            overlap: list[bool] = []
+            original_handle_request_testdata = producer._handle_request_testdata
+
+            def handle_request_testdata(*, request: StrDict) -> StrDict:
+                running.append(request['identifier'])
+                overlap.append(len(running) > 1)
+                gsleep(0.01)
+                running.remove(request['identifier'])
+
+                return original_handle_request_testdata(request=request)
+
+            mocker.patch.object(producer, '_handle_request_testdata', side_effect=handle_request_testdata)
+
+            def request(identifier: str) -> None:
+                message = Message('produce_testdata', {'uid': 1, 'cid': 'foobar', 'rid': identifier, 'request': {'message': 'testdata', 'identifier': identifier}}, node_id=None)
+                producer.handle_request(grizzly.state.locust.environment, message)
+
+            # scenarios does not share any variables, handled in parallel
+            joinall([gspawn(request, scenario.class_name) for scenario in grizzly.scenarios], raise_error=True)
+            assert overlap == [False, True]
+            assert send_message_mock.call_count == 2
+
+            # same scenario, requests are serialized
+            overlap.clear()
+            joinall([gspawn(request, grizzly.scenarios[0].class_name) for _ in range(2)], raise_error=True)
+            assert overlap == [False, False]
+            assert producer.scenarios_iteration == {grizzly.scenarios[0].class_name: 2, grizzly.scenarios[1].class_name: 1}
+        finally:
+            with suppress(KeyError):
+                del environ['GRIZZLY_FEATURE_FILE']
+
+            cleanup()
+
     def test_on_stop(self, cleanup: AtomicVariableCleanupFixture, grizzly_fixture: GrizzlyFixture) -> None:
         try:
             grizzly = grizzly_fixture.grizzly
@@ -1327,11 +1506,12 @@ class TestTestdataConsumer:
         grizzly = grizzly_fixture.grizzly
 
         def mock_testdata(consumer: TestdataConsumer, data: StrDict, action: str | None = 'consume') -> MagicMock:
-            def send_message_mock(*_args: Any, **_kwargs: Any) -> None:
+            def send_message_mock(*args: Any, **_kwargs: Any) -> None:
                 message = Message(
                     'consume_testdata',
                     {
                         'uid': id(parent.user),
+                        'rid': args[1]['rid'],
                         'cid': cast('LocalRunner', grizzly.state.locust).client_id,
                         'response': {'action': action, 'data': data},
                     },
@@ -1491,6 +1671,199 @@ class TestTestdataConsumer:
         )
         send_message.reset_mock()
 
+    def test_testdata_batched(self, mocker: MockerFixture, grizzly_fixture: GrizzlyFixture) -> None:
+        parent = grizzly_fixture()
+        grizzly = grizzly_fixture.grizzly
+        parent.user._scenario.testdata_batch_size = 4
+
+        batches: list[StrDict] = [
+            {'action': 'consume', 'data': [{'value': index, '__iteration__': (index, 6), 'variables': {'foo': 'bar'}} for index in range(4)]},
+            {'action': 'consume', 'data': [{'value': index, '__iteration__': (index, 6), 'variables': {'foo': 'bar'}} for index in range(4, 6)]},
+            {'action': 'stop'},
+            {'action': 'stop'},
+        ]
+
+        def send_message_mock(*args: Any, **_kwargs: Any) -> None:
+            message = Message(
+                'consume_testdata',
+                {
+                    'uid': args[1]['uid'],
+                    'rid': args[1]['rid'],
+                    'cid': cast('LocalRunner', grizzly.state.locust).client_id,
+                    'response': batches.pop(0),
+                },
+                node_id=None,
+            )
+            TestdataConsumer.handle_response(environment=consumer.runner.environment, msg=message)
+
+        send_message = mocker.patch.object(grizzly.state.locust, 'send_message', side_effect=send_message_mock)
+
+        consumer = TestdataConsumer(cast('LocalRunner', grizzly.state.locust), parent)
+
+        assert consumer.batch_size == 4
+        assert consumer.low_water_mark == 2
+
+        # first call has to wait for the buffer to be filled
+        assert consumer.testdata() == {'value': 0, '__iteration__': (0, 6), 'variables': transform(grizzly.scenario, {'foo': 'bar'})}
+        send_message.assert_called_once_with(
+            'produce_testdata',
+            {
+                'uid': id(parent.user),
+                'cid': cast('LocalRunner', grizzly.state.locust).client_id,
+                'rid': ANYUUID(version=4),
+                'request': {'message': 'testdata', 'identifier': 'TestScenario_001', 'size': 4},
+            },
+        )
+        send_message.reset_mock()
+
+        assert consumer.testdata() == SOME(dict, value=1, __iteration__=(1, 6))
+        assert len(consumer._buffer) == 2
+        # low-water mark reached, refill is done in the background
+        assert consumer._refill is not None
+        send_message.assert_not_called()
+
+        gsleep(0)
+
+        assert consumer._refill is None
+        assert send_message.call_count == 1
+        assert len(consumer._buffer) == 4
+
+        assert [cast('StrDict', consumer.testdata())['value'] for _ in range(3)] == [2, 3, 4]
+        assert consumer._refill is not None
+
+        gsleep(0)
+
+        # background refill got stop, buffer is drained before stopping
+        assert consumer._refill is None
+        assert consumer._exhausted
+        assert send_message.call_count == 2
+
+        assert consumer.testdata() == SOME(dict, value=5, __iteration__=(5, 6))
+        assert consumer._refill is None
+
+        # empty buffer, ask producer again which says stop
+        assert consumer.testdata() is None
+        assert send_message.call_count == 3
+        assert batches == []
+
+    def test_handle_response(self, grizzly_fixture: GrizzlyFixture, caplog: LogCaptureFixture) -> None:
+        grizzly_fixture()
+        grizzly = grizzly_fixture.grizzly
+        environment = grizzly.state.locust.environment
+
+        result = AsyncResult()
+        TestdataConsumer._responses.update({'foobar': result})
+
+        try:
+            TestdataConsumer.handle_response(environment, Message('consume_testdata', {'uid': 1, 'rid': 'foobar', 'response': {'action': 'stop'}}, node_id=None))
+            assert result.get(timeout=1.0) == {'action': 'stop'}
+
+            with caplog.at_level(logging.WARNING):
+                TestdataConsumer.handle_response(environment, Message('consume_testdata', {'uid': 1, 'rid': 'barfoo', 'response': {'action': 'stop'}}, node_id=None))
+
+            assert caplog.messages == ['received response for unknown request barfoo']
+        finally:
+            TestdataConsumer._responses.clear()
+
+    def test__request_pipelined(self, mocker: MockerFixture, grizzly_fixture: GrizzlyFixture) -> None:
+        parent = grizzly_fixture()
+        grizzly = grizzly_fixture.grizzly
+        environment = grizzly.state.locust.environment
+
+        pending: list[StrDict] = []
+        all_sent = Event()
+        expected_in_flight = [0]
+
+        def send_message_mock(_message_type: str, data: StrDict, **_kwargs: Any) -> None:
+            pending.append(data)
+            if len(pending) >= expected_in_flight[0]:
+                all_sent.set()
+
+        def respond() -> int:
+            responses = pending.copy()
+            pending.clear()
+
+            for data in responses:
+                message = Message('consume_testdata', {'uid': data['uid'], 'rid': data['rid'], 'response': {'action': 'consume', 'data': {}}}, node_id=None)
+                TestdataConsumer.handle_response(environment=environment, msg=message)
+
+            gsleep(0)
+
+            return len(responses)
+
+        mocker.patch.object(grizzly.state.locust, 'send_message', side_effect=send_message_mock)
+
+        consumer = TestdataConsumer(cast('LocalRunner', grizzly.state.locust), parent)
+
+        for user_count in [1, 10, 50]:
+            all_sent.clear()
+            expected_in_flight[0] = user_count
+
+            greenlets = [gspawn(consumer._request, {'message': 'testdata', 'identifier': consumer.identifier}) for _ in range(user_count)]
+
+            # requests are not serialized, all of them are sent before any response has been received
+            assert all_sent.wait(timeout=1.0)
+            assert len(pending) == user_count
+            assert len({data['rid'] for data in pending}) == user_count
+            assert not any(greenlet.ready() for greenlet in greenlets)
+
+            assert respond() == user_count
+            joinall(greenlets, raise_error=True)
+
+            assert [greenlet.value for greenlet in greenlets] == [{'action': 'consume', 'data': {}}] * user_count
+
+        assert TestdataConsumer._responses == {}
+
+        # number of requests in flight is bounded
+        consumer.window = BoundedSemaphore(4)
+        all_sent.clear()
+        expected_in_flight[0] = 4
+
+        greenlets = [gspawn(consumer._request, {'message': 'testdata', 'identifier': consumer.identifier}) for _ in range(10)]
+
+        assert all_sent.wait(timeout=1.0)
+        gsleep(0)
+
+        in_flight: list[int] = []
+        while not all(greenlet.ready() for greenlet in greenlets):
+            in_flight.append(respond())
+
+        joinall(greenlets, raise_error=True)
+
+        assert [count for count in in_flight if count > 0] == [4, 4, 2]
+        assert TestdataConsumer._responses == {}
+
+    @pytest.mark.skip(reason='benchmark, should only execute explicitly during development')
+    def test__request_pipelined_benchmark(self, mocker: MockerFixture, grizzly_fixture: GrizzlyFixture) -> None:
+        """Benchmark of requests/second for number of users sharing the same consumer, where the producer has a fixed latency."""
+        parent = grizzly_fixture()
+        grizzly = grizzly_fixture.grizzly
+        latency = 0.01
+        requests_per_user = 5
+
+        def produce(data: StrDict) -> None:
+            gsleep(latency)
+            message = Message('consume_testdata', {'uid': data['uid'], 'rid': data['rid'], 'response': {'action': 'consume', 'data': {}}}, node_id=None)
+            TestdataConsumer.handle_response(environment=grizzly.state.locust.environment, msg=message)
+
+        def send_message_mock(_message_type: str, data: StrDict, **_kwargs: Any) -> None:
+            gspawn(produce, data)
+
+        mocker.patch.object(grizzly.state.locust, 'send_message', side_effect=send_message_mock)
+
+        consumer = TestdataConsumer(cast('LocalRunner', grizzly.state.locust), parent)
+
+        def user() -> None:
+            for _ in range(requests_per_user):
+                consumer._request({'message': 'testdata', 'identifier': consumer.identifier})
+
+        for user_count in [1, 10, 50]:
+            start = perf_counter()
+            joinall([gspawn(user) for _ in range(user_count)], raise_error=True)
+            delta = perf_counter() - start
+
+            print(f'{user_count:>4} users: {(user_count * requests_per_user) / delta:8.1f} requests/s')
+
     @pytest.mark.parametrize('remove', [False, True])
     def test_keystore_get(self, mocker: MockerFixture, grizzly_fixture: GrizzlyFixture, remove: bool) -> None:  # noqa: FBT001
         parent = grizzly_fixture()
@@ -2,15 +2,18 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from array import array
+from collections import deque
+from time import perf_counter
+from typing import TYPE_CHECKING, cast
 
 import pytest
-from grizzly.testdata.variables import AtomicIntegerIncrementer, AtomicRandomString, AtomicVariable, destroy_variables
+from grizzly.testdata.variables import AtomicIntegerIncrementer, AtomicRandomString, AtomicVariable, LazyRowQueue, RowQueue, destroy_variables
 
 from test_framework.helpers import AtomicCustomVariable
 
 if TYPE_CHECKING:  # pragma: no cover
-    from test_framework.fixtures import AtomicVariableCleanupFixture, GrizzlyFixture
+    from test_framework.fixtures import AtomicVariableCleanupFixture, GrizzlyFixture, MockerFixture
 
 
 def test_destroy_variables(grizzly_fixture: GrizzlyFixture, cleanup: AtomicVariableCleanupFixture) -> None:
@@ -115,3 +118,175 @@ class TestAtomicVariable:
             assert t['hello'] == 'world'
         finally:
             cleanup()
+
+
+class TestRowQueue:
+    def test_sequential(self) -> None:
+        queue = RowQueue(['a', 'b', 'c'])
+
+        assert len(queue) == 3
+        assert [queue.get() for _ in range(4)] == ['a', 'b', 'c', None]
+        assert len(queue) == 0
+
+        queue = RowQueue(['a', 'b', 'c'], repeat=True)
+
+        assert [queue.get() for _ in range(7)] == ['a', 'b', 'c', 'a', 'b', 'c', 'a']
+        assert len(queue) == 3
+
+        # put back, next row should be the same
+        row = queue.get()
+        assert row == 'b'
+        queue.put_back(row)
+        assert len(queue) == 3
+        assert [queue.get() for _ in range(3)] == ['b', 'c', 'a']
+
+        queue = RowQueue(['a', 'b', 'c'])
+        row = queue.get()
+        queue.put_back(cast('str', row))
+        assert [queue.get() for _ in range(4)] == ['a', 'b', 'c', None]
+
+        assert RowQueue([]).get() is None
+        assert RowQueue([], repeat=True).get() is None
+
+    def test_random(self) -> None:
+        rows = [f'row{index}' for index in range(100)]
+        queue = RowQueue(rows, random=True)
+
+        values = [queue.get() for _ in range(100)]
+        assert sorted(cast('list[str]', values)) == sorted(rows)
+        assert values != rows  # 1 in 100! to fail
+        assert queue.get() is None
+
+        queue = RowQueue(['a', 'b', 'c'], random=True)
+        row = cast('str', queue.get())
+        assert len(queue) == 2
+        queue.put_back(row)
+        assert len(queue) == 3
+        assert sorted(cast('list[str]', [queue.get() for _ in range(3)])) == ['a', 'b', 'c']
+
+        queue = RowQueue(['a', 'b', 'c'], random=True, repeat=True)
+        values = [queue.get() for _ in range(300)]
+        assert set(values) == {'a', 'b', 'c'}
+        assert len(queue) == 3
+        queue.put_back(cast('str', values[-1]))
+        assert len(queue) == 3
+
+        assert RowQueue([], random=True).get() is None
+        assert RowQueue([], random=True, repeat=True).get() is None
+
+    def test_constant_time(self, mocker: MockerFixture) -> None:
+        # sequential, rows are only taken from the start and added at the end of a deque
+        queue = RowQueue(['a', 'b', 'c', 'd'])
+        assert isinstance(queue._rows, deque)
+
+        assert queue.get() == 'a'
+        assert list(queue._rows) == ['b', 'c', 'd']
+
+        queue = RowQueue(['a', 'b', 'c', 'd'], repeat=True)
+        assert queue.get() == 'a'
+        assert list(queue._rows) == ['b', 'c', 'd', 'a']
+
+        # random, the selected row is swapped with the last row, so only the end of the list is changed
+        randbelow_mock = mocker.patch('grizzly.testdata.variables.randbelow', side_effect=[1, 2, 0])
+
+        queue = RowQueue(['a', 'b', 'c', 'd'], random=True)
+        assert isinstance(queue._rows, list)
+
+        assert queue.get() == 'b'
+        assert queue._rows == ['a', 'd', 'c']
+
+        assert queue.get() == 'c'
+        assert queue._rows == ['a', 'd']
+
+        queue.put_back('c')
+        assert queue._rows == ['a', 'd', 'c']
+
+        # random with repeat, rows are never moved
+        queue = RowQueue(['a', 'b', 'c', 'd'], random=True, repeat=True)
+        assert queue.get() == 'a'
+        assert queue._rows == ['a', 'b', 'c', 'd']
+
+        assert randbelow_mock.call_count == 3
+
+    @pytest.mark.skip(reason='benchmark, should only execute explicitly during development')
+    @pytest.mark.parametrize(
+        ('repeat', 'random'),
+        [
+            (False, False),
+            (True, False),
+            (False, True),
+            (True, True),
+        ],
+    )
+    def test_benchmark(self, *, repeat: bool, random: bool) -> None:
+        """Get 10^5 rows from a queue with 10^6 rows, with `list.pop(index)` this would take minutes."""
+        count = 10**6
+        gets = 10**5
+        queue = RowQueue(range(count), repeat=repeat, random=random)
+
+        start = perf_counter()
+        for _ in range(gets):
+            queue.get()
+        delta = perf_counter() - start
+
+        print(f'{repeat=}, {random=}: {gets} of {count} rows in {delta:.2f} seconds ({gets / delta:.0f} rows/s)')
+
+
+class TestLazyRowQueue:
+    def test_sequential(self) -> None:
+        refs = array('Q', [0, 1, 2])
+        queue = LazyRowQueue(refs, 'abc'.__getitem__)
+
+        assert len(queue) == 3
+        assert [queue.get() for _ in range(4)] == ['a', 'b', 'c', None]
+        assert len(queue) == 0
+        assert refs.tolist() == [0, 1, 2]
+
+        queue = LazyRowQueue(refs, 'abc'.__getitem__, repeat=True)
+
+        assert [queue.get() for _ in range(7)] == ['a', 'b', 'c', 'a', 'b', 'c', 'a']
+        assert len(queue) == 3
+
+        # put back, next row should be the same
+        row = cast('str', queue.get())
+        assert row == 'b'
+        queue.put_back(row)
+        assert [queue.get() for _ in range(3)] == ['b', 'c', 'a']
+
+        queue = LazyRowQueue(refs, 'abc'.__getitem__)
+        queue.put_back('a')  # nothing to undo
+        row = cast('str', queue.get())
+        queue.put_back(row)
+        assert len(queue) == 3
+        assert [queue.get() for _ in range(4)] == ['a', 'b', 'c', None]
+
+        assert LazyRowQueue(array('Q'), str).get() is None
+        assert LazyRowQueue(array('Q'), str, repeat=True).get() is None
+
+    def test_random(self) -> None:
+        rows = [f'row{index}' for index in range(100)]
+        refs = array('Q', range(100))
+        queue = LazyRowQueue(refs, rows.__getitem__, random=True)
+
+        values = [queue.get() for _ in range(100)]
+        assert sorted(cast('list[str]', values)) == sorted(rows)
+        assert values != rows  # 1 in 100! to fail
+        assert queue.get() is None
+        assert refs.tolist() == list(range(100))  # references are copied when rows are removed
+
+        queue = LazyRowQueue(array('Q', [0, 1, 2]), 'abc'.__getitem__, random=True)
+        row = cast('str', queue.get())
+        assert len(queue) == 2
+        queue.put_back(row)
+        assert len(queue) == 3
+        assert sorted(cast('list[str]', [queue.get() for _ in range(3)])) == ['a', 'b', 'c']
+
+        queue = LazyRowQueue(refs, rows.__getitem__, random=True, repeat=True)
+        assert queue._refs is refs
+        values = [queue.get() for _ in range(1000)]
+        assert set(values) <= set(rows)
+        assert len(queue) == 100
+        queue.put_back(cast('str', values[-1]))
+        assert len(queue) == 100
+
+        assert LazyRowQueue(array('Q'), str, random=True).get() is None
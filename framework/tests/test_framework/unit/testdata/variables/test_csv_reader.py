@@ -3,13 +3,15 @@
 from __future__ import annotations
 
 from contextlib import suppress
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, cast
 
 import pytest
 from grizzly.testdata.variables import AtomicCsvReader
-from grizzly.testdata.variables.csv_reader import _atomiccsvreader
+from grizzly.testdata.variables.csv_reader import CsvRowIndex, _atomiccsvreader
 
 if TYPE_CHECKING:  # pragma: no cover
+    from grizzly.testdata.variables import LazyRowQueue
+
     from test_framework.fixtures import AtomicVariableCleanupFixture, GrizzlyFixture
 
 
@@ -37,6 +39,52 @@ def test__atomiccsvreader(grizzly_fixture: GrizzlyFixture) -> None:
         _atomiccsvreader('file1.csv | arg1=test')
 
     assert _atomiccsvreader('file1.csv|random=True') == 'file1.csv | random=True'
+    assert _atomiccsvreader('file1.csv|stream=True') == 'file1.csv | stream=True'
+
+
+class TestCsvRowIndex:
+    def test___init__(self, grizzly_fixture: GrizzlyFixture) -> None:
+        test_context = grizzly_fixture.test_context / 'requests'
+        test_context.mkdir(exist_ok=True)
+
+        test_file = test_context / 'index.csv'
+        test_file.write_text('header1,header2\r\nvalue11,value12\n\n"multi\n\nline",value22\nvalue31,"a ""quoted"" value"\nvalue41,value42', encoding='utf-8-sig')
+
+        index = CsvRowIndex(test_file)
+
+        assert index.fieldnames == ['header1', 'header2']
+        assert len(index) == 4
+        assert [index.decode(offset) for offset in index.offsets] == [
+            {'header1': 'value11', 'header2': 'value12'},
+            {'header1': 'multi\n\nline', 'header2': 'value22'},
+            {'header1': 'value31', 'header2': 'a "quoted" value'},
+            {'header1': 'value41', 'header2': 'value42'},
+        ]
+
+        test_file.write_text('')
+        index = CsvRowIndex(test_file)
+        assert index.fieldnames == []
+        assert len(index) == 0
+
+        test_file.write_text('header1\n')
+        index = CsvRowIndex(test_file)
+        assert index.fieldnames == ['header1']
+        assert len(index) == 0
+
+    def test_get(self, grizzly_fixture: GrizzlyFixture) -> None:
+        test_context = grizzly_fixture.test_context / 'requests'
+        test_context.mkdir(exist_ok=True)
+
+        test_file = test_context / 'shared.csv'
+        test_file.write_text('header1\nvalue1\n')
+
+        index = CsvRowIndex.get(test_file)
+        assert CsvRowIndex.get(test_file) is index
+
+        test_file.write_text('header1\nvalue1\nvalue2\n')
+        changed_index = CsvRowIndex.get(test_file)
+        assert changed_index is not index
+        assert len(changed_index) == 2
 
 
 class TestAtomicCsvReader:
@@ -204,6 +252,62 @@ class TestAtomicCsvReader:
         finally:
             cleanup()
 
+    @pytest.mark.parametrize(
+        ('repeat', 'random'),
+        [
+            (False, False),
+            (True, False),
+            (False, True),
+            (True, True),
+        ],
+    )
+    def test_variable_stream(self, grizzly_fixture: GrizzlyFixture, cleanup: AtomicVariableCleanupFixture, *, repeat: bool, random: bool) -> None:
+        test_context = grizzly_fixture.test_context / 'requests'
+        test_context.mkdir(exist_ok=True)
+
+        rows = [{'header1': f'value1{row}', 'header2': f'value2{row}'} for row in range(1, 11)]
+
+        with (test_context / 'stream.csv').open('w') as fd:
+            fd.write('header1,header2\n')
+            for row in rows:
+                fd.write(f'{row["header1"]},{row["header2"]}\n')
+
+        grizzly = grizzly_fixture.grizzly
+        scenario1 = grizzly.scenario
+        scenario2 = grizzly.scenarios.create(grizzly_fixture.behave.create_scenario('second'))
+
+        try:
+            value = f'stream.csv | stream=True, repeat={repeat}, random={random}'
+            instance1 = AtomicCsvReader(scenario=scenario1, variable='test', value=value)
+            instance2 = AtomicCsvReader(scenario=scenario2, variable='test', value=value)
+
+            for instance in [instance1, instance2]:
+                assert len(instance._rows['test']) == 10
+
+                with pytest.raises(ValueError, match=r'AtomicCsvReader\.test: header3 does not exists'):
+                    instance['test.header3']
+
+                assert len(instance._rows['test']) == 10
+
+                values = [instance['test'] for _ in range(10)]
+
+                if random:
+                    assert all(value in rows for value in values)
+                else:
+                    assert values == rows
+
+                if not random and not repeat:
+                    assert instance['test.header2'] is None
+                elif not random:
+                    assert instance['test.header2'] == {'header2': 'value21'}
+
+            # offset index is shared between scenarios, unless rows are removed in random order
+            refs1 = cast('LazyRowQueue', instance1._rows['test'])._refs
+            refs2 = cast('LazyRowQueue', instance2._rows['test'])._refs
+            assert (refs1 is refs2) is not (random and not repeat)
+        finally:
+            cleanup()
+
     def test_clear_and_destroy(self, grizzly_fixture: GrizzlyFixture, cleanup: AtomicVariableCleanupFixture) -> None:
         test_context = grizzly_fixture.test_context / 'requests'
         test_context.mkdir(exist_ok=True)
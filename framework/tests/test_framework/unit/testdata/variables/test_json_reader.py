@@ -7,16 +7,16 @@ from contextlib import suppress
 from typing import TYPE_CHECKING
 
 import pytest
-from grizzly.testdata.variables import AtomicJsonReader
-from grizzly.testdata.variables.json_reader import atomicjsonreader__base_type__
+from grizzly.testdata.variables import AtomicJsonReader, LazyRowQueue
+from grizzly.testdata.variables.json_reader import JsonLinesIndex, _outer_characters, atomicjsonreader__base_type__
 
 if TYPE_CHECKING:  # pragma: no cover
     from grizzly.types import StrDict
 
-    from test_framework.fixtures import AtomicVariableCleanupFixture, GrizzlyFixture
+    from test_framework.fixtures import AtomicVariableCleanupFixture, GrizzlyFixture, MockerFixture
 
 
-def test_atomicjsonreader__base_type__(grizzly_fixture: GrizzlyFixture) -> None:
+def test_atomicjsonreader__base_type__(grizzly_fixture: GrizzlyFixture, mocker: MockerFixture) -> None:
     test_context = grizzly_fixture.test_context / 'requests'
     test_context.mkdir(exist_ok=True)
 
@@ -51,6 +51,75 @@ def test_atomicjsonreader__base_type__(grizzly_fixture: GrizzlyFixture) -> None:
 
     assert atomicjsonreader__base_type__('file1.json|random=True') == 'file1.json | random=True'
 
+    # only the structure is validated
+    test_file.write_text('  \n[{"hello": "world"},\n{"foo": }]  \n')
+    assert atomicjsonreader__base_type__('file1.json') == 'file1.json'
+
+    test_file.write_text('[{"hello": "world"}')
+    with pytest.raises(ValueError, match='failed to load contents of'):
+        atomicjsonreader__base_type__('file1.json')
+
+    test_file.write_text('[{"hello": "world"}]', encoding='utf-8-sig')
+    assert atomicjsonreader__base_type__('file1.json') == 'file1.json'
+
+    index_spy = mocker.spy(JsonLinesIndex, '_index')
+
+    test_file = test_context / 'file1.jsonl'
+    test_file.write_text('\n["foo", "bar"]\n{"hello": "world"}\n')
+
+    with pytest.raises(ValueError, match=r'contents of file1.jsonl is not valid JSON Lines, line 2 is not a JSON object'):
+        atomicjsonreader__base_type__('file1.jsonl')
+
+    # only the first object is validated, the file is indexed when the variable is initialized
+    test_file.write_text('{"hello": "world"}\n\n["foo", "bar"]\n')
+    assert atomicjsonreader__base_type__('file1.jsonl') == 'file1.jsonl'
+
+    test_file.write_text('{"hello": "world"}\n\n{"foo": "bar"}')
+    assert atomicjsonreader__base_type__('file1.jsonl | repeat=True') == 'file1.jsonl | repeat=True'
+
+    (test_context / 'file1.ndjson').write_text('')
+    assert atomicjsonreader__base_type__('file1.ndjson') == 'file1.ndjson'
+
+    index_spy.assert_not_called()
+
+
+def test__outer_characters(grizzly_fixture: GrizzlyFixture) -> None:
+    test_context = grizzly_fixture.test_context / 'requests'
+    test_context.mkdir(exist_ok=True)
+
+    test_file = test_context / 'outer.json'
+    test_file.write_text('')
+    assert _outer_characters(test_file) == (b'', b'')
+
+    test_file.write_text(' \n\t ')
+    assert _outer_characters(test_file) == (b'', b'')
+
+    test_file.write_text('[{"hello": "world"}]', encoding='utf-8-sig')
+    assert _outer_characters(test_file) == (b'[', b']')
+
+    test_file.write_text('{"hello": "world"}' + ' ' * 100)
+    assert _outer_characters(test_file, chunk_size=10) == (b'{', b'}')
+
+
+class TestJsonLinesIndex:
+    def test___init__(self, grizzly_fixture: GrizzlyFixture) -> None:
+        test_context = grizzly_fixture.test_context / 'requests'
+        test_context.mkdir(exist_ok=True)
+
+        test_file = test_context / 'index.jsonl'
+        test_file.write_text('{"hello": "world"}\r\n\n  {"foo": ["bar"]}\n{"last": true}', encoding='utf-8-sig')
+
+        index = JsonLinesIndex(test_file)
+        assert len(index) == 3
+        assert [index.decode(offset) for offset in index.offsets] == [{'hello': 'world'}, {'foo': ['bar']}, {'last': True}]
+
+        test_file.write_text('')
+        assert len(JsonLinesIndex(test_file)) == 0
+
+        test_file.write_text('{"hello": "world"}\n"foo"\n')
+        with pytest.raises(ValueError, match='line 2 is not a JSON object'):
+            JsonLinesIndex(test_file)
+
 
 class TestAtomicJsonReader:
     def test_variable(self, grizzly_fixture: GrizzlyFixture, cleanup: AtomicVariableCleanupFixture) -> None:  # noqa: PLR0915
@@ -208,6 +277,71 @@ class TestAtomicJsonReader:
         finally:
             cleanup()
 
+    @pytest.mark.parametrize(
+        ('repeat', 'random'),
+        [
+            (False, False),
+            (True, False),
+            (False, True),
+            (True, True),
+        ],
+    )
+    def test_variable_json_lines(self, grizzly_fixture: GrizzlyFixture, cleanup: AtomicVariableCleanupFixture, *, repeat: bool, random: bool) -> None:
+        test_context = grizzly_fixture.test_context / 'requests'
+        test_context.mkdir(exist_ok=True)
+
+        items = [{'prop1': f'value1{item}', 'prop2': item} for item in range(1, 11)]
+        (test_context / 'items.ndjson').write_text('\n'.join(json.dumps(item) for item in items))
+
+        grizzly = grizzly_fixture.grizzly
+        scenario1 = grizzly.scenario
+        scenario2 = grizzly.scenarios.create(grizzly_fixture.behave.create_scenario('second'))
+
+        try:
+            value = f'items.ndjson | repeat={repeat}, random={random}'
+            instance1 = AtomicJsonReader(scenario=scenario1, variable='test', value=value)
+            instance2 = AtomicJsonReader(scenario=scenario2, variable='test', value=value)
+
+            for instance in [instance1, instance2]:
+                assert isinstance(instance._items['test'], LazyRowQueue)
+                assert len(instance._items['test']) == 10
+
+                with pytest.raises(ValueError, match=r'AtomicJsonReader\.test: prop3 does not exists'):
+                    instance['test.prop3']
+
+                assert len(instance._items['test']) == 10
+
+                values = [instance['test'] for _ in range(10)]
+
+                if random:
+                    assert all(value in items for value in values)
+                else:
+                    assert values == items
+
+                if not random and not repeat:
+                    assert instance['test.prop2'] is None
+                elif not random:
+                    assert instance['test.prop2'] == {'prop2': 1}
+        finally:
+            cleanup()
+
+    def test_variable_invalid(self, grizzly_fixture: GrizzlyFixture, cleanup: AtomicVariableCleanupFixture) -> None:
+        test_context = grizzly_fixture.test_context / 'requests'
+        test_context.mkdir(exist_ok=True)
+
+        (test_context / 'invalid.json').write_text('[{"hello": }]')
+
+        try:
+            with pytest.raises(ValueError, match=r'AtomicJsonReader: failed to load contents of invalid\.json'):
+                AtomicJsonReader(scenario=grizzly_fixture.grizzly.scenario, variable='test', value='invalid.json')
+
+            (test_context / 'invalid.jsonl').write_text('{"hello": "world"}\n\n["foo", "bar"]\n')
+
+            with pytest.raises(ValueError, match=r'AtomicJsonReader: contents of invalid\.jsonl is not valid JSON Lines, line 3 is not a JSON object'):
+                AtomicJsonReader(scenario=grizzly_fixture.grizzly.scenario, variable='lines', value='invalid.jsonl')
+        finally:
+            cleanup()
+
     def test_clear_and_destroy(self, grizzly_fixture: GrizzlyFixture, cleanup: AtomicVariableCleanupFixture) -> None:
         test_context = grizzly_fixture.test_context / 'requests'
         test_context.mkdir(exist_ok=True)
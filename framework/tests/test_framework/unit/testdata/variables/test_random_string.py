@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import re
-from typing import TYPE_CHECKING
+from string import ascii_letters, digits
+from time import perf_counter
+from typing import TYPE_CHECKING, cast
 
 import gevent
 import pytest
 from grizzly.testdata.variables import AtomicRandomString
+from grizzly.testdata.variables.random_string import BloomFilter, RandomStringPool, random_characters
 
 if TYPE_CHECKING:  # pragma: no cover
     from gevent.greenlet import Greenlet
@@ -108,7 +111,12 @@ class TestAtomicRandomString:
 
             assert len(t._strings['regnr']) == 10000
             # check that all are unique
-            assert sorted(t._strings['regnr']) == sorted(set(t._strings['regnr']))
+            values = [t['regnr'] for _ in range(10000)]
+            assert len(set(values)) == 10000
+            assert t['regnr'] is None
+
+            with pytest.raises(ValueError, match=r'AtomicRandomString: "%d" can only generate 10 unique strings, not 11'):
+                AtomicRandomString(scenario=scenario1, variable='digit', value='%d | count=11')
 
             t = AtomicRandomString(scenario=scenario2, variable='uuid', value='%g | count=3')
 
@@ -166,3 +174,84 @@ class TestAtomicRandomString:
             assert t['greenlet_var'] is None
         finally:
             cleanup()
+
+
+def test_random_characters() -> None:
+    assert random_characters(digits, 0) == ''
+
+    characters = random_characters(digits, 10000)
+    assert len(characters) == 10000
+    assert set(characters) == set(digits)
+
+    characters = random_characters(ascii_letters, 10000)
+    assert set(characters) == set(ascii_letters)
+
+
+class TestBloomFilter:
+    def test_add(self) -> None:
+        bloom = BloomFilter(1000, 0.001)
+
+        assert bloom.size == 14378
+        assert bloom.hashes == 10
+
+        assert bloom.add('foo')
+        assert not bloom.add('foo')
+        assert bloom.add('bar')
+
+        added = sum(bloom.add(f'value{index}') for index in range(1000))
+        assert added >= 995  # false positives
+
+    def test___sizeof__(self) -> None:
+        small = BloomFilter(1000, 0.001)
+        large = BloomFilter(10**6, 0.001)
+
+        assert small.__sizeof__() > 14378 // 8
+        assert large.__sizeof__() < 2 * 1024 * 1024
+
+
+class TestRandomStringPool:
+    def test___init__(self) -> None:
+        pool = RandomStringPool('%s%d', count=10, upper=False)
+        assert len(pool) == 10
+        assert isinstance(pool._seen, set)
+        assert pool._block == []
+
+        with pytest.raises(ValueError, match=r'"%s%d" can only generate 260 unique strings, not 261'):
+            RandomStringPool('%s%d', count=261, upper=True)
+
+        assert len(RandomStringPool('%s%d', count=520, upper=False)) == 520
+
+        # would need most of the possible strings
+        pool = RandomStringPool('%d%d%d%d%d%d', count=500_001, upper=False)
+        assert isinstance(pool._seen, set)
+
+        pool = RandomStringPool('%d%d%d%d%d%d', count=499_999, upper=False)
+        assert isinstance(pool._seen, BloomFilter)
+
+    def test_get(self) -> None:
+        # all possible strings
+        pool = RandomStringPool('a%d%d', count=100, upper=True)
+        values = [pool.get() for _ in range(100)]
+
+        assert pool.get() is None
+        assert len(pool) == 0
+        assert sorted(cast('list[str]', values)) == [f'A{index:02}' for index in range(100)]
+
+    def test_benchmark(self) -> None:
+        """Initializing and getting strings from a pool with 10^7 strings should be fast, and use a bounded amount of memory."""
+        count = 10**7
+        gets = 10**4
+
+        start = perf_counter()
+        pool = RandomStringPool('%s%s%s%d%d%d%d%d', count=count, upper=True)
+        values = {pool.get() for _ in range(gets)}
+        delta = perf_counter() - start
+
+        print(f'{gets} of {count} strings in {delta:.2f} seconds ({gets / delta:.0f} strings/s), {pool._seen.__sizeof__()} bytes')
+
+        assert len(values) == gets
+        assert len(pool) == count - gets
+        assert len(pool._block) < RandomStringPool.block_size
+        assert isinstance(pool._seen, BloomFilter)
+        assert pool._seen.__sizeof__() < 20 * 1024 * 1024
+        assert delta < 5.0
@@ -7,12 +7,15 @@ from contextlib import suppress
 from json import loads as jsonloads
 from typing import TYPE_CHECKING
 
+import grizzly.users as users_module
 import pytest
 from grizzly.exceptions import RestartIteration, RestartScenario, RetryTask, StopUser
 from grizzly.tasks import RequestTask
+from grizzly.tasks import request as request_module
 from grizzly.testdata.filters import templatingfilter
 from grizzly.types import FailureAction, GrizzlyResponse, RequestMethod, ScenarioState
 from grizzly.users import GrizzlyUser
+from grizzly_common.transformer import TransformerContentType, TransformerError
 from jinja2.filters import FILTERS
 
 from test_framework.helpers import ANY, SOME
@@ -116,6 +119,42 @@ class TestGrizzlyUser:
         parent.user.set_variable('are', 'foo')
         assert parent.user.render('how {{ are }} we {{ doing | sarcasm }} today', variables={'doing': 'bar'}) == 'how foo we BaR today'
 
+        # compiled template is cached
+        template = parent.user._scenario._templates.get('how {{ are }} we {{ doing | sarcasm }} today')
+        assert template is not None
+
+        parent.user.set_variable('are', 'bar')
+        assert parent.user.render('how {{ are }} we {{ doing | sarcasm }} today', variables={'doing': 'foo'}) == 'how bar we FoO today'
+        assert parent.user._scenario._templates.get('how {{ are }} we {{ doing | sarcasm }} today') is template
+
+        # no template, nothing cached
+        assert parent.user.render('how are we doing today') == 'how are we doing today'
+        assert parent.user._scenario._templates.get('how are we doing today') is None
+
+    def test_transform(self, grizzly_fixture: GrizzlyFixture) -> None:
+        parent = grizzly_fixture(user_type=DummyGrizzlyUser)
+
+        payload = '{"hello": "world"}'
+        transformed = parent.user.transform(TransformerContentType.JSON, payload)
+        assert transformed == {'hello': 'world'}
+
+        # same payload, or an equal one, is only transformed once
+        assert parent.user.transform(TransformerContentType.JSON, payload) is transformed
+        assert parent.user.transform(TransformerContentType.JSON, ''.join(['{"hello": ', '"world"}'])) is transformed  # noqa: FLY002
+
+        other_transformed = parent.user.transform(TransformerContentType.JSON, '{"hello": "foo"}')
+        assert other_transformed == {'hello': 'foo'}
+
+        # cached per content type
+        assert parent.user.transform(TransformerContentType.PLAIN, payload) == payload
+        assert parent.user.transform(TransformerContentType.JSON, '{"hello": "foo"}') is other_transformed
+
+        with pytest.raises(TransformerError, match='failed to transform input as JSON'):
+            parent.user.transform(TransformerContentType.JSON, '{"hello": }')
+
+        with pytest.raises(TransformerError, match='could not find a transformer for UNDEFINED'):
+            parent.user.transform(TransformerContentType.UNDEFINED, payload)
+
     def test_render_request(self, grizzly_fixture: GrizzlyFixture) -> None:  # noqa: PLR0915
         grizzly = grizzly_fixture.grizzly
         test_context = grizzly_fixture.test_context / 'requests'
@@ -187,6 +226,16 @@ class TestGrizzlyUser:
             assert request.source == 'this is a test alice'
             assert request.arguments is None
             assert request.metadata == {}
+
+            # arguments and metadata are rendered field by field
+            template.arguments = {'content_type': '{{ content_type }}', '{{ argument }}': 'static "value"'}
+            template.metadata = {'x-name': '{{ name | uppercase }} said "hello"', 'x-count': 1, 'x-nested': {'x-value': '{{ name }}'}}  # type: ignore[dict-item]
+            user.set_variable('content_type', 'json')
+            user.set_variable('argument', 'foo')
+            request = user.render_request(template)
+            assert request.arguments == {'content_type': 'json', 'foo': 'static "value"'}
+            assert request.metadata == {'x-name': 'ALICE said "hello"', 'x-count': 1, 'x-nested': {'x-value': 'alice'}}
+            assert template.arguments == {'content_type': '{{ content_type }}', '{{ argument }}': 'static "value"'}
         finally:
             with suppress(KeyError):
                 del FILTERS['uppercase']
@@ -236,6 +285,70 @@ class TestGrizzlyUser:
         assert data['MeasureResult']['name'] == user.variables['name']
         assert data['MeasureResult']['value'] == user.variables['value']
 
+    def test_render_request_plan(self, grizzly_fixture: GrizzlyFixture, mocker: MockerFixture) -> None:
+        grizzly = grizzly_fixture.grizzly
+        test_context = grizzly_fixture.test_context / 'requests'
+        test_context.mkdir(exist_ok=True)
+        (test_context / 'static.txt').write_text('static payload')
+        (test_context / 'dynamic.j2.txt').write_text('hello {{ name }}')
+        (test_context / 'statement.j2.txt').write_text('hello{% if name %} world{% endif %}{# comment #}')
+
+        grizzly.scenarios.clear()
+        grizzly.scenarios.create(grizzly_fixture.behave.create_scenario('test'))
+        DummyGrizzlyUser.__scenario__ = grizzly.scenario
+        user = DummyGrizzlyUser(grizzly_fixture.behave.locust.environment)
+        user.set_variable('name', 'bob')
+        user.set_variable('file', 'dynamic.j2.txt')
+
+        plan_read_spy = mocker.spy(request_module, 'read_request_source')
+        user_read_spy = mocker.spy(users_module, 'read_request_source')
+        render_spy = mocker.spy(user, '_render')
+
+        # static values are resolved once, and not rendered
+        template = RequestTask(RequestMethod.POST, name='test', endpoint='/api/test | foo=bar', source='static.txt')
+
+        for _ in range(3):
+            request = user.render_request(template)
+            assert request.name == '001 test'
+            assert request.endpoint == '/api/test'
+            assert request.source == 'static payload'
+            assert request.arguments == {'foo': 'bar'}
+            assert request.arguments is not template.arguments
+
+        assert plan_read_spy.call_count == 1
+        assert user_read_spy.call_count == 0
+        render_spy.assert_not_called()
+
+        # static file with templates
+        template = RequestTask(RequestMethod.POST, name='test', endpoint='/api/test', source='dynamic.j2.txt')
+
+        for _ in range(3):
+            assert user.render_request(template).source == 'hello bob'
+
+        assert plan_read_spy.call_count == 2
+        assert user_read_spy.call_count == 0
+        assert render_spy.call_count == 3
+
+        # rendered source might be a file
+        template = RequestTask(RequestMethod.POST, name='test', endpoint='/api/test', source='{{ file }}')
+
+        for _ in range(3):
+            assert user.render_request(template).source == 'hello bob'
+
+        assert plan_read_spy.call_count == 2
+        assert user_read_spy.call_count == 3
+
+        # templates with only statements or comments are also rendered
+        template = RequestTask(
+            RequestMethod.POST, name='test{# comment #}', endpoint='/api/{% if name %}test{% endif %} | foo="{% if name %}bar{% endif %}"', source='statement.j2.txt'
+        )
+        request = user.render_request(template)
+
+        assert request.name == '001 test'
+        assert request.endpoint == '/api/test'
+        assert request.arguments == {'foo': 'bar'}
+        assert request.source == 'hello world'
+
     def test_request(self, grizzly_fixture: GrizzlyFixture, mocker: MockerFixture) -> None:
         parent = grizzly_fixture(user_type=DummyGrizzlyUser)
         payload = RequestTask(RequestMethod.GET, name='test', endpoint='/api/test')
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from os import environ
+from os import environ, utime
 from types import FunctionType
 from typing import TYPE_CHECKING, cast
 
@@ -13,6 +13,7 @@ from grizzly.tasks import RequestTask
 from grizzly.types import RequestMethod
 from grizzly.users import GrizzlyUser, RestApiUser
 from grizzly.utils import (
+    FileCache,
     ModuleLoader,
     create_scenario_class_type,
     create_user_class_type,
@@ -30,6 +31,8 @@ from grizzly.utils import (
 from locust import TaskSet
 
 if TYPE_CHECKING:  # pragma: no cover
+    from pathlib import Path
+
     from grizzly.types.behave import Context
 
     from test_framework.fixtures import BehaveFixture
@@ -85,6 +88,84 @@ class TestModuleLoader:
             assert hasattr(user_class_instance, 'tasks')
 
 
+class TestFileCache:
+    def test_read_text(self, tmp_path: Path) -> None:
+        cache = FileCache(max_bytes=10)
+        file = tmp_path / 'test.txt'
+        file.write_text('hello')
+
+        assert cache.read_text(file) == 'hello'
+        assert file in cache
+        assert len(cache) == 1
+        assert cache.size == 5
+
+        # cached, not read again
+        cache._entries[file] = (*cache._entries[file][:2], 'cached')
+        assert cache.read_text(file) == 'cached'
+
+        # changed size
+        file.write_text('world!')
+        assert cache.read_text(file) == 'world!'
+        assert cache.size == 6
+
+        # changed modification time, same size
+        file.write_text('foobar')
+        stat = file.stat()
+        utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        cache._entries[file] = (*cache._entries[file][:2], 'cached')
+        assert cache.read_text(file) == 'foobar'
+        assert cache.size == 6
+
+        with pytest.raises(FileNotFoundError):
+            cache.read_text(tmp_path / 'missing.txt')
+
+    def test_read_text_evict(self, tmp_path: Path) -> None:
+        cache = FileCache(max_bytes=10)
+        files = []
+        for index in range(3):
+            file = tmp_path / f'test-{index}.txt'
+            file.write_text(str(index) * 4)
+            files.append(file)
+
+        for file in files[:2]:
+            cache.read_text(file)
+
+        assert cache.size == 8
+
+        # least recently used is evicted
+        cache.read_text(files[0])
+        cache.read_text(files[2])
+
+        assert files[0] in cache
+        assert files[1] not in cache
+        assert files[2] in cache
+        assert cache.size == 8
+
+        # larger than the cache, not cached
+        large_file = tmp_path / 'large.txt'
+        large_file.write_text('a' * 11)
+
+        assert cache.read_text(large_file) == 'a' * 11
+        assert large_file not in cache
+        assert len(cache) == 2
+
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.size == 0
+
+    def test_warm(self, tmp_path: Path) -> None:
+        cache = FileCache(max_bytes=1024)
+        (tmp_path / 'sub').mkdir()
+        (tmp_path / 'a.json').write_text('{}')
+        (tmp_path / 'sub' / 'b.json').write_text('[]')
+
+        assert cache.warm(tmp_path.rglob('*')) == 2
+        assert tmp_path / 'a.json' in cache
+        assert tmp_path / 'sub' / 'b.json' in cache
+        assert tmp_path / 'sub' not in cache
+
+
 def test_fail_directly(behave_fixture: BehaveFixture) -> None:
     behave = behave_fixture.context
     behave.config.stop = False
@@ -126,6 +207,7 @@ def test_create_user_class_type(behave_fixture: BehaveFixture) -> None:  # noqa:
     assert user_class_type_1.weight == 1
     assert user_class_type_1.fixed_count == 0
     assert user_class_type_1.sticky_tag is None
+    assert user_class_type_1.cost == 1.0
     assert user_class_type_1.__scenario__ is scenario
     assert user_class_type_1.host == 'http://localhost:8000'
     assert user_class_type_1.__module__ == 'grizzly.users.restapi'
@@ -199,6 +281,7 @@ def test_create_user_class_type(behave_fixture: BehaveFixture) -> None:  # noqa:
     scenario.user.class_name = 'RestApiUser'
     scenario.user.sticky_tag = 'foobar'
     scenario.user.fixed_count = 100
+    scenario.user.cost = 2.5
     scenario.context['metadata'] = {
         'Content-Type': 'application/xml',
         'Foo-Bar': 'hello world',
@@ -227,6 +310,7 @@ def test_create_user_class_type(behave_fixture: BehaveFixture) -> None:  # noqa:
     assert user_class_type_2.weight == 1
     assert user_class_type_2.fixed_count == 100
     assert user_class_type_2.sticky_tag == 'foobar'
+    assert user_class_type_2.cost == 2.5
     assert user_class_type_2.__scenario__ is scenario
     assert user_class_type_2.host == 'http://localhost:8001'
     assert user_class_type_2.__module__ == 'grizzly.users.restapi'
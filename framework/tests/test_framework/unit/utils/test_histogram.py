@@ -0,0 +1,135 @@
+"""Unit tests of grizzly.utils.histogram."""
+
+from __future__ import annotations
+
+from random import Random
+
+import pytest
+from grizzly.utils.histogram import Histogram
+
+
+class TestHistogram:
+    def test___init__(self) -> None:
+        histogram = Histogram()
+
+        assert histogram.relative_accuracy == 0.01
+        assert len(histogram) == 0
+        assert histogram.mean == 0.0
+        assert histogram.percentile(0.5) == 0.0
+
+        with pytest.raises(AssertionError, match='relative accuracy must be between 0 and 1'):
+            Histogram(relative_accuracy=0.0)
+
+        with pytest.raises(AssertionError, match='relative accuracy must be between 0 and 1'):
+            Histogram(relative_accuracy=1.0)
+
+    def test_add(self) -> None:
+        histogram = Histogram()
+
+        histogram.add(10.0)
+        histogram.add(5.0, count=3)
+        histogram.add(20.0)
+
+        assert len(histogram) == 5
+        assert histogram.total == 45.0
+        assert histogram.mean == 9.0
+        assert histogram.minimum == 5.0
+        assert histogram.maximum == 20.0
+        assert histogram.percentile(0.0) == 5.0
+        assert histogram.percentile(0.6) == pytest.approx(5.0, rel=0.01)
+        assert histogram.percentile(0.8) == pytest.approx(10.0, rel=0.01)
+        assert histogram.percentile(1.0) == 20.0
+
+        histogram.clear()
+
+        assert len(histogram) == 0
+        assert histogram.total == 0.0
+        assert histogram._buckets == {}
+
+    def test_add_zero(self) -> None:
+        histogram = Histogram()
+
+        histogram.add(0.0, count=2)
+        histogram.add(-1.0)
+        histogram.add(100.0)
+
+        assert len(histogram) == 4
+        assert histogram.minimum == -1.0
+        assert histogram.maximum == 100.0
+        assert histogram._zero == 3
+        assert histogram.percentile(0.5) == 0.0
+        assert histogram.percentile(0.99) == 100.0
+
+    def test_percentile(self) -> None:
+        randomizer = Random(1337)  # noqa: S311
+        values = sorted(randomizer.lognormvariate(5.0, 1.5) for _ in range(10_000))
+        histogram = Histogram()
+
+        for value in values:
+            histogram.add(value)
+
+        # a fixed number of buckets, regardless of the number of values
+        assert len(histogram._buckets) < 1000
+
+        for percent in [0.5, 0.9, 0.95, 0.99, 0.999]:
+            expected = values[int(percent * len(values)) - 1]
+            assert histogram.percentile(percent) == pytest.approx(expected, rel=0.01)
+
+    def test_merge(self) -> None:
+        histogram = Histogram()
+        other = Histogram()
+        expected = Histogram()
+
+        for value in range(1, 501):
+            histogram.add(value)
+            expected.add(value)
+
+        for value in range(501, 1001):
+            other.add(value)
+            expected.add(value)
+
+        assert Histogram().merge(Histogram()).count == 0
+        assert histogram.merge(Histogram()) is histogram
+        assert histogram.merge(other) is histogram
+
+        assert len(histogram) == 1000
+        assert histogram.minimum == 1.0
+        assert histogram.maximum == 1000.0
+        assert histogram._buckets == expected._buckets
+        assert histogram.percentile(0.5) == expected.percentile(0.5)
+
+        empty = Histogram().merge(other)
+        assert empty.minimum == 501.0
+        assert empty.maximum == 1000.0
+
+        with pytest.raises(AssertionError, match='can only merge histograms with the same relative accuracy'):
+            histogram.merge(Histogram(relative_accuracy=0.02))
+
+    def test_serialize(self) -> None:
+        histogram = Histogram(relative_accuracy=0.02)
+
+        for value in [0.0, 1.5, 10.0, 10.0, 250.0]:
+            histogram.add(value)
+
+        data = histogram.serialize()
+
+        assert data == {
+            'relative_accuracy': 0.02,
+            'count': 5,
+            'total': 271.5,
+            'minimum': 0.0,
+            'maximum': 250.0,
+            'zero': 1,
+            'buckets': [[11, 1], [58, 2], [139, 1]],
+        }
+
+        other = Histogram.unserialize(data)
+
+        assert other.relative_accuracy == histogram.relative_accuracy
+        assert len(other) == len(histogram)
+        assert other.total == histogram.total
+        assert other.minimum == histogram.minimum
+        assert other.maximum == histogram.maximum
+        assert other._zero == histogram._zero
+        assert other._buckets == histogram._buckets
+        assert other.percentile(0.5) == histogram.percentile(0.5)